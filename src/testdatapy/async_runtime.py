@@ -0,0 +1,380 @@
+"""Asyncio runtime for correlated data generation.
+
+Every transactional entity runs as a task on one event loop, paced by its
+own deadline-based AsyncPacer instead of ``time.sleep``, so hundreds of
+low-rate streams run concurrently without threads. A poll task drives the
+producer's delivery callbacks on the loop, where they resolve per-message
+futures; a bound on in-flight messages provides backpressure in place of
+blocking ``flush()`` calls.
+"""
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from testdatapy.config.correlation_config import CorrelationConfig
+from testdatapy.generators.correlated_generator import CorrelatedDataGenerator
+from testdatapy.generators.reference_pool import ReferencePool
+from testdatapy.sinks.pool import SinkPool
+
+DEFAULT_MAX_IN_FLIGHT = 100_000
+
+# Unpaced streams yield to the loop after this many records
+_UNPACED_BATCH = 100
+
+
+@dataclass
+class StreamStats:
+    """Progress of one entity stream."""
+
+    entity_type: str
+    topic: str
+    generated: int = 0
+    delivered: int = 0
+    failed: int = 0
+    started_at: float = 0.0
+    finished_at: float | None = None
+    error: str | None = None
+
+    @property
+    def records_per_second(self) -> float:
+        """Generation rate since the stream started."""
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return self.generated / elapsed if elapsed > 0 else 0.0
+
+    def record_delivery(self, future: asyncio.Future) -> None:
+        """Count a delivery report (future resolving to the delivery error)."""
+        if future.result() is None:
+            self.delivered += 1
+        else:
+            self.failed += 1
+
+
+class AsyncPacer:
+    """Paces a stream to a target rate with absolute deadlines.
+
+    Each call waits until the next slot of an ideal schedule, so sleep
+    overshoot does not accumulate into drift. A stream that falls more
+    than ``max_lag`` seconds behind restarts its schedule instead of
+    bursting to catch up.
+    """
+
+    def __init__(self, rate_per_second: float | None, max_lag: float = 1.0):
+        """Initialize the pacer.
+
+        Args:
+            rate_per_second: Target rate; None or 0 runs unpaced
+            max_lag: Largest backlog in seconds that is caught up by bursting
+        """
+        self.interval = 1.0 / rate_per_second if rate_per_second else 0.0
+        self.max_lag = max_lag
+        self._next: float | None = None
+        self._count = 0
+
+    async def wait(self) -> None:
+        """Wait for the next slot."""
+        if not self.interval:
+            # Unpaced: yield now and then so other streams keep running
+            self._count += 1
+            if self._count % _UNPACED_BATCH == 0:
+                await asyncio.sleep(0)
+            return
+
+        now = asyncio.get_running_loop().time()
+        if self._next is None or now - self._next > self.max_lag:
+            self._next = now
+        delay = self._next - now
+        self._next += self.interval
+        await asyncio.sleep(delay if delay > 0 else 0)
+
+
+class AsyncProducer:
+    """Produces through a producer pool and resolves delivery reports as futures.
+
+    Futures resolve to the delivery error, or None on success. Sink pools
+    have no delivery reports, so their futures resolve immediately.
+    """
+
+    def __init__(
+        self,
+        producer: Any,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        poll_interval: float = 0.01,
+    ):
+        """Initialize the async producer.
+
+        Args:
+            producer: ProducerPool or SinkPool
+            max_in_flight: Messages awaiting delivery before produce() waits
+            poll_interval: Seconds between polls for delivery reports
+        """
+        self.producer = producer
+        self.poll_interval = poll_interval
+        self._reports = not isinstance(producer, SinkPool)
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._poll_task: asyncio.Task | None = None
+
+    @property
+    def in_flight(self) -> int:
+        """Messages produced and not yet acknowledged."""
+        return self._in_flight
+
+    def start(self) -> None:
+        """Start polling for delivery reports on the running loop."""
+        if self._reports and self._poll_task is None:
+            self._poll_task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def produce(self, topic: str, value: dict[str, Any], key: str | None = None) -> asyncio.Future:
+        """Produce a message once an in-flight slot is free.
+
+        Args:
+            topic: Registered topic
+            value: Message value
+            key: Message key
+
+        Returns:
+            Future resolving to the delivery error (None on success)
+        """
+        future = asyncio.get_running_loop().create_future()
+        if not self._reports:
+            self.producer.produce(topic, value, key=key)
+            future.set_result(None)
+            return future
+
+        await self._slots.acquire()
+        self._in_flight += 1
+        self._idle.clear()
+
+        def on_delivery(err, msg):
+            self._release()
+            if not future.done():
+                future.set_result(err)
+
+        # Keep the pool's own partition and latency accounting
+        callback = self.producer.delivery_callback(on_delivery)
+        while True:
+            try:
+                self.producer.produce(topic, value, key=key, on_delivery=callback)
+                return future
+            except BufferError:
+                # librdkafka's queue is full; let deliveries free space
+                await asyncio.sleep(self.poll_interval)
+            except Exception:
+                # Never produced, so no delivery report will resolve the future
+                self._release()
+                raise
+
+    def _release(self) -> None:
+        """Free the in-flight slot of a message."""
+        self._in_flight -= 1
+        self._slots.release()
+        if self._in_flight == 0:
+            self._idle.set()
+
+    async def drain(self, timeout: float | None = None) -> int:
+        """Wait until all produced messages are acknowledged.
+
+        Args:
+            timeout: Maximum time to wait
+
+        Returns:
+            Number of messages still in flight
+        """
+        if self._reports:
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            self.producer.flush()
+        return self._in_flight
+
+    async def stop(self) -> None:
+        """Stop polling for delivery reports."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+
+    async def _poll(self) -> None:
+        """Serve delivery callbacks on the loop thread."""
+        while True:
+            self.producer.poll(0)
+            await asyncio.sleep(self.poll_interval)
+
+
+def split_message_key(record: dict[str, Any], key_field: str | None) -> tuple[str | None, dict[str, Any]]:
+    """Get the message key of a generated record and the value to produce.
+
+    Key-only fields take precedence over record fields and are removed
+    from the produced value.
+    """
+    key_only_fields = record.get("_key_only_fields", {})
+    if key_field in key_only_fields:
+        key = key_only_fields[key_field]
+    else:
+        key = record.get(key_field)
+    if "_key_only_fields" in record:
+        record = {k: v for k, v in record.items() if k != "_key_only_fields"}
+    return (str(key) if key is not None else None), record
+
+
+class AsyncCorrelatedRuntime:
+    """Runs the transactional entities of a correlation config as concurrent tasks."""
+
+    def __init__(
+        self,
+        config: CorrelationConfig,
+        reference_pool: ReferencePool,
+        producer: Any,
+        entities: list[str] | None = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        progress_interval: float | None = 5.0,
+        progress_records: int | None = None,
+        on_progress: Callable[[dict[str, StreamStats]], None] | None = None,
+        reference_wait: float = 0.05,
+        seed: int | None = None,
+    ):
+        """Initialize the runtime.
+
+        Args:
+            config: Correlation configuration
+            reference_pool: Pool holding master data and generated references
+            producer: ProducerPool or SinkPool receiving the records
+            entities: Transactional entities to run (default: all)
+            max_in_flight: Messages awaiting delivery before streams wait
+            progress_interval: Seconds between on_progress calls (None for
+                no timed reports)
+            progress_records: Also call on_progress after every this many
+                records generated across all streams
+            on_progress: Called on the loop with the stats of all streams,
+                e.g. to print progress or update metrics and health checks
+            reference_wait: Seconds a stream waits for referenced entities
+                that have no records yet
+            seed: Root seed of the entity generators
+        """
+        self.config = config
+        self.reference_pool = reference_pool
+        self.producer = producer
+        transactional = config.config.get("transactional_data", {})
+        self.entities = list(entities) if entities is not None else list(transactional)
+        self.max_in_flight = max_in_flight
+        self.progress_interval = progress_interval
+        self.progress_records = progress_records
+        self.on_progress = on_progress
+        self.reference_wait = reference_wait
+        self.seed = seed
+
+        self.stats: dict[str, StreamStats] = {}
+        self._generated = 0
+        self._stopping: asyncio.Event | None = None
+
+    def stop(self) -> None:
+        """Ask all streams to finish after their current record."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def run(self, drain_timeout: float | None = 30.0) -> dict[str, StreamStats]:
+        """Run all streams until they reach max_messages or stop() is called.
+
+        Args:
+            drain_timeout: Maximum time to wait for outstanding deliveries
+
+        Returns:
+            Stats per entity type
+        """
+        self._stopping = asyncio.Event()
+        async_producer = AsyncProducer(self.producer, self.max_in_flight)
+        async_producer.start()
+
+        streams = [
+            asyncio.create_task(self._run_stream(entity_type, async_producer), name=entity_type)
+            for entity_type in self.entities
+        ]
+        progress = None
+        if self.on_progress and self.progress_interval:
+            progress = asyncio.create_task(self._report_progress())
+        try:
+            await asyncio.gather(*streams)
+        finally:
+            for task in streams:
+                task.cancel()
+            await async_producer.drain(drain_timeout)
+            await async_producer.stop()
+            if progress is not None:
+                progress.cancel()
+            if self.on_progress:
+                self.on_progress(self.stats)
+        return self.stats
+
+    async def _run_stream(self, entity_type: str, async_producer: AsyncProducer) -> None:
+        """Generate and produce one entity at its configured rate."""
+        entity_config = self.config.get_transaction_config(entity_type)
+        topic = entity_config.get("kafka_topic")
+        stats = self.stats[entity_type] = StreamStats(entity_type, topic, started_at=time.monotonic())
+
+        generator = CorrelatedDataGenerator(
+            entity_type=entity_type,
+            config=self.config,
+            reference_pool=self.reference_pool,
+            rate_per_second=entity_config.get("rate_per_second"),
+            max_messages=entity_config.get("max_messages"),
+            seed=self.seed,
+        )
+        if entity_config.get("track_recent", False):
+            self.reference_pool.enable_recent_tracking(entity_type, window_size=1000)
+        key_field = self.config.get_key_field(entity_type, is_master=False)
+        if not self.producer.has_topic(topic):
+            self.producer.add_json_topic(topic)
+
+        pacer = AsyncPacer(generator.rate_per_second)
+        try:
+            while generator.should_continue() and not self._stopping.is_set():
+                await pacer.wait()
+                try:
+                    record = generator.generate_one()
+                except ValueError as e:
+                    # References to entities other streams have not produced yet
+                    if self._references_pending(entity_type):
+                        await asyncio.sleep(self.reference_wait)
+                        continue
+                    stats.error = str(e)
+                    break
+                key, value = split_message_key(record, key_field)
+                try:
+                    future = await async_producer.produce(topic, value, key)
+                except Exception as e:
+                    stats.failed += 1
+                    stats.error = str(e)
+                    break
+                stats.generated += 1
+                future.add_done_callback(stats.record_delivery)
+                self._generated += 1
+                if self.on_progress and self.progress_records and self._generated % self.progress_records == 0:
+                    self.on_progress(self.stats)
+        except Exception as e:
+            # Errors stop this stream only, as in threaded generation
+            stats.error = str(e)
+        finally:
+            stats.finished_at = time.monotonic()
+
+    def _references_pending(self, entity_type: str) -> bool:
+        """Check whether other streams are still running and may add references."""
+        return any(
+            stats.finished_at is None
+            for other, stats in self.stats.items()
+            if other != entity_type
+        ) or len(self.stats) < len(self.entities)
+
+    async def _report_progress(self) -> None:
+        """Call on_progress periodically."""
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            self.on_progress(self.stats)
@@ -5,13 +5,22 @@ import time
 
 import click
 
-from testdatapy.config.loader import AppConfig
+from testdatapy.config.loader import THROUGHPUT_PRESETS, AppConfig, throughput_settings
 from testdatapy.generators import CSVGenerator, FakerGenerator
 from testdatapy.health import create_health_monitor
 from testdatapy.metrics.collector import create_metrics_collector
-from testdatapy.producers import AvroProducer, JsonProducer, ProtobufProducer
+from testdatapy.metrics.latency import LatencyTracker
+from testdatapy.metrics.librdkafka_stats import LibrdkafkaStats
+from testdatapy.producers import AvroProducer, JsonProducer, ProtobufProducer, ReplayProducer
+from testdatapy.producers.partitioning import (
+    PARTITIONER_MODES,
+    PartitionStats,
+    create_partitioner,
+)
 from testdatapy.schema_evolution import SchemaEvolutionManager
 from testdatapy.shutdown import GracefulProducer, create_shutdown_handler
+from testdatapy.sinks import SINK_FORMATS, MessageLog, MessageLogSink, create_sink
+from testdatapy.sinks.message_log import json_value_serializer
 
 
 def _load_protobuf_class(
@@ -343,6 +352,16 @@ def cli():
 @click.option("--auto-create-topic/--no-auto-create-topic", default=True, help="Auto-create topic if it doesn't exist")
 @click.option("--topic-partitions", type=int, default=1, help="Number of partitions for auto-created topics")
 @click.option("--topic-replication", type=int, default=1, help="Replication factor for auto-created topics")
+@click.option("--fast-serialization/--no-fast-serialization", default=False, help="Frame avro/protobuf messages with a precomputed schema header")
+@click.option("--partitioner", "partitioner_mode", type=click.Choice(PARTITIONER_MODES), default="default", help="Client-side partition assignment (default leaves it to librdkafka)")
+@click.option("--partition-field", help="Record field holding an explicit partition (for --partitioner field)")
+@click.option("--partition-report/--no-partition-report", default=False, help="Report the per-partition message/byte distribution")
+@click.option("--preset", type=click.Choice(list(THROUGHPUT_PRESETS)), help="Throughput preset for linger, batching, compression and queue sizes")
+@click.option("--latency-report/--no-latency-report", default=False, help="Report enqueue-to-ack latency percentiles (always on with --metrics)")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="Write messages to a file instead of Kafka (.ndjson/.jsonl, optionally .gz/.zst, .avro or .parquet)")
+@click.option("--output-format", type=click.Choice(SINK_FORMATS), help="Output file format (default: from the --output suffix)")
+@click.option("--rotate-bytes", type=int, help="Start a new output file once the current one reaches this size")
+@click.option("--rotate-seconds", type=float, help="Start a new output file after this many seconds")
 def produce(
     config: str | None,
     topic: str,
@@ -368,8 +387,18 @@ def produce(
     auto_create_topic: bool,
     topic_partitions: int,
     topic_replication: int,
+    fast_serialization: bool,
+    partitioner_mode: str,
+    partition_field: str | None,
+    partition_report: bool,
+    preset: str | None,
+    latency_report: bool,
+    output: str | None,
+    output_format: str | None,
+    rotate_bytes: int | None,
+    rotate_seconds: float | None,
 ):
-    """Produce test data to Kafka."""
+    """Produce test data to Kafka or to files."""
     # Create shutdown handler
     shutdown_handler = create_shutdown_handler()
     
@@ -386,6 +415,11 @@ def produce(
         app_config.producer.max_messages = count
     if duration is not None:
         app_config.producer.max_duration_seconds = duration
+    if preset is not None:
+        app_config.producer.throughput_preset = preset
+
+    if partitioner_mode == "field" and not partition_field:
+        raise click.UsageError("--partitioner field requires --partition-field")
 
     # Set up metrics
     metrics_collector = create_metrics_collector(enabled=metrics)
@@ -439,8 +473,33 @@ def produce(
         raise click.BadParameter(f"Unknown generator: {generator}")
 
     # Set up producer
-    if not dry_run:
+    producer_settings = {}
+    producer_stats = None
+    sink = None
+    num_partitions = None
+    if output and not dry_run:
+        try:
+            sink = create_sink(
+                output,
+                format=output_format,
+                schema=schema_file,
+                topic=topic,
+                key_field=key_field,
+                max_bytes=rotate_bytes,
+                max_seconds=rotate_seconds,
+            )
+        except ValueError as e:
+            raise click.UsageError(str(e)) from None
+        producer = GracefulProducer(sink, shutdown_handler)
+    elif not dry_run:
         kafka_config = app_config.to_confluent_config()
+        producer_settings = throughput_settings(kafka_config)
+        if producer_settings or metrics:
+            # Statistics feed the Prometheus gauges and the run summary
+            producer_stats = LibrdkafkaStats(
+                on_update=metrics_collector.record_librdkafka_stats
+            )
+            kafka_config = producer_stats.configure(kafka_config)
         
         # Topic configuration for auto-creation
         topic_config = {
@@ -472,6 +531,7 @@ def produce(
                 key_field=key_field,
                 auto_create_topic=auto_create_topic,
                 topic_config=topic_config,
+                fast_serialization=fast_serialization,
             )
         elif format == "protobuf":
             # Dynamically load protobuf class
@@ -494,6 +554,7 @@ def produce(
                 key_field=key_field,
                 auto_create_topic=auto_create_topic,
                 topic_config=topic_config,
+                fast_serialization=fast_serialization,
             )
             
             # Auto-register schema if requested
@@ -507,11 +568,39 @@ def produce(
         else:
             raise click.BadParameter(f"Unknown format: {format}")
         
+        if partitioner_mode != "default" or partition_report:
+            num_partitions = producer.partition_count()
+            producer.partitioner = create_partitioner(
+                partitioner_mode, num_partitions, partition_field, seed
+            )
+        
         # Wrap producer for graceful shutdown
         producer = GracefulProducer(producer, shutdown_handler)
     else:
         producer = None
 
+    # Partition distribution and delivery latency from delivery reports
+    partition_stats = None
+    latency_tracker = None
+    on_delivery = None
+    # Files have no partitions or delivery reports
+    kafka_output = not dry_run and sink is None
+    if kafka_output and (partitioner_mode != "default" or partition_report):
+        partition_stats = PartitionStats()
+    if kafka_output and (latency_report or metrics):
+        latency_tracker = LatencyTracker()
+
+    if partition_stats is not None or latency_tracker is not None:
+        def report_failure(err, msg):
+            if err is not None:
+                click.echo(f"Message delivery failed: {err}", err=True)
+
+        on_delivery = report_failure
+        if partition_stats is not None:
+            on_delivery = partition_stats.delivery_callback(on_delivery)
+        if latency_tracker is not None:
+            on_delivery = latency_tracker.delivery_callback(on_delivery)
+
     # Start producing
     start_time = time.time()
     message_count = 0
@@ -520,11 +609,20 @@ def produce(
     click.echo(f"Generator: {generator}")
     click.echo(f"Format: {format}")
     click.echo(f"Topic: {topic}")
+    if sink is not None:
+        click.echo(f"Output: {output}")
     click.echo(f"Rate: {app_config.producer.rate_per_second} msg/s")
     if app_config.producer.max_messages:
         click.echo(f"Max messages: {app_config.producer.max_messages}")
     if app_config.producer.max_duration_seconds:
         click.echo(f"Max duration: {app_config.producer.max_duration_seconds}s")
+    if producer_settings:
+        if app_config.producer.throughput_preset:
+            click.echo(f"Throughput preset: {app_config.producer.throughput_preset}")
+        click.echo(
+            "Producer settings: "
+            + ", ".join(f"{k}={v}" for k, v in producer_settings.items())
+        )
     click.echo()
 
     try:
@@ -561,20 +659,19 @@ def produce(
             if dry_run:
                 click.echo(f"Key: {key}, Value: {json.dumps(data, indent=2)}")
             else:
-                produce_start = time.time()
-                producer.produce(key=key, value=data)
-                produce_duration = time.time() - produce_start
-                
-                # Record metrics
                 if metrics:
-                    data_size = len(json.dumps(data).encode('utf-8'))
+                    produce_start = time.perf_counter()
+                    producer.produce(key=key, value=data, on_delivery=on_delivery)
+                    # Size comes from the producer, so values are not serialized twice
                     metrics_collector.record_message_produced(
                         topic=topic,
                         format=format,
                         generator=generator,
-                        size_bytes=data_size,
-                        duration=produce_duration
+                        size_bytes=producer.last_value_size,
+                        duration=time.perf_counter() - produce_start
                     )
+                else:
+                    producer.produce(key=key, value=data, on_delivery=on_delivery)
 
             message_count += 1
 
@@ -587,6 +684,11 @@ def produce(
                     f"(rate: {actual_rate:.1f} msg/s)"
                 )
                 
+                if metrics and partition_stats is not None:
+                    metrics_collector.update_partition_stats(partition_stats)
+                if metrics and latency_tracker is not None:
+                    metrics_collector.update_delivery_latency(latency_tracker)
+                
                 # Update health check
                 if health:
                     health_monitor.update_check(
@@ -610,6 +712,11 @@ def produce(
             remaining = producer.flush(10.0)
             if remaining > 0:
                 click.echo(f"Warning: {remaining} messages still in queue")
+            if producer_stats is not None:
+                # Pick up a statistics report that covers the final batches
+                producer_stats.wait_for_update(producer.poll)
+        if sink is not None:
+            sink.close()
 
     # Print summary
     elapsed = time.time() - start_time
@@ -619,16 +726,240 @@ def produce(
     click.echo(f"Total messages: {message_count}")
     click.echo(f"Duration: {elapsed:.1f}s")
     click.echo(f"Actual rate: {actual_rate:.1f} msg/s")
+    if sink is not None:
+        for path in sink.files:
+            click.echo(f"Wrote {path}")
     
     if metrics:
         stats = metrics_collector.get_stats()
         click.echo(f"Success rate: {stats['success_rate']:.1%}")
         click.echo(f"Total bytes: {stats['bytes_produced']:,}")
     
+    if producer_stats is not None and producer_stats.updates:
+        click.echo(f"Bytes on the wire: {producer_stats.tx_bytes:,}")
+        ratio = producer_stats.compression_ratio
+        if ratio is not None:
+            click.echo(
+                f"Compression ratio: {ratio:.2f}x "
+                f"({producer_stats.txmsg_bytes:,} message bytes)"
+            )
+        summary = producer_stats.summary()
+        click.echo(f"Producer queue depth: {summary['queue_messages']:,} messages")
+        for topic_name, avg in summary["topic_batch_size_avg"].items():
+            click.echo(f"Average batch size ({topic_name}): {avg:,} bytes")
+        for broker, rtt_ms in summary["broker_rtt_p99_ms"].items():
+            click.echo(
+                f"Broker {broker}: RTT p99 {rtt_ms:.1f} ms, "
+                f"throttle avg {summary['broker_throttle_avg_ms'][broker]} ms, "
+                f"retries {summary['broker_tx_retries'][broker]}"
+            )
+    
+    if latency_tracker is not None:
+        metrics_collector.update_delivery_latency(latency_tracker)
+        for line in latency_tracker.format_report():
+            click.echo(line)
+    
+    if partition_stats is not None:
+        metrics_collector.update_partition_stats(partition_stats)
+        click.echo()
+        for line in partition_stats.format_report(topic, num_partitions):
+            click.echo(line)
+    
     # Graceful shutdown
     shutdown_handler.shutdown()
 
 
+@cli.command("generate-to-file")
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True),
+    help="Configuration file path (JSON format)",
+)
+@click.option("--topic", "-t", required=True, help="Topic the messages are generated for")
+@click.option(
+    "--format",
+    "-f",
+    type=click.Choice(["json", "avro"]),
+    default="json",
+    help="Message format",
+)
+@click.option(
+    "--generator",
+    "-g",
+    type=click.Choice(["faker", "csv"]),
+    default="faker",
+    help="Data generator type",
+)
+@click.option("--schema-file", type=click.Path(exists=True), help="Avro schema file")
+@click.option("--csv-file", type=click.Path(exists=True), help="CSV file for csv generator")
+@click.option("--key-field", help="Field to use as message key")
+@click.option("--count", type=int, required=True, help="Number of messages to generate")
+@click.option("--seed", type=int, help="Random seed for reproducible data")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), required=True, help="Message log file to write")
+@click.option("--rotate-bytes", type=int, help="Start a new message log once the current one reaches this size")
+def generate_to_file(
+    config: str | None,
+    topic: str,
+    format: str,
+    generator: str,
+    schema_file: str | None,
+    csv_file: str | None,
+    key_field: str | None,
+    count: int,
+    seed: int | None,
+    output: str,
+    rotate_bytes: int | None,
+):
+    """Generate serialized messages into a message log for replay."""
+    app_config = AppConfig.from_file(config) if config else AppConfig()
+
+    if generator == "faker":
+        # Unthrottled: the rate only matters when the log is replayed
+        data_generator = FakerGenerator(rate_per_second=0, max_messages=count, seed=seed)
+    else:
+        if not csv_file:
+            raise click.UsageError("CSV generator requires --csv-file")
+        data_generator = CSVGenerator(csv_file=csv_file, rate_per_second=0, max_messages=count)
+
+    metadata = {"format": format}
+    serializer = json_value_serializer
+    data_iterator = data_generator.generate()
+    if format == "avro":
+        if not schema_file:
+            raise click.UsageError("Avro format requires --schema-file")
+        from confluent_kafka.schema_registry import SchemaRegistryClient
+
+        from testdatapy.producers.wire_format import FramedAvroSerializer
+
+        with open(schema_file) as f:
+            schema_str = f.read()
+        # Values carry the schema ID of this registry; replay against the same one
+        serializer = FramedAvroSerializer(
+            schema_str=schema_str,
+            schema_registry_client=SchemaRegistryClient(app_config.to_schema_registry_config()),
+            subject=f"{topic}-value",
+        )
+        metadata["schema_id"] = serializer.schema_id
+        if generator == "faker":
+            data_iterator = data_generator.generate_generic(json.loads(schema_str))
+
+    sink = MessageLogSink(
+        output,
+        serializer=serializer,
+        metadata=metadata,
+        topic=topic,
+        key_field=key_field,
+        max_bytes=rotate_bytes,
+    )
+    start_time = time.time()
+    message_count = 0
+    with sink:
+        for data in data_iterator:
+            sink.produce(None, data)
+            message_count += 1
+            if message_count >= count:
+                break
+
+    elapsed = time.time() - start_time
+    click.echo(f"Generated {message_count} messages in {elapsed:.1f}s")
+    for path in sink.files:
+        click.echo(f"Wrote {path}")
+
+
+@cli.command()
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True),
+    help="Configuration file path (JSON format)",
+)
+@click.option("--topic", "-t", help="Topic to replay to (default: the topic recorded in each file)")
+@click.option("--rate", type=float, help="Messages per second (default: as fast as possible)")
+@click.option("--count", type=int, help="Maximum number of messages to replay")
+@click.option("--loops", type=int, default=1, help="Replay the files this many times")
+@click.option("--preset", type=click.Choice(list(THROUGHPUT_PRESETS)), help="Throughput preset for linger, batching, compression and queue sizes")
+@click.option("--auto-create-topic/--no-auto-create-topic", default=True, help="Auto-create topics that don't exist")
+@click.option("--topic-partitions", type=int, default=1, help="Number of partitions for auto-created topics")
+@click.option("--topic-replication", type=int, default=1, help="Replication factor for auto-created topics")
+def replay(
+    files: tuple[str, ...],
+    config: str | None,
+    topic: str | None,
+    rate: float | None,
+    count: int | None,
+    loops: int,
+    preset: str | None,
+    auto_create_topic: bool,
+    topic_partitions: int,
+    topic_replication: int,
+):
+    """Replay message logs to Kafka without generating or serializing data."""
+    app_config = AppConfig.from_file(config) if config else AppConfig()
+    if preset is not None:
+        app_config.producer.throughput_preset = preset
+
+    try:
+        logs = [MessageLog(path) for path in files]
+    except ValueError as e:
+        raise click.UsageError(str(e)) from None
+
+    kafka_config = app_config.to_confluent_config()
+    producer_settings = throughput_settings(kafka_config)
+    if producer_settings:
+        click.echo(
+            "Producer settings: "
+            + ", ".join(f"{k}={v}" for k, v in producer_settings.items())
+        )
+
+    shutdown_handler = create_shutdown_handler()
+    producer = ReplayProducer(
+        bootstrap_servers=app_config.kafka.bootstrap_servers,
+        config=kafka_config,
+        auto_create_topic=auto_create_topic,
+        topic_config={"num_partitions": topic_partitions, "replication_factor": topic_replication},
+    )
+
+    start_time = time.time()
+    try:
+        for _ in range(loops):
+            remaining = None if count is None else count - producer.messages_sent
+            if shutdown_handler.is_shutting_down() or remaining == 0:
+                break
+            producer.replay_all(
+                logs,
+                topic=topic,
+                rate_per_second=rate,
+                max_messages=remaining,
+                should_stop=shutdown_handler.is_shutting_down,
+            )
+    except KeyboardInterrupt:
+        click.echo("\nInterrupted by user")
+    finally:
+        remaining = producer.flush(30.0)
+        if remaining > 0:
+            click.echo(f"Warning: {remaining} messages still in queue")
+        for log in logs:
+            log.close()
+
+    elapsed = time.time() - start_time
+    click.echo()
+    click.echo("Summary:")
+    click.echo(f"Total messages: {producer.messages_sent}")
+    click.echo(f"Total bytes: {producer.bytes_sent:,}")
+    click.echo(f"Duration: {elapsed:.1f}s")
+    if elapsed > 0:
+        click.echo(
+            f"Actual rate: {producer.messages_sent / elapsed:.1f} msg/s "
+            f"({producer.bytes_sent / elapsed / (1024 * 1024):.1f} MB/s)"
+        )
+    if producer.failed:
+        click.echo(f"Failed deliveries: {producer.failed}", err=True)
+
+    shutdown_handler.shutdown()
+
+
 @cli.command()
 @click.option(
     "--config",
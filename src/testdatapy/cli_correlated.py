@@ -1,18 +1,156 @@
 """CLI commands for correlated data generation."""
+import asyncio
 import click
+import signal
 import sys
 import time
 from pathlib import Path
 import yaml
 
-from testdatapy.generators import ReferencePool, CorrelatedDataGenerator
+from testdatapy.async_runtime import AsyncCorrelatedRuntime, split_message_key
+from testdatapy.generators import ReferencePool, CorrelatedDataGenerator, VirtualClock
+from testdatapy.generators.clock import as_utc
+from testdatapy.generators.event_time import EventTimeScheduler
 from testdatapy.generators.master_data_generator import MasterDataGenerator
+from testdatapy.generators.shared_pool import is_shared_pool_file
 from testdatapy.config.correlation_config import CorrelationConfig
-from testdatapy.producers import JsonProducer
-from testdatapy.producers.protobuf_producer import ProtobufProducer
+from testdatapy.config.loader import THROUGHPUT_PRESETS, apply_throughput_preset, throughput_settings
+from testdatapy.metrics.latency import LatencyTracker
+from testdatapy.metrics.librdkafka_stats import LibrdkafkaStats
+from testdatapy.producers import ProducerPool
+from testdatapy.producers.partitioning import PARTITIONER_MODES, PartitionStats
+from testdatapy.sinks import COMPRESSIONS, SinkPool
 from testdatapy.schemas.schema_loader import get_protobuf_class_for_entity, fallback_to_hardcoded_mapping
 from testdatapy.performance.benchmark import VehicleBenchmarkSuite, PerformanceMonitor
 
+# Formats of --event-time-start/--event-time-end, with or without UTC offset
+_EVENT_TIME_FORMATS = [
+    '%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%d %H:%M:%S%z',
+]
+
+def _configured_topics(correlation_config: CorrelationConfig) -> list:
+    """Get the Kafka topics of all master and transactional entities."""
+    return [
+        entity_config["kafka_topic"]
+        for section in ("master_data", "transactional_data")
+        for entity_config in correlation_config.config.get(section, {}).values()
+        if entity_config.get("kafka_topic")
+    ]
+
+
+def _run_async_transactions(
+    correlation_config: CorrelationConfig,
+    ref_pool: ReferencePool,
+    producer,
+    seed: int | None = None,
+    progress_interval: int = 1000,
+) -> None:
+    """Generate all transactional entities concurrently on one event loop.
+
+    Like the threaded path, progress is reported every progress_interval
+    records (across all entities here).
+    """
+    def report(stats):
+        for entity_stats in stats.values():
+            click.echo(
+                f"    {entity_stats.entity_type}: {entity_stats.generated} generated, "
+                f"{entity_stats.delivered} delivered ({entity_stats.records_per_second:.0f} rps)"
+            )
+
+    runtime = AsyncCorrelatedRuntime(
+        correlation_config, ref_pool, producer,
+        progress_interval=None, progress_records=progress_interval, on_progress=report, seed=seed,
+    )
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, runtime.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Not supported on this platform or outside the main thread
+                pass
+        return await runtime.run()
+
+    stats = asyncio.run(run())
+    for entity_stats in stats.values():
+        click.echo(f"    Total: {entity_stats.generated} {entity_stats.entity_type} ({entity_stats.records_per_second:.0f} rps)")
+        if entity_stats.failed:
+            click.echo(f"    Failed deliveries: {entity_stats.failed}", err=True)
+        if entity_stats.error:
+            click.echo(f"Error generating {entity_stats.entity_type}: {entity_stats.error}", err=True)
+
+
+def _run_event_time_transactions(
+    correlation_config: CorrelationConfig,
+    ref_pool: ReferencePool,
+    producer,
+    seed: int | None,
+    start,
+    end,
+    dry_run: bool,
+    progress_interval: int
+) -> None:
+    """Generate all transactional entities in event-time order without sleeping."""
+    generators = []
+    for entity_type, entity_config in correlation_config.config.get("transactional_data", {}).items():
+        try:
+            generators.append(CorrelatedDataGenerator(
+                entity_type=entity_type,
+                config=correlation_config,
+                reference_pool=ref_pool,
+                rate_per_second=entity_config.get("rate_per_second"),
+                max_messages=entity_config.get("max_messages"),
+                seed=seed,
+                clock=VirtualClock(start),
+                event_time=True,
+                end_time=end
+            ))
+        except ValueError as e:
+            click.echo(f"Error: {e}", err=True)
+            sys.exit(1)
+        if entity_config.get("track_recent", False):
+            ref_pool.enable_recent_tracking(entity_type, window_size=1000)
+        if end is None and not entity_config.get("max_messages"):
+            click.echo(f"Error: {entity_type} needs max_messages or --event-time-end", err=True)
+            sys.exit(1)
+    
+    scheduler = EventTimeScheduler(generators)
+    key_fields = {g.entity_type: correlation_config.get_key_field(g.entity_type, is_master=False) for g in generators}
+    generation_start_time = time.time()
+    count = 0
+    event_time = start
+    for generator, event_time, record in scheduler:
+        count += 1
+        if dry_run:
+            click.echo(f"    {event_time.isoformat()} {generator.entity_type}: {record}")
+            if count >= 5:  # Show only first 5 in dry run
+                break
+            continue
+        
+        topic = generator.entity_config.get("kafka_topic")
+        key, value = split_message_key(record, key_fields[generator.entity_type])
+        if not producer.has_topic(topic):
+            producer.add_json_topic(topic)
+        # The message timestamp is the event time, as stream processors expect
+        producer.produce(topic, value, key=key, timestamp=int(event_time.timestamp() * 1000))
+        
+        if count % progress_interval == 0:
+            elapsed_time = time.time() - generation_start_time
+            rate = count / elapsed_time if elapsed_time > 0 else 0
+            click.echo(f"    Generated {count} records up to {event_time.isoformat()} ({rate:.0f} rps)")
+    
+    elapsed_time = time.time() - generation_start_time
+    for generator in generators:
+        click.echo(f"    Total: {generator.message_count} {generator.entity_type}")
+        if scheduler.skipped[generator.entity_type]:
+            click.echo(f"    Skipped {scheduler.skipped[generator.entity_type]} {generator.entity_type} slots before their references existed")
+        if generator.entity_type in scheduler.errors:
+            click.echo(f"Error generating {generator.entity_type}: {scheduler.errors[generator.entity_type]}", err=True)
+    rate = count / elapsed_time if elapsed_time > 0 else 0
+    click.echo(f"    Event time {start.isoformat()} to {event_time.isoformat()} in {elapsed_time:.1f}s ({rate:.0f} rps)")
+
 
 @click.group()
 def correlated():
@@ -35,7 +173,27 @@ def correlated():
 @click.option('--monitor-memory', is_flag=True, help='Enable real-time memory monitoring')
 @click.option('--correlation-report', is_flag=True, help='Generate detailed correlation analysis report')
 @click.option('--benchmark-output', help='Directory to save benchmark results')
-def generate(config, bootstrap_servers, producer_config, dry_run, master_only, transaction_only, format, schema_registry_url, clean_topics, benchmark, progress_interval, monitor_memory, correlation_report, benchmark_output):
+@click.option('--fast-serialization', is_flag=True, help='Frame protobuf messages with a precomputed schema header')
+@click.option('--partitioner', 'partitioner_mode', type=click.Choice(PARTITIONER_MODES), default='default', help='Client-side partition assignment (default leaves it to librdkafka)')
+@click.option('--partition-field', help='Record field holding an explicit partition (for --partitioner field)')
+@click.option('--partition-report', is_flag=True, help='Report the per-partition message/byte distribution')
+@click.option('--preset', type=click.Choice(list(THROUGHPUT_PRESETS)), help='Throughput preset for linger, batching, compression and queue sizes')
+@click.option('--latency-report', is_flag=True, help='Report enqueue-to-ack latency percentiles per topic')
+@click.option('--columnar', is_flag=True, help='Generate Faker master data and read CSV master data column by column with NumPy')
+@click.option('--master-workers', type=int, default=1, help='Worker processes for loading master data entities and chunks in parallel')
+@click.option('--seed', type=int, help='Seed for reproducible master and transactional data')
+@click.option('--save-master', type=click.Path(dir_okay=False), help='Save a reference pool snapshot after loading master data')
+@click.option('--reuse-master', type=click.Path(exists=True, dir_okay=False), help='Load master data from a reference pool snapshot or shared pool file instead of generating it')
+@click.option('--publish-master', type=click.Path(dir_okay=False), help='Publish master data as a shared pool file other processes can map (e.g. under /dev/shm)')
+@click.option('--output-dir', type=click.Path(file_okay=False), help='Write each topic to files in this directory instead of producing to Kafka')
+@click.option('--output-format', type=click.Choice(['ndjson', 'parquet']), default='ndjson', help='File format for --output-dir')
+@click.option('--output-compression', type=click.Choice(COMPRESSIONS), help='Compression of NDJSON output files')
+@click.option('--rotate-bytes', type=int, help='Start a new output file once the current one reaches this size')
+@click.option('--rotate-seconds', type=float, help='Start a new output file after this many seconds')
+@click.option('--async-runtime', is_flag=True, help='Run transactional entities concurrently as asyncio tasks (JSON only)')
+@click.option('--event-time-start', type=click.DateTime(_EVENT_TIME_FORMATS), help='Generate in event time from this time on, as fast as possible (JSON only; UTC unless an offset is given)')
+@click.option('--event-time-end', type=click.DateTime(_EVENT_TIME_FORMATS), help='End of the event-time window (default: stop at max_messages; UTC unless an offset is given)')
+def generate(config, bootstrap_servers, producer_config, dry_run, master_only, transaction_only, format, schema_registry_url, clean_topics, benchmark, progress_interval, monitor_memory, correlation_report, benchmark_output, fast_serialization, partitioner_mode, partition_field, partition_report, preset, latency_report, columnar, master_workers, seed, save_master, reuse_master, publish_master, output_dir, output_format, output_compression, rotate_bytes, rotate_seconds, async_runtime, event_time_start, event_time_end):
     """Generate correlated test data based on configuration."""
     
     # Load configuration with vehicle validation
@@ -61,7 +219,23 @@ def generate(config, bootstrap_servers, producer_config, dry_run, master_only, t
         sys.exit(1)
     
     # Create reference pool with enhanced monitoring
-    ref_pool = ReferencePool()
+    if reuse_master:
+        try:
+            if is_shared_pool_file(reuse_master):
+                ref_pool = ReferencePool.attach_shared(path=reuse_master)
+            else:
+                ref_pool = ReferencePool.load_snapshot(reuse_master)
+        except Exception as e:
+            click.echo(f"Error loading master data snapshot: {e}", err=True)
+            sys.exit(1)
+        click.echo(f"Reusing master data from {reuse_master}")
+        for entity_type in correlation_config.config.get("master_data", {}):
+            if ref_pool.has_type(entity_type):
+                click.echo(f"  {entity_type}: {ref_pool.get_type_count(entity_type)} records")
+            else:
+                click.echo(f"Warning: Snapshot has no records for {entity_type}", err=True)
+    else:
+        ref_pool = ReferencePool()
     ref_pool.enable_stats()
     
     # Initialize advanced monitoring if requested
@@ -79,16 +253,51 @@ def generate(config, bootstrap_servers, producer_config, dry_run, master_only, t
         performance_monitor.start_monitoring()
         click.echo("📊 Real-time memory monitoring enabled")
     
-    # Validate protobuf requirements
-    if format == 'protobuf' and not schema_registry_url:
+    # Validate protobuf requirements (files store records as JSON documents)
+    if format == 'protobuf' and not schema_registry_url and not output_dir:
         click.echo("Error: Protobuf format requires --schema-registry-url", err=True)
         sys.exit(1)
     
-    # Setup producer if not dry run
+    if partitioner_mode == 'field' and not partition_field:
+        click.echo("Error: --partitioner field requires --partition-field", err=True)
+        sys.exit(1)
+    
+    if async_runtime and format != 'json' and not output_dir:
+        click.echo("Error: --async-runtime supports JSON format only", err=True)
+        sys.exit(1)
+    
+    if event_time_end and not event_time_start:
+        click.echo("Error: --event-time-end requires --event-time-start", err=True)
+        sys.exit(1)
+    
+    if event_time_start and (async_runtime or (format != 'json' and not output_dir)):
+        click.echo("Error: Event-time generation supports JSON format without --async-runtime only", err=True)
+        sys.exit(1)
+    # Event times become Kafka timestamps; times without an offset are UTC
+    if event_time_start:
+        event_time_start = as_utc(event_time_start)
+    if event_time_end:
+        event_time_end = as_utc(event_time_end)
+    
+    # Setup producer pool if not dry run - one client shared by all topics
     producer = None
-    topic_producers = {}  # Store per-topic producers for protobuf
+    partition_stats = None
+    latency_tracker = None
+    producer_stats = None
     
-    if not dry_run:
+    if output_dir and not dry_run:
+        try:
+            producer = SinkPool(
+                output_dir,
+                format=output_format,
+                compression=output_compression,
+                max_bytes=rotate_bytes,
+                max_seconds=rotate_seconds
+            )
+        except Exception as e:
+            click.echo(f"Error creating file output: {e}", err=True)
+            sys.exit(1)
+    elif not dry_run:
         try:
             kafka_config = {"bootstrap.servers": bootstrap_servers}
             
@@ -101,412 +310,465 @@ def generate(config, bootstrap_servers, producer_config, dry_run, master_only, t
             # Extract bootstrap_servers and pass remaining as config
             servers = kafka_config.pop("bootstrap.servers", bootstrap_servers)
             
-            if format == 'json':
-                # We need a dummy topic for the producer - will be overridden per message
-                producer = JsonProducer(
-                    bootstrap_servers=servers,
-                    topic="dummy",  # Will be overridden in produce calls
-                    config=kafka_config
+            # Settings from the producer config file take precedence over the preset
+            kafka_config = apply_throughput_preset(kafka_config, preset)
+            producer_settings = throughput_settings(kafka_config)
+            if producer_settings:
+                producer_stats = LibrdkafkaStats()
+                kafka_config = producer_stats.configure(kafka_config)
+                if preset:
+                    click.echo(f"Throughput preset: {preset}")
+                click.echo(
+                    "Producer settings: "
+                    + ", ".join(f"{k}={v}" for k, v in producer_settings.items())
                 )
-            elif format == 'protobuf':
-                # For protobuf, we'll create producers per topic later
-                # as we need specific protobuf classes for each entity type
-                pass
+            
+            if partitioner_mode != 'default' or partition_report:
+                partition_stats = PartitionStats()
+            if latency_report:
+                latency_tracker = LatencyTracker()
+            
+            producer = ProducerPool(
+                bootstrap_servers=servers,
+                config=kafka_config,
+                schema_registry_url=schema_registry_url,
+                fast_serialization=fast_serialization,
+                partitioner=partitioner_mode,
+                partition_field=partition_field,
+                partition_stats=partition_stats,
+                latency_tracker=latency_tracker
+            )
                 
         except Exception as e:
             click.echo(f"Error creating producer: {e}", err=True)
             sys.exit(1)
     
-    # Phase 0: Clean topics if requested
-    if clean_topics and not dry_run:
-        click.echo("Cleaning topics...")
-        try:
-            from testdatapy.topics import TopicManager
+    # File sinks must be finished even if generation fails or is interrupted
+    try:
+        # Phase 0: Clean topics if requested
+        if clean_topics and not dry_run and not output_dir:
+            click.echo("Cleaning topics...")
+            try:
+                from testdatapy.topics import TopicManager
             
-            # Get all topics from configuration
-            topics_to_clean = []
+                # Get all topics from configuration
+                topics_to_clean = []
             
-            # Master data topics
-            for entity_config in correlation_config.config.get("master_data", {}).values():
-                topic = entity_config.get("kafka_topic")
-                if topic:
-                    topics_to_clean.append(topic)
+                # Master data topics
+                for entity_config in correlation_config.config.get("master_data", {}).values():
+                    topic = entity_config.get("kafka_topic")
+                    if topic:
+                        topics_to_clean.append(topic)
             
-            # Transactional data topics
-            for entity_config in correlation_config.config.get("transactional_data", {}).values():
-                topic = entity_config.get("kafka_topic") 
-                if topic:
-                    topics_to_clean.append(topic)
+                # Transactional data topics
+                for entity_config in correlation_config.config.get("transactional_data", {}).values():
+                    topic = entity_config.get("kafka_topic") 
+                    if topic:
+                        topics_to_clean.append(topic)
             
-            if topics_to_clean:
-                # Create topic manager
-                kafka_config = {"bootstrap.servers": bootstrap_servers}
-                if producer_config:
-                    with open(producer_config, 'r') as f:
-                        import json
-                        additional_config = json.load(f)
-                        kafka_config.update(additional_config)
+                if topics_to_clean:
+                    # Create topic manager
+                    kafka_config = {"bootstrap.servers": bootstrap_servers}
+                    if producer_config:
+                        with open(producer_config, 'r') as f:
+                            import json
+                            additional_config = json.load(f)
+                            kafka_config.update(additional_config)
                 
-                topic_manager = TopicManager(bootstrap_servers, kafka_config)
+                    topic_manager = TopicManager(bootstrap_servers, kafka_config)
                 
-                # Delete topics
-                for topic in topics_to_clean:
-                    try:
-                        if topic_manager.topic_exists(topic):
-                            topic_manager.delete_topic(topic)
-                            click.echo(f"  ✓ Deleted topic: {topic}")
-                        else:
-                            click.echo(f"  - Topic not found: {topic}")
-                    except Exception as e:
-                        click.echo(f"  ✗ Failed to delete {topic}: {e}")
+                    # Delete topics
+                    for topic in topics_to_clean:
+                        try:
+                            if topic_manager.topic_exists(topic):
+                                topic_manager.delete_topic(topic)
+                                click.echo(f"  ✓ Deleted topic: {topic}")
+                            else:
+                                click.echo(f"  - Topic not found: {topic}")
+                        except Exception as e:
+                            click.echo(f"  ✗ Failed to delete {topic}: {e}")
                 
-                click.echo(f"Topic cleanup completed for {len(topics_to_clean)} topics")
-            else:
-                click.echo("No topics found in configuration to clean")
+                    click.echo(f"Topic cleanup completed for {len(topics_to_clean)} topics")
+                else:
+                    click.echo("No topics found in configuration to clean")
                 
-        except Exception as e:
-            click.echo(f"Error during topic cleanup: {e}", err=True)
-            # Don't exit - continue with generation
+            except Exception as e:
+                click.echo(f"Error during topic cleanup: {e}", err=True)
+                # Don't exit - continue with generation
     
-    # Phase 1: Load master data
-    if not transaction_only:
-        click.echo("Loading master data...")
-        master_gen = MasterDataGenerator(
-            config=correlation_config,
-            reference_pool=ref_pool,
-            producer=producer
-        )
+        # Ensure all configured topics exist with a single batched admin call
+        if producer:
+            configured_topics = _configured_topics(correlation_config)
+            try:
+                created_topics = producer.ensure_topics(configured_topics)
+                if created_topics:
+                    click.echo(f"Created topics: {', '.join(created_topics)}")
+            except Exception as e:
+                click.echo(f"Warning: Failed to ensure topics exist: {e}", err=True)
+    
+        # Phase 1: Load master data
+        if not transaction_only and not reuse_master:
+            click.echo("Loading master data...")
+            master_gen = MasterDataGenerator(
+                config=correlation_config,
+                reference_pool=ref_pool,
+                producer=producer,
+                columnar=columnar,
+                seed=seed,
+                workers=master_workers,
+                clock=VirtualClock(event_time_start) if event_time_start else None
+            )
         
-        try:
-            master_gen.load_all()
+            try:
+                master_gen.load_all()
             
-            # Show loading performance statistics
-            loading_stats = master_gen.get_loading_stats()
-            total_stats = loading_stats.get("_total", {})
-            total_duration = total_stats.get("duration_seconds", 0)
-            total_records = total_stats.get("total_records", 0)
+                # Show loading performance statistics
+                loading_stats = master_gen.get_loading_stats()
+                total_stats = loading_stats.get("_total", {})
+                total_duration = total_stats.get("duration_seconds", 0)
+                total_records = total_stats.get("total_records", 0)
             
-            click.echo(f"✅ Master data loaded in {total_duration:.2f}s ({total_records} total records)")
+                click.echo(f"✅ Master data loaded in {total_duration:.2f}s ({total_records} total records)")
             
-            # Show detailed summary with performance metrics
-            for entity_type in correlation_config.config.get("master_data", {}):
-                count = ref_pool.get_type_count(entity_type)
-                entity_stats = loading_stats.get(entity_type, {})
-                rps = entity_stats.get("records_per_second", 0)
-                click.echo(f"  {entity_type}: {count} records ({rps:.0f} rec/s)")
+                # Show detailed summary with performance metrics
+                for entity_type in correlation_config.config.get("master_data", {}):
+                    count = ref_pool.get_type_count(entity_type)
+                    entity_stats = loading_stats.get(entity_type, {})
+                    rps = entity_stats.get("records_per_second", 0)
+                    click.echo(f"  {entity_type}: {count} records ({rps:.0f} rec/s)")
                 
-                # Show sample if dry run
-                if dry_run:
-                    sample = master_gen.get_sample(entity_type, count=3)
-                    for record in sample:
-                        click.echo(f"    {record}")
+                    # Show sample if dry run
+                    if dry_run:
+                        sample = master_gen.get_sample(entity_type, count=3)
+                        for record in sample:
+                            click.echo(f"    {record}")
             
-            # Show memory usage for large datasets
-            memory_usage = master_gen.get_memory_usage()
-            if memory_usage["total_records"] > 10000:  # Only for large datasets
-                click.echo(f"📊 Memory usage: {memory_usage['total_records']} records loaded")
-                for entity_type, usage in memory_usage["entities"].items():
-                    if usage["memory_mb"] > 0:
-                        click.echo(f"   {entity_type}: {usage['memory_mb']:.1f} MB")
+                # Show memory usage for large datasets
+                memory_usage = master_gen.get_memory_usage()
+                if memory_usage["total_records"] > 10000:  # Only for large datasets
+                    click.echo(f"📊 Memory usage: {memory_usage['total_records']} records loaded")
+                    for entity_type, usage in memory_usage["entities"].items():
+                        if usage["memory_mb"] > 0:
+                            click.echo(f"   {entity_type}: {usage['memory_mb']:.1f} MB")
             
-            # Produce if not dry run
-            if not dry_run:
-                if format == 'json':
-                    try:
-                        click.echo("Producing master data to Kafka...")
-                        master_gen.produce_all()
-                        click.echo("Master data production completed")
-                    except Exception as e:
-                        click.echo(f"Error producing master data: {e}", err=True)
-                        import traceback
-                        traceback.print_exc()
-                elif format == 'protobuf':
-                    # Produce master data with protobuf using dynamic loading
-                    for entity_type, entity_config in correlation_config.config.get("master_data", {}).items():
-                        topic = entity_config.get("kafka_topic")
-                        # Use consistent key field priority logic for master data
-                        key_field = correlation_config.get_key_field(entity_type, is_master=True)
-                        
-                        # Try to get protobuf class using dynamic loading
-                        proto_class = None
+                # Produce if not dry run
+                if not dry_run:
+                    if format == 'json':
                         try:
-                            # First try configuration-based loading
-                            proto_class = get_protobuf_class_for_entity(entity_config, entity_type)
+                            click.echo("Producing master data to Kafka...")
+                            master_gen.produce_all()
+                            click.echo("Master data production completed")
+                        except Exception as e:
+                            click.echo(f"Error producing master data: {e}", err=True)
+                            import traceback
+                            traceback.print_exc()
+                    elif format == 'protobuf':
+                        # Produce master data with protobuf using dynamic loading
+                        for entity_type, entity_config in correlation_config.config.get("master_data", {}).items():
+                            topic = entity_config.get("kafka_topic")
+                            # Use consistent key field priority logic for master data
+                            key_field = correlation_config.get_key_field(entity_type, is_master=True)
+                        
+                            # Try to get protobuf class using dynamic loading
+                            proto_class = None
+                            try:
+                                # First try configuration-based loading
+                                proto_class = get_protobuf_class_for_entity(entity_config, entity_type)
                             
-                            # If no config-based class found, try hardcoded mapping fallback
-                            if proto_class is None:
-                                proto_class = fallback_to_hardcoded_mapping(entity_type)
+                                # If no config-based class found, try hardcoded mapping fallback
+                                if proto_class is None:
+                                    proto_class = fallback_to_hardcoded_mapping(entity_type)
                             
-                            if proto_class is None:
-                                click.echo(f"Warning: No protobuf class found for {entity_type}, using JSON", err=True)
-                                continue
+                                if proto_class is None:
+                                    click.echo(f"Warning: No protobuf class found for {entity_type}, using JSON", err=True)
+                                    continue
                                 
-                        except Exception as e:
-                            click.echo(f"❌ Error loading protobuf class for {entity_type}: {e}", err=True)
-                            if hasattr(e, '__class__') and 'ModuleNotFoundError' in str(e.__class__):
-                                click.echo(f"💡 Hint: Ensure protobuf module is compiled with: protoc --python_out=. your_schema.proto", err=True)
-                                click.echo(f"💡 Or specify 'schema_path' in configuration to use custom location", err=True)
-                            click.echo(f"⚠️  Falling back to JSON for {entity_type}", err=True)
-                            continue
+                            except Exception as e:
+                                click.echo(f"❌ Error loading protobuf class for {entity_type}: {e}", err=True)
+                                if hasattr(e, '__class__') and 'ModuleNotFoundError' in str(e.__class__):
+                                    click.echo(f"💡 Hint: Ensure protobuf module is compiled with: protoc --python_out=. your_schema.proto", err=True)
+                                    click.echo(f"💡 Or specify 'schema_path' in configuration to use custom location", err=True)
+                                click.echo(f"⚠️  Falling back to JSON for {entity_type}", err=True)
+                                continue
                         
-                        if topic not in topic_producers:
-                            topic_producers[topic] = ProtobufProducer(
-                                bootstrap_servers=servers,
-                                topic=topic,
-                                schema_registry_url=schema_registry_url,
-                                schema_proto_class=proto_class,
-                                config=kafka_config.copy(),
-                                key_field=key_field,
-                                auto_create_topic=True
-                            )
+                            if not producer.has_topic(topic):
+                                producer.add_protobuf_topic(topic, proto_class, key_field=key_field)
                         
-                        # Produce each record
-                        data = master_gen.loaded_data.get(entity_type, [])
-                        for record in data:
-                            topic_producers[topic].produce(record)
+                            # Produce each record
+                            data = master_gen.loaded_data.get(entity_type, [])
+                            for record in data:
+                                producer.produce(topic, record)
                         
-                        topic_producers[topic].flush()
+                            producer.flush()
                 
-                click.echo("Master data produced to Kafka")
+                    click.echo("Master data produced to Kafka")
+            
+                if save_master:
+                    snapshot_size = ref_pool.save_snapshot(
+                        save_master,
+                        {"master_entities": list(correlation_config.config.get("master_data", {}))}
+                    )
+                    click.echo(f"Saved master data snapshot to {save_master} ({snapshot_size / (1024 * 1024):.1f} MB)")
+            
+                if publish_master:
+                    segment = ref_pool.publish_shared(path=publish_master)
+                    click.echo(f"Published shared master data to {publish_master} ({segment.size / (1024 * 1024):.1f} MB)")
                 
-        except Exception as e:
-            click.echo(f"Error loading master data: {e}", err=True)
-            sys.exit(1)
+            except Exception as e:
+                click.echo(f"Error loading master data: {e}", err=True)
+                sys.exit(1)
     
-    # Phase 2: Generate transactional data
-    if not master_only:
-        click.echo("\nGenerating transactional data...")
+        # Phase 2: Generate transactional data
+        if not master_only and event_time_start:
+            click.echo(f"\nGenerating transactional data in event time from {event_time_start.isoformat()}...")
+            _run_event_time_transactions(
+                correlation_config, ref_pool, producer, seed,
+                event_time_start, event_time_end, dry_run, progress_interval
+            )
+        elif not master_only and async_runtime and not dry_run:
+            click.echo("\nGenerating transactional data (async runtime)...")
+            _run_async_transactions(correlation_config, ref_pool, producer, seed, progress_interval)
+        elif not master_only:
+            click.echo("\nGenerating transactional data...")
         
-        for entity_type, entity_config in correlation_config.config.get("transactional_data", {}).items():
-            click.echo(f"  Generating {entity_type}...")
+            for entity_type, entity_config in correlation_config.config.get("transactional_data", {}).items():
+                click.echo(f"  Generating {entity_type}...")
             
-            try:
-                generator = CorrelatedDataGenerator(
-                    entity_type=entity_type,
-                    config=correlation_config,
-                    reference_pool=ref_pool,
-                    rate_per_second=entity_config.get("rate_per_second"),
-                    max_messages=entity_config.get("max_messages")
-                )
+                try:
+                    generator = CorrelatedDataGenerator(
+                        entity_type=entity_type,
+                        config=correlation_config,
+                        reference_pool=ref_pool,
+                        rate_per_second=entity_config.get("rate_per_second"),
+                        max_messages=entity_config.get("max_messages"),
+                        seed=seed
+                    )
                 
-                # Track recent items if needed
-                if entity_config.get("track_recent", False):
-                    ref_pool.enable_recent_tracking(entity_type, window_size=1000)
+                    # Track recent items if needed
+                    if entity_config.get("track_recent", False):
+                        ref_pool.enable_recent_tracking(entity_type, window_size=1000)
                 
-                # Initialize monitoring for this entity
-                correlation_count = 0
-                total_count = 0
-                generation_start_time = time.time()
+                    # Initialize monitoring for this entity
+                    correlation_count = 0
+                    total_count = 0
+                    generation_start_time = time.time()
                 
-                count = 0
-                for record in generator.generate():
-                    count += 1
-                    total_count += 1
+                    count = 0
+                    for record in generator.generate():
+                        count += 1
+                        total_count += 1
                     
-                    # Track correlations for detailed reporting
-                    if correlation_report and record.get("appointment_plate") is not None:
-                        correlation_count += 1
+                        # Track correlations for detailed reporting
+                        if correlation_report and record.get("appointment_plate") is not None:
+                            correlation_count += 1
                     
-                    if dry_run:
-                        click.echo(f"    {record}")
-                        if count >= 5:  # Show only first 5 in dry run
-                            break
-                    else:
-                        topic = entity_config.get("kafka_topic")
-                        # Use consistent key field priority logic
-                        key_field = correlation_config.get_key_field(entity_type, is_master=False)
-                        
-                        # Check if key field is in key_only_fields first
-                        key_only_fields = record.get("_key_only_fields", {})
-                        if key_field in key_only_fields:
-                            key = key_only_fields[key_field]
+                        if dry_run:
+                            click.echo(f"    {record}")
+                            if count >= 5:  # Show only first 5 in dry run
+                                break
                         else:
-                            key = record.get(key_field)
+                            topic = entity_config.get("kafka_topic")
+                            # Use consistent key field priority logic
+                            key_field = correlation_config.get_key_field(entity_type, is_master=False)
                         
-                        # Remove _key_only_fields from the record before producing
-                        if "_key_only_fields" in record:
-                            record_copy = record.copy()
-                            del record_copy["_key_only_fields"]
-                            record = record_copy
+                            # Check if key field is in key_only_fields first
+                            key_only_fields = record.get("_key_only_fields", {})
+                            if key_field in key_only_fields:
+                                key = key_only_fields[key_field]
+                            else:
+                                key = record.get(key_field)
                         
-                        if format == 'json':
-                            # Create topic-specific producer if needed
-                            if not hasattr(producer, '_topic_producers'):
-                                producer._topic_producers = {}
-                            
-                            if topic not in producer._topic_producers:
-                                producer._topic_producers[topic] = JsonProducer(
-                                    bootstrap_servers=producer.bootstrap_servers,
-                                    topic=topic,
-                                    config=producer.config,
-                                    auto_create_topic=True
-                                )
+                            # Remove _key_only_fields from the record before producing
+                            if "_key_only_fields" in record:
+                                record_copy = record.copy()
+                                del record_copy["_key_only_fields"]
+                                record = record_copy
+                        
+                            if format == 'json':
+                                if not producer.has_topic(topic):
+                                    producer.add_json_topic(topic)
                             
-                            producer._topic_producers[topic].produce(key=key, value=record)
+                                producer.produce(topic, record, key=key)
                         
-                        elif format == 'protobuf':
-                            # Create protobuf producer for this entity type if needed
-                            if topic not in topic_producers:
-                                # Get protobuf class using dynamic loading
-                                proto_class = None
-                                try:
-                                    # First try configuration-based loading
-                                    proto_class = get_protobuf_class_for_entity(entity_config, entity_type)
+                            elif format == 'protobuf':
+                                # Register protobuf serializer for this entity type if needed
+                                if not producer.has_topic(topic):
+                                    # Get protobuf class using dynamic loading
+                                    proto_class = None
+                                    try:
+                                        # First try configuration-based loading
+                                        proto_class = get_protobuf_class_for_entity(entity_config, entity_type)
                                     
-                                    # If no config-based class found, try hardcoded mapping fallback
-                                    if proto_class is None:
-                                        proto_class = fallback_to_hardcoded_mapping(entity_type)
+                                        # If no config-based class found, try hardcoded mapping fallback
+                                        if proto_class is None:
+                                            proto_class = fallback_to_hardcoded_mapping(entity_type)
                                     
-                                    if proto_class is None:
-                                        click.echo(f"Warning: No protobuf class found for {entity_type}, skipping", err=True)
-                                        continue
+                                        if proto_class is None:
+                                            click.echo(f"Warning: No protobuf class found for {entity_type}, skipping", err=True)
+                                            continue
                                         
-                                except Exception as e:
-                                    click.echo(f"❌ Error loading protobuf class for {entity_type}: {e}", err=True)
-                                    if hasattr(e, '__class__') and 'ModuleNotFoundError' in str(e.__class__):
-                                        click.echo(f"💡 Hint: Ensure protobuf module is compiled with: protoc --python_out=. your_schema.proto", err=True)
-                                        click.echo(f"💡 Or add 'protobuf_module' and 'protobuf_class' fields to your configuration", err=True)
-                                    click.echo(f"⚠️  Skipping {entity_type}", err=True)
-                                    continue
+                                    except Exception as e:
+                                        click.echo(f"❌ Error loading protobuf class for {entity_type}: {e}", err=True)
+                                        if hasattr(e, '__class__') and 'ModuleNotFoundError' in str(e.__class__):
+                                            click.echo(f"💡 Hint: Ensure protobuf module is compiled with: protoc --python_out=. your_schema.proto", err=True)
+                                            click.echo(f"💡 Or add 'protobuf_module' and 'protobuf_class' fields to your configuration", err=True)
+                                        click.echo(f"⚠️  Skipping {entity_type}", err=True)
+                                        continue
                                 
-                                topic_producers[topic] = ProtobufProducer(
-                                    bootstrap_servers=servers,
-                                    topic=topic,
-                                    schema_registry_url=schema_registry_url,
-                                    schema_proto_class=proto_class,
-                                    config=kafka_config.copy(),
-                                    key_field=key_field,
-                                    auto_create_topic=True
-                                )
+                                    producer.add_protobuf_topic(topic, proto_class, key_field=key_field)
                             
-                            topic_producers[topic].produce(record)
+                                producer.produce(topic, record)
                     
-                    # Enhanced progress reporting
-                    if count % progress_interval == 0:
-                        elapsed_time = time.time() - generation_start_time
-                        rate = count / elapsed_time if elapsed_time > 0 else 0
+                        # Enhanced progress reporting
+                        if count % progress_interval == 0:
+                            elapsed_time = time.time() - generation_start_time
+                            rate = count / elapsed_time if elapsed_time > 0 else 0
                         
-                        if correlation_report and total_count > 0:
-                            current_correlation_ratio = correlation_count / total_count
-                            click.echo(f"    Generated {count} records ({rate:.0f} rps, correlation: {current_correlation_ratio:.3f})")
-                        else:
-                            click.echo(f"    Generated {count} records ({rate:.0f} rps)")
+                            if correlation_report and total_count > 0:
+                                current_correlation_ratio = correlation_count / total_count
+                                click.echo(f"    Generated {count} records ({rate:.0f} rps, correlation: {current_correlation_ratio:.3f})")
+                            else:
+                                click.echo(f"    Generated {count} records ({rate:.0f} rps)")
                         
-                        # Memory monitoring update
-                        if performance_monitor:
-                            current_memory = performance_monitor.get_peak_memory()
-                            if current_memory > 0:
-                                click.echo(f"    Memory usage: {current_memory:.1f} MB")
+                            # Memory monitoring update
+                            if performance_monitor:
+                                current_memory = performance_monitor.get_peak_memory()
+                                if current_memory > 0:
+                                    click.echo(f"    Memory usage: {current_memory:.1f} MB")
                     
-                    # Check if we should stop
-                    max_messages = entity_config.get("max_messages")
-                    if max_messages and count >= max_messages:
-                        break
+                        # Check if we should stop
+                        max_messages = entity_config.get("max_messages")
+                        if max_messages and count >= max_messages:
+                            break
                 
-                # Entity completion statistics
-                entity_duration = time.time() - generation_start_time
-                entity_rate = count / entity_duration if entity_duration > 0 else 0
+                    # Entity completion statistics
+                    entity_duration = time.time() - generation_start_time
+                    entity_rate = count / entity_duration if entity_duration > 0 else 0
                 
-                click.echo(f"    Total: {count} {entity_type} ({entity_rate:.0f} rps)")
+                    click.echo(f"    Total: {count} {entity_type} ({entity_rate:.0f} rps)")
                 
-                # Correlation reporting
-                if correlation_report and total_count > 0:
-                    final_correlation_ratio = correlation_count / total_count
-                    click.echo(f"    Correlation ratio: {final_correlation_ratio:.3f} ({correlation_count}/{total_count})")
+                    # Correlation reporting
+                    if correlation_report and total_count > 0:
+                        final_correlation_ratio = correlation_count / total_count
+                        click.echo(f"    Correlation ratio: {final_correlation_ratio:.3f} ({correlation_count}/{total_count})")
                     
-                    # Vehicle requirement validation
-                    target_ratio = 0.25
-                    if abs(final_correlation_ratio - target_ratio) <= 0.05:
-                        click.echo(f"    ✅ Vehicle correlation requirement met (target: {target_ratio})")
-                    else:
-                        click.echo(f"    ⚠️  Vehicle correlation requirement not met (target: {target_ratio}, actual: {final_correlation_ratio:.3f})")
+                        # Vehicle requirement validation
+                        target_ratio = 0.25
+                        if abs(final_correlation_ratio - target_ratio) <= 0.05:
+                            click.echo(f"    ✅ Vehicle correlation requirement met (target: {target_ratio})")
+                        else:
+                            click.echo(f"    ⚠️  Vehicle correlation requirement not met (target: {target_ratio}, actual: {final_correlation_ratio:.3f})")
                 
-            except Exception as e:
-                click.echo(f"Error generating {entity_type}: {e}", err=True)
-                continue
-    
-    # Enhanced statistics and monitoring reports
-    click.echo("\n📊 Generation Statistics:")
-    
-    # Reference pool statistics
-    if ref_pool._stats_enabled:
-        stats = ref_pool.get_stats()
-        for ref_type, type_stats in stats.items():
-            click.echo(f"  {ref_type}:")
-            click.echo(f"    References: {type_stats['reference_count']}")
-            click.echo(f"    Accesses: {type_stats['access_count']}")
-    
-    # Memory monitoring results
-    if performance_monitor:
-        performance_monitor.stop_monitoring()
-        peak_memory = performance_monitor.get_peak_memory()
-        avg_cpu = performance_monitor.get_average_cpu()
-        peak_cpu = performance_monitor.get_peak_cpu()
+                except Exception as e:
+                    click.echo(f"Error generating {entity_type}: {e}", err=True)
+                    continue
+    
+        # Enhanced statistics and monitoring reports
+        click.echo("\n📊 Generation Statistics:")
+    
+        # Reference pool statistics
+        if ref_pool._stats_enabled:
+            stats = ref_pool.get_stats()
+            for ref_type, type_stats in stats.items():
+                click.echo(f"  {ref_type}:")
+                click.echo(f"    References: {type_stats['reference_count']}")
+                click.echo(f"    Accesses: {type_stats['access_count']}")
+    
+        # Memory monitoring results
+        if performance_monitor:
+            performance_monitor.stop_monitoring()
+            peak_memory = performance_monitor.get_peak_memory()
+            avg_cpu = performance_monitor.get_average_cpu()
+            peak_cpu = performance_monitor.get_peak_cpu()
         
-        click.echo(f"\n💾 Memory & Performance:")
-        click.echo(f"  Peak memory usage: {peak_memory:.1f} MB")
-        if avg_cpu > 0:
-            click.echo(f"  Average CPU usage: {avg_cpu:.1f}%")
-            click.echo(f"  Peak CPU usage: {peak_cpu:.1f}%")
-    
-    # Reference pool optimization metrics
-    if hasattr(ref_pool, 'get_memory_usage'):
-        ref_memory = ref_pool.get_memory_usage()
-        click.echo(f"\n🔗 Reference Pool Metrics:")
-        click.echo(f"  Total references: {ref_memory.get('total_references', 0)}")
-        click.echo(f"  Cached records: {ref_memory.get('total_cached_records', 0)}")
-        click.echo(f"  Index entries: {ref_memory.get('total_indices', 0)}")
-        if ref_memory.get('memory_estimate_mb', 0) > 0:
-            click.echo(f"  Estimated memory: {ref_memory['memory_estimate_mb']} MB")
-    
-    # Benchmark results
-    if benchmark:
-        try:
-            click.echo(f"\n⚡ Running benchmark analysis...")
-            metrics = benchmark_suite.benchmark_vehicle_scenario(
-                config_file=config,
-                test_name="CLI_Benchmark",
-                enable_monitoring=False  # Already monitored above
-            )
+            click.echo(f"\n💾 Memory & Performance:")
+            click.echo(f"  Peak memory usage: {peak_memory:.1f} MB")
+            if avg_cpu > 0:
+                click.echo(f"  Average CPU usage: {avg_cpu:.1f}%")
+                click.echo(f"  Peak CPU usage: {peak_cpu:.1f}%")
+    
+        # Reference pool optimization metrics
+        if hasattr(ref_pool, 'get_memory_usage'):
+            ref_memory = ref_pool.get_memory_usage()
+            click.echo(f"\n🔗 Reference Pool Metrics:")
+            click.echo(f"  Total references: {ref_memory.get('total_references', 0)}")
+            click.echo(f"  Cached records: {ref_memory.get('total_cached_records', 0)}")
+            click.echo(f"  Index entries: {ref_memory.get('total_indices', 0)}")
+            if ref_memory.get('memory_estimate_mb', 0) > 0:
+                click.echo(f"  Estimated memory: {ref_memory['memory_estimate_mb']} MB")
+    
+        # Benchmark results
+        if benchmark:
+            try:
+                click.echo(f"\n⚡ Running benchmark analysis...")
+                metrics = benchmark_suite.benchmark_vehicle_scenario(
+                    config_file=config,
+                    test_name="CLI_Benchmark",
+                    enable_monitoring=False  # Already monitored above
+                )
             
-            click.echo(f"📈 Benchmark Results:")
-            click.echo(f"  Total records: {metrics.records_generated}")
-            click.echo(f"  Throughput: {metrics.records_per_second:.0f} records/sec")
-            click.echo(f"  Duration: {metrics.duration_seconds:.1f} seconds")
-            click.echo(f"  Correlation ratio: {metrics.correlation_ratio:.3f}")
+                click.echo(f"📈 Benchmark Results:")
+                click.echo(f"  Total records: {metrics.records_generated}")
+                click.echo(f"  Throughput: {metrics.records_per_second:.0f} records/sec")
+                click.echo(f"  Duration: {metrics.duration_seconds:.1f} seconds")
+                click.echo(f"  Correlation ratio: {metrics.correlation_ratio:.3f}")
             
-            # Vehicle requirements validation
-            validation = benchmark_suite.validate_vehicle_requirements(metrics)
-            click.echo(f"\n🎯 Vehicle Requirements Validation:")
-            for req, passed in validation.items():
-                status = "✅" if passed else "❌"
-                click.echo(f"  {status} {req.replace('_', ' ').title()}: {'PASS' if passed else 'FAIL'}")
+                # Vehicle requirements validation
+                validation = benchmark_suite.validate_vehicle_requirements(metrics)
+                click.echo(f"\n🎯 Vehicle Requirements Validation:")
+                for req, passed in validation.items():
+                    status = "✅" if passed else "❌"
+                    click.echo(f"  {status} {req.replace('_', ' ').title()}: {'PASS' if passed else 'FAIL'}")
             
-            # Save benchmark results if output directory specified
-            if benchmark_output:
-                import json
-                report = benchmark_suite.generate_performance_report()
-                report_file = Path(benchmark_output) / f"cli_benchmark_{int(time.time())}.json"
-                with open(report_file, 'w') as f:
-                    json.dump(report, f, indent=2)
-                click.echo(f"\n📁 Benchmark report saved: {report_file}")
+                # Save benchmark results if output directory specified
+                if benchmark_output:
+                    import json
+                    report = benchmark_suite.generate_performance_report()
+                    report_file = Path(benchmark_output) / f"cli_benchmark_{int(time.time())}.json"
+                    with open(report_file, 'w') as f:
+                        json.dump(report, f, indent=2)
+                    click.echo(f"\n📁 Benchmark report saved: {report_file}")
                 
-        except Exception as e:
-            click.echo(f"⚠️  Benchmark analysis failed: {e}")
-    
-    if not dry_run:
-        # Flush all producers
-        if format == 'json' and producer:
-            if hasattr(producer, '_topic_producers'):
-                for topic_producer in producer._topic_producers.values():
-                    topic_producer.flush()
-            else:
+            except Exception as e:
+                click.echo(f"⚠️  Benchmark analysis failed: {e}")
+    
+        if not dry_run:
+            # Flush the shared producer for all topics
+            if producer:
                 producer.flush()
-        elif format == 'protobuf':
-            for topic_producer in topic_producers.values():
-                topic_producer.flush()
         
-        click.echo("\nAll data produced to Kafka successfully!")
+            if producer_stats is not None:
+                producer_stats.wait_for_update(producer.poll)
+                if producer_stats.updates:
+                    click.echo(f"\n📡 Bytes on the wire: {producer_stats.tx_bytes:,}")
+                    ratio = producer_stats.compression_ratio
+                    if ratio is not None:
+                        click.echo(
+                            f"  Compression ratio: {ratio:.2f}x "
+                            f"({producer_stats.txmsg_bytes:,} message bytes)"
+                        )
+        
+            if latency_tracker is not None:
+                click.echo("\n⏱️  Delivery Latency:")
+                for line in latency_tracker.format_report():
+                    click.echo(f"  {line}")
+        
+            if partition_stats is not None:
+                click.echo("\n📦 Partition Distribution:")
+                for topic in partition_stats.topics:
+                    for line in partition_stats.format_report(topic, producer.partition_count(topic)):
+                        click.echo(f"  {line}")
+        
+            if isinstance(producer, SinkPool):
+                producer.close()
+                click.echo(f"\nAll data written to {output_dir}:")
+                for path in producer.files:
+                    click.echo(f"  {path}")
+            else:
+                click.echo("\nAll data produced to Kafka successfully!")
+    finally:
+        if isinstance(producer, SinkPool):
+            producer.close()
 
 
 @correlated.command()
@@ -775,3 +1037,153 @@ def analyze_correlation(config, entity_type, sample_size):
     except Exception as e:
         click.echo(f"❌ Analysis failed: {e}", err=True)
         sys.exit(1)
+
+
+@correlated.command('latency-probe')
+@click.option('--config', '-c', help='Path to correlation config YAML file (probes all its topics)')
+@click.option('--topic', '-t', 'topics', multiple=True, help='Topic to probe (can be used multiple times)')
+@click.option('--bootstrap-servers', '-b', default='localhost:9092', help='Kafka bootstrap servers')
+@click.option('--producer-config', '-p', help='Path to client config JSON file')
+@click.option('--messages', default=1000, help='Marker records per topic')
+@click.option('--rate', default=1000.0, help='Marker records per second across all topics (0 for unthrottled)')
+@click.option('--timeout', default=30.0, help='Seconds to wait for markers after the last send')
+@click.option('--output', '-o', help='Write the results as JSON to this file')
+def latency_probe(config, topics, bootstrap_servers, producer_config, messages, rate, timeout, output):
+    """Measure produce-to-consume latency with timestamped marker records."""
+    from testdatapy.validators.latency_probe import LatencyProbe
+    
+    probe_topics = list(topics)
+    if config:
+        try:
+            probe_topics.extend(
+                t for t in _configured_topics(CorrelationConfig.from_yaml_file(config))
+                if t not in probe_topics
+            )
+        except Exception as e:
+            click.echo(f"Error loading configuration: {e}", err=True)
+            sys.exit(1)
+    if not probe_topics:
+        click.echo("Error: Specify --topic or --config", err=True)
+        sys.exit(1)
+    
+    client_config = {}
+    if producer_config:
+        import json
+        with open(producer_config, 'r') as f:
+            client_config = json.load(f)
+        bootstrap_servers = client_config.pop("bootstrap.servers", bootstrap_servers)
+    
+    click.echo(f"⏱️  Probing {len(probe_topics)} topics with {messages} markers each...")
+    
+    try:
+        result = LatencyProbe(
+            bootstrap_servers=bootstrap_servers,
+            topics=probe_topics,
+            config=client_config,
+            messages_per_topic=messages,
+            rate=rate,
+            timeout=timeout,
+        ).run()
+    except Exception as e:
+        click.echo(f"❌ Latency probe failed: {e}", err=True)
+        sys.exit(1)
+    
+    for line in result.format_report():
+        click.echo(f"  {line}")
+    
+    overall = result.overall_latency().summary()
+    click.echo(
+        f"\n📈 Overall: p50 {overall['p50'] * 1000:.1f} ms, "
+        f"p99 {overall['p99'] * 1000:.1f} ms, p999 {overall['p999'] * 1000:.1f} ms "
+        f"in {result.duration:.1f}s"
+    )
+    
+    lost = sum(result.lost.values())
+    if lost:
+        click.echo(f"⚠️  {lost} markers were not consumed back within {timeout:.0f}s")
+    
+    if output:
+        import json
+        with open(output, 'w') as f:
+            json.dump(result.to_dict(), f, indent=2)
+        click.echo(f"📁 Results saved: {output}")
+
+
+@correlated.command()
+@click.option('--config', '-c', required=True, help='Path to correlation config YAML file')
+@click.option('--bootstrap-servers', '-b', default='localhost:9092', help='Kafka bootstrap servers')
+@click.option('--producer-config', '-p', help='Path to client config JSON file')
+@click.option('--format', '-f', type=click.Choice(['json', 'protobuf']), default='json', help='Message format of the topics')
+@click.option('--key-set', type=click.Choice(['bloom', 'exact']), default='bloom', help='Key set for referenced IDs (bloom: ~14 bits/key, exact: 8 bytes/key)')
+@click.option('--error-rate', default=0.001, help='Bloom filter false-positive rate')
+@click.option('--idle-timeout', default=10.0, help='Seconds without messages before giving up on a topic')
+@click.option('--output', '-o', help='Write the results as JSON to this file')
+def verify(config, bootstrap_servers, producer_config, format, key_set, error_rate, idle_timeout, output):
+    """Verify that produced references join with their referenced topics."""
+    from testdatapy.validators.referential_integrity import (
+        ReferentialIntegrityVerifier,
+        protobuf_decoder,
+    )
+    
+    try:
+        correlation_config = CorrelationConfig.from_yaml_file(config)
+    except Exception as e:
+        click.echo(f"Error loading configuration: {e}", err=True)
+        sys.exit(1)
+    
+    client_config = {}
+    if producer_config:
+        import json
+        with open(producer_config, 'r') as f:
+            client_config = json.load(f)
+        bootstrap_servers = client_config.pop("bootstrap.servers", bootstrap_servers)
+    
+    decoders = {}
+    if format == 'protobuf':
+        for section in ('master_data', 'transactional_data'):
+            for entity_type, entity_config in correlation_config.config.get(section, {}).items():
+                proto_class = get_protobuf_class_for_entity(entity_config, entity_type)
+                if proto_class is None:
+                    proto_class = fallback_to_hardcoded_mapping(entity_type)
+                if proto_class is not None:
+                    decoders[entity_type] = protobuf_decoder(proto_class)
+    
+    verifier = ReferentialIntegrityVerifier(
+        bootstrap_servers=bootstrap_servers,
+        config=correlation_config,
+        client_config=client_config,
+        key_set_type=key_set,
+        error_rate=error_rate,
+        decoders=decoders,
+        idle_timeout=idle_timeout,
+    )
+    if not verifier.relationships:
+        click.echo("No relationships between Kafka topics to verify")
+        return
+    
+    click.echo(f"🔗 Verifying {len(verifier.relationships)} relationships...")
+    try:
+        result = verifier.run()
+    except Exception as e:
+        click.echo(f"❌ Verification failed: {e}", err=True)
+        sys.exit(1)
+    
+    for line in result.format_report():
+        click.echo(f"  {line}")
+    for error in result.errors[:5]:
+        click.echo(f"  ⚠️  {error}")
+    if key_set == 'bloom':
+        click.echo(f"  (Bloom filter: up to {error_rate:.2%} of orphans may go undetected)")
+    
+    if output:
+        import json
+        with open(output, 'w') as f:
+            json.dump(result.to_dict(), f, indent=2, default=str)
+        click.echo(f"📁 Results saved: {output}")
+    
+    if result.passed:
+        click.echo(f"✅ All references join ({result.duration:.1f}s)")
+    else:
+        orphans = sum(r.orphans for r in result.relationships)
+        click.echo(f"❌ {orphans:,} orphaned references", err=True)
+        sys.exit(1)
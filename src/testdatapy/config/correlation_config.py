@@ -7,6 +7,8 @@ from pathlib import Path
 
 from .validation import validate_and_warn, ConfigurationError
 
+CSV_COMPRESSIONS = ("none", "gzip", "zstd")
+
 
 class ValidationError(Exception):
     """Raised when configuration validation fails."""
@@ -326,6 +328,13 @@ class CorrelationConfig:
                     raise ValidationError(
                         f"CSV export for '{entity_name}' delimiter must be a single character"
                     )
+
+            # Validate compression if specified
+            if "compression" in csv_config and csv_config["compression"] not in CSV_COMPRESSIONS:
+                raise ValidationError(
+                    f"CSV export for '{entity_name}' compression must be one of: "
+                    f"{', '.join(CSV_COMPRESSIONS)}"
+                )
         else:
             raise ValidationError(f"Invalid csv_export configuration for '{entity_name}': must be string or dict")
     
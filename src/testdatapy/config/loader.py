@@ -6,6 +6,75 @@ from typing import Any, List, Optional
 from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# librdkafka settings for the named throughput presets
+THROUGHPUT_PRESETS: dict[str, dict[str, Any]] = {
+    "latency": {
+        "linger.ms": 0,
+        "batch.size": 16384,
+        "compression.type": "none",
+        "queue.buffering.max.messages": 100000,
+        "queue.buffering.max.kbytes": 65536,
+    },
+    "balanced": {
+        "linger.ms": 10,
+        "batch.size": 262144,
+        "compression.type": "lz4",
+        "queue.buffering.max.messages": 500000,
+        "queue.buffering.max.kbytes": 524288,
+    },
+    "max-throughput": {
+        "linger.ms": 100,
+        "batch.size": 1048576,
+        "batch.num.messages": 100000,
+        "compression.type": "zstd",
+        "queue.buffering.max.messages": 1000000,
+        "queue.buffering.max.kbytes": 1048576,
+    },
+}
+
+# Producer settings that control batching, compression and queueing
+THROUGHPUT_SETTING_KEYS = (
+    "linger.ms",
+    "batch.size",
+    "batch.num.messages",
+    "compression.type",
+    "queue.buffering.max.messages",
+    "queue.buffering.max.kbytes",
+)
+
+
+def apply_throughput_preset(config: dict[str, Any], preset: str | None) -> dict[str, Any]:
+    """Merge a throughput preset into a librdkafka configuration.
+
+    Settings already present in ``config`` take precedence over the preset.
+
+    Args:
+        config: librdkafka configuration
+        preset: Name of a preset in THROUGHPUT_PRESETS, or None
+
+    Returns:
+        New configuration dictionary
+    """
+    if not preset:
+        return dict(config)
+    if preset not in THROUGHPUT_PRESETS:
+        raise ValueError(f"Unknown throughput preset: {preset}")
+    merged = dict(THROUGHPUT_PRESETS[preset])
+    merged.update(config)
+    return merged
+
+
+def throughput_settings(config: dict[str, Any]) -> dict[str, Any]:
+    """Extract the batching/compression/queue settings from a configuration.
+
+    Args:
+        config: librdkafka configuration
+
+    Returns:
+        Settings that are set explicitly (others use librdkafka defaults)
+    """
+    return {key: config[key] for key in THROUGHPUT_SETTING_KEYS if key in config}
+
 
 class KafkaConfig(BaseModel):
     """Kafka connection configuration."""
@@ -45,6 +114,20 @@ class ProducerConfig(BaseModel):
     max_messages: int | None = Field(default=None, gt=0)
     max_duration_seconds: float | None = Field(default=None, gt=0)
     batch_size: int = Field(default=100, gt=0)
+    throughput_preset: str | None = None
+    linger_ms: int | None = Field(default=None, ge=0)
+    compression_type: str | None = None
+
+    @field_validator('throughput_preset')
+    @classmethod
+    def validate_throughput_preset(cls, v):
+        """Validate that the preset exists."""
+        if v is not None and v not in THROUGHPUT_PRESETS:
+            raise ValueError(
+                f"Unknown throughput preset '{v}'. "
+                f"Available: {', '.join(THROUGHPUT_PRESETS)}"
+            )
+        return v
 
 
 class GeneratorConfig(BaseModel):
@@ -139,7 +222,8 @@ class AppConfig(BaseSettings):
                 protobuf_config = value
             else:
                 # Try to map to producer or generator config
-                if key in ["rate_per_second", "max_messages", "max_duration_seconds"]:
+                if key in ["rate_per_second", "max_messages", "max_duration_seconds",
+                           "batch_size", "throughput_preset", "linger_ms", "compression_type"]:
                     producer_config[key] = value
                 else:
                     generator_config[key] = value
@@ -199,7 +283,15 @@ class AppConfig(BaseSettings):
             if self.kafka.ssl_truststore_password:
                 config["ssl.truststore.password"] = self.kafka.ssl_truststore_password
 
-        return config
+        # Explicit producer settings override the preset
+        if "batch_size" in self.producer.model_fields_set:
+            config["batch.num.messages"] = self.producer.batch_size
+        if self.producer.linger_ms is not None:
+            config["linger.ms"] = self.producer.linger_ms
+        if self.producer.compression_type:
+            config["compression.type"] = self.producer.compression_type
+
+        return apply_throughput_preset(config, self.producer.throughput_preset)
 
     def to_schema_registry_config(self) -> dict[str, Any]:
         """Convert to Schema Registry configuration format.
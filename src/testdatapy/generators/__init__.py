@@ -1,5 +1,6 @@
 """Data generators for test data generation."""
 from testdatapy.generators.base import DataGenerator
+from testdatapy.generators.clock import VirtualClock, WallClock
 from testdatapy.generators.csv_gen import CSVGenerator
 from testdatapy.generators.faker_gen import FakerGenerator
 from testdatapy.generators.rate_limiter import RateLimiter, TokenBucket
@@ -16,4 +17,6 @@ __all__ = [
     "ReferencePool",
     "CorrelatedDataGenerator",
     "MasterDataGenerator",
+    "VirtualClock",
+    "WallClock",
 ]
\ No newline at end of file
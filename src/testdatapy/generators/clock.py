@@ -0,0 +1,67 @@
+"""Clocks that timestamp generated records."""
+from datetime import datetime, timedelta, timezone
+
+# Start of virtual time when none is configured
+DEFAULT_START_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Convert a datetime to UTC, reading naive datetimes as UTC.
+
+    Virtual times become epoch timestamps, which must not depend on the
+    time zone of the machine generating them.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class WallClock:
+    """Timestamps records with the current time."""
+
+    def now(self) -> datetime:
+        """Current time."""
+        return datetime.now()
+
+    def advance(self, seconds: float) -> None:
+        """Wall time advances by itself."""
+
+
+class VirtualClock:
+    """Clock that only moves when advanced.
+
+    Generators advance it by the interval between records, so timestamps
+    follow the configured rate and are identical in every run.
+    """
+
+    def __init__(self, start: datetime | str | None = None):
+        """Initialize the clock.
+
+        Args:
+            start: Initial time, as datetime or ISO 8601 string; times
+                without an offset are UTC (default: DEFAULT_START_TIME)
+        """
+        if start is None:
+            start = DEFAULT_START_TIME
+        elif isinstance(start, str):
+            start = datetime.fromisoformat(start.replace("Z", "+00:00"))
+        self.start = as_utc(start)
+        self.elapsed = 0.0
+        # Compensation for rounding errors of many small advances
+        self._error = 0.0
+
+    def now(self) -> datetime:
+        """Current virtual time."""
+        return self.start + timedelta(seconds=self.elapsed)
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward.
+
+        Args:
+            seconds: Seconds of virtual time
+        """
+        # Kahan summation keeps billions of sub-millisecond steps accurate
+        step = seconds - self._error
+        elapsed = self.elapsed + step
+        self._error = (elapsed - self.elapsed) - step
+        self.elapsed = elapsed
@@ -0,0 +1,579 @@
+"""Columnar master data generation with NumPy.
+
+Each schema field is generated (or read from CSV) as a whole column instead
+of one record at a time. Records are only materialized (in chunks) when they
+are iterated, e.g. when producing to Kafka or exporting CSV.
+"""
+import csv
+import re
+from collections.abc import Callable, Collection, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Field types generated as vectorized columns
+VECTORIZED_TYPES = {
+    "string", "integer", "float", "choice", "weighted_choice", "uuid",
+    "timestamp", "timestamp_millis",
+}
+# Field types drawn from a pool of row-wise generated values
+POOLED_TYPES = {"faker"}
+
+DEFAULT_FAKER_POOL_SIZE = 10_000
+MATERIALIZE_CHUNK_SIZE = 10_000
+
+_SEQ_PATTERN = re.compile(r'\{seq:(\d+)d\}')
+# {index}, {index:d}, {index:6d} or {index:06d}
+_INDEX_PATTERN = re.compile(r'\{index(?::(0?)(\d*)d)?\}')
+
+
+class ArrayColumn:
+    """Column backed by a NumPy array."""
+
+    def __init__(self, values: np.ndarray):
+        self.array = values
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def item(self, index: int) -> Any:
+        value = self.array[index]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def slice(self, start: int, stop: int) -> List[Any]:
+        return self.array[start:stop].tolist()
+
+
+class PooledColumn:
+    """Column of indices into a list of distinct values."""
+
+    def __init__(self, pool: Sequence[Any], indices: np.ndarray):
+        self.pool = pool
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def item(self, index: int) -> Any:
+        return self.pool[self.indices[index]]
+
+    def slice(self, start: int, stop: int) -> List[Any]:
+        pool = self.pool
+        return [pool[i] for i in self.indices[start:stop].tolist()]
+
+
+class ConstantColumn:
+    """Column with the same value in every row."""
+
+    def __init__(self, value: Any, length: int):
+        self.value = value
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def item(self, index: int) -> Any:
+        return self.value
+
+    def slice(self, start: int, stop: int) -> List[Any]:
+        return [self.value] * (min(stop, self.length) - start)
+
+
+class ColumnarRecords(Sequence):
+    """Read-only sequence of records stored as columns.
+
+    Indexing builds a single record dictionary; iteration materializes
+    records chunk by chunk, so full record lists never exist in memory.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, Any],
+        length: int,
+        paths: Optional[Dict[str, Tuple[str, ...]]] = None
+    ):
+        """Initialize the records.
+
+        Args:
+            columns: Field name to column, in record field order
+            length: Number of records
+            paths: Nested key path of columns with flattened names like
+                ``address.city``; records are flat if None
+        """
+        self.columns = columns
+        self._length = length
+        self.paths = paths
+        self._key_paths = None
+        if paths:
+            self._key_paths = [paths.get(name, (name,)) for name in columns]
+
+    def _record(self, names: List[str], row: Sequence[Any]) -> Dict[str, Any]:
+        """Build one record from its column values."""
+        if self._key_paths is None:
+            return dict(zip(names, row))
+        record: Dict[str, Any] = {}
+        for path, value in zip(self._key_paths, row):
+            current = record
+            for key in path[:-1]:
+                current = current.setdefault(key, {})
+            current[path[-1]] = value
+        return record
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(self.iter_range(start, stop))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("record index out of range")
+        return self._record(
+            list(self.columns), [column.item(index) for column in self.columns.values()]
+        )
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_range(0, self._length)
+
+    def iter_range(self, start: int, stop: int) -> Iterator[Dict[str, Any]]:
+        """Iterate records in a range, materializing them in chunks."""
+        names = list(self.columns)
+        for chunk_start in range(start, stop, MATERIALIZE_CHUNK_SIZE):
+            chunk_stop = min(chunk_start + MATERIALIZE_CHUNK_SIZE, stop)
+            values = [column.slice(chunk_start, chunk_stop) for column in self.columns.values()]
+            if self._key_paths is None:
+                for row in zip(*values):
+                    yield dict(zip(names, row))
+            else:
+                for row in zip(*values):
+                    yield self._record(names, row)
+
+    @classmethod
+    def concat(cls, parts: Sequence["ColumnarRecords"]) -> "ColumnarRecords":
+        """Concatenate records with the same fields, e.g. generated in chunks."""
+        if len(parts) == 1:
+            return parts[0]
+        length = sum(len(part) for part in parts)
+        columns = {
+            name: _concat_columns([part.columns[name] for part in parts])
+            for name in parts[0].columns
+        }
+        return cls(columns, length, parts[0].paths)
+
+    def column_values(self, name: str) -> List[Any]:
+        """Get all values of a column as a list."""
+        return self.columns[name].slice(0, self._length)
+
+    def column_strings(self, name: str) -> List[Optional[str]]:
+        """Get all values of a column as strings, None for empty values."""
+        column = self.columns[name]
+        if isinstance(column, ArrayColumn) and column.array.dtype.kind == "U":
+            values = column.array.tolist()
+            if not (column.array == "").any():
+                return values
+        else:
+            values = column.slice(0, self._length)
+        return [str(value) if value else None for value in values]
+
+
+class ColumnarRecordCache(Mapping):
+    """Record cache mapping IDs to records of a ColumnarRecords.
+
+    The ID-to-row index is built on first lookup, and records are only
+    materialized when looked up.
+    """
+
+    def __init__(self, records: ColumnarRecords, ids: List[Optional[str]]):
+        """Initialize the cache.
+
+        Args:
+            records: Cached records
+            ids: ID of each record in row order (None for records without one)
+        """
+        self.records = records
+        self.ids = ids
+        self._rows: Optional[Dict[str, int]] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The row index is rebuilt on demand
+        return {"records": self.records, "ids": self.ids, "_rows": None}
+
+    def _row_index(self) -> Dict[str, int]:
+        if self._rows is None:
+            self._rows = {
+                record_id: row for row, record_id in enumerate(self.ids) if record_id is not None
+            }
+        return self._rows
+
+    def __getitem__(self, record_id: str) -> Dict[str, Any]:
+        return self.records[self._row_index()[record_id]]
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._row_index()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._row_index())
+
+    def __len__(self) -> int:
+        return len(self._row_index())
+
+
+def _concat_columns(columns: List[Any]):
+    """Concatenate columns of the same field."""
+    if all(isinstance(column, ArrayColumn) for column in columns):
+        return ArrayColumn(np.concatenate([column.array for column in columns]))
+    if all(isinstance(column, ConstantColumn) for column in columns) and \
+            len({repr(column.value) for column in columns}) == 1:
+        return ConstantColumn(columns[0].value, sum(len(column) for column in columns))
+
+    pool: List[Any] = []
+    indices = []
+    for column in columns:
+        if isinstance(column, PooledColumn):
+            indices.append(column.indices + len(pool))
+            pool.extend(column.pool)
+        else:
+            indices.append(np.arange(len(pool), len(pool) + len(column)))
+            pool.extend(column.slice(0, len(column)))
+    return PooledColumn(pool, np.concatenate(indices))
+
+
+# Schema types converted when reading CSV columns
+CSV_CAST_TYPES = {"integer", "float", "boolean", "timestamp", "timestamp_millis"}
+_TRUE_VALUES = ("true", "1", "yes", "on")
+_FALSE_VALUES = ("false", "0", "no", "off")
+
+
+def load_csv_columns(csv_path: Path, schema: Dict[str, Any]) -> Optional[ColumnarRecords]:
+    """Read a CSV file into typed columns.
+
+    The file is parsed by pandas' C reader as strings, then each column with a
+    numeric, boolean or timestamp schema type is converted in one vectorized
+    cast. Dot-notation headers become nested records through precomputed key
+    paths when records are materialized.
+
+    Args:
+        csv_path: CSV file with a header row
+        schema: Entity schema (may be empty)
+
+    Returns:
+        ColumnarRecords, or None if the header cannot be read column-wise
+        (duplicate names, or a name that is also the parent of another)
+    """
+    import pandas as pd
+
+    with open(csv_path, "r", newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), None)
+    if not header:
+        return ColumnarRecords({}, 0)
+    paths = {name: tuple(name.split(".")) for name in header}
+    if len(paths) != len(header) or _conflicting_paths(paths.values()):
+        return None
+
+    frame = pd.read_csv(
+        csv_path, dtype=str, keep_default_na=False, na_filter=False, encoding="utf-8"
+    )
+    columns = {}
+    for name in header:
+        values = frame[name].to_numpy(dtype=object)
+        field_schema = _csv_field_schema(schema, paths[name])
+        field_type = field_schema.get("type") if field_schema else None
+        if field_type in CSV_CAST_TYPES:
+            values = _cast_column(name, values, field_type)
+        columns[name] = ArrayColumn(values)
+
+    nested = any(len(path) > 1 for path in paths.values())
+    return ColumnarRecords(columns, len(frame), paths if nested else None)
+
+
+def _conflicting_paths(paths) -> bool:
+    """Check whether a key path is also the parent of another key path."""
+    parents = {path[:i] for path in paths for i in range(1, len(path))}
+    return any(path in parents for path in paths)
+
+
+def _csv_field_schema(schema: Dict[str, Any], path: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    """Find the schema of a CSV column like MasterDataGenerator._apply_schema_types.
+
+    Each key is looked up by name or by its dotted path; nested objects use
+    their properties, other nesting keeps the enclosing schema.
+    """
+    current = schema
+    dotted = ""
+    for depth, key in enumerate(path):
+        dotted = f"{dotted}.{key}" if dotted else key
+        field_schema = current.get(key, current.get(dotted))
+        if depth == len(path) - 1:
+            return field_schema if isinstance(field_schema, dict) else None
+        if isinstance(field_schema, dict) and field_schema.get("type") == "object" \
+                and "properties" in field_schema:
+            current = field_schema["properties"]
+    return None
+
+
+def _cast_column(name: str, values: np.ndarray, field_type: str) -> np.ndarray:
+    """Convert a column of CSV strings to a schema type.
+
+    Empty strings and values that cannot be converted are kept unchanged.
+    Columns without such values become typed NumPy arrays.
+    """
+    present = values != ""
+    if not present.any():
+        return values
+    raw = values[present].astype(str)
+    converted = np.ones(len(raw), dtype=bool)
+
+    try:
+        if field_type == "integer":
+            cast = raw.astype(np.int64)
+        elif field_type == "float":
+            cast = raw.astype(np.float64)
+        elif field_type == "boolean":
+            lower = np.char.lower(raw)
+            cast = np.isin(lower, _TRUE_VALUES)
+            converted = cast | np.isin(lower, _FALSE_VALUES)
+        else:
+            # Unix timestamps become integers, other formats stay strings
+            converted = np.char.isdigit(raw)
+            cast = np.zeros(len(raw), dtype=np.int64)
+            cast[converted] = raw[converted].astype(np.int64)
+    except (ValueError, OverflowError):
+        # Mixed or out-of-range values: convert one by one
+        cast = np.array([_cast_value(value, field_type) for value in raw], dtype=object)
+        converted = np.array([not isinstance(value, str) for value in cast], dtype=bool)
+        if field_type in ("timestamp", "timestamp_millis"):
+            converted |= ~np.char.isdigit(raw)
+
+    failed = int((~converted).sum())
+    if failed and field_type in ("integer", "float", "boolean"):
+        print(f"Warning: Failed to convert {failed} values of {name} to {field_type}")
+
+    if converted.all() and present.all() and cast.dtype != object:
+        return cast
+    result = values.copy()
+    result[np.flatnonzero(present)[converted]] = cast[converted]
+    return result
+
+
+def _cast_value(value: str, field_type: str) -> Any:
+    """Convert a single CSV string, keeping it unchanged if it does not convert."""
+    try:
+        if field_type == "integer":
+            return int(value)
+        if field_type == "float":
+            return float(value)
+        if field_type == "boolean":
+            lower_value = value.lower()
+            if lower_value in _TRUE_VALUES:
+                return True
+            if lower_value in _FALSE_VALUES:
+                return False
+            return value
+        return int(value) if value.isdigit() else value
+    except (ValueError, TypeError):
+        return value
+
+
+def supports_schema(schema: Dict[str, Any]) -> bool:
+    """Check whether every field of a schema can be generated as a column.
+
+    Nested objects, references and templates depend on other fields of the
+    same record and need row-wise generation.
+    """
+    for field_config in schema.values():
+        field_type = field_config.get("type", "string")
+        if field_type not in VECTORIZED_TYPES and field_type not in POOLED_TYPES:
+            return False
+        if field_type == "string" and field_config.get("template"):
+            return False
+    return True
+
+
+class ColumnarGenerator:
+    """Generates schema fields as whole columns."""
+
+    def __init__(
+        self,
+        rng: Optional[np.random.Generator] = None,
+        faker_pool_size: int = DEFAULT_FAKER_POOL_SIZE
+    ):
+        """Initialize the generator.
+
+        Args:
+            rng: NumPy random generator (a fresh unseeded one if None)
+            faker_pool_size: Distinct values generated for Faker fields
+        """
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.faker_pool_size = faker_pool_size
+
+    def generate(
+        self,
+        entity_type: str,
+        schema: Dict[str, Any],
+        count: int,
+        row_generator: Callable[[str, Dict[str, Any], int], Any],
+        sequence_counters: Dict[str, int],
+        sequence_start: int = 1,
+        unique_fields: Collection[str] = (),
+        index_start: int = 0
+    ) -> ColumnarRecords:
+        """Generate the records of an entity.
+
+        Args:
+            entity_type: Entity type (used for sequence counter keys)
+            schema: Field schema; must satisfy supports_schema()
+            count: Number of records
+            row_generator: Generates one value of a field row-wise, used to
+                fill the value pool of Faker fields
+            sequence_counters: Shared "{entity}_{field}" sequence counters,
+                advanced by count for sequence fields
+            sequence_start: First sequence value of counters not yet started
+            unique_fields: Fields generated row by row instead of sampled
+                from a value pool, e.g. the id field and fields other
+                entities reference, which must not repeat
+            index_start: Index of the first record, for parts of an entity
+                generated separately
+
+        Returns:
+            ColumnarRecords with one column per schema field
+        """
+        columns = {}
+        for field_name, field_config in schema.items():
+            columns[field_name] = self._column(
+                entity_type, field_name, field_config, count, row_generator,
+                sequence_counters, sequence_start, field_name in unique_fields, index_start
+            )
+        return ColumnarRecords(columns, count)
+
+    def _column(
+        self,
+        entity_type: str,
+        field_name: str,
+        field_config: Dict[str, Any],
+        count: int,
+        row_generator: Callable[[str, Dict[str, Any], int], Any],
+        sequence_counters: Dict[str, int],
+        sequence_start: int,
+        unique: bool = False,
+        index_start: int = 0
+    ):
+        """Generate a single column."""
+        field_type = field_config.get("type", "string")
+        rng = self.rng
+
+        if field_type == "string":
+            format_str = field_config.get("format")
+            if format_str and "{seq:" in format_str:
+                counter_key = f"{entity_type}_{field_name}"
+                start = sequence_counters.get(counter_key, sequence_start)
+                sequence_counters[counter_key] = start + count
+                return ArrayColumn(_format_sequence(format_str, start, count))
+            indices = np.arange(index_start, index_start + count)
+            if format_str:
+                if "{index" not in format_str:
+                    return ConstantColumn(format_str.format(index=0), count)
+                return ArrayColumn(_format_index(format_str, indices))
+            return ArrayColumn(_join_strings(f"{field_name}_", indices.astype("U"), ""))
+
+        if field_type == "integer":
+            return ArrayColumn(rng.integers(
+                field_config.get("min", 0), field_config.get("max", 1000), size=count, endpoint=True
+            ))
+
+        if field_type == "float":
+            values = rng.uniform(field_config.get("min", 0.0), field_config.get("max", 1000.0), size=count)
+            return ArrayColumn(np.round(values, 2))
+
+        if field_type in ("choice", "weighted_choice"):
+            choices = field_config.get("choices", [])
+            if not choices:
+                value = f"{field_name}_choice" if field_type == "choice" else None
+                return ConstantColumn(value, count)
+            weights = field_config.get("weights") if field_type == "weighted_choice" else None
+            probabilities = None
+            if weights and len(weights) == len(choices):
+                total = float(sum(weights))
+                probabilities = [w / total for w in weights]
+            indices = rng.choice(len(choices), size=count, p=probabilities)
+            return PooledColumn(list(choices), indices)
+
+        if field_type == "uuid":
+            return ArrayColumn(_random_uuids(rng, count))
+
+        if field_type in ("timestamp", "timestamp_millis"):
+            # The generation time, as in row-wise generation
+            return ConstantColumn(row_generator(field_name, field_config, 0), count)
+
+        if field_type in POOLED_TYPES:
+            pool_size = count if unique else max(1, min(count, self.faker_pool_size))
+            pool = [row_generator(field_name, field_config, i) for i in range(pool_size)]
+            if pool_size == count:
+                return PooledColumn(pool, np.arange(count))
+            return PooledColumn(pool, rng.integers(0, pool_size, size=count))
+
+        raise ValueError(f"Field type '{field_type}' of {field_name} cannot be generated as a column")
+
+
+_HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+# Positions of the 32 hex digits in the 36-character UUID string
+_UUID_DIGIT_POSITIONS = np.array(
+    [i for i in range(36) if i not in (8, 13, 18, 23)], dtype=np.intp
+)
+
+
+def _random_uuids(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Generate random UUID4 strings, formatted with vectorized operations."""
+    raw = np.frombuffer(rng.bytes(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    # Version 4 and RFC 4122 variant bits
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+
+    chars = np.full((count, 36), ord("-"), dtype=np.uint8)
+    digits = np.empty((count, 32), dtype=np.uint8)
+    digits[:, 0::2] = _HEX_DIGITS[raw >> 4]
+    digits[:, 1::2] = _HEX_DIGITS[raw & 0x0F]
+    chars[:, _UUID_DIGIT_POSITIONS] = digits
+    return chars.view("S36").ravel().astype("U36")
+
+
+def _join_strings(prefix: str, values: np.ndarray, suffix: str) -> np.ndarray:
+    """Concatenate a prefix and suffix to every string of an array."""
+    if prefix:
+        values = np.char.add(prefix, values)
+    if suffix:
+        values = np.char.add(values, suffix)
+    return values
+
+
+def _format_index(format_str: str, indices: np.ndarray) -> np.ndarray:
+    """Format record indices like ``C_{index:04d}`` for a range of records.
+
+    A single integer index field is formatted with vectorized operations;
+    any other format is applied value by value, as in row-wise generation.
+    """
+    matches = list(_INDEX_PATTERN.finditer(format_str))
+    if len(matches) == 1:
+        match = matches[0]
+        prefix, suffix = format_str[:match.start()], format_str[match.end():]
+        if not any(brace in prefix + suffix for brace in "{}"):
+            numbers = indices.astype("U")
+            if match.group(2):
+                width = int(match.group(2))
+                numbers = np.char.zfill(numbers, width) if match.group(1) else np.char.rjust(numbers, width)
+            return _join_strings(prefix, numbers, suffix)
+    return np.array([format_str.format(index=int(index)) for index in indices])
+
+
+def _format_sequence(format_str: str, start: int, count: int) -> np.ndarray:
+    """Format sequence values like ``CUST_{seq:04d}`` for a range of numbers."""
+    match = _SEQ_PATTERN.search(format_str)
+    if not match:
+        return np.full(count, format_str)
+    width = int(match.group(1))
+    numbers = np.char.zfill(np.arange(start, start + count).astype("U"), width)
+    return _join_strings(format_str[:match.start()], numbers, format_str[match.end():])
@@ -1,13 +1,14 @@
 """Correlated data generator for creating related test data."""
-import random
 import time
+import zlib
 from collections.abc import Iterator
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Callable
-import uuid
 
 from testdatapy.generators.base import DataGenerator
+from testdatapy.generators.clock import VirtualClock, WallClock, as_utc
 from testdatapy.generators.reference_pool import ReferencePool
+from testdatapy.generators.seeding import derive_seed, random_uuid, seeded_random
 from testdatapy.config.correlation_config import CorrelationConfig
 
 
@@ -26,6 +27,10 @@ class CorrelatedDataGenerator(DataGenerator):
         reference_pool: ReferencePool,
         rate_per_second: float = None,
         max_messages: int | None = None,
+        seed: int | None = None,
+        clock: VirtualClock | WallClock | None = None,
+        event_time: bool = False,
+        end_time: datetime | None = None,
     ):
         """Initialize the correlated data generator.
         
@@ -35,10 +40,29 @@ class CorrelatedDataGenerator(DataGenerator):
             reference_pool: Pool of reference IDs for relationships
             rate_per_second: Override rate from config
             max_messages: Maximum number of messages to generate
+            seed: Root seed; the entity draws from its own stream derived
+                from it, so output is reproducible
+            clock: Clock for timestamps (default: a VirtualClock when seeded
+                or in event-time mode, the wall clock otherwise)
+            event_time: Generate in event time: records are spaced by the rate
+                on the virtual clock and produced without sleeping
+            end_time: In event-time mode, stop once the clock reaches this time
+                (UTC if it has no offset)
+        
+        Raises:
+            ValueError: If event-time mode has no rate or is given a wall clock
         """
         self.entity_type = entity_type
         self.config = config
         self.reference_pool = reference_pool
+        self.seed = seed
+        self._random = seeded_random(seed, "transactional", entity_type)
+        self._faker = None
+        if clock is None:
+            clock = VirtualClock() if seed is not None or event_time else WallClock()
+        self.clock = clock
+        self.event_time = event_time
+        self.end_time = as_utc(end_time) if end_time is not None else None
         
         # Get entity configuration
         self.entity_config = config.get_transaction_config(entity_type)
@@ -58,6 +82,16 @@ class CorrelatedDataGenerator(DataGenerator):
         
         # Pre-calculate sleep time for rate limiting
         self._sleep_time = 1.0 / rate_per_second if rate_per_second > 0 else 0
+        # Virtual time between records
+        self.interval = self._sleep_time
+        
+        if event_time:
+            if not self.interval:
+                raise ValueError(f"Event-time mode needs a rate_per_second for {entity_type}")
+            if not isinstance(self.clock, VirtualClock):
+                raise ValueError("Event-time mode needs a VirtualClock")
+            # Records are produced as fast as they are generated
+            self._sleep_time = 0
     
     def generate(self) -> Iterator[dict[str, Any]]:
         """Generate correlated data records.
@@ -74,6 +108,7 @@ class CorrelatedDataGenerator(DataGenerator):
             
             yield record
             self.increment_count()
+            self.clock.advance(self.interval)
             
             # Rate limiting
             if self._sleep_time > 0:
@@ -83,6 +118,50 @@ class CorrelatedDataGenerator(DataGenerator):
                     time.sleep(self._sleep_time - elapsed)
                 last_message_time = time.time()
     
+    def generate_one(self) -> Dict[str, Any]:
+        """Generate the next record without rate limiting.
+        
+        Callers that pace generation themselves (e.g. the asyncio runtime)
+        use this instead of generate().
+        
+        Raises:
+            ValueError: If a referenced entity has no records yet
+        """
+        record = self._generate_record()
+        self.increment_count()
+        self.clock.advance(self.interval)
+        return record
+    
+    @property
+    def referenced_types(self) -> List[str]:
+        """Entity types the relationships of this entity draw references from."""
+        rel_configs = []
+        for rel_config in self.entity_config.get("relationships", {}).values():
+            if rel_config.get("type") == "array":
+                rel_configs.extend(
+                    item_config for item_config in rel_config.get("item_schema", {}).values()
+                    if isinstance(item_config, dict) and "references" in item_config
+                )
+            else:
+                rel_configs.append(rel_config)
+        ref_parts = (rel_config.get("references", "").split(".") for rel_config in rel_configs)
+        return list(dict.fromkeys(parts[0] for parts in ref_parts if len(parts) >= 2))
+    
+    def should_continue(self) -> bool:
+        """Check max_messages and, in event-time mode, the end of the window."""
+        if self.end_time is not None and self.clock.now() >= self.end_time:
+            return False
+        return super().should_continue()
+    
+    def _get_faker(self):
+        """Get the Faker instance for faker template fields, seeded like the entity."""
+        if self._faker is None:
+            from faker import Faker
+            self._faker = Faker()
+            if self.seed is not None:
+                self._faker.seed_instance(derive_seed(self.seed, "transactional", self.entity_type, "faker"))
+        return self._faker
+    
     def _generate_record(self) -> Dict[str, Any]:
         """Generate a single data record with relationships."""
         record = {}
@@ -94,7 +173,7 @@ class CorrelatedDataGenerator(DataGenerator):
         
         # Only auto-generate if not in relationships AND not in derived_fields
         if id_field not in relationships and id_field not in derived_fields:
-            record[id_field] = str(uuid.uuid4())
+            record[id_field] = random_uuid(self._random)
         
         # Generate fields from relationships and store mapped field values
         mapped_field_values = {}
@@ -193,7 +272,7 @@ class CorrelatedDataGenerator(DataGenerator):
         # Handle temporal relationships
         if rel_config.get("recency_bias", False) and self.reference_pool.get_recent(ref_type):
             try:
-                ref_id = self.reference_pool.get_random_recent(ref_type, bias_recent=True)
+                ref_id = self.reference_pool.get_random_recent(ref_type, bias_recent=True, rng=self._random)
                 return self._get_reference_field_value(ref_type, ref_id, ref_field_path)
             except ValueError:
                 # Fall back to regular random if no recent items
@@ -204,24 +283,24 @@ class CorrelatedDataGenerator(DataGenerator):
         
         if distribution == "weighted":
             weight_func = self._get_weight_function(rel_config.get("weight_field"))
-            ref_id = self.reference_pool.get_weighted_random(ref_type, weight_func)
+            ref_id = self.reference_pool.get_weighted_random(ref_type, weight_func, rng=self._random)
             return self._get_reference_field_value(ref_type, ref_id, ref_field_path)
         elif distribution == "zipf":
             # Implement Zipf distribution
             alpha = rel_config.get("alpha", 1.5)
             weight_func = self._get_zipf_weight_function(alpha)
-            ref_id = self.reference_pool.get_weighted_random(ref_type, weight_func)
+            ref_id = self.reference_pool.get_weighted_random(ref_type, weight_func, rng=self._random)
             return self._get_reference_field_value(ref_type, ref_id, ref_field_path)
         else:
             # Default uniform distribution
-            ref_id = self.reference_pool.get_random(ref_type)
+            ref_id = self.reference_pool.get_random(ref_type, rng=self._random)
             return self._get_reference_field_value(ref_type, ref_id, ref_field_path)
     
     def _generate_array_relationship(self, field_name: str, rel_config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate an array of related items."""
         min_items = rel_config.get("min_items", 1)
         max_items = rel_config.get("max_items", 5)
-        item_count = random.randint(min_items, max_items)
+        item_count = self._random.randint(min_items, max_items)
         
         items = []
         item_schema = rel_config.get("item_schema", {})
@@ -249,11 +328,11 @@ class CorrelatedDataGenerator(DataGenerator):
         if field_type == "integer":
             min_val = field_config.get("min", 0)
             max_val = field_config.get("max", 100)
-            return random.randint(min_val, max_val)
+            return self._random.randint(min_val, max_val)
         elif field_type == "float":
             min_val = field_config.get("min", 0.0)
             max_val = field_config.get("max", 100.0)
-            return round(random.uniform(min_val, max_val), 2)
+            return round(self._random.uniform(min_val, max_val), 2)
         elif field_type == "string":
             return field_config.get("default", f"{field_name}_value")
         else:
@@ -264,14 +343,14 @@ class CorrelatedDataGenerator(DataGenerator):
         field_type = field_config.get("type")
         
         if field_type == "uuid":
-            return str(uuid.uuid4())
+            return random_uuid(self._random)
         
         elif field_type == "timestamp":
             format_type = field_config.get("format", "iso8601")
             if format_type == "iso8601":
-                return datetime.now().isoformat()
+                return self.clock.now().isoformat()
             else:
-                return int(datetime.now().timestamp())
+                return int(self.clock.now().timestamp())
         
         elif field_type == "string":
             # Handle string formatting with sequences and templates
@@ -289,12 +368,12 @@ class CorrelatedDataGenerator(DataGenerator):
         elif field_type == "float":
             min_val = field_config.get("min", 0.0)
             max_val = field_config.get("max", 100.0)
-            return round(random.uniform(min_val, max_val), 2)
+            return round(self._random.uniform(min_val, max_val), 2)
         
         elif field_type == "random_float":
             min_val = field_config.get("min", 0.0)
             max_val = field_config.get("max", 100.0)
-            return round(random.uniform(min_val, max_val), 2)
+            return round(self._random.uniform(min_val, max_val), 2)
         
         elif field_type == "calculated":
             # This would require expression evaluation
@@ -308,7 +387,7 @@ class CorrelatedDataGenerator(DataGenerator):
             # Handle choice fields with random selection from choices
             choices = field_config.get("choices", [])
             if choices:
-                return random.choice(choices)
+                return self._random.choice(choices)
             else:
                 return None
         
@@ -319,7 +398,7 @@ class CorrelatedDataGenerator(DataGenerator):
         elif field_type == "random_boolean":
             # Handle random boolean generation
             probability = field_config.get("probability", 0.5)
-            return random.random() < probability
+            return self._random.random() < probability
         
         elif field_type == "timestamp_millis":
             # Handle relative timestamp generation in milliseconds
@@ -409,8 +488,9 @@ class CorrelatedDataGenerator(DataGenerator):
         """Get a Zipf distribution weight function."""
         def zipf_weight(ref_id: str) -> float:
             # In real implementation, would map IDs to ranks
-            # For testing, use a simple hash-based approach
-            rank = (hash(ref_id) % 100) + 1
+            # For testing, use a simple hash-based approach (crc32 is stable
+            # across processes, unlike hash())
+            rank = (zlib.crc32(str(ref_id).encode("utf-8")) % 100) + 1
             return 1.0 / (rank ** alpha)
         return zipf_weight
     
@@ -459,15 +539,14 @@ class CorrelatedDataGenerator(DataGenerator):
         
         elif field_type == "choice":
             choices = field_config.get("choices", [])
-            return random.choice(choices) if choices else None
+            return self._random.choice(choices) if choices else None
         
         elif field_type == "conditional":
             return self._evaluate_conditional(field_config, record)
         
         elif field_type == "faker":
             # Handle faker fields in templates
-            from faker import Faker
-            fake = Faker()
+            fake = self._get_faker()
             method = field_config.get("method", "word")
             text = field_config.get("text", "")
             
@@ -498,13 +577,13 @@ class CorrelatedDataGenerator(DataGenerator):
         # Handle {random_letters:N} patterns
         letter_matches = re.findall(r'\{random_letters:(\d+)\}', result)
         for count in letter_matches:
-            random_letters = ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=int(count)))
+            random_letters = ''.join(self._random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=int(count)))
             result = result.replace(f'{{random_letters:{count}}}', random_letters, 1)
         
         # Handle {random_digits:N} patterns
         digit_matches = re.findall(r'\{random_digits:(\d+)\}', result)
         for count in digit_matches:
-            random_digits = ''.join(random.choices('0123456789', k=int(count)))
+            random_digits = ''.join(self._random.choices('0123456789', k=int(count)))
             result = result.replace(f'{{random_digits:{count}}}', random_digits, 1)
         
         return result
@@ -550,7 +629,7 @@ class CorrelatedDataGenerator(DataGenerator):
                 
                 # Try to get a random reference from the pool
                 try:
-                    ref_id = self.reference_pool.get_random(entity_type)
+                    ref_id = self.reference_pool.get_random(entity_type, rng=self._random)
                     if (hasattr(self.reference_pool, '_record_cache') and 
                         entity_type in self.reference_pool._record_cache and
                         ref_id in self.reference_pool._record_cache[entity_type]):
@@ -561,7 +640,7 @@ class CorrelatedDataGenerator(DataGenerator):
                     pass  # No references available
         
         # Fallback to random value
-        return f"ref_{random.randint(1000, 9999)}"
+        return f"ref_{self._random.randint(1000, 9999)}"
     
     def _get_nested_field_value(self, record: Dict[str, Any], field_path: str) -> Any:
         """Get value from nested field path like 'full.Vehicle.cLicenseNr'."""
@@ -592,16 +671,16 @@ class CorrelatedDataGenerator(DataGenerator):
         # Use current time as base if no reference found
         if base_timestamp is None:
             if fallback == "now":
-                base_timestamp = datetime.now()
+                base_timestamp = self.clock.now()
             else:
                 # Try to parse fallback as datetime if it's not "now"
                 try:
                     base_timestamp = datetime.fromisoformat(fallback)
                 except:
-                    base_timestamp = datetime.now()
+                    base_timestamp = self.clock.now()
         
         # Add random offset
-        offset_minutes = random.uniform(offset_minutes_min, offset_minutes_max)
+        offset_minutes = self._random.uniform(offset_minutes_min, offset_minutes_max)
         final_timestamp = base_timestamp + timedelta(minutes=offset_minutes)
         
         # Return milliseconds since epoch
@@ -629,7 +708,7 @@ class CorrelatedDataGenerator(DataGenerator):
                     
                     # Fallback: get random reference
                     try:
-                        ref_id = self.reference_pool.get_random(entity_type)
+                        ref_id = self.reference_pool.get_random(entity_type, rng=self._random)
                         if (hasattr(self.reference_pool, '_record_cache') and 
                             entity_type in self.reference_pool._record_cache and
                             ref_id in self.reference_pool._record_cache[entity_type]):
@@ -681,14 +760,14 @@ class CorrelatedDataGenerator(DataGenerator):
         
         if not weights or len(weights) != len(choices):
             # Fall back to uniform choice if weights are missing or mismatched
-            return random.choice(choices)
+            return self._random.choice(choices)
         
         # Ensure weights are normalized and sum to 1.0 for precision
         total_weight = sum(weights)
         normalized_weights = [w / total_weight for w in weights]
         
         # Use random.choices for proper weighted selection
-        return random.choices(choices, weights=normalized_weights)[0]
+        return self._random.choices(choices, weights=normalized_weights)[0]
     
     def _should_correlate(self, percentage: float) -> bool:
         """Determine if current record should be correlated based on percentage."""
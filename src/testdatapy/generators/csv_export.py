@@ -0,0 +1,264 @@
+"""Streaming CSV export of master data.
+
+Records are flattened one at a time and written in buffered chunks, so an
+export never holds a flattened copy of the whole entity. The header comes
+from the schema when the shape of generated records is known in advance,
+otherwise from a first pass collecting the union of all flattened keys.
+Output can be compressed on the fly with gzip or zstd.
+"""
+import csv
+import io
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from testdatapy.generators.columnar import ArrayColumn, ColumnarRecords, PooledColumn
+from testdatapy.sinks.base import open_compressed
+from testdatapy.utils.data_flattening import DataFlattener, FlattenPlan, FlattenPlanCache
+
+EXPORT_CHUNK_SIZE = 10_000
+
+
+class HeaderMismatchError(ValueError):
+    """A record has fields that are not part of the CSV header."""
+
+
+def schema_csv_header(schema: Dict[str, Any]) -> Optional[List[str]]:
+    """Get the flattened columns of records generated from a schema.
+
+    Args:
+        schema: Field configurations of the entity
+
+    Returns:
+        Column names in record field order, or None if references or
+        objects without properties make the record shape unpredictable
+    """
+    try:
+        return FlattenPlan.from_schema(schema).columns
+    except ValueError:
+        return None
+
+
+def union_csv_header(records: Iterable[Dict[str, Any]], plans: FlattenPlanCache) -> List[str]:
+    """Collect all flattened keys of the records, in order of first appearance."""
+    header: Dict[str, None] = {}
+    seen = set()
+    for record in records:
+        plan, _ = plans.lookup(record)
+        if plan is None:
+            keys = DataFlattener.flatten_for_csv(record)
+        elif plan in seen:
+            continue
+        else:
+            seen.add(plan)
+            keys = plan.columns
+        for key in keys:
+            if key not in header:
+                header[key] = None
+    return list(header)
+
+
+# Formats values like DataFlattener.flatten_for_csv()
+_csv_value = DataFlattener.value_converter()
+
+
+def _flattened_rows(
+    records: Iterable[Dict[str, Any]],
+    header: List[str],
+    plans: FlattenPlanCache
+) -> Iterator[List[str]]:
+    """Flatten records into value rows in header order.
+
+    Records matching a compiled plan are read into rows directly; others
+    go through DataFlattener.
+
+    Raises:
+        HeaderMismatchError: If a record has a column outside the header
+    """
+    index = {column: position for position, column in enumerate(header)}
+    positions: Dict[Any, Optional[List[int]]] = {}
+
+    def column_positions(columns: Iterable[str]) -> Optional[List[int]]:
+        """Get the header positions of columns, None if they are the header."""
+        columns = list(columns)
+        if columns == header:
+            return None
+        extra = [column for column in columns if column not in index]
+        if extra:
+            raise HeaderMismatchError(f"Fields not in CSV header: {', '.join(extra)}")
+        return [index[column] for column in columns]
+
+    for record in records:
+        plan, values = plans.lookup(record)
+        if plan is None:
+            flat = DataFlattener.flatten_for_csv(record)
+            mapping = column_positions(flat)
+            values = flat.values()
+        else:
+            if plan not in positions:
+                positions[plan] = column_positions(plan.columns)
+            mapping = positions[plan]
+            values = map(_csv_value, values)
+        if mapping is None:
+            yield list(values)
+        else:
+            row = [""] * len(header)
+            for position, value in zip(mapping, values):
+                row[position] = value
+            yield row
+
+
+class CsvExportWriter:
+    """Writes CSV rows in buffered chunks to a plain or compressed file."""
+
+    def __init__(
+        self,
+        path,
+        header: Sequence[str],
+        delimiter: str = ",",
+        include_headers: bool = True,
+        compression: str = "none",
+        chunk_size: int = EXPORT_CHUNK_SIZE
+    ):
+        """Initialize the writer.
+
+        Args:
+            path: Export file path
+            header: Column names
+            delimiter: Field delimiter
+            include_headers: Write the header as the first row
+            compression: One of sinks.base.COMPRESSIONS
+            chunk_size: Rows formatted in memory before each write
+        """
+        self.path = Path(path)
+        self.header = list(header)
+        self.delimiter = delimiter
+        self.include_headers = include_headers
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.rows_written = 0
+
+    def write_dicts(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Write dictionary rows; missing columns are left empty.
+
+        Raises:
+            HeaderMismatchError: If a row has a column outside the header
+        """
+        header = self.header
+        columns = set(header)
+
+        def values() -> Iterator[List[Any]]:
+            for row in rows:
+                if not columns.issuperset(row):
+                    extra = [key for key in row if key not in columns]
+                    raise HeaderMismatchError(f"Fields not in CSV header: {', '.join(extra)}")
+                yield [row.get(column, "") for column in header]
+
+        return self.write_rows(values())
+
+    def write_columns(self, records: ColumnarRecords) -> int:
+        """Write columnar records column-wise, without building record dictionaries."""
+        converters = [_column_strings(column) for column in records.columns.values()]
+
+        def values() -> Iterator[List[str]]:
+            for start in range(0, len(records), self.chunk_size):
+                stop = min(start + self.chunk_size, len(records))
+                yield from zip(*(convert(start, stop) for convert in converters))
+
+        return self.write_rows(values())
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> int:
+        """Write value rows in header order.
+
+        Returns:
+            Number of rows written
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=self.delimiter)
+        self.rows_written = 0
+        with open_compressed(self.path, self.compression, text=True) as f:
+            if self.include_headers:
+                writer.writerow(self.header)
+            pending = 0
+            for row in rows:
+                writer.writerow(row)
+                pending += 1
+                if pending == self.chunk_size:
+                    f.write(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+                    self.rows_written += pending
+                    pending = 0
+            f.write(buffer.getvalue())
+            self.rows_written += pending
+        return self.rows_written
+
+
+def _column_strings(column) -> Callable[[int, int], List[str]]:
+    """Get a function formatting a range of a column as CSV strings."""
+    if isinstance(column, PooledColumn):
+        pool = [_csv_value(value) for value in column.pool]
+        return lambda start, stop: [pool[i] for i in column.indices[start:stop].tolist()]
+    if isinstance(column, ArrayColumn) and column.array.dtype.kind == "U":
+        return column.slice
+    return lambda start, stop: [_csv_value(value) for value in column.slice(start, stop)]
+
+
+def export_records(
+    records: Sequence[Dict[str, Any]],
+    path,
+    schema: Optional[Dict[str, Any]] = None,
+    flatten_objects: bool = True,
+    delimiter: str = ",",
+    include_headers: bool = True,
+    compression: str = "none",
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> int:
+    """Export records to a CSV file.
+
+    Args:
+        records: Records to export; iterated again if a header pass is needed
+        path: Export file path
+        schema: Schema the records were generated from, used for the header
+        flatten_objects: Flatten nested objects into dot-notation columns
+        delimiter: Field delimiter
+        include_headers: Write a header row
+        compression: One of sinks.base.COMPRESSIONS
+        chunk_size: Rows formatted in memory before each write
+
+    Returns:
+        Number of records written
+    """
+    options = dict(
+        delimiter=delimiter, include_headers=include_headers,
+        compression=compression, chunk_size=chunk_size,
+    )
+    if flatten_objects and isinstance(records, ColumnarRecords):
+        return CsvExportWriter(path, list(records.columns), **options).write_columns(records)
+
+    if not flatten_objects:
+        header: Dict[str, None] = {}
+        for record in records:
+            header.update(dict.fromkeys(record))
+        return CsvExportWriter(path, list(header), **options).write_dicts(records)
+
+    plans = FlattenPlanCache()
+    header = None
+    if schema:
+        try:
+            schema_plan = FlattenPlan.from_schema(schema)
+        except ValueError:
+            pass
+        else:
+            plans.add(schema_plan)
+            header = schema_plan.columns
+    if header is not None:
+        try:
+            return CsvExportWriter(path, header, **options).write_rows(
+                _flattened_rows(records, header, plans)
+            )
+        except HeaderMismatchError:
+            # Generated values had a different shape than the schema suggests
+            pass
+    header = union_csv_header(records, plans)
+    return CsvExportWriter(path, header, **options).write_rows(_flattened_rows(records, header, plans))
@@ -0,0 +1,66 @@
+"""Dependency ordering of master data entities."""
+from typing import Any, Dict, Iterator, List, Set
+
+
+def _referenced_entities(schema: Dict[str, Any]) -> Iterator[str]:
+    """Yield the entities referenced by the fields of a schema, recursively."""
+    for field_config in schema.values():
+        if not isinstance(field_config, dict):
+            continue
+        if field_config.get("type") == "reference":
+            source = field_config.get("source", "")
+            if source and not source.startswith("self."):
+                yield source.split(".", 1)[0]
+        for nested_key in ("properties", "fields"):
+            nested = field_config.get(nested_key)
+            if isinstance(nested, dict):
+                yield from _referenced_entities(nested)
+
+
+def master_data_dependencies(master_config: Dict[str, Any]) -> Dict[str, Set[str]]:
+    """Find the master data entities each entity references.
+
+    Args:
+        master_config: The ``master_data`` section of a correlation config
+
+    Returns:
+        Mapping of entity to the other configured entities its schema references
+    """
+    dependencies = {}
+    for entity_type, entity_config in master_config.items():
+        schema = entity_config.get("schema") or {}
+        dependencies[entity_type] = {
+            referenced for referenced in _referenced_entities(schema)
+            if referenced in master_config and referenced != entity_type
+        }
+    return dependencies
+
+
+def dependency_levels(dependencies: Dict[str, Set[str]]) -> List[List[str]]:
+    """Group entities into levels that only depend on earlier levels.
+
+    Entities within a level are independent of each other and keep their
+    configuration order.
+
+    Args:
+        dependencies: Mapping of entity to the entities it depends on
+
+    Returns:
+        Levels of entities, in loading order
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    levels = []
+    loaded: Set[str] = set()
+    remaining = list(dependencies)
+    while remaining:
+        level = [entity for entity in remaining if dependencies[entity] <= loaded]
+        if not level:
+            raise ValueError(
+                f"Circular master data references between: {', '.join(remaining)}"
+            )
+        levels.append(level)
+        loaded.update(level)
+        remaining = [entity for entity in remaining if entity not in loaded]
+    return levels
@@ -1,16 +1,99 @@
 """Master data generator for bulk loading reference data."""
 import csv
+import time
+from collections.abc import Collection
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-import uuid
+from typing import Dict, Any, List, Optional, Tuple
 
+import numpy as np
 from faker import Faker
 
 from testdatapy.generators.base import DataGenerator
+from testdatapy.generators.columnar import (
+    ColumnarGenerator,
+    ColumnarRecords,
+    load_csv_columns,
+    supports_schema,
+)
+from testdatapy.generators.clock import VirtualClock, WallClock
+from testdatapy.generators.csv_export import export_records
+from testdatapy.generators.dependency_graph import dependency_levels, master_data_dependencies
 from testdatapy.generators.reference_pool import ReferencePool
+from testdatapy.generators.seeding import derive_seed, random_uuid
 from testdatapy.config.correlation_config import CorrelationConfig
 from testdatapy.producers.base import KafkaProducer
-from testdatapy.utils.data_flattening import DataFlattener
+from testdatapy.producers.pool import ProducerPool
+from testdatapy.sinks.base import compression_for_path
+from testdatapy.sinks.pool import SinkPool
+from testdatapy.utils.data_flattening import DataFlattener, FlattenPlan
+
+# Records per chunk when Faker entities are generated in parallel
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def create_loading_executor(workers: int) -> Executor:
+    """Create the worker pool used for loading master data.
+
+    Faker generation holds the GIL, so a process pool is used where the
+    platform supports one, with a thread pool as fallback.
+
+    Args:
+        workers: Number of workers
+
+    Returns:
+        Executor for _load_entity_part calls
+    """
+    try:
+        return ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError, ImportError):
+        return ThreadPoolExecutor(max_workers=workers)
+
+
+def _load_entity_part(
+    config: CorrelationConfig,
+    entity_type: str,
+    start: int,
+    count: int,
+    seed: int,
+    columnar: bool,
+    sequence_counters: Dict[str, int],
+    clock: Optional[VirtualClock | WallClock] = None
+) -> Tuple[Any, Dict[str, int]]:
+    """Load records start..start+count of an entity, in a worker process.
+
+    CSV entities are loaded completely; start and count only apply to
+    generated entities.
+
+    Args:
+        config: Correlation configuration
+        entity_type: Entity to load
+        start: Index of the first record
+        count: Number of records to generate
+        seed: Seed of this part
+        columnar: Generate column by column where the schema allows it
+        sequence_counters: Sequence counters before the entity was loaded
+        clock: Clock for timestamps
+
+    Returns:
+        Tuple of the records and the sequence counters they advanced
+    """
+    generator = MasterDataGenerator(config, ReferencePool(), columnar=columnar, seed=seed, clock=clock)
+    entity_config = config.config["master_data"][entity_type]
+    if entity_config.get("source", "faker") != "faker":
+        generator._load_source(entity_type, entity_config)
+        return generator.loaded_data[entity_type], {}
+
+    # Sequences continue where the previous part ends
+    shifted = {key: value + start for key, value in sequence_counters.items()}
+    generator._sequence_counters = dict(shifted)
+    generator._sequence_start = 1 + start
+    generator._generate_with_faker(entity_type, dict(entity_config, count=count), index_start=start)
+    advanced = {
+        key: value for key, value in generator._sequence_counters.items()
+        if shifted.get(key) != value
+    }
+    return generator.loaded_data[entity_type], advanced
 
 
 class MasterDataGenerator:
@@ -25,21 +108,51 @@ class MasterDataGenerator:
         self,
         config: CorrelationConfig,
         reference_pool: ReferencePool,
-        producer: Optional[KafkaProducer] = None
+        producer: Optional[KafkaProducer | ProducerPool | SinkPool] = None,
+        columnar: bool = False,
+        seed: Optional[int] = None,
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        clock: Optional[VirtualClock | WallClock] = None
     ):
         """Initialize the master data generator.
         
         Args:
             config: Correlation configuration
             reference_pool: Reference pool to populate
-            producer: Optional Kafka producer for bulk loading
+            producer: Optional Kafka producer, producer pool or file sink pool
+                for bulk loading
+            columnar: Generate Faker-sourced entities and read CSV-sourced
+                entities column by column (entities can also set
+                ``columnar: true`` individually)
+            seed: Seed for reproducible data; generated entities are split
+                into chunks with seeds derived from it
+            workers: Worker processes loading independent entities and
+                chunks of large entities in parallel
+            chunk_size: Records per chunk of generated entities when loading
+                with a seed or more than one worker
+            clock: Clock for timestamps (default: a VirtualClock when seeded,
+                the wall clock otherwise)
         """
         self.config = config
         self.reference_pool = reference_pool
         self.producer = producer
+        self.columnar = columnar
+        self.seed = seed
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self._columnar_generator: Optional[ColumnarGenerator] = None
         self.loaded_data: Dict[str, List[Dict[str, Any]]] = {}
         self.faker = Faker()
+        if seed is not None:
+            self.faker.seed_instance(seed)
+        # Seeded data is stamped with virtual time so reruns match
+        if clock is None:
+            clock = VirtualClock() if seed is not None else WallClock()
+        self.clock = clock
         self._sequence_counters: Dict[str, int] = {}
+        # First value of sequences not started yet
+        self._sequence_start = 1
         
         # Track loading performance
         self._loading_stats: Dict[str, Dict[str, Any]] = {}
@@ -49,28 +162,25 @@ class MasterDataGenerator:
             self.reference_pool._record_cache = {}
     
     def load_all(self) -> None:
-        """Load all master data defined in configuration."""
-        import time
+        """Load all master data defined in configuration.
+        
+        Entities are loaded after the entities their reference fields point
+        to. With a seed or more than one worker, independent entities and
+        chunks of generated entities are loaded as separate tasks.
+        """
         start_time = time.time()
         
         master_config = self.config.config.get("master_data", {})
+        levels = dependency_levels(master_data_dependencies(master_config))
         
-        # Sort by dependency order if needed
-        entity_order = self._get_dependency_order(master_config)
-        
-        for entity_type in entity_order:
-            if entity_type in master_config:
-                entity_start = time.time()
-                entity_config = master_config[entity_type]
-                self.load_entity(entity_type, entity_config)
-                entity_duration = time.time() - entity_start
-                
-                # Track loading performance for scale analysis
-                self._loading_stats[entity_type] = {
-                    "duration_seconds": entity_duration,
-                    "record_count": len(self.loaded_data.get(entity_type, [])),
-                    "records_per_second": len(self.loaded_data.get(entity_type, [])) / max(entity_duration, 0.001)
-                }
+        if self.workers > 1 or self.seed is not None:
+            self._load_in_parts(master_config, levels)
+        else:
+            for level in levels:
+                for entity_type in level:
+                    entity_start = time.time()
+                    self.load_entity(entity_type, master_config[entity_type])
+                    self._record_loading_stats(entity_type, time.time() - entity_start)
         
         total_duration = time.time() - start_time
         self._loading_stats["_total"] = {
@@ -78,6 +188,86 @@ class MasterDataGenerator:
             "total_records": sum(len(data) for data in self.loaded_data.values())
         }
     
+    def _record_loading_stats(self, entity_type: str, duration: float) -> None:
+        """Track loading performance of an entity for scale analysis."""
+        record_count = len(self.loaded_data.get(entity_type, []))
+        self._loading_stats[entity_type] = {
+            "duration_seconds": duration,
+            "record_count": record_count,
+            "records_per_second": record_count / max(duration, 0.001)
+        }
+    
+    def _load_in_parts(self, master_config: Dict[str, Any], levels: List[List[str]]) -> None:
+        """Load entities level by level as parallel parts with derived seeds.
+        
+        Args:
+            master_config: Master data configuration
+            levels: Entity levels from dependency_levels()
+        """
+        entropy = self.seed if self.seed is not None else np.random.SeedSequence().entropy
+        executor = create_loading_executor(self.workers) if self.workers > 1 else None
+        try:
+            for level in levels:
+                level_start = time.time()
+                # Submit the whole level before collecting any results
+                parts = {
+                    entity_type: self._submit_parts(
+                        executor, entity_type, master_config[entity_type], entropy
+                    )
+                    for entity_type in level
+                }
+                for entity_type in level:
+                    results = [future.result() for future in parts[entity_type]]
+                    records = [result[0] for result in results]
+                    if isinstance(records[0], ColumnarRecords):
+                        self.loaded_data[entity_type] = ColumnarRecords.concat(records)
+                    elif len(records) == 1:
+                        self.loaded_data[entity_type] = records[0]
+                    else:
+                        self.loaded_data[entity_type] = [r for part in records for r in part]
+                    # The last part advanced the sequences past the whole entity
+                    self._sequence_counters.update(results[-1][1])
+                    self._register_entity(entity_type, master_config[entity_type])
+                    self._record_loading_stats(entity_type, time.time() - level_start)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    
+    def _submit_parts(
+        self,
+        executor: Optional[Executor],
+        entity_type: str,
+        entity_config: Dict[str, Any],
+        entropy: int
+    ) -> List[Future]:
+        """Submit the load tasks of an entity, running them inline without an executor."""
+        if entity_config.get("source", "faker") == "faker":
+            count = entity_config.get("count", 100)
+            chunks = [
+                (start, min(self.chunk_size, count - start))
+                for start in range(0, count, self.chunk_size)
+            ] or [(0, 0)]
+        else:
+            chunks = [(0, 0)]
+        
+        futures = []
+        for chunk_index, (start, count) in enumerate(chunks):
+            args = (
+                self.config, entity_type, start, count,
+                derive_seed(entropy, entity_type, chunk_index),
+                self.columnar, dict(self._sequence_counters), self.clock
+            )
+            if executor is not None:
+                futures.append(executor.submit(_load_entity_part, *args))
+                continue
+            future: Future = Future()
+            try:
+                future.set_result(_load_entity_part(*args))
+            except Exception as e:
+                future.set_exception(e)
+            futures.append(future)
+        return futures
+    
     def load_entity(self, entity_type: str, entity_config: Dict[str, Any]) -> None:
         """Load a single entity type.
         
@@ -85,6 +275,11 @@ class MasterDataGenerator:
             entity_type: Type of entity (e.g., 'customers')
             entity_config: Configuration for this entity
         """
+        self._load_source(entity_type, entity_config)
+        self._register_entity(entity_type, entity_config)
+    
+    def _load_source(self, entity_type: str, entity_config: Dict[str, Any]) -> None:
+        """Load or generate the records of an entity into loaded_data."""
         source = entity_config.get("source", "faker")
         
         if source == "csv":
@@ -93,13 +288,10 @@ class MasterDataGenerator:
             self._generate_with_faker(entity_type, entity_config)
         else:
             raise ValueError(f"Unknown source type: {source}")
-        
-        # Populate reference pool
+    
+    def _register_entity(self, entity_type: str, entity_config: Dict[str, Any]) -> None:
+        """Add the loaded records of an entity to the reference pool."""
         self._populate_reference_pool(entity_type, entity_config)
-        
-        # Build indices after bulk loading
-        if len(self.loaded_data.get(entity_type, [])) > 1000:  # Only for large datasets
-            self.reference_pool.build_indices_for_entity(entity_type)
     
     def _load_from_csv(self, entity_type: str, entity_config: Dict[str, Any]) -> None:
         """Load data from CSV file with enhanced structure reconstruction and type conversion."""
@@ -111,6 +303,17 @@ class MasterDataGenerator:
         if not csv_path.exists():
             raise FileNotFoundError(f"CSV file not found: {file_path}")
         
+        if entity_config.get("columnar", self.columnar):
+            records = load_csv_columns(csv_path, entity_config.get("schema", {}))
+            if records is not None:
+                if not len(records):
+                    print(f"Warning: CSV file {file_path} is empty")
+                    self.loaded_data[entity_type] = []
+                else:
+                    self.loaded_data[entity_type] = records
+                    print(f"✅ Loaded {len(records)} {entity_type} records from CSV")
+                return
+        
         # Load raw CSV data
         raw_data = []
         with open(csv_path, 'r', newline='', encoding='utf-8') as f:
@@ -131,9 +334,11 @@ class MasterDataGenerator:
             # Reconstruct nested structure from flattened CSV
             print(f"📋 Reconstructing nested structure for {entity_type} from flattened CSV")
             structured_data = []
+            # Rows share the CSV header, so one compiled plan rebuilds them all
+            plan = FlattenPlan.from_columns(list(sample_row))
             for row in raw_data:
                 try:
-                    unflattened = DataFlattener.unflatten_dict(row)
+                    unflattened = plan.unflatten(row) if plan else DataFlattener.unflatten_dict(row)
                     structured_data.append(unflattened)
                 except Exception as e:
                     print(f"Warning: Failed to unflatten row in {entity_type}: {e}")
@@ -236,8 +441,17 @@ class MasterDataGenerator:
         
         return converted
     
-    def _generate_with_faker(self, entity_type: str, entity_config: Dict[str, Any]) -> None:
-        """Generate data using Faker."""
+    def _generate_with_faker(
+        self, entity_type: str, entity_config: Dict[str, Any], index_start: int = 0
+    ) -> None:
+        """Generate data using Faker.
+
+        Args:
+            entity_type: Entity to generate
+            entity_config: Entity configuration
+            index_start: Index of the first record, for parts of an entity
+                generated separately
+        """
         count = entity_config.get("count", 100)
         schema = entity_config.get("schema", {})
         
@@ -245,8 +459,19 @@ class MasterDataGenerator:
         if not schema:
             schema = self._get_default_schema(entity_type)
         
+        if entity_config.get("columnar", self.columnar) and supports_schema(schema):
+            # Ids and referenced fields must not repeat, so they are not pooled
+            unique_fields = {entity_config.get("id_field", f"{entity_type[:-1]}_id")}
+            unique_fields.update(
+                path.split(".")[0] for path in self._correlation_index_paths(entity_type)
+            )
+            self.loaded_data[entity_type] = self._generate_columnar(
+                entity_type, schema, count, unique_fields, index_start
+            )
+            return
+        
         data = []
-        for i in range(count):
+        for i in range(index_start, index_start + count):
             record = {}
             # First pass: generate non-reference fields
             for field_name, field_config in schema.items():
@@ -265,6 +490,30 @@ class MasterDataGenerator:
         
         self.loaded_data[entity_type] = data
     
+    def _generate_columnar(
+        self,
+        entity_type: str,
+        schema: Dict[str, Any],
+        count: int,
+        unique_fields: Collection[str] = (),
+        index_start: int = 0
+    ) -> ColumnarRecords:
+        """Generate data column by column instead of record by record."""
+        if self._columnar_generator is None:
+            self._columnar_generator = ColumnarGenerator(rng=np.random.default_rng(self.seed))
+        return self._columnar_generator.generate(
+            entity_type,
+            schema,
+            count,
+            lambda field_name, field_config, index: self._generate_field(
+                field_name, field_config, entity_type, index
+            ),
+            self._sequence_counters,
+            self._sequence_start,
+            unique_fields,
+            index_start,
+        )
+    
     def _generate_field(
         self, 
         field_name: str, 
@@ -337,7 +586,7 @@ class MasterDataGenerator:
                     from datetime import datetime, timedelta
                     import re
                     
-                    now = datetime.now()
+                    now = self.clock.now()
                     
                     # Parse relative dates like "-1w", "+2d", etc.
                     def parse_relative_date(date_str):
@@ -379,7 +628,7 @@ class MasterDataGenerator:
                 return self.faker.word()
         
         elif field_type == "uuid":
-            return str(uuid.uuid4())
+            return random_uuid(self.faker.random)
         
         elif field_type == "integer":
             min_val = field_config.get("min", 0)
@@ -413,17 +662,15 @@ class MasterDataGenerator:
         
         elif field_type == "timestamp":
             # Handle timestamp fields
-            from datetime import datetime
             format_type = field_config.get("format", "iso8601")
             if format_type == "iso8601":
-                return datetime.now().isoformat()
+                return self.clock.now().isoformat()
             else:
-                return int(datetime.now().timestamp())
+                return int(self.clock.now().timestamp())
         
         elif field_type == "timestamp_millis":
             # Handle timestamp in milliseconds
-            from datetime import datetime
-            return int(datetime.now().timestamp() * 1000)
+            return int(self.clock.now().timestamp() * 1000)
         
         elif field_type == "reference":
             # Handle reference fields with formatting support
@@ -460,7 +707,7 @@ class MasterDataGenerator:
             counter_key = f"{entity_type}_{field_name}"
             
             if counter_key not in self._sequence_counters:
-                self._sequence_counters[counter_key] = 1
+                self._sequence_counters[counter_key] = self._sequence_start
             
             current = self._sequence_counters[counter_key]
             self._sequence_counters[counter_key] += 1
@@ -497,46 +744,26 @@ class MasterDataGenerator:
         """Populate the reference pool with loaded data."""
         id_field = entity_config.get("id_field", f"{entity_type[:-1]}_id")
         data = self.loaded_data.get(entity_type, [])
+        index_field_paths = self._correlation_index_paths(entity_type)
         
-        # Extract IDs and add to reference pool
-        ids = []
-        for record in data:
-            record_id = None
-            
-            # Handle nested ID fields
-            if "." in id_field:
-                record_id = self._get_nested_field_value(record, id_field)
-            elif id_field in record:
-                record_id = record[id_field]
-            
-            if record_id:
-                ids.append(str(record_id))
+        indexed_count = self.reference_pool.bulk_load(entity_type, data, id_field, index_field_paths)
         
-        if ids:
-            self.reference_pool.add_references(entity_type, ids)
-            
-            # Cache full records for efficient lookups
-            if entity_type not in self.reference_pool._record_cache:
-                self.reference_pool._record_cache[entity_type] = {}
-            
-            for record in data:
-                record_id = None
-                if "." in id_field:
-                    record_id = self._get_nested_field_value(record, id_field)
-                elif id_field in record:
-                    record_id = record[id_field]
-                
-                if record_id:
-                    self.reference_pool._record_cache[entity_type][str(record_id)] = record
-            
-            # Build indices for efficient correlation lookups
-            self._build_correlation_indices(entity_type, data, entity_config)
+        if indexed_count > 0:
+            print(f"🔍 Built {indexed_count} correlation indices for {entity_type} across {len(index_field_paths)} field paths")
     
     def produce_all(self) -> None:
         """Bulk produce all loaded master data to Kafka and export CSV files."""
         master_config = self.config.config.get("master_data", {})
         kafka_errors = []
         
+        # CSV exports run in the background while records are produced to Kafka
+        export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="csv-export")
+        exports = {
+            entity_type: export_executor.submit(self._export_to_csv, entity_type, entity_config)
+            for entity_type, entity_config in master_config.items()
+            if "csv_export" in entity_config
+        }
+        
         for entity_type, entity_config in master_config.items():
             # Check if Kafka production is needed
             has_topic = entity_config.get("kafka_topic") is not None
@@ -550,13 +777,14 @@ class MasterDataGenerator:
                     self.produce_entity(entity_type, entity_config)
                 except Exception as e:
                     kafka_errors.append(f"Failed to produce {entity_type} to Kafka: {e}")
-            
-            # CSV export (always runs independent of Kafka production success/failure)
-            if "csv_export" in entity_config:
-                try:
-                    self._export_to_csv(entity_type, entity_config)
-                except Exception as e:
-                    print(f"Warning: Failed to export {entity_type} to CSV: {e}")
+        
+        # CSV export (always completes independent of Kafka production success/failure)
+        export_executor.shutdown(wait=True)
+        for entity_type, export in exports.items():
+            try:
+                export.result()
+            except Exception as e:
+                print(f"Warning: Failed to export {entity_type} to CSV: {e}")
         
         # Flush producer only if we have one and used it successfully
         if self.producer and not kafka_errors:
@@ -591,6 +819,14 @@ class MasterDataGenerator:
         # Use consistent key field priority logic: key_field > id_field > default
         key_field = self.config.get_key_field(entity_type, is_master=True)
         
+        # A producer pool shares one client across topics; a sink pool writes files
+        if isinstance(self.producer, (ProducerPool, SinkPool)):
+            if not self.producer.has_topic(topic):
+                self.producer.add_json_topic(topic, key_field=key_field)
+            for record in data:
+                self.producer.produce(topic, record)
+            return
+        
         # Create topic-specific producer if needed
         if not hasattr(self.producer, '_topic_producers'):
             self.producer._topic_producers = {}
@@ -626,25 +862,10 @@ class MasterDataGenerator:
         data = self.loaded_data.get(entity_type, [])
         return data[:count]
     
-    # TODO - this is bullshit - too specialized for single use case
     def _get_dependency_order(self, master_config: Dict[str, Any]) -> List[str]:
         """Get dependency order for master data loading."""
-        vehicle_order = ["appointments", "customers", "products"]
-        
-        # Ensure all configured entities are included
-        all_entities = list(master_config.keys())
-        ordered_entities = []
-        
-        # Add priority entities first
-        for entity in vehicle_order:
-            if entity in all_entities:
-                ordered_entities.append(entity)
-                all_entities.remove(entity)
-        
-        # Add remaining entities
-        ordered_entities.extend(all_entities)
-        
-        return ordered_entities
+        levels = dependency_levels(master_data_dependencies(master_config))
+        return [entity_type for level in levels for entity_type in level]
     
     def _get_nested_field_value(self, record: Dict[str, Any], field_path: str) -> Any:
         """Get value from nested field path like 'full.Job.cKeyJob'."""
@@ -696,7 +917,6 @@ class MasterDataGenerator:
     
     def _apply_time_offset(self, value: Any, offset_min: int, offset_max: int) -> Any:
         """Apply random time offset to a timestamp value."""
-        import random
         from datetime import datetime, timedelta
         
         if isinstance(value, str):
@@ -705,7 +925,7 @@ class MasterDataGenerator:
                 dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
                 
                 # Apply random offset
-                offset_minutes = random.uniform(offset_min, offset_max)
+                offset_minutes = self.faker.random.uniform(offset_min, offset_max)
                 new_dt = dt + timedelta(minutes=offset_minutes)
                 
                 # Return in same format
@@ -715,7 +935,7 @@ class MasterDataGenerator:
                 return value
         elif isinstance(value, datetime):
             # Apply random offset
-            offset_minutes = random.uniform(offset_min, offset_max)
+            offset_minutes = self.faker.random.uniform(offset_min, offset_max)
             new_dt = value + timedelta(minutes=offset_minutes)
             return new_dt.isoformat()
         else:
@@ -872,38 +1092,30 @@ class MasterDataGenerator:
         
         # Parse CSV configuration
         if isinstance(csv_config, str):
-            csv_file = csv_config
-            include_headers = True
-            flatten_objects = True
-            delimiter = ","
-        else:
-            csv_file = csv_config["file"]
-            include_headers = csv_config.get("include_headers", True)
-            flatten_objects = csv_config.get("flatten_objects", True)
-            delimiter = csv_config.get("delimiter", ",")
+            csv_config = {"file": csv_config}
+        csv_file = csv_config["file"]
         
         # Get data to export
         data = self.loaded_data.get(entity_type, [])
         if not data:
             return
         
-        # Flatten objects if requested
-        if flatten_objects:
-            data = [self._flatten_record(record) for record in data]
-        
-        # Ensure parent directory exists
-        csv_path = Path(csv_file)
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write CSV
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            if data:
-                writer = csv.DictWriter(f, fieldnames=data[0].keys(), delimiter=delimiter)
-                if include_headers:
-                    writer.writeheader()
-                writer.writerows(data)
-        
-        print(f"✅ Exported {len(data)} {entity_type} records to {csv_file}")
+        schema = None
+        if entity_config.get("source", "faker") == "faker":
+            schema = entity_config.get("schema") or self._get_default_schema(entity_type)
+        
+        # Records are flattened and written in chunks as the file is streamed
+        count = export_records(
+            data,
+            csv_file,
+            schema=schema,
+            flatten_objects=csv_config.get("flatten_objects", True),
+            delimiter=csv_config.get("delimiter", ","),
+            include_headers=csv_config.get("include_headers", True),
+            compression=compression_for_path(csv_file, csv_config.get("compression")),
+        )
+        
+        print(f"✅ Exported {count} {entity_type} records to {csv_file}")
     
     def _flatten_record(self, record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
         """Flatten nested objects into dot-notation fields.
@@ -947,67 +1159,33 @@ class MasterDataGenerator:
         
         return flattened
     
-    def _build_correlation_indices(self, entity_type: str, data: List[Dict[str, Any]], entity_config: Dict[str, Any]) -> None:
-        """Build indices for efficient correlation lookups.
+    def _correlation_index_paths(self, entity_type: str) -> List[str]:
+        """Get the field paths of an entity that need correlation indices.
         
-        This method creates field indices for commonly used correlation fields to enable O(1) lookups
-        instead of O(n) linear searches, which is critical for performance at scale.
-        
-        Args:
-            entity_type: Type of entity (e.g., 'appointments')
-            data: List of loaded data records
-            entity_config: Configuration for this entity
+        These are the paths of ``references`` and ``source`` settings
+        anywhere in the configuration that point into this entity, e.g.
+        ``full.Vehicle.cLicenseNrCleaned`` for
+        ``references: appointments.full.Vehicle.cLicenseNrCleaned``.
         """
-        if not data:
-            return
-            
-        # Get schema to understand field structure
-        schema = entity_config.get("schema", {})
-        
-        # Common correlation field paths that need indexing for performance
-        index_field_paths = [
-            "full.Vehicle.cLicenseNr",
-            "full.Vehicle.cLicenseNrCleaned", 
-            "full.Customer.cKeyCustomer",
-            "full.Job.cKeyJob",
-            "jobid",
-            "id"
-        ]
-        
-        # Also check for any reference fields in the config that might be used for correlation
-        # by scanning the entire configuration for references to this entity
-        try:
-            config_str = str(self.config.config)
-            if f"{entity_type}." in config_str:
-                # Extract potential field paths from references
-                import re
-                ref_patterns = re.findall(rf'{entity_type}\.([a-zA-Z0-9_.]+)', config_str)
-                for pattern in ref_patterns:
-                    if pattern not in index_field_paths:
-                        index_field_paths.append(pattern)
-        except Exception:
-            # If pattern extraction fails, just use the common paths
-            pass
-        
-        # Build indices for each field path
-        indexed_count = 0
-        for record in data:
-            # Get the record ID for indexing
-            id_field = entity_config.get("id_field", "id")
-            record_id = record.get(id_field)
-            if not record_id:
-                continue
-                
-            # Index each field path
-            for field_path in index_field_paths:
-                field_value = self._get_nested_field_value(record, field_path)
-                if field_value is not None:
-                    # Add to reference pool index for O(1) lookup
-                    self.reference_pool.add_field_index(entity_type, field_path, str(record_id), str(field_value))
-                    indexed_count += 1
+        prefix = f"{entity_type}."
+        index_field_paths: List[str] = []
+        
+        def collect(node: Any) -> None:
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if key in ("references", "source") and isinstance(value, str):
+                        if value.startswith(prefix) and len(value) > len(prefix):
+                            path = value[len(prefix):]
+                            if path not in index_field_paths:
+                                index_field_paths.append(path)
+                    else:
+                        collect(value)
+            elif isinstance(node, list):
+                for item in node:
+                    collect(item)
         
-        if indexed_count > 0:
-            print(f"🔍 Built {indexed_count} correlation indices for {entity_type} across {len(index_field_paths)} field paths")
+        collect(self.config.config)
+        return index_field_paths
     
     def _get_nested_field_value(self, record: Dict[str, Any], field_path: str) -> Any:
         """Get value from nested field path like 'full.Vehicle.cLicenseNr'.
@@ -0,0 +1,99 @@
+"""Binary snapshots of a reference pool.
+
+A snapshot holds the complete pool state (references, record cache, field
+indices and recent windows) so a later run can reuse loaded master data
+instead of generating it again.
+
+The state is pickled with protocol 5; NumPy arrays of columnar records are
+written as out-of-band buffers after the pickle payload. Loading memory-maps
+the file, so these arrays are backed by the file pages instead of being
+read into memory. Snapshots are trusted input: only load snapshots written
+by testdatapy.
+"""
+import mmap
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+MAGIC = b"TDPYSNAP"
+VERSION = 1
+# Buffers are aligned for memory-mapped NumPy arrays
+ALIGNMENT = 64
+
+_HEADER = struct.Struct("<8sIQQ")  # magic, version, payload length, buffer count
+_LENGTH = struct.Struct("<Q")
+
+
+def _padding(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+def save_snapshot(pool, path, metadata: Optional[Dict[str, Any]] = None) -> int:
+    """Write a snapshot of a reference pool.
+
+    Args:
+        pool: ReferencePool to save
+        path: Snapshot file path
+        metadata: Optional information stored alongside the pool state
+
+    Returns:
+        Size of the snapshot in bytes
+    """
+    state = {"metadata": metadata or {}, "pool": pool.snapshot_state()}
+    buffers: List[pickle.PickleBuffer] = []
+    payload = pickle.dumps(state, protocol=5, buffer_callback=buffers.append)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(payload), len(buffers)))
+        f.write(payload)
+        for buffer in buffers:
+            data = buffer.raw()
+            f.write(_LENGTH.pack(data.nbytes))
+            f.write(b"\0" * _padding(f.tell()))
+            f.write(data)
+        return f.tell()
+
+
+def read_snapshot(path, memory_map: bool = True) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Read the metadata and pool state of a snapshot.
+
+    Args:
+        path: Snapshot file path
+        memory_map: Map the file instead of reading it into memory
+
+    Returns:
+        Tuple of (metadata, pool state)
+
+    Raises:
+        ValueError: If the file is not a snapshot of a supported version
+    """
+    with open(path, "rb") as f:
+        if memory_map:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            data = memoryview(f.read())
+
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path} is not a reference pool snapshot")
+    magic, version, payload_length, buffer_count = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a reference pool snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} in {path}")
+
+    offset = _HEADER.size
+    payload = data[offset:offset + payload_length]
+    offset += payload_length
+    buffers = []
+    for _ in range(buffer_count):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        offset += _padding(offset)
+        buffers.append(data[offset:offset + length])
+        offset += length
+
+    state = pickle.loads(payload, buffers=buffers)
+    return state["metadata"], state["pool"]
@@ -2,7 +2,38 @@
 import random
 import threading
 from collections import defaultdict, deque
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, Iterable, List, Optional, Callable, Sequence
+
+from testdatapy.generators.columnar import ColumnarRecordCache, ColumnarRecords
+
+
+def compile_path_getter(field_path: str) -> Callable[[Dict[str, Any]], Any]:
+    """Compile a dot-notation field path into a getter function.
+    
+    Args:
+        field_path: Path like 'customer_id' or 'full.Vehicle.cLicenseNr'
+        
+    Returns:
+        Function returning the value at the path of a record, or None
+    """
+    parts = tuple(field_path.split("."))
+    if len(parts) == 1:
+        key = parts[0]
+        
+        def get_field(record: Dict[str, Any]) -> Any:
+            return record.get(key) if isinstance(record, dict) else None
+        
+        return get_field
+    
+    def get_nested_field(record: Dict[str, Any]) -> Any:
+        current = record
+        for part in parts:
+            if not isinstance(current, dict):
+                return None
+            current = current.get(part)
+        return current
+    
+    return get_nested_field
 
 
 class ReferencePool:
@@ -48,6 +79,9 @@ class ReferencePool:
         with self._lock:
             if ref_type not in self._references:
                 self._references[ref_type] = []
+            elif not isinstance(self._references[ref_type], list):
+                # Copy references attached from a shared pool before writing
+                self._references[ref_type] = list(self._references[ref_type])
             self._references[ref_type].extend(references)
             
             if self._stats_enabled:
@@ -63,11 +97,12 @@ class ReferencePool:
         with self._lock:
             return len(self._references.get(ref_type, []))
     
-    def get_random(self, ref_type: str) -> str:
+    def get_random(self, ref_type: str, rng: Optional[random.Random] = None) -> str:
         """Get a random reference of a specific type.
         
         Args:
             ref_type: Type of reference to retrieve
+            rng: Random stream to draw from (default: the random module)
             
         Returns:
             Random reference ID
@@ -83,14 +118,15 @@ class ReferencePool:
                 self._stats[ref_type]["access_count"] += 1
                 self._stats[ref_type]["last_access"] = threading.get_ident()
             
-            return random.choice(self._references[ref_type])
+            return (rng or random).choice(self._references[ref_type])
     
-    def get_random_multiple(self, ref_type: str, count: int) -> List[str]:
+    def get_random_multiple(self, ref_type: str, count: int, rng: Optional[random.Random] = None) -> List[str]:
         """Get multiple unique random references.
         
         Args:
             ref_type: Type of references to retrieve
             count: Number of references to get
+            rng: Random stream to draw from (default: the random module)
             
         Returns:
             List of unique random reference IDs
@@ -101,14 +137,17 @@ class ReferencePool:
             
             available = self._references[ref_type]
             sample_size = min(count, len(available))
-            return random.sample(available, sample_size)
+            return (rng or random).sample(available, sample_size)
     
-    def get_weighted_random(self, ref_type: str, weight_func: Callable[[str], float]) -> str:
+    def get_weighted_random(
+        self, ref_type: str, weight_func: Callable[[str], float], rng: Optional[random.Random] = None
+    ) -> str:
         """Get a weighted random reference.
         
         Args:
             ref_type: Type of reference to retrieve
             weight_func: Function that returns weight for each reference ID
+            rng: Random stream to draw from (default: the random module)
             
         Returns:
             Weighted random reference ID
@@ -123,7 +162,7 @@ class ReferencePool:
             
             references = self._references[ref_type]
             weights = [weight_func(ref) for ref in references]
-            return random.choices(references, weights=weights)[0]
+            return (rng or random).choices(references, weights=weights)[0]
     
     def enable_recent_tracking(self, ref_type: str, window_size: int) -> None:
         """Enable tracking of recent items for a reference type.
@@ -161,12 +200,15 @@ class ReferencePool:
                 return list(self._recent_items[ref_type])
             return []
     
-    def get_random_recent(self, ref_type: str, bias_recent: bool = True) -> str:
+    def get_random_recent(
+        self, ref_type: str, bias_recent: bool = True, rng: Optional[random.Random] = None
+    ) -> str:
         """Get a random reference from recent items.
         
         Args:
             ref_type: Type of reference
             bias_recent: Whether to bias selection towards more recent items
+            rng: Random stream to draw from (default: the random module)
             
         Returns:
             Random reference from recent items
@@ -183,9 +225,9 @@ class ReferencePool:
             if bias_recent:
                 # Weight more recent items higher
                 weights = [i + 1 for i in range(len(recent))]
-                return random.choices(recent, weights=weights)[0]
+                return (rng or random).choices(recent, weights=weights)[0]
             else:
-                return random.choice(recent)
+                return (rng or random).choice(recent)
     
     def clear_type(self, ref_type: str) -> None:
         """Clear all references of a specific type."""
@@ -237,6 +279,90 @@ class ReferencePool:
         
         return pool
     
+    def snapshot_state(self) -> Dict[str, Any]:
+        """Get the complete pool state, including record cache and indices."""
+        with self._lock:
+            state = self.to_dict()
+            state["record_cache"] = dict(self._record_cache)
+            state["indices"] = dict(self._indices)
+            return state
+    
+    @classmethod
+    def from_snapshot_state(cls, state: Dict[str, Any]) -> 'ReferencePool':
+        """Create a ReferencePool from snapshot_state()."""
+        pool = cls.from_dict(state)
+        pool._record_cache = state.get("record_cache", {})
+        pool._indices = state.get("indices", {})
+        return pool
+    
+    def save_snapshot(self, path, metadata: Optional[Dict[str, Any]] = None) -> int:
+        """Save the complete pool to a binary snapshot file.
+        
+        Args:
+            path: Snapshot file path
+            metadata: Optional information stored with the snapshot
+            
+        Returns:
+            Size of the snapshot in bytes
+        """
+        from testdatapy.generators.pool_snapshot import save_snapshot
+        return save_snapshot(self, path, metadata)
+    
+    @classmethod
+    def load_snapshot(cls, path, memory_map: bool = True) -> 'ReferencePool':
+        """Load a pool saved with save_snapshot().
+        
+        Args:
+            path: Snapshot file path
+            memory_map: Memory-map the file (NumPy columns stay file-backed)
+            
+        Returns:
+            Restored ReferencePool
+        """
+        from testdatapy.generators.pool_snapshot import read_snapshot
+        _, state = read_snapshot(path, memory_map=memory_map)
+        return cls.from_snapshot_state(state)
+    
+    def publish_shared(self, path=None, name: Optional[str] = None):
+        """Publish the pool for read-only use by other processes.
+        
+        Args:
+            path: File to write (use a path under /dev/shm to stay in memory)
+            name: multiprocessing shared memory name, used when no path is
+                given (None for a generated name)
+            
+        Returns:
+            SharedPoolSegment; the publishing process unlinks it when done
+        """
+        from testdatapy.generators.shared_pool import publish_shared_pool
+        return publish_shared_pool(self, path=path, name=name)
+    
+    @classmethod
+    def attach_shared(cls, path=None, name: Optional[str] = None) -> 'ReferencePool':
+        """Create a pool backed by a pool published with publish_shared().
+        
+        References, cached records and field indices are read-only views of
+        the shared buffer; adding to them copies the affected type locally.
+        
+        Args:
+            path: Published file
+            name: Shared memory name, used when no path is given
+            
+        Returns:
+            ReferencePool over the shared data
+        """
+        from testdatapy.generators.shared_pool import SharedPoolView
+        view = SharedPoolView.attach(path=path, name=name)
+        pool = cls.from_dict({
+            "references": dict(view.references),
+            "recent_items": view.recent_items,
+            "recent_window_sizes": view.recent_window_sizes,
+        })
+        pool._record_cache = dict(view.record_caches)
+        pool._indices = dict(view.indices)
+        pool._shared_view = view
+        return pool
+    
     def validate_reference(self, ref_type: str, reference: str) -> bool:
         """Check if a reference exists in the pool."""
         with self._lock:
@@ -252,13 +378,115 @@ class ReferencePool:
         with self._lock:
             return dict(self._stats)
     
+    def _writable_index(self, index_key: str) -> Dict[str, str]:
+        """Get a field index for writing, copying indices attached from a shared pool."""
+        index = self._indices.get(index_key)
+        if index is None:
+            index = self._indices[index_key] = {}
+        elif not isinstance(index, dict):
+            index = self._indices[index_key] = dict(index)
+        return index
+    
     def add_field_index(self, ref_type: str, field_path: str, record_id: str, field_value: str) -> None:
         """Add field index for fast lookups by field value."""
         with self._lock:
-            index_key = f"{ref_type}.{field_path}"
-            if index_key not in self._indices:
-                self._indices[index_key] = {}
-            self._indices[index_key][str(field_value)] = record_id
+            self._writable_index(f"{ref_type}.{field_path}")[str(field_value)] = record_id
+    
+    def bulk_load(
+        self,
+        ref_type: str,
+        records: Sequence[Dict[str, Any]],
+        id_path: str,
+        index_paths: Iterable[str] = ()
+    ) -> int:
+        """Add loaded records as references in a single pass.
+        
+        IDs are extracted, records cached for lookups by ID and field
+        indices built for the given paths while traversing the records
+        once. Records without an ID are skipped. Columnar records are
+        loaded column by column without materializing records.
+        
+        Args:
+            ref_type: Type of references
+            records: Records, or ColumnarRecords
+            id_path: Dot-notation path of the record ID
+            index_paths: Field paths to index for find_by_field_value()
+            
+        Returns:
+            Number of indexed field values
+        """
+        index_paths = list(dict.fromkeys(index_paths))
+        if isinstance(records, ColumnarRecords):
+            if id_path not in records.columns:
+                return 0
+            return self._bulk_load_columns(ref_type, records, id_path, index_paths)
+        
+        get_id = compile_path_getter(id_path)
+        getters = [(compile_path_getter(path), {}) for path in index_paths]
+        ids: List[str] = []
+        cache: Dict[str, Any] = {}
+        for record in records:
+            record_id = get_id(record)
+            if not record_id:
+                continue
+            record_id = str(record_id)
+            ids.append(record_id)
+            cache[record_id] = record
+            for get_value, index in getters:
+                field_value = get_value(record)
+                if field_value is not None:
+                    index[str(field_value)] = record_id
+        
+        indices = {path: index for path, (_, index) in zip(index_paths, getters)}
+        return self._merge_bulk_load(ref_type, ids, cache, indices)
+    
+    def _bulk_load_columns(
+        self,
+        ref_type: str,
+        records: ColumnarRecords,
+        id_path: str,
+        index_paths: List[str]
+    ) -> int:
+        """Bulk load columnar records from their ID and indexed columns."""
+        # One entry per row, None for records without an ID
+        row_ids = records.column_strings(id_path)
+        ids = row_ids if None not in row_ids else [rid for rid in row_ids if rid is not None]
+        indices = {}
+        for path in index_paths:
+            if path in records.columns:
+                indices[path] = {
+                    str(field_value): record_id
+                    for record_id, field_value in zip(row_ids, records.column_values(path))
+                    if record_id is not None and field_value is not None
+                }
+        return self._merge_bulk_load(ref_type, ids, ColumnarRecordCache(records, row_ids), indices)
+    
+    def _merge_bulk_load(
+        self,
+        ref_type: str,
+        ids: List[str],
+        cache: Any,
+        indices: Dict[str, Dict[str, str]]
+    ) -> int:
+        """Merge bulk loaded references, cached records and indices."""
+        if not ids:
+            return 0
+        with self._lock:
+            self.add_references(ref_type, ids)
+            existing = self._record_cache.get(ref_type)
+            if not existing:
+                self._record_cache[ref_type] = cache
+            elif isinstance(existing, dict):
+                existing.update(cache)
+            else:
+                self._record_cache[ref_type] = {**existing, **cache}
+            for path, index in indices.items():
+                index_key = f"{ref_type}.{path}"
+                if index_key in self._indices:
+                    self._writable_index(index_key).update(index)
+                else:
+                    self._indices[index_key] = index
+        return sum(len(index) for index in indices.values())
     
     def find_by_field_value(self, ref_type: str, field_path: str, field_value: str) -> Optional[str]:
         """Find reference ID by field value using index."""
@@ -274,7 +502,7 @@ class ReferencePool:
             if ref_type not in self._references or not self._references[ref_type]:
                 return []
             
-            available = self._references[ref_type].copy()
+            available = self._references[ref_type]
             
             # Optionally avoid recent items to ensure variety
             if avoid_recent and ref_type in self._recent_items:
@@ -0,0 +1,51 @@
+"""Seed hierarchy for reproducible generation.
+
+Every unit of work (an entity, a chunk of an entity, a worker) draws from
+its own random stream whose seed is derived from the root seed and the
+unit's path with ``numpy.random.SeedSequence``. A stream's values
+therefore only depend on the root seed and its path, not on how many
+workers run or in which order units are scheduled.
+"""
+import random
+import uuid
+import zlib
+
+import numpy as np
+
+
+def derive_seed(entropy: int, *path: str | int) -> int:
+    """Derive the seed of a unit of work.
+
+    Args:
+        entropy: Root seed
+        *path: Entity names, chunk indices etc. identifying the unit
+
+    Returns:
+        32-bit seed
+    """
+    spawn_key = tuple(
+        zlib.crc32(part.encode("utf-8")) if isinstance(part, str) else part
+        for part in path
+    )
+    seed_sequence = np.random.SeedSequence(entropy, spawn_key=spawn_key)
+    return int(seed_sequence.generate_state(1)[0])
+
+
+def seeded_random(entropy: int | None, *path: str | int) -> random.Random:
+    """Create the random stream of a unit of work.
+
+    Args:
+        entropy: Root seed (None for an unseeded stream)
+        *path: Entity names, chunk indices etc. identifying the unit
+
+    Returns:
+        Random instance
+    """
+    if entropy is None:
+        return random.Random()
+    return random.Random(derive_seed(entropy, *path))
+
+
+def random_uuid(rng: random.Random) -> str:
+    """Generate a version 4 UUID string from a random stream."""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
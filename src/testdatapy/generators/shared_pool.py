@@ -0,0 +1,386 @@
+"""Reference pool data shared read-only between processes.
+
+The references, cached records and field indices of a loaded pool are laid
+out as flat arrays in one buffer: a ``multiprocessing.shared_memory``
+segment or a file that is memory-mapped (put it under /dev/shm to keep it
+in memory). Processes attaching to the buffer read IDs and records through
+read-only views instead of holding their own copies, so master data costs
+memory once per node rather than once per process.
+
+Layout: header, arrays (each 64-byte aligned), pickled manifest describing
+the arrays. Strings are stored as UTF-8 data plus offsets, cached records
+as pickled bytes, and lookups by ID or field value go through sorted 64-bit
+key hashes.
+"""
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import sys
+from collections.abc import Iterator, Mapping, Sequence
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"TDPYSHRD"
+VERSION = 1
+ALIGNMENT = 64
+
+_HEADER = struct.Struct("<8sIQQ")  # magic, version, manifest offset, manifest length
+
+
+def _key_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def is_shared_pool_file(path) -> bool:
+    """Check whether a file holds a shared reference pool."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class StringTable(Sequence):
+    """Read-only sequence of strings stored as UTF-8 data and offsets."""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray, decode=None):
+        self.offsets = offsets
+        self.data = data
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def raw(self, index: int) -> bytes:
+        """Get the stored bytes of an item."""
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string table index out of range")
+        raw = self.raw(index)
+        return self._decode(raw) if self._decode else raw.decode("utf-8")
+
+
+class HashLookup:
+    """Finds the row of a string key through sorted key hashes."""
+
+    def __init__(self, hashes: np.ndarray, rows: np.ndarray, keys: StringTable):
+        self.hashes = hashes
+        self.rows = rows
+        self.keys = keys
+
+    def find(self, key: str) -> Optional[int]:
+        """Get the row of a key, or None if it is not stored."""
+        key_hash = np.uint64(_key_hash(key))
+        position = int(np.searchsorted(self.hashes, key_hash))
+        while position < len(self.hashes) and self.hashes[position] == key_hash:
+            row = int(self.rows[position])
+            if self.keys[row] == key:
+                return row
+            position += 1
+        return None
+
+
+class SharedRecordCache(Mapping):
+    """Read-only record cache mapping IDs to records in a shared buffer."""
+
+    def __init__(self, ids: StringTable, records: StringTable, lookup: HashLookup):
+        self.ids = ids
+        self.records = records
+        self.lookup = lookup
+
+    def __getitem__(self, record_id: str) -> Dict[str, Any]:
+        row = self.lookup.find(str(record_id))
+        if row is None:
+            raise KeyError(record_id)
+        return self.records[row]
+
+    def __contains__(self, record_id: object) -> bool:
+        return isinstance(record_id, str) and self.lookup.find(record_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class SharedFieldIndex(Mapping):
+    """Read-only field index mapping field values to record IDs."""
+
+    def __init__(self, values: StringTable, ids: StringTable, lookup: HashLookup):
+        self.values = values
+        self.ids = ids
+        self.lookup = lookup
+
+    def __getitem__(self, field_value: str) -> str:
+        row = self.lookup.find(str(field_value))
+        if row is None:
+            raise KeyError(field_value)
+        return self.ids[row]
+
+    def __contains__(self, field_value: object) -> bool:
+        return isinstance(field_value, str) and self.lookup.find(field_value) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class _Builder:
+    """Collects the arrays of a shared pool."""
+
+    def __init__(self):
+        self.arrays: List[Tuple[str, np.ndarray]] = []
+
+    def add(self, key: str, array: np.ndarray) -> None:
+        self.arrays.append((key, np.ascontiguousarray(array)))
+
+    def add_strings(self, key: str, items: List[bytes]) -> None:
+        lengths = np.fromiter((len(item) for item in items), dtype=np.uint64, count=len(items))
+        offsets = np.zeros(len(items) + 1, dtype=np.uint64)
+        np.cumsum(lengths, out=offsets[1:])
+        self.add(f"{key}.offsets", offsets)
+        self.add(f"{key}.data", np.frombuffer(b"".join(items), dtype=np.uint8))
+
+    def add_lookup(self, key: str, keys: List[str]) -> None:
+        hashes = np.fromiter((_key_hash(k) for k in keys), dtype=np.uint64, count=len(keys))
+        order = np.argsort(hashes, kind="stable")
+        self.add(f"{key}.hashes", hashes[order])
+        self.add(f"{key}.rows", order.astype(np.int64))
+
+    def layout(self) -> Tuple[Dict[str, Tuple[int, str, int]], int]:
+        """Assign aligned offsets to the arrays.
+
+        Returns:
+            Tuple of the array manifest and the offset after the last array
+        """
+        manifest = {}
+        offset = _HEADER.size
+        for key, array in self.arrays:
+            offset += -offset % ALIGNMENT
+            manifest[key] = (offset, array.dtype.str, len(array))
+            offset += array.nbytes
+        return manifest, offset
+
+
+def _build(pool) -> Tuple[_Builder, Dict[str, Any]]:
+    """Lay out the state of a reference pool as arrays."""
+    builder = _Builder()
+    types: Dict[str, Dict[str, Any]] = {}
+    state = pool.snapshot_state()
+
+    for ref_type, references in state["references"].items():
+        builder.add_strings(f"{ref_type}.references", [str(r).encode("utf-8") for r in references])
+        types[ref_type] = {"records": False}
+
+    for ref_type, cache in state["record_cache"].items():
+        cache_ids = [str(record_id) for record_id in cache]
+        builder.add_strings(f"{ref_type}.cache.ids", [i.encode("utf-8") for i in cache_ids])
+        builder.add_strings(
+            f"{ref_type}.cache.records",
+            [pickle.dumps(cache[record_id], protocol=5) for record_id in cache],
+        )
+        builder.add_lookup(f"{ref_type}.cache", cache_ids)
+        types.setdefault(ref_type, {})["records"] = True
+
+    indices = []
+    for index_key, index in state["indices"].items():
+        values = [str(value) for value in index]
+        builder.add_strings(f"{index_key}.index.values", [v.encode("utf-8") for v in values])
+        builder.add_strings(f"{index_key}.index.ids", [str(index[v]).encode("utf-8") for v in index])
+        builder.add_lookup(f"{index_key}.index", values)
+        indices.append(index_key)
+
+    manifest = {
+        "types": types,
+        "indices": indices,
+        "recent_items": state["recent_items"],
+        "recent_window_sizes": state["recent_window_sizes"],
+    }
+    return builder, manifest
+
+
+def _serialize(builder: _Builder, manifest: Dict[str, Any]) -> Tuple[Dict[str, Any], int, bytes]:
+    """Lay out the arrays and pickle the manifest.
+
+    Returns:
+        Tuple of array manifest, manifest offset and pickled manifest
+    """
+    arrays, end = builder.layout()
+    return arrays, end, pickle.dumps(dict(manifest, arrays=arrays), protocol=5)
+
+
+def _write(builder: _Builder, arrays: Dict[str, Any], end: int, payload: bytes, write_at) -> None:
+    """Write header, arrays and manifest through write_at(offset, bytes)."""
+    for key, array in builder.arrays:
+        write_at(arrays[key][0], array.tobytes())
+    write_at(end, payload)
+    write_at(0, _HEADER.pack(MAGIC, VERSION, end, len(payload)))
+
+
+# Shared memory names published by this process (and inherited by forked
+# workers), whose resource tracker registration belongs to the publisher
+_published_names: set = set()
+
+
+class SharedPoolSegment:
+    """A published shared pool, owned by the process that created it."""
+
+    def __init__(self, size: int, path: Optional[Path] = None, shm=None):
+        self.size = size
+        self.path = path
+        self._shm = shm
+
+    @property
+    def name(self) -> Optional[str]:
+        """Shared memory name, or None for a file."""
+        return self._shm.name if self._shm is not None else None
+
+    def close(self) -> None:
+        """Release this process' mapping of the segment."""
+        if self._shm is not None:
+            self._shm.close()
+
+    def unlink(self) -> None:
+        """Remove the segment once no process needs it any more."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            _published_names.discard(self._shm.name)
+        elif self.path is not None and self.path.exists():
+            self.path.unlink()
+
+    def __enter__(self) -> "SharedPoolSegment":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.unlink()
+
+
+def publish_shared_pool(pool, path=None, name: Optional[str] = None) -> SharedPoolSegment:
+    """Publish the state of a reference pool for other processes.
+
+    Args:
+        pool: Loaded ReferencePool
+        path: File to write (memory-mapped by attaching processes)
+        name: Shared memory name, used when no path is given (None for a
+            generated name)
+
+    Returns:
+        SharedPoolSegment identifying the published pool
+    """
+    builder, manifest = _build(pool)
+    arrays, end, payload = _serialize(builder, manifest)
+    size = end + len(payload)
+
+    if path is not None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            def write_file(offset: int, data: bytes) -> None:
+                f.seek(offset)
+                f.write(data)
+            _write(builder, arrays, end, payload, write_file)
+        return SharedPoolSegment(size, path=path)
+
+    shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+    def write_memory(offset: int, data: bytes) -> None:
+        shm.buf[offset:offset + len(data)] = data
+
+    _write(builder, arrays, end, payload, write_memory)
+    _published_names.add(shm.name)
+    return SharedPoolSegment(size, shm=shm)
+
+
+class SharedPoolView:
+    """Read-only views of a published shared pool."""
+
+    def __init__(self, buffer, keepalive: Any):
+        self._buffer = buffer
+        self._keepalive = keepalive
+        magic, version, manifest_offset, manifest_length = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("Buffer does not hold a shared reference pool")
+        if version != VERSION:
+            raise ValueError(f"Unsupported shared pool version {version}")
+        manifest = pickle.loads(bytes(buffer[manifest_offset:manifest_offset + manifest_length]))
+        self._arrays = manifest["arrays"]
+        self.recent_items = manifest["recent_items"]
+        self.recent_window_sizes = manifest["recent_window_sizes"]
+
+        self.references: Dict[str, StringTable] = {}
+        self.record_caches: Dict[str, SharedRecordCache] = {}
+        for ref_type, info in manifest["types"].items():
+            if f"{ref_type}.references.offsets" in self._arrays:
+                self.references[ref_type] = self._strings(f"{ref_type}.references")
+            if info.get("records"):
+                ids = self._strings(f"{ref_type}.cache.ids")
+                self.record_caches[ref_type] = SharedRecordCache(
+                    ids,
+                    self._strings(f"{ref_type}.cache.records", decode=pickle.loads),
+                    self._lookup(f"{ref_type}.cache", ids),
+                )
+        self.indices: Dict[str, SharedFieldIndex] = {}
+        for index_key in manifest["indices"]:
+            values = self._strings(f"{index_key}.index.values")
+            self.indices[index_key] = SharedFieldIndex(
+                values, self._strings(f"{index_key}.index.ids"),
+                self._lookup(f"{index_key}.index", values),
+            )
+
+    def _array(self, key: str) -> np.ndarray:
+        offset, dtype, length = self._arrays[key]
+        array = np.frombuffer(self._buffer, dtype=np.dtype(dtype), count=length, offset=offset)
+        array.flags.writeable = False
+        return array
+
+    def _strings(self, key: str, decode=None) -> StringTable:
+        return StringTable(self._array(f"{key}.offsets"), self._array(f"{key}.data"), decode)
+
+    def _lookup(self, key: str, keys: StringTable) -> HashLookup:
+        return HashLookup(self._array(f"{key}.hashes"), self._array(f"{key}.rows"), keys)
+
+    @classmethod
+    def attach(cls, path=None, name: Optional[str] = None) -> "SharedPoolView":
+        """Attach to a shared pool published as a file or shared memory.
+
+        Args:
+            path: File written by publish_shared_pool()
+            name: Shared memory name, used when no path is given
+
+        Returns:
+            SharedPoolView over the published data
+        """
+        if path is not None:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(memoryview(mapped), mapped)
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            if shm.name not in _published_names:
+                # Older versions register attached segments with the resource
+                # tracker, which would unlink them when this process exits
+                resource_tracker.unregister(shm._name, "shared_memory")
+        try:
+            # Map the segment separately: SharedMemory cannot be closed while
+            # arrays export its buffer, and those may outlive the view
+            if os.name == "nt":
+                mapped = mmap.mmap(-1, shm.size, tagname=shm.name, access=mmap.ACCESS_READ)
+            else:
+                mapped = mmap.mmap(shm._fd, shm.size, access=mmap.ACCESS_READ)
+        finally:
+            shm.close()
+        return cls(memoryview(mapped), mapped)
@@ -1,6 +1,8 @@
 """Metrics collection and reporting for TestDataPy."""
+import threading
 import time
 from dataclasses import dataclass, field
+from typing import Any
 
 from prometheus_client import (
     CollectorRegistry,
@@ -11,10 +13,36 @@ from prometheus_client import (
     start_http_server,
 )
 
+from testdatapy.metrics.latency import REPORT_QUANTILES
+from testdatapy.metrics.librdkafka_stats import summarize_stats
+
+
+class _BoundMetrics:
+    """Label children of the per-message metrics for one label combination."""
+
+    __slots__ = ("messages", "bytes", "duration", "rate")
+
+    def __init__(self, messages, bytes, duration, rate):
+        self.messages = messages
+        self.bytes = bytes
+        self.duration = duration
+        self.rate = rate
+
 
 @dataclass
 class MetricsCollector:
-    """Collects and exposes metrics for monitoring."""
+    """Collects and exposes metrics for monitoring.
+
+    Per-message updates are kept cheap: label children are bound once per
+    label combination, counter increments are buffered per thread and flushed
+    every ``flush_every`` messages or ``flush_interval`` seconds, and only one
+    in ``histogram_sample_rate`` durations is observed.
+    """
+
+    # Hot-path batching
+    flush_every: int = 1000
+    flush_interval: float = 0.1
+    histogram_sample_rate: int = 16
 
     # Registry for metrics
     registry: CollectorRegistry = field(default_factory=CollectorRegistry, init=False)
@@ -26,12 +54,23 @@ class MetricsCollector:
     produce_duration: Histogram = field(init=False)
     generation_rate: Gauge = field(init=False)
     producer_queue_size: Gauge = field(init=False)
+    partition_messages: Gauge = field(init=False)
+    partition_bytes: Gauge = field(init=False)
+    client_queue_messages: Gauge = field(init=False)
+    client_tx_bytes: Gauge = field(init=False)
+    batch_size_avg: Gauge = field(init=False)
+    broker_rtt_p99: Gauge = field(init=False)
+    broker_throttle_avg: Gauge = field(init=False)
+    broker_tx_retries: Gauge = field(init=False)
+    delivery_latency: Gauge = field(init=False)
     
     # Internal metrics
     _start_time: float = field(default_factory=time.time, init=False)
     _message_count: int = field(default=0, init=False)
     _error_count: int = field(default=0, init=False)
     _total_bytes: int = field(default=0, init=False)
+    _bound: dict = field(default_factory=dict, init=False)
+    _local: threading.local = field(default_factory=threading.local, init=False)
 
     def __post_init__(self):
         """Initialize Prometheus metrics."""
@@ -81,6 +120,70 @@ class MetricsCollector:
             registry=self.registry
         )
         
+        # Per-partition distribution, set from delivery-report histograms
+        self.partition_messages = Gauge(
+            'testdatapy_partition_messages',
+            'Messages delivered per partition',
+            ['topic', 'partition'],
+            registry=self.registry
+        )
+        
+        self.partition_bytes = Gauge(
+            'testdatapy_partition_bytes',
+            'Bytes delivered per partition',
+            ['topic', 'partition'],
+            registry=self.registry
+        )
+        
+        # librdkafka statistics
+        self.client_queue_messages = Gauge(
+            'testdatapy_librdkafka_queue_messages',
+            'Messages waiting in the librdkafka producer queue',
+            registry=self.registry
+        )
+        
+        self.client_tx_bytes = Gauge(
+            'testdatapy_librdkafka_tx_bytes',
+            'Bytes sent to brokers by the librdkafka producer',
+            registry=self.registry
+        )
+        
+        self.batch_size_avg = Gauge(
+            'testdatapy_librdkafka_batch_size_avg_bytes',
+            'Average produce batch size',
+            ['topic'],
+            registry=self.registry
+        )
+        
+        self.broker_rtt_p99 = Gauge(
+            'testdatapy_librdkafka_broker_rtt_p99_seconds',
+            'Broker request round-trip time, 99th percentile',
+            ['broker'],
+            registry=self.registry
+        )
+        
+        self.broker_throttle_avg = Gauge(
+            'testdatapy_librdkafka_broker_throttle_avg_seconds',
+            'Average broker throttle time',
+            ['broker'],
+            registry=self.registry
+        )
+        
+        self.broker_tx_retries = Gauge(
+            'testdatapy_librdkafka_broker_tx_retries',
+            'Requests retried by the producer',
+            ['broker'],
+            registry=self.registry
+        )
+        
+        # Enqueue-to-ack latency quantiles from delivery reports
+        self.delivery_latency = Gauge(
+            'testdatapy_delivery_latency_seconds',
+            'Latency from produce() to broker acknowledgement',
+            ['topic', 'quantile'],
+            registry=self.registry
+        )
+        
         # Summary for overall performance
         self.performance_summary = Summary(
             'testdatapy_performance',
@@ -107,6 +210,9 @@ class MetricsCollector:
     ):
         """Record successful message production.
         
+        Counter increments are buffered and the duration is sampled; call
+        flush() to publish buffered increments immediately.
+        
         Args:
             topic: Kafka topic
             format: Message format (json/avro)
@@ -114,30 +220,76 @@ class MetricsCollector:
             size_bytes: Message size in bytes
             duration: Production duration in seconds
         """
-        self.messages_produced.labels(
-            topic=topic,
-            format=format,
-            generator=generator
-        ).inc()
+        key = (topic, format, generator)
+        local = self._local
+        pending = getattr(local, "pending", None)
+        if pending is None:
+            pending = self._init_local()
         
-        self.bytes_produced.labels(
-            topic=topic,
-            format=format
-        ).inc(size_bytes)
+        counts = pending.get(key)
+        if counts is None:
+            if key not in self._bound:
+                self._bind(key)
+            pending[key] = [1, size_bytes]
+        else:
+            counts[0] += 1
+            counts[1] += size_bytes
         
-        self.produce_duration.labels(
-            topic=topic,
-            format=format
-        ).observe(duration)
+        if local.seen % self.histogram_sample_rate == 0:
+            self._bound[key].duration.observe(duration)
+        local.seen += 1
         
         self._message_count += 1
         self._total_bytes += size_bytes
         
-        # Update generation rate
+        local.buffered += 1
+        if (
+            local.buffered >= self.flush_every
+            or time.monotonic() - local.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Publish the calling thread's buffered counter increments."""
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            return
+        
         elapsed = time.time() - self._start_time
-        if elapsed > 0:
-            rate = self._message_count / elapsed
-            self.generation_rate.labels(generator=generator).set(rate)
+        rate = self._message_count / elapsed if elapsed > 0 else 0
+        
+        for key, (count, size_bytes) in pending.items():
+            bound = self._bound[key]
+            bound.messages.inc(count)
+            bound.bytes.inc(size_bytes)
+            # Update generation rate
+            if elapsed > 0:
+                bound.rate.set(rate)
+        pending.clear()
+        
+        self._local.buffered = 0
+        self._local.last_flush = time.monotonic()
+
+    def _init_local(self) -> dict:
+        """Create the calling thread's buffer."""
+        local = self._local
+        local.pending = {}
+        local.seen = 0
+        local.buffered = 0
+        local.last_flush = time.monotonic()
+        return local.pending
+
+    def _bind(self, key: tuple[str, str, str]) -> None:
+        """Bind the label children for a (topic, format, generator) combination."""
+        topic, format, generator = key
+        self._bound[key] = _BoundMetrics(
+            messages=self.messages_produced.labels(
+                topic=topic, format=format, generator=generator
+            ),
+            bytes=self.bytes_produced.labels(topic=topic, format=format),
+            duration=self.produce_duration.labels(topic=topic, format=format),
+            rate=self.generation_rate.labels(generator=generator),
+        )
 
     def record_message_failed(
         self,
@@ -169,12 +321,63 @@ class MetricsCollector:
         """
         self.producer_queue_size.labels(topic=topic).set(size)
 
+    def update_partition_stats(self, partition_stats) -> None:
+        """Export a per-partition message/byte histogram.
+        
+        Args:
+            partition_stats: PartitionStats collected from delivery reports
+        """
+        for topic in partition_stats.topics:
+            for partition, counts in partition_stats.histogram(topic).items():
+                self.partition_messages.labels(
+                    topic=topic, partition=str(partition)
+                ).set(counts["messages"])
+                self.partition_bytes.labels(
+                    topic=topic, partition=str(partition)
+                ).set(counts["bytes"])
+
+    def record_librdkafka_stats(self, stats: dict[str, Any]) -> None:
+        """Export a librdkafka statistics report.
+        
+        Args:
+            stats: Parsed librdkafka statistics report
+        """
+        summary = summarize_stats(stats)
+        
+        self.client_queue_messages.set(summary["queue_messages"])
+        self.client_tx_bytes.set(summary["tx_bytes"])
+        
+        for topic, depth in summary["topic_queue"].items():
+            self.update_queue_size(topic=topic, size=depth)
+        for topic, avg in summary["topic_batch_size_avg"].items():
+            self.batch_size_avg.labels(topic=topic).set(avg)
+        
+        for broker, rtt_ms in summary["broker_rtt_p99_ms"].items():
+            self.broker_rtt_p99.labels(broker=broker).set(rtt_ms / 1000)
+        for broker, throttle_ms in summary["broker_throttle_avg_ms"].items():
+            self.broker_throttle_avg.labels(broker=broker).set(throttle_ms / 1000)
+        for broker, retries in summary["broker_tx_retries"].items():
+            self.broker_tx_retries.labels(broker=broker).set(retries)
+
+    def update_delivery_latency(self, latency_tracker) -> None:
+        """Export per-topic delivery latency quantiles.
+        
+        Args:
+            latency_tracker: LatencyTracker collected from delivery reports
+        """
+        for topic, histogram in latency_tracker.histograms.items():
+            for quantile in REPORT_QUANTILES:
+                self.delivery_latency.labels(
+                    topic=topic, quantile=str(quantile)
+                ).set(histogram.percentile(quantile))
+
     def get_stats(self) -> dict[str, any]:
         """Get current statistics.
         
         Returns:
             Dictionary with current stats
         """
+        self.flush()
         elapsed = time.time() - self._start_time
         rate = self._message_count / elapsed if elapsed > 0 else 0
         
@@ -193,6 +396,7 @@ class MetricsCollector:
 
     def reset(self):
         """Reset internal counters."""
+        self.flush()
         self._start_time = time.time()
         self._message_count = 0
         self._error_count = 0
@@ -214,6 +418,10 @@ class DummyMetricsCollector(MetricsCollector):
         """No-op."""
         pass
     
+    def flush(self):
+        """No-op."""
+        pass
+    
     def record_message_failed(self, *args, **kwargs):
         """No-op."""
         pass
@@ -221,6 +429,18 @@ class DummyMetricsCollector(MetricsCollector):
     def update_queue_size(self, *args, **kwargs):
         """No-op."""
         pass
+    
+    def update_partition_stats(self, *args, **kwargs):
+        """No-op."""
+        pass
+    
+    def record_librdkafka_stats(self, *args, **kwargs):
+        """No-op."""
+        pass
+    
+    def update_delivery_latency(self, *args, **kwargs):
+        """No-op."""
+        pass
 
 
 def create_metrics_collector(enabled: bool = True) -> MetricsCollector:
@@ -0,0 +1,195 @@
+"""Delivery latency tracking with HDR-style histograms."""
+from collections.abc import Callable
+
+# Values are bucketed in microseconds with 2^(SUB_BUCKET_BITS - 1) sub-buckets
+# per power of two, like HdrHistogram with two significant digits: the relative
+# error stays below 1/64 at constant memory per order of magnitude.
+SUB_BUCKET_BITS = 7
+_SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+_SUB_BUCKET_HALF = _SUB_BUCKET_COUNT >> 1
+
+REPORT_QUANTILES = (0.5, 0.99, 0.999)
+
+
+def _bucket_index(value: int) -> int:
+    """Map a non-negative integer to its bucket index."""
+    if value < _SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return _SUB_BUCKET_COUNT + (shift - 1) * _SUB_BUCKET_HALF + (value >> shift) - _SUB_BUCKET_HALF
+
+
+def _bucket_value(index: int) -> int:
+    """Get the highest value that maps to a bucket index."""
+    if index < _SUB_BUCKET_COUNT:
+        return index
+    shift = (index - _SUB_BUCKET_COUNT) // _SUB_BUCKET_HALF + 1
+    sub_bucket = (index - _SUB_BUCKET_COUNT) % _SUB_BUCKET_HALF + _SUB_BUCKET_HALF
+    return ((sub_bucket + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram with bounded relative error."""
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds: float) -> None:
+        """Record a latency.
+
+        Args:
+            seconds: Latency in seconds
+        """
+        index = _bucket_index(int(seconds * 1_000_000))
+        counts = self._counts
+        counts[index] = counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the recordings of another histogram.
+
+        Args:
+            other: Histogram to merge into this one
+        """
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, quantile: float) -> float:
+        """Get the latency at a quantile.
+
+        Args:
+            quantile: Quantile between 0 and 1 (e.g. 0.99)
+
+        Returns:
+            Latency in seconds (0.0 if nothing was recorded)
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, int(quantile * self.count + 0.5))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(_bucket_value(index) / 1_000_000, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        """Summarize the histogram.
+
+        Returns:
+            Count, min, mean, max and the report quantiles (p50, p99, p999) in seconds
+        """
+        summary = {
+            "count": self.count,
+            "min": self.min or 0.0,
+            "mean": self.mean,
+            "max": self.max or 0.0,
+        }
+        for quantile in REPORT_QUANTILES:
+            summary[_quantile_name(quantile)] = self.percentile(quantile)
+        return summary
+
+
+def _quantile_name(quantile: float) -> str:
+    """Name a quantile like p50, p99 or p999."""
+    return "p" + f"{quantile * 100:g}".replace(".", "")
+
+
+class LatencyTracker:
+    """Per-topic enqueue-to-ack latency from delivery reports.
+
+    librdkafka stamps every message when ``produce()`` enqueues it and
+    reports the time until the broker acknowledged it as ``Message.latency()``,
+    so no per-message headers or opaque objects are needed.
+    """
+
+    def __init__(self):
+        """Initialize an empty tracker."""
+        self.histograms: dict[str, LatencyHistogram] = {}
+
+    def record(self, topic: str, seconds: float) -> None:
+        """Record a delivery latency.
+
+        Args:
+            topic: Topic the message was written to
+            seconds: Enqueue-to-ack latency in seconds
+        """
+        histogram = self.histograms.get(topic)
+        if histogram is None:
+            histogram = self.histograms[topic] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def on_delivery(self, err, msg) -> None:
+        """Delivery callback that records the latency of delivered messages.
+
+        Args:
+            err: Error if delivery failed
+            msg: Message that was delivered
+        """
+        if err is None:
+            latency = msg.latency()
+            if latency is not None:
+                self.record(msg.topic(), latency)
+
+    def delivery_callback(self, chained: Callable | None = None) -> Callable:
+        """Build a delivery callback that records latency and calls another callback.
+
+        Args:
+            chained: Optional callback to call after recording
+
+        Returns:
+            Delivery callback
+        """
+        if chained is None:
+            return self.on_delivery
+
+        def callback(err, msg):
+            self.on_delivery(err, msg)
+            chained(err, msg)
+
+        return callback
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Summarize latencies per topic.
+
+        Returns:
+            Mapping of topic to histogram summary
+        """
+        return {topic: h.summary() for topic, h in self.histograms.items()}
+
+    def format_report(self) -> list[str]:
+        """Format per-topic latencies for the run summary.
+
+        Returns:
+            Report lines
+        """
+        lines = []
+        for topic, s in self.summary().items():
+            lines.append(
+                f"Delivery latency {topic}: "
+                f"p50 {s['p50'] * 1000:.1f} ms, p99 {s['p99'] * 1000:.1f} ms, "
+                f"p999 {s['p999'] * 1000:.1f} ms, max {s['max'] * 1000:.1f} ms "
+                f"({s['count']:,} messages)"
+            )
+        return lines
@@ -0,0 +1,148 @@
+"""librdkafka statistics collection for producers."""
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+DEFAULT_STATISTICS_INTERVAL_MS = 1000
+
+
+class LibrdkafkaStats:
+    """Keeps the latest statistics report emitted by a librdkafka producer.
+
+    An instance is passed as ``stats_cb``; librdkafka calls it from
+    ``poll()``/``flush()`` every ``statistics.interval.ms``.
+    """
+
+    def __init__(self, on_update: Callable[[dict[str, Any]], None] | None = None):
+        """Initialize empty statistics.
+
+        Args:
+            on_update: Called with each parsed producer report (e.g. to export metrics)
+        """
+        self.latest: dict[str, Any] = {}
+        self.updates = 0
+        self.on_update = on_update
+
+    def __call__(self, stats_json: str) -> None:
+        """Handle a statistics report.
+
+        Args:
+            stats_json: Statistics JSON string emitted by librdkafka
+        """
+        stats = json.loads(stats_json)
+        # Admin clients sharing the configuration report their own stats
+        if stats.get("type", "producer") != "producer":
+            return
+        self.latest = stats
+        self.updates += 1
+        if self.on_update is not None:
+            self.on_update(stats)
+
+    def configure(
+        self, config: dict[str, Any], interval_ms: int = DEFAULT_STATISTICS_INTERVAL_MS
+    ) -> dict[str, Any]:
+        """Enable statistics reporting to this instance in a producer configuration.
+
+        Args:
+            config: librdkafka configuration
+            interval_ms: Statistics interval, unless already set in ``config``
+
+        Returns:
+            New configuration dictionary
+        """
+        configured = dict(config)
+        configured.setdefault("statistics.interval.ms", interval_ms)
+        configured["stats_cb"] = self
+        return configured
+
+    def wait_for_update(self, poll: Callable[[float], Any], timeout: float = 2.0) -> bool:
+        """Poll until a new statistics report arrives.
+
+        Args:
+            poll: Producer poll function
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if a new report arrived within the timeout
+        """
+        before = self.updates
+        deadline = time.monotonic() + timeout
+        while self.updates == before and time.monotonic() < deadline:
+            poll(0.1)
+        return self.updates != before
+
+    @property
+    def tx_bytes(self) -> int:
+        """Bytes sent to brokers, including protocol overhead (bytes on the wire)."""
+        return self.latest.get("tx_bytes", 0)
+
+    @property
+    def txmsg_bytes(self) -> int:
+        """Uncompressed message bytes transmitted to brokers."""
+        return self.latest.get("txmsg_bytes", 0)
+
+    @property
+    def txmsgs(self) -> int:
+        """Messages transmitted to brokers."""
+        return self.latest.get("txmsgs", 0)
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """Ratio of message bytes to bytes on the wire, or None without data."""
+        if not self.tx_bytes or not self.txmsg_bytes:
+            return None
+        return self.txmsg_bytes / self.tx_bytes
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize the latest report.
+
+        Returns:
+            Key producer and broker figures, see summarize_stats()
+        """
+        return summarize_stats(self.latest)
+
+
+def summarize_stats(stats: dict[str, Any]) -> dict[str, Any]:
+    """Extract the figures that tell generator-bound from broker-bound runs.
+
+    Args:
+        stats: Parsed librdkafka statistics report
+
+    Returns:
+        Dictionary with queue depth (total and per topic), average batch size
+        per topic, RTT p99, throttle time and retries per broker, and bytes sent
+    """
+    topic_queue = {}
+    topic_batch_size_avg = {}
+    for name, topic in stats.get("topics", {}).items():
+        topic_queue[name] = sum(
+            partition.get("msgq_cnt", 0) + partition.get("xmit_msgq_cnt", 0)
+            for partition in topic.get("partitions", {}).values()
+        )
+        topic_batch_size_avg[name] = topic.get("batchsize", {}).get("avg", 0)
+
+    broker_rtt_p99_ms = {}
+    broker_throttle_avg_ms = {}
+    broker_tx_retries = {}
+    for broker in stats.get("brokers", {}).values():
+        # Skip bootstrap placeholders that have no node id yet
+        if broker.get("nodeid", -1) < 0:
+            continue
+        name = broker.get("nodename") or broker.get("name", "")
+        # rtt is reported in microseconds, throttle in milliseconds
+        broker_rtt_p99_ms[name] = broker.get("rtt", {}).get("p99", 0) / 1000
+        broker_throttle_avg_ms[name] = broker.get("throttle", {}).get("avg", 0)
+        broker_tx_retries[name] = broker.get("txretries", 0)
+
+    return {
+        "queue_messages": stats.get("msg_cnt", 0),
+        "queue_bytes": stats.get("msg_size", 0),
+        "topic_queue": topic_queue,
+        "topic_batch_size_avg": topic_batch_size_avg,
+        "broker_rtt_p99_ms": broker_rtt_p99_ms,
+        "broker_throttle_avg_ms": broker_throttle_avg_ms,
+        "broker_tx_retries": broker_tx_retries,
+        "tx_bytes": stats.get("tx_bytes", 0),
+        "txmsg_bytes": stats.get("txmsg_bytes", 0),
+    }
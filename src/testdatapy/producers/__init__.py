@@ -2,11 +2,15 @@
 from testdatapy.producers.avro_producer import AvroProducer
 from testdatapy.producers.base import KafkaProducer
 from testdatapy.producers.json_producer import JsonProducer
+from testdatapy.producers.pool import ProducerPool
 from testdatapy.producers.protobuf_producer import ProtobufProducer
+from testdatapy.producers.replay import ReplayProducer
 
 __all__ = [
     "KafkaProducer",
     "JsonProducer",
     "AvroProducer",
     "ProtobufProducer",
+    "ProducerPool",
+    "ReplayProducer",
 ]
\ No newline at end of file
@@ -13,6 +13,7 @@ from confluent_kafka.serialization import (
 )
 
 from testdatapy.producers.base import KafkaProducer
+from testdatapy.producers.wire_format import FramedAvroSerializer
 
 
 class AvroProducer(KafkaProducer):
@@ -30,6 +31,7 @@ class AvroProducer(KafkaProducer):
         key_field: str | None = None,
         auto_create_topic: bool = True,
         topic_config: dict[str, Any] | None = None,
+        fast_serialization: bool = False,
     ):
         """Initialize the Avro producer.
 
@@ -44,6 +46,8 @@ class AvroProducer(KafkaProducer):
             key_field: Field to use as message key
             auto_create_topic: Whether to auto-create topic if it doesn't exist
             topic_config: Configuration for topic creation
+            fast_serialization: Resolve the schema ID once and frame fastavro-encoded
+                records with a precomputed wire-format header
         """
         super().__init__(bootstrap_servers, topic, config, auto_create_topic, topic_config)
         self.key_field = key_field
@@ -69,6 +73,13 @@ class AvroProducer(KafkaProducer):
             schema_str=self.schema_str,
             schema_registry_client=self._schema_registry_client,
         )
+        self._framed_serializer = None
+        if fast_serialization:
+            self._framed_serializer = FramedAvroSerializer(
+                schema_str=self.schema_str,
+                schema_registry_client=self._schema_registry_client,
+                subject=f"{topic}-value",
+            )
 
         # Set up producer
         producer_config = {"bootstrap.servers": bootstrap_servers}
@@ -98,11 +109,13 @@ class AvroProducer(KafkaProducer):
         # Serialize key
         serialized_key = self._key_serializer(key) if key else None
 
-        # Create serialization context
-        ctx = SerializationContext(self.topic, MessageField.VALUE)
-
         # Serialize value with Avro
-        serialized_value = self._value_serializer(value, ctx)
+        if self._framed_serializer is not None:
+            serialized_value = self._framed_serializer(value)
+        else:
+            ctx = SerializationContext(self.topic, MessageField.VALUE)
+            serialized_value = self._value_serializer(value, ctx)
+        self.last_value_size = len(serialized_value)
 
         # Produce message
         self._producer.produce(
@@ -110,11 +123,50 @@ class AvroProducer(KafkaProducer):
             key=serialized_key,
             value=serialized_value,
             on_delivery=on_delivery or self._default_callback,
+            **self._partition_kwargs(serialized_key, value),
         )
 
         # Poll for callbacks
         self._producer.poll(0)
 
+    def produce_batch(
+        self,
+        values: list[dict[str, Any]],
+        on_delivery: Callable | None = None,
+    ) -> None:
+        """Produce many Avro messages to Kafka.
+
+        With fast serialization enabled the whole batch is encoded in one call.
+
+        Args:
+            values: Message values as dictionaries
+            on_delivery: Callback for delivery reports
+        """
+        if self._framed_serializer is not None:
+            serialized_values = self._framed_serializer.serialize_batch(values)
+        else:
+            ctx = SerializationContext(self.topic, MessageField.VALUE)
+            serialized_values = [self._value_serializer(value, ctx) for value in values]
+
+        callback = on_delivery or self._default_callback
+        for value, serialized_value in zip(values, serialized_values):
+            key = None
+            if self.key_field and self.key_field in value:
+                key = str(value[self.key_field])
+
+            serialized_key = self._key_serializer(key) if key else None
+            self.last_value_size = len(serialized_value)
+            self._producer.produce(
+                topic=self.topic,
+                key=serialized_key,
+                value=serialized_value,
+                on_delivery=callback,
+                **self._partition_kwargs(serialized_key, value),
+            )
+
+        # Poll for callbacks
+        self._producer.poll(0)
+
     def flush(self, timeout: float = 10.0) -> int:
         """Flush any pending messages.
 
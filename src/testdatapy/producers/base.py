@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Callable
 from typing import Any
 
+from testdatapy.producers.partitioning import Partitioner
 from testdatapy.topics import TopicManager
 
 
@@ -30,6 +31,12 @@ class KafkaProducer(ABC):
         self.topic = topic
         self.config = config or {}
         self._producer = None
+
+        # Client-side partitioner (None leaves partitioning to librdkafka)
+        self.partitioner: Partitioner | None = None
+
+        # Size of the last serialized value, for metrics without re-serializing
+        self.last_value_size = 0
         
         # Topic management
         self.auto_create_topic = auto_create_topic
@@ -58,6 +65,32 @@ class KafkaProducer(ABC):
             config=config
         )
 
+    def partition_count(self, timeout: float = 10.0) -> int:
+        """Get the number of partitions of the topic from cluster metadata.
+
+        Args:
+            timeout: Maximum time to wait for metadata
+
+        Returns:
+            Number of partitions
+        """
+        metadata = self._producer.list_topics(self.topic, timeout=timeout)
+        return len(metadata.topics[self.topic].partitions)
+
+    def _partition_kwargs(self, key: bytes | None, value: dict[str, Any]) -> dict[str, int]:
+        """Build the partition argument for a produce call.
+
+        Args:
+            key: Serialized message key
+            value: Message value as dictionary
+
+        Returns:
+            ``{"partition": n}`` when a partitioner is set, otherwise empty
+        """
+        if self.partitioner is None:
+            return {}
+        return {"partition": self.partitioner.partition(key, value)}
+
     @abstractmethod
     def produce(
         self,
@@ -66,6 +66,7 @@ class JsonProducer(KafkaProducer):
 
         # Serialize value to JSON
         serialized_value = json.dumps(value).encode("utf-8")
+        self.last_value_size = len(serialized_value)
 
         # Produce message
         self._producer.produce(
@@ -73,6 +74,7 @@ class JsonProducer(KafkaProducer):
             key=serialized_key,
             value=serialized_value,
             on_delivery=on_delivery or self._default_callback,
+            **self._partition_kwargs(serialized_key, value),
         )
 
         # Poll for callbacks
@@ -0,0 +1,343 @@
+"""Client-side partition assignment and partition-skew tracking."""
+import random
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+_MURMUR2_SEED = 0x9747B28C
+_MURMUR2_M = 0x5BD1E995
+_MASK_32 = 0xFFFFFFFF
+
+
+def murmur2(data: bytes) -> int:
+    """Compute the 32-bit murmur2 hash used by the Java Kafka client.
+
+    Args:
+        data: Bytes to hash
+
+    Returns:
+        Signed 32-bit hash, identical to ``Utils.murmur2`` in Kafka
+    """
+    length = len(data)
+    h = (_MURMUR2_SEED ^ length) & _MASK_32
+    length4 = length // 4
+
+    for i in range(length4):
+        i4 = i * 4
+        k = data[i4] | (data[i4 + 1] << 8) | (data[i4 + 2] << 16) | (data[i4 + 3] << 24)
+        k = (k * _MURMUR2_M) & _MASK_32
+        k ^= k >> 24
+        k = (k * _MURMUR2_M) & _MASK_32
+        h = (h * _MURMUR2_M) & _MASK_32
+        h ^= k
+
+    remaining = length % 4
+    tail = length4 * 4
+    if remaining == 3:
+        h ^= data[tail + 2] << 16
+    if remaining >= 2:
+        h ^= data[tail + 1] << 8
+    if remaining >= 1:
+        h ^= data[tail]
+        h = (h * _MURMUR2_M) & _MASK_32
+
+    h ^= h >> 13
+    h = (h * _MURMUR2_M) & _MASK_32
+    h ^= h >> 15
+
+    return h - (1 << 32) if h & 0x80000000 else h
+
+
+def murmur2_partition(key: bytes, num_partitions: int) -> int:
+    """Map a key to a partition like the Java client's default partitioner.
+
+    Args:
+        key: Serialized message key
+        num_partitions: Number of partitions of the topic
+
+    Returns:
+        Partition number
+    """
+    return (murmur2(key) & 0x7FFFFFFF) % num_partitions
+
+
+class Partitioner(ABC):
+    """Base class for client-side partitioners."""
+
+    def __init__(self, num_partitions: int):
+        """Initialize the partitioner.
+
+        Args:
+            num_partitions: Number of partitions of the target topic
+        """
+        if num_partitions <= 0:
+            raise ValueError("num_partitions must be positive")
+        self.num_partitions = num_partitions
+
+    @abstractmethod
+    def partition(self, key: bytes | None, value: dict[str, Any]) -> int:
+        """Choose a partition for a message.
+
+        Args:
+            key: Serialized message key
+            value: Message value as dictionary
+
+        Returns:
+            Partition number
+        """
+        pass
+
+
+class StickyPartitioner(Partitioner):
+    """Keeps sending to one partition and switches after a batch of messages.
+
+    Mirrors the sticky behaviour Kafka clients use for messages without a key.
+    """
+
+    def __init__(self, num_partitions: int, batch_messages: int = 1000, seed: int | None = None):
+        """Initialize the sticky partitioner.
+
+        Args:
+            num_partitions: Number of partitions of the target topic
+            batch_messages: Messages sent to a partition before switching
+            seed: Random seed for reproducible partition switches
+        """
+        super().__init__(num_partitions)
+        self.batch_messages = max(1, batch_messages)
+        self._random = random.Random(seed)
+        self._current = self._random.randrange(num_partitions)
+        self._remaining = self.batch_messages
+
+    def _next_sticky(self) -> int:
+        """Return the sticky partition, switching when the batch is full."""
+        if self._remaining == 0:
+            if self.num_partitions > 1:
+                # Always move to a different partition, as the Java client does
+                offset = self._random.randrange(1, self.num_partitions)
+                self._current = (self._current + offset) % self.num_partitions
+            self._remaining = self.batch_messages
+        self._remaining -= 1
+        return self._current
+
+    def partition(self, key: bytes | None, value: dict[str, Any]) -> int:
+        """Choose the sticky partition regardless of the key."""
+        return self._next_sticky()
+
+
+class Murmur2Partitioner(StickyPartitioner):
+    """murmur2 partitioning for keyed messages, sticky for null keys."""
+
+    def __init__(self, num_partitions: int, batch_messages: int = 1000, seed: int | None = None):
+        """Initialize the murmur2 partitioner.
+
+        Args:
+            num_partitions: Number of partitions of the target topic
+            batch_messages: Sticky batch size for messages without a key
+            seed: Random seed for reproducible sticky switches
+        """
+        super().__init__(num_partitions, batch_messages, seed)
+        # Hot keys repeat a lot (e.g. Zipf), so cache their partitions
+        self._cache: dict[bytes, int] = {}
+
+    def partition(self, key: bytes | None, value: dict[str, Any]) -> int:
+        """Hash the key with murmur2, falling back to sticky for null keys."""
+        if not key:
+            return self._next_sticky()
+        partition = self._cache.get(key)
+        if partition is None:
+            partition = murmur2_partition(key, self.num_partitions)
+            if len(self._cache) < 100_000:
+                self._cache[key] = partition
+        return partition
+
+
+class FieldPartitioner(Murmur2Partitioner):
+    """Takes an explicit partition from a record field.
+
+    Records without the field fall back to murmur2/sticky partitioning.
+    """
+
+    def __init__(
+        self,
+        num_partitions: int,
+        partition_field: str,
+        batch_messages: int = 1000,
+        seed: int | None = None,
+    ):
+        """Initialize the field partitioner.
+
+        Args:
+            num_partitions: Number of partitions of the target topic
+            partition_field: Record field holding the partition number
+            batch_messages: Sticky batch size for the fallback
+            seed: Random seed for reproducible sticky switches
+        """
+        super().__init__(num_partitions, batch_messages, seed)
+        self.partition_field = partition_field
+
+    def partition(self, key: bytes | None, value: dict[str, Any]) -> int:
+        """Use the record's partition field, modulo the partition count."""
+        explicit = value.get(self.partition_field)
+        if explicit is None:
+            return super().partition(key, value)
+        return int(explicit) % self.num_partitions
+
+
+PARTITIONER_MODES = ("default", "murmur2", "sticky", "field")
+
+
+def create_partitioner(
+    mode: str,
+    num_partitions: int,
+    partition_field: str | None = None,
+    seed: int | None = None,
+) -> Partitioner | None:
+    """Create a client-side partitioner.
+
+    Args:
+        mode: One of PARTITIONER_MODES; "default" leaves partitioning to librdkafka
+        num_partitions: Number of partitions of the target topic
+        partition_field: Record field holding the partition (for "field" mode)
+        seed: Random seed for sticky partition switches
+
+    Returns:
+        Partitioner instance, or None for librdkafka's default partitioning
+    """
+    if mode == "default":
+        return None
+    if mode == "murmur2":
+        return Murmur2Partitioner(num_partitions, seed=seed)
+    if mode == "sticky":
+        return StickyPartitioner(num_partitions, seed=seed)
+    if mode == "field":
+        if not partition_field:
+            raise ValueError("Partitioner mode 'field' requires a partition field")
+        return FieldPartitioner(num_partitions, partition_field, seed=seed)
+    raise ValueError(f"Unknown partitioner mode: {mode}")
+
+
+class PartitionStats:
+    """Per-topic, per-partition message and byte histogram.
+
+    Filled from delivery reports, so it reflects where messages actually
+    landed regardless of who chose the partition.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        # topic -> partition -> [messages, bytes]
+        self._counts: dict[str, dict[int, list[int]]] = {}
+
+    def record(self, topic: str, partition: int, size_bytes: int) -> None:
+        """Record one delivered message.
+
+        Args:
+            topic: Topic the message was written to
+            partition: Partition the message was written to
+            size_bytes: Message value size in bytes
+        """
+        partitions = self._counts.get(topic)
+        if partitions is None:
+            partitions = self._counts[topic] = {}
+        counts = partitions.get(partition)
+        if counts is None:
+            partitions[partition] = [1, size_bytes]
+        else:
+            counts[0] += 1
+            counts[1] += size_bytes
+
+    def on_delivery(self, err, msg) -> None:
+        """Delivery callback that records successfully delivered messages.
+
+        Args:
+            err: Error if delivery failed
+            msg: Message that was delivered
+        """
+        if err is None:
+            value = msg.value()
+            self.record(msg.topic(), msg.partition(), len(value) if value else 0)
+
+    def delivery_callback(self, chained: Callable | None = None) -> Callable:
+        """Build a delivery callback that records stats and calls another callback.
+
+        Args:
+            chained: Optional callback to call after recording
+
+        Returns:
+            Delivery callback
+        """
+        if chained is None:
+            return self.on_delivery
+
+        def callback(err, msg):
+            self.on_delivery(err, msg)
+            chained(err, msg)
+
+        return callback
+
+    @property
+    def topics(self) -> list[str]:
+        """Topics with recorded messages."""
+        return list(self._counts)
+
+    def histogram(self, topic: str) -> dict[int, dict[str, int]]:
+        """Get the per-partition histogram for a topic.
+
+        Args:
+            topic: Topic name
+
+        Returns:
+            Mapping of partition to message and byte counts, sorted by partition
+        """
+        partitions = self._counts.get(topic, {})
+        return {
+            partition: {"messages": counts[0], "bytes": counts[1]}
+            for partition, counts in sorted(partitions.items())
+        }
+
+    def skew(self, topic: str) -> float:
+        """Ratio of the busiest partition's message count to the mean.
+
+        Args:
+            topic: Topic name
+
+        Returns:
+            1.0 for a perfectly even distribution, 0.0 if nothing was recorded
+        """
+        counts = [c[0] for c in self._counts.get(topic, {}).values()]
+        if not counts:
+            return 0.0
+        mean = sum(counts) / len(counts)
+        return max(counts) / mean if mean > 0 else 0.0
+
+    def format_report(self, topic: str, num_partitions: int | None = None) -> list[str]:
+        """Format the histogram of a topic for the run summary.
+
+        Args:
+            topic: Topic name
+            num_partitions: Partition count, so empty partitions are listed too
+
+        Returns:
+            Report lines
+        """
+        histogram = self.histogram(topic)
+        if num_partitions:
+            for partition in range(num_partitions):
+                histogram.setdefault(partition, {"messages": 0, "bytes": 0})
+            histogram = dict(sorted(histogram.items()))
+
+        total = sum(h["messages"] for h in histogram.values())
+        lines = [f"Partition distribution for {topic}:"]
+        for partition, h in histogram.items():
+            share = h["messages"] / total if total else 0
+            bar = "#" * round(share * 40)
+            lines.append(
+                f"  [{partition:>3}] {h['messages']:>10,} msgs {h['bytes']:>14,} bytes "
+                f"{share:6.1%} {bar}"
+            )
+        # Skew over all partitions, including empty ones
+        counts = [h["messages"] for h in histogram.values()]
+        mean = total / len(counts) if counts else 0
+        skew = max(counts) / mean if mean else 0.0
+        lines.append(f"  Skew (max/mean): {skew:.2f}")
+        return lines
@@ -0,0 +1,353 @@
+"""Shared multi-topic producer pool."""
+import json
+from collections.abc import Callable
+from typing import Any
+
+from confluent_kafka import Producer as ConfluentProducer
+from confluent_kafka.schema_registry import SchemaRegistryClient
+from confluent_kafka.schema_registry.protobuf import ProtobufSerializer
+from confluent_kafka.serialization import (
+    MessageField,
+    SerializationContext,
+    StringSerializer,
+)
+
+from testdatapy.metrics.latency import LatencyTracker
+from testdatapy.producers.partitioning import (
+    PartitionStats,
+    Partitioner,
+    create_partitioner,
+)
+from testdatapy.producers.protobuf_producer import dict_to_protobuf
+from testdatapy.producers.wire_format import FramedProtobufSerializer
+from testdatapy.topics import TopicManager
+
+
+class _TopicRoute:
+    """Per-topic serializer and key extraction settings."""
+
+    __slots__ = ("serialize", "key_field", "format", "partitioner")
+
+    def __init__(self, serialize: Callable[[dict[str, Any]], bytes], key_field: str | None, format: str):
+        self.serialize = serialize
+        self.key_field = key_field
+        self.format = format
+        self.partitioner: Partitioner | None = None
+
+
+class ProducerPool:
+    """Produces to many topics through a single librdkafka client.
+
+    Each topic gets its own value serializer, but all topics share one
+    producer (connections, threads and queues), one Schema Registry client
+    and one AdminClient for topic checks.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers: str,
+        config: dict[str, Any] | None = None,
+        schema_registry_url: str | None = None,
+        schema_registry_config: dict[str, Any] | None = None,
+        topic_config: dict[str, Any] | None = None,
+        fast_serialization: bool = False,
+        partitioner: str = "default",
+        partition_field: str | None = None,
+        partition_stats: PartitionStats | None = None,
+        latency_tracker: LatencyTracker | None = None,
+    ):
+        """Initialize the producer pool.
+
+        Args:
+            bootstrap_servers: Kafka bootstrap servers
+            config: Additional producer configuration
+            schema_registry_url: Schema Registry URL (required for protobuf topics)
+            schema_registry_config: Schema Registry configuration
+            topic_config: Configuration for topic creation (partitions, replication_factor, etc.)
+            fast_serialization: Frame protobuf messages with a precomputed wire-format header
+            partitioner: Client-side partitioner mode applied to every registered topic
+            partition_field: Record field holding the partition (for "field" mode)
+            partition_stats: Collects the per-partition distribution from delivery reports
+            latency_tracker: Collects enqueue-to-ack latency from delivery reports
+        """
+        self.bootstrap_servers = bootstrap_servers
+        self.config = config or {}
+        self.schema_registry_url = schema_registry_url
+        self.schema_registry_config = schema_registry_config or {}
+        self.topic_config = topic_config or {}
+        self.fast_serialization = fast_serialization
+        self.partitioner = partitioner
+        self.partition_field = partition_field
+        self.partition_stats = partition_stats
+        self.latency_tracker = latency_tracker
+
+        self._routes: dict[str, _TopicRoute] = {}
+        self._schema_registry: SchemaRegistryClient | None = None
+        self._key_serializer = StringSerializer("utf-8")
+        self._delivery_callback = self._default_callback
+        if partition_stats is not None:
+            self._delivery_callback = partition_stats.delivery_callback(self._delivery_callback)
+        if latency_tracker is not None:
+            self._delivery_callback = latency_tracker.delivery_callback(self._delivery_callback)
+
+        producer_config = {"bootstrap.servers": bootstrap_servers}
+        producer_config.update(self.config)
+        self._producer = ConfluentProducer(producer_config)
+
+    def delivery_callback(self, chained: Callable | None = None) -> Callable:
+        """Build a delivery callback that keeps the pool's accounting.
+
+        Partition statistics, latency tracking and failure reporting see
+        the report first, so callers passing their own on_delivery to
+        produce() can still chain them.
+
+        Args:
+            chained: Optional callback to call after the pool's callback
+
+        Returns:
+            Delivery callback
+        """
+        pool_callback = self._delivery_callback
+        if chained is None:
+            return pool_callback
+
+        def callback(err, msg):
+            pool_callback(err, msg)
+            chained(err, msg)
+
+        return callback
+
+    @property
+    def topics(self) -> list[str]:
+        """Topics registered with the pool."""
+        return list(self._routes)
+
+    def has_topic(self, topic: str) -> bool:
+        """Check whether a topic has a serializer registered.
+
+        Args:
+            topic: Topic name
+
+        Returns:
+            True if the topic is registered
+        """
+        return topic in self._routes
+
+    def ensure_topics(self, topics: list[str]) -> list[str]:
+        """Ensure all topics exist using a single batched admin call.
+
+        Args:
+            topics: Topic names
+
+        Returns:
+            Names of the topics that were created
+        """
+        if not topics:
+            return []
+
+        topic_manager = TopicManager(bootstrap_servers=self.bootstrap_servers, config=self.config)
+        num_partitions = self.topic_config.get("num_partitions", 1)
+        replication_factor = self.topic_config.get("replication_factor", 1)
+        config = {k: v for k, v in self.topic_config.items()
+                  if k not in ["num_partitions", "replication_factor"]}
+        return topic_manager.ensure_topics_exist(
+            topics,
+            num_partitions=num_partitions,
+            replication_factor=replication_factor,
+            config=config
+        )
+
+    def partition_count(self, topic: str, timeout: float = 10.0) -> int:
+        """Get the number of partitions of a topic from cluster metadata.
+
+        Args:
+            topic: Topic name
+            timeout: Maximum time to wait for metadata
+
+        Returns:
+            Number of partitions
+        """
+        metadata = self._producer.list_topics(topic, timeout=timeout)
+        return len(metadata.topics[topic].partitions)
+
+    def set_partitioner(self, topic: str, partitioner: Partitioner | None) -> None:
+        """Assign partitions for a registered topic on the client side.
+
+        Args:
+            topic: Topic name
+            partitioner: Partitioner to use, or None for librdkafka's default
+        """
+        route = self._routes.get(topic)
+        if route is None:
+            raise ValueError(f"Topic '{topic}' is not registered with the producer pool")
+        route.partitioner = partitioner
+
+    def add_json_topic(self, topic: str, key_field: str | None = None) -> None:
+        """Register a topic whose values are JSON encoded.
+
+        Args:
+            topic: Topic name
+            key_field: Field to use as message key
+        """
+        self._register_route(topic, _TopicRoute(self._serialize_json, key_field, "json"))
+
+    def add_protobuf_topic(
+        self,
+        topic: str,
+        proto_class: type,
+        key_field: str | None = None,
+    ) -> None:
+        """Register a topic whose values are Protobuf encoded.
+
+        Args:
+            topic: Topic name
+            proto_class: Protobuf message class
+            key_field: Field to use as message key
+        """
+        serializer = ProtobufSerializer(
+            proto_class,
+            self._get_schema_registry(),
+            {"use.deprecated.format": False}
+        )
+
+        if self.fast_serialization:
+            framed = FramedProtobufSerializer.from_serializer(serializer, proto_class, topic)
+
+            def serialize(value: dict[str, Any]) -> bytes:
+                return framed(dict_to_protobuf(proto_class, value))
+        else:
+            ctx = SerializationContext(topic, MessageField.VALUE)
+
+            def serialize(value: dict[str, Any]) -> bytes:
+                return serializer(dict_to_protobuf(proto_class, value), ctx)
+
+        self._register_route(topic, _TopicRoute(serialize, key_field, "protobuf"))
+
+    def produce(
+        self,
+        topic: str,
+        value: dict[str, Any],
+        key: str | None = None,
+        on_delivery: Callable | None = None,
+        timestamp: int | None = None,
+    ) -> None:
+        """Produce a message to a registered topic.
+
+        Args:
+            topic: Topic to produce to
+            value: Message value as dictionary
+            key: Message key (if None, will try to extract from value using the topic's key_field)
+            on_delivery: Callback for delivery reports
+            timestamp: Message timestamp in milliseconds since the epoch
+                (default: the time of producing)
+        """
+        route = self._routes.get(topic)
+        if route is None:
+            raise ValueError(f"Topic '{topic}' is not registered with the producer pool")
+
+        if key is None and route.key_field and route.key_field in value:
+            key = str(value[route.key_field])
+
+        serialized_key = self._key_serializer(key) if key else None
+        options = {} if timestamp is None else {"timestamp": timestamp}
+        if route.partitioner is None:
+            self._producer.produce(
+                topic=topic,
+                key=serialized_key,
+                value=route.serialize(value),
+                on_delivery=on_delivery or self._delivery_callback,
+                **options,
+            )
+        else:
+            self._producer.produce(
+                topic=topic,
+                key=serialized_key,
+                value=route.serialize(value),
+                partition=route.partitioner.partition(serialized_key, value),
+                on_delivery=on_delivery or self._delivery_callback,
+                **options,
+            )
+
+        # Poll for callbacks
+        self._producer.poll(0)
+
+    def flush(self, timeout: float = 10.0) -> int:
+        """Flush any pending messages for all topics.
+
+        Args:
+            timeout: Maximum time to wait for messages to be delivered
+
+        Returns:
+            Number of messages still in queue
+        """
+        if self._producer is not None:
+            return self._producer.flush(timeout)
+        return 0
+
+    def close(self) -> None:
+        """Close the pool and clean up resources."""
+        if self._producer:
+            self._producer.flush()
+            self._producer = None
+
+    def poll(self, timeout: float = 0) -> int:
+        """Poll for events.
+
+        Args:
+            timeout: Maximum time to wait
+
+        Returns:
+            Number of events processed
+        """
+        return self._producer.poll(timeout)
+
+    @property
+    def queue_size(self) -> int:
+        """Get the current queue size across all topics.
+
+        Returns:
+            Number of messages in the queue
+        """
+        return len(self._producer)
+
+    def _register_route(self, topic: str, route: _TopicRoute) -> None:
+        """Register a topic route and attach the pool's partitioner."""
+        self._routes[topic] = route
+        if self.partitioner != "default":
+            route.partitioner = create_partitioner(
+                self.partitioner, self.partition_count(topic), self.partition_field
+            )
+
+    def _get_schema_registry(self) -> SchemaRegistryClient:
+        """Create the shared Schema Registry client on first use."""
+        if self._schema_registry is None:
+            if not self.schema_registry_url:
+                raise ValueError("Schema Registry URL is required for protobuf topics")
+            sr_config = {"url": self.schema_registry_url}
+            sr_config.update(self.schema_registry_config)
+            self._schema_registry = SchemaRegistryClient(sr_config)
+        return self._schema_registry
+
+    @staticmethod
+    def _serialize_json(value: dict[str, Any]) -> bytes:
+        """Serialize a value to JSON bytes."""
+        return json.dumps(value).encode("utf-8")
+
+    @staticmethod
+    def _default_callback(err, msg):
+        """Default delivery callback.
+
+        Args:
+            err: Error if delivery failed
+            msg: Message that was delivered
+        """
+        if err is not None:
+            print(f"Message delivery failed: {err}")
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
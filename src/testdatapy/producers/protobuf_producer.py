@@ -16,6 +16,7 @@ from confluent_kafka.serialization import (
 )
 
 from testdatapy.producers.base import KafkaProducer
+from testdatapy.producers.wire_format import FramedProtobufSerializer
 from testdatapy.exceptions import (
     ProtobufSerializationError,
     SchemaRegistryConnectionError,
@@ -30,6 +31,58 @@ from testdatapy.logging_config import get_schema_logger, PerformanceTimer
 logger = get_schema_logger(__name__)
 
 
+def dict_to_protobuf(proto_class: type, data: dict[str, Any]) -> Any:
+    """Convert dictionary to protobuf message.
+
+    Args:
+        proto_class: Protobuf message class
+        data: Dictionary data
+
+    Returns:
+        Protobuf message instance
+    """
+    message = proto_class()
+    
+    # Define nested message field mappings
+    # This allows for flexible handling of nested structures
+    nested_mappings = {
+        'address': ['street', 'city', 'postal_code', 'country_code']
+    }
+    
+    # Handle nested message structures first
+    for nested_field, field_names in nested_mappings.items():
+        if hasattr(message, nested_field):
+            # Check if we have an address dict or individual address fields
+            if nested_field in data and isinstance(data[nested_field], dict):
+                # Handle address as a nested dict
+                nested_message = getattr(message, nested_field)
+                address_data = data[nested_field]
+                for field_name in field_names:
+                    if field_name in address_data:
+                        setattr(nested_message, field_name, address_data[field_name])
+            elif any(field in data for field in field_names):
+                # Handle individual address fields at the top level
+                nested_message = getattr(message, nested_field)
+                for field_name in field_names:
+                    if field_name in data:
+                        setattr(nested_message, field_name, data[field_name])
+    
+    # Set all other fields directly on the message
+    nested_field_names = {field for fields in nested_mappings.values() for field in fields}
+    nested_field_names.update(nested_mappings.keys())  # Also exclude the nested field itself
+    
+    for field, value in data.items():
+        if field not in nested_field_names and hasattr(message, field):
+            try:
+                setattr(message, field, value)
+            except AttributeError as e:
+                # Some protobuf fields may not be assignable, log and skip
+                logger.debug(f"Cannot assign field {field}: {e}")
+                continue
+    
+    return message
+
+
 class ProtobufProducer(KafkaProducer):
     """Kafka producer for Protobuf messages with Schema Registry support."""
 
@@ -45,6 +98,7 @@ class ProtobufProducer(KafkaProducer):
         key_field: Optional[str] = None,
         auto_create_topic: bool = True,
         topic_config: Optional[dict[str, Any]] = None,
+        fast_serialization: bool = False,
     ):
         """Initialize the Protobuf producer.
 
@@ -59,6 +113,9 @@ class ProtobufProducer(KafkaProducer):
             key_field: Field to use as message key
             auto_create_topic: Whether to auto-create topic if it doesn't exist
             topic_config: Configuration for topic creation
+            fast_serialization: Resolve the schema ID once and frame messages with a
+                precomputed wire-format header instead of calling the serializer
+                per message
         """
         super().__init__(bootstrap_servers, topic, config, auto_create_topic, topic_config)
         
@@ -97,6 +154,23 @@ class ProtobufProducer(KafkaProducer):
             self.schema_registry,
             {"use.deprecated.format": False}
         )
+        self._framed_serializer = None
+        if fast_serialization:
+            try:
+                self._framed_serializer = FramedProtobufSerializer.from_serializer(
+                    self._value_serializer, schema_proto_class, topic
+                )
+                logger.info(
+                    "Resolved protobuf wire-format header",
+                    topic=topic,
+                    schema_id=self._framed_serializer.schema_id
+                )
+            except Exception as e:
+                raise SchemaRegistrationError(
+                    subject=f"{topic}-value",
+                    schema_content=schema_proto_class.__name__,
+                    registration_error=e
+                ) from e
         
         # Set up Kafka producer with error handling
         producer_config = {"bootstrap.servers": bootstrap_servers}
@@ -154,13 +228,15 @@ class ProtobufProducer(KafkaProducer):
                     serialization_error=e
                 ) from e
             
-            # Create serialization context
-            ctx = SerializationContext(self.topic, MessageField.VALUE)
-            
             # Serialize value with error handling
             try:
-                serialized_value = self._value_serializer(protobuf_message, ctx)
+                if self._framed_serializer is not None:
+                    serialized_value = self._framed_serializer(protobuf_message)
+                else:
+                    ctx = SerializationContext(self.topic, MessageField.VALUE)
+                    serialized_value = self._value_serializer(protobuf_message, ctx)
                 message_size = len(serialized_value) if serialized_value else 0
+                self.last_value_size = message_size
                 logger.debug("Serialized protobuf message", 
                            size_bytes=message_size,
                            topic=self.topic)
@@ -180,7 +256,8 @@ class ProtobufProducer(KafkaProducer):
                     topic=self.topic,
                     key=serialized_key,
                     value=serialized_value,
-                    on_delivery=callback
+                    on_delivery=callback,
+                    **self._partition_kwargs(serialized_key, value)
                 )
                 
                 # Trigger any callbacks
@@ -224,46 +301,7 @@ class ProtobufProducer(KafkaProducer):
         Returns:
             Protobuf message instance
         """
-        message = self.schema_proto_class()
-        
-        # Define nested message field mappings
-        # This allows for flexible handling of nested structures
-        nested_mappings = {
-            'address': ['street', 'city', 'postal_code', 'country_code']
-        }
-        
-        # Handle nested message structures first
-        for nested_field, field_names in nested_mappings.items():
-            if hasattr(message, nested_field):
-                # Check if we have an address dict or individual address fields
-                if nested_field in data and isinstance(data[nested_field], dict):
-                    # Handle address as a nested dict
-                    nested_message = getattr(message, nested_field)
-                    address_data = data[nested_field]
-                    for field_name in field_names:
-                        if field_name in address_data:
-                            setattr(nested_message, field_name, address_data[field_name])
-                elif any(field in data for field in field_names):
-                    # Handle individual address fields at the top level
-                    nested_message = getattr(message, nested_field)
-                    for field_name in field_names:
-                        if field_name in data:
-                            setattr(nested_message, field_name, data[field_name])
-        
-        # Set all other fields directly on the message
-        nested_field_names = {field for fields in nested_mappings.values() for field in fields}
-        nested_field_names.update(nested_mappings.keys())  # Also exclude the nested field itself
-        
-        for field, value in data.items():
-            if field not in nested_field_names and hasattr(message, field):
-                try:
-                    setattr(message, field, value)
-                except AttributeError as e:
-                    # Some protobuf fields may not be assignable, log and skip
-                    logger.debug(f"Cannot assign field {field}: {e}")
-                    continue
-        
-        return message
+        return dict_to_protobuf(self.schema_proto_class, data)
 
     def register_schema(self, subject: str) -> int:
         """Register the protobuf schema with Schema Registry.
@@ -428,6 +466,26 @@ class ProtobufProducer(KafkaProducer):
         """
         return self._producer.flush(timeout)
 
+    def poll(self, timeout: float = 0) -> int:
+        """Poll for events.
+
+        Args:
+            timeout: Maximum time to wait
+
+        Returns:
+            Number of events processed
+        """
+        return self._producer.poll(timeout)
+
+    @property
+    def queue_size(self) -> int:
+        """Get the current queue size.
+
+        Returns:
+            Number of messages in the queue
+        """
+        return len(self._producer)
+
     def close(self) -> None:
         """Close the producer and clean up resources."""
         self.flush()
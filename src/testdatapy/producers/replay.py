@@ -0,0 +1,221 @@
+"""Replay of pre-serialized message logs."""
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from confluent_kafka import Producer as ConfluentProducer
+
+from testdatapy.sinks.message_log import MessageLog
+from testdatapy.topics import TopicManager
+
+# Messages between delivery-report polls and stop checks
+_POLL_INTERVAL = 1000
+
+# Paced replays check the rate about this often (seconds)
+_PACING_TICK = 0.01
+
+# Longest sleep between should_stop checks (seconds)
+_MAX_SLEEP = 0.1
+
+# Seconds close() waits for outstanding deliveries
+_CLOSE_TIMEOUT = 10.0
+
+
+class ReplayProducer:
+    """Produces the raw bytes of message logs to Kafka.
+
+    Generation and serialization happen ahead of time (see MessageLogSink),
+    so replay throughput is bounded by the client and the brokers only,
+    and every run sends byte-identical messages.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers: str,
+        config: dict[str, Any] | None = None,
+        auto_create_topic: bool = True,
+        topic_config: dict[str, Any] | None = None,
+    ):
+        """Initialize the replay producer.
+
+        Args:
+            bootstrap_servers: Kafka bootstrap servers
+            config: Additional producer configuration
+            auto_create_topic: Whether to create replayed topics that do not exist
+            topic_config: Configuration for topic creation (partitions, replication_factor, etc.)
+        """
+        self.bootstrap_servers = bootstrap_servers
+        self.config = config or {}
+        self.auto_create_topic = auto_create_topic
+        self.topic_config = topic_config or {}
+
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.failed = 0
+        self._ensured_topics: set[str] = set()
+
+        # Only failed deliveries call back into Python
+        producer_config = {
+            "bootstrap.servers": bootstrap_servers,
+            "delivery.report.only.error": True,
+        }
+        producer_config.update(self.config)
+        self._producer = ConfluentProducer(producer_config)
+
+    def replay(
+        self,
+        log: MessageLog,
+        topic: str | None = None,
+        rate_per_second: float | None = None,
+        max_messages: int | None = None,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> int:
+        """Produce every message of a log.
+
+        Args:
+            log: Message log to replay
+            topic: Target topic (default: the topic the log was generated for)
+            rate_per_second: Pace messages to this rate (default: as fast as possible)
+            max_messages: Stop after this many messages
+            should_stop: Checked periodically; replay stops when it returns True
+
+        Returns:
+            Number of messages produced from the log
+        """
+        topic = topic or log.topic
+        if not topic:
+            raise ValueError(f"{log.path} does not name a topic, pass one explicitly")
+        self._ensure_topic(topic)
+
+        produce = self._producer.produce
+        poll = self._producer.poll
+        callback = self._delivery_callback
+        # Low rates are paced per message, high rates per batch of one tick
+        check_interval = (
+            max(1, min(_POLL_INTERVAL, int(rate_per_second * _PACING_TICK)))
+            if rate_per_second else _POLL_INTERVAL
+        )
+        start = time.perf_counter()
+        count = 0
+        size = 0
+        for key, value in log:
+            if max_messages is not None and count >= max_messages:
+                break
+            while True:
+                try:
+                    produce(topic, value=value, key=key, on_delivery=callback)
+                    break
+                except BufferError:
+                    # Local queue is full; wait for deliveries to free space
+                    poll(0.05)
+            count += 1
+            size += len(value)
+
+            if count % check_interval == 0:
+                poll(0)
+                if should_stop is not None and should_stop():
+                    break
+                if rate_per_second and self._wait_until(
+                    start + count / rate_per_second, should_stop
+                ):
+                    break
+        poll(0)
+
+        self.messages_sent += count
+        self.bytes_sent += size
+        return count
+
+    def _wait_until(self, deadline: float, should_stop: Callable[[], bool] | None) -> bool:
+        """Sleep until a perf_counter deadline in short steps.
+
+        Returns:
+            True if should_stop asked to stop while waiting
+        """
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            time.sleep(min(remaining, _MAX_SLEEP))
+            self._producer.poll(0)
+            if should_stop is not None and should_stop():
+                return True
+
+    def replay_all(self, logs: Iterable[MessageLog], **options: Any) -> int:
+        """Replay several logs in order.
+
+        Args:
+            logs: Message logs to replay
+            **options: Options of replay()
+
+        Returns:
+            Number of messages produced
+        """
+        max_messages = options.pop("max_messages", None)
+        total = 0
+        for log in logs:
+            remaining = None if max_messages is None else max_messages - total
+            if remaining is not None and remaining <= 0:
+                break
+            total += self.replay(log, max_messages=remaining, **options)
+        return total
+
+    def flush(self, timeout: float = 10.0) -> int:
+        """Flush any pending messages.
+
+        Args:
+            timeout: Maximum time to wait for messages to be delivered
+
+        Returns:
+            Number of messages still in queue
+        """
+        return self._producer.flush(timeout)
+
+    def close(self) -> None:
+        """Close the producer and clean up resources."""
+        if self._producer:
+            self._producer.flush(_CLOSE_TIMEOUT)
+            self._producer = None
+
+    def poll(self, timeout: float = 0) -> int:
+        """Poll for events.
+
+        Args:
+            timeout: Maximum time to wait
+
+        Returns:
+            Number of events processed
+        """
+        return self._producer.poll(timeout)
+
+    @property
+    def queue_size(self) -> int:
+        """Number of messages in the producer queue."""
+        return len(self._producer)
+
+    def _ensure_topic(self, topic: str) -> None:
+        """Create a replayed topic on first use if auto-creation is enabled."""
+        if not self.auto_create_topic or topic in self._ensured_topics:
+            return
+        topic_manager = TopicManager(bootstrap_servers=self.bootstrap_servers, config=self.config)
+        config = {k: v for k, v in self.topic_config.items()
+                  if k not in ["num_partitions", "replication_factor"]}
+        topic_manager.ensure_topic_exists(
+            topic,
+            num_partitions=self.topic_config.get("num_partitions", 1),
+            replication_factor=self.topic_config.get("replication_factor", 1),
+            config=config
+        )
+        self._ensured_topics.add(topic)
+
+    def _delivery_callback(self, err, msg):
+        """Count failed deliveries."""
+        if err is not None:
+            self.failed += 1
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
@@ -78,19 +78,28 @@ class ShutdownHandler:
 
 
 class GracefulProducer:
-    """Producer wrapper with graceful shutdown support."""
+    """Producer wrapper with graceful shutdown support.
     
-    def __init__(self, producer, shutdown_handler: ShutdownHandler):
+    In-flight messages are read from the librdkafka queue length rather than
+    counted per message, so ``produce`` adds no callbacks or locking.
+    """
+    
+    def __init__(self, producer, shutdown_handler: ShutdownHandler, drain_timeout: float = 30.0):
         """Initialize graceful producer.
         
         Args:
             producer: Kafka producer instance
             shutdown_handler: Shutdown handler
+            drain_timeout: Maximum time to wait for in-flight messages on shutdown
         """
         self.producer = producer
         self.shutdown_handler = shutdown_handler
-        self._messages_in_flight = 0
-        self._lock = threading.Lock()
+        self.drain_timeout = drain_timeout
+        self.undelivered = 0
+        
+        # Bind hot-path lookups once
+        self._is_shutting_down = shutdown_handler.is_shutting_down
+        self._produce = producer.produce
         
         # Register cleanup
         shutdown_handler.register_cleanup(self._cleanup)
@@ -102,42 +111,45 @@ class GracefulProducer:
             *args: Producer arguments
             **kwargs: Producer keyword arguments
         """
-        if self.shutdown_handler.is_shutting_down():
+        if self._is_shutting_down():
             raise RuntimeError("Cannot produce during shutdown")
         
-        with self._lock:
-            self._messages_in_flight += 1
-        
-        # Add delivery callback wrapper
-        original_callback = kwargs.get('on_delivery')
-        kwargs['on_delivery'] = self._create_callback_wrapper(original_callback)
-        
-        return self.producer.produce(*args, **kwargs)
+        return self._produce(*args, **kwargs)
     
-    def _create_callback_wrapper(self, original_callback):
-        """Create callback wrapper that tracks in-flight messages.
+    @property
+    def messages_in_flight(self) -> int:
+        """Number of messages queued in librdkafka and not yet delivered.
         
-        Args:
-            original_callback: Original delivery callback
-            
         Returns:
-            Wrapped callback
+            Current producer queue length
         """
-        def wrapper(err, msg):
-            with self._lock:
-                self._messages_in_flight -= 1
-            
-            if original_callback:
-                original_callback(err, msg)
-        
-        return wrapper
+        try:
+            queue_size = getattr(self.producer, "queue_size", None)
+            if isinstance(queue_size, int):
+                return queue_size
+            return len(self.producer)
+        except TypeError:
+            # Producer already closed or does not expose its queue
+            return 0
+    
+    @property
+    def last_value_size(self) -> int:
+        """Size of the last serialized value produced by the wrapped producer."""
+        size = getattr(self.producer, "last_value_size", 0)
+        return size if isinstance(size, int) else 0
     
     def _cleanup(self):
-        """Cleanup producer on shutdown."""
-        print(f"Flushing {self._messages_in_flight} messages...")
-        self.producer.flush(timeout=30.0)
-        
-        if hasattr(self.producer, 'close'):
+        """Drain the producer on shutdown within the bounded timeout."""
+        print(f"Flushing {self.messages_in_flight} messages...")
+        remaining = self.producer.flush(timeout=self.drain_timeout)
+        self.undelivered = remaining if isinstance(remaining, int) else 0
+        if self.undelivered > 0:
+            # close() flushes again without a timeout, which would undo the bound
+            print(
+                f"Warning: {self.undelivered} messages not delivered "
+                f"within {self.drain_timeout:.1f}s"
+            )
+        elif hasattr(self.producer, 'close'):
             self.producer.close()
             
             
@@ -147,6 +159,12 @@ class GracefulProducer:
             return self.producer.flush(timeout)
         return 0
 
+    def poll(self, timeout: float = 0):
+        """Proxy poll to the underlying producer"""
+        if hasattr(self.producer, 'poll'):
+            return self.producer.poll(timeout)
+        return 0
+
 
 def create_shutdown_handler() -> ShutdownHandler:
     """Create and return a shutdown handler.
@@ -0,0 +1,81 @@
+"""File sinks for writing test data without a Kafka cluster."""
+from pathlib import Path
+from typing import Any
+
+from testdatapy.sinks.avro_file import AvroFileSink
+from testdatapy.sinks.base import COMPRESSIONS, SINK_FORMATS, FileSink
+from testdatapy.sinks.message_log import MessageLog, MessageLogSink, is_message_log
+from testdatapy.sinks.ndjson import NdjsonSink
+from testdatapy.sinks.parquet import ParquetSink
+from testdatapy.sinks.pool import SinkPool
+
+_SUFFIX_FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".avro": "avro", ".parquet": "parquet"}
+
+
+def sink_format_for_path(path: str | Path) -> str:
+    """Get the sink format matching a file name.
+
+    Args:
+        path: Output file path, e.g. orders.ndjson.gz or orders.parquet
+
+    Returns:
+        One of SINK_FORMATS
+
+    Raises:
+        ValueError: If the suffix does not name a format
+    """
+    path = Path(path)
+    suffix = path.suffix
+    if suffix in (".gz", ".zst"):
+        suffix = Path(path.stem).suffix
+    if suffix not in _SUFFIX_FORMATS:
+        raise ValueError(
+            f"Cannot tell the output format of '{path.name}', "
+            f"use one of {', '.join(SINK_FORMATS)} explicitly"
+        )
+    return _SUFFIX_FORMATS[suffix]
+
+
+def create_sink(
+    path: str | Path,
+    format: str | None = None,
+    schema: dict[str, Any] | str | Path | None = None,
+    **options: Any,
+) -> FileSink:
+    """Create a file sink.
+
+    Args:
+        path: Output file path
+        format: One of SINK_FORMATS (default: from the file suffix)
+        schema: Avro schema (required for avro output)
+        **options: Options of the sink class (compression, rotation, topic, ...)
+
+    Returns:
+        File sink instance
+    """
+    format = format or sink_format_for_path(path)
+    if format == "ndjson":
+        return NdjsonSink(path, **options)
+    if format == "avro":
+        if schema is None:
+            raise ValueError("Avro output requires a schema")
+        return AvroFileSink(path, schema, **options)
+    if format == "parquet":
+        return ParquetSink(path, **options)
+    raise ValueError(f"Unsupported output format '{format}', use one of {', '.join(SINK_FORMATS)}")
+
+
+__all__ = [
+    "COMPRESSIONS",
+    "SINK_FORMATS",
+    "FileSink",
+    "NdjsonSink",
+    "AvroFileSink",
+    "ParquetSink",
+    "SinkPool",
+    "MessageLogSink",
+    "MessageLog",
+    "is_message_log",
+    "create_sink",
+    "sink_format_for_path",
+]
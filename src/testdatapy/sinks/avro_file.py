@@ -0,0 +1,73 @@
+"""Avro object container file sink."""
+import json
+from pathlib import Path
+from typing import IO, Any
+
+import fastavro
+from fastavro.write import Writer
+
+from testdatapy.sinks.base import FileSink
+
+AVRO_CODECS = ("null", "deflate", "snappy", "zstandard")
+
+
+class AvroFileSink(FileSink):
+    """Writes records to Avro object container files.
+
+    Each file carries its writer schema in the header, so it can be read
+    back without a Schema Registry. Records are validated against the
+    schema as they are written and stored in compressed blocks.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        schema: dict[str, Any] | str | Path,
+        codec: str = "deflate",
+        **options: Any,
+    ):
+        """Initialize the Avro file sink.
+
+        Args:
+            path: Output file path
+            schema: Avro schema, or the path of an .avsc file
+            codec: Block compression codec, one of AVRO_CODECS
+            **options: FileSink options (topic, rotation, buffering)
+        """
+        super().__init__(path, **options)
+        if codec not in AVRO_CODECS:
+            raise ValueError(
+                f"Unsupported Avro codec '{codec}', use one of {', '.join(AVRO_CODECS)}"
+            )
+        if not isinstance(schema, dict):
+            with open(schema) as f:
+                schema = json.load(f)
+        self.schema = fastavro.parse_schema(schema)
+        self.codec = codec
+        self._file: IO | None = None
+        self._writer: Writer | None = None
+
+    def _encode(self, key: str | None, value: dict[str, Any]) -> dict[str, Any]:
+        # Records are serialized by the container writer
+        return value
+
+    def _open(self, path: Path) -> None:
+        self._file = open(path, "wb")
+        self._writer = Writer(self._file, self.schema, codec=self.codec)
+
+    def _write(self, items: list[dict[str, Any]]) -> None:
+        start = self._file.tell()
+        write = self._writer.write
+        for record in items:
+            write(record)
+        self._writer.flush()
+        self.last_value_size = (self._file.tell() - start) // len(items)
+
+    def _flush_file(self) -> None:
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._writer.flush()
+        self._file.close()
+        self._writer = None
+        self._file = None
@@ -0,0 +1,240 @@
+"""Base file sink interface."""
+import gzip
+import os
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any
+
+DEFAULT_BUFFER_RECORDS = 10_000
+
+SINK_FORMATS = ("ndjson", "avro", "parquet")
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+_SUFFIX_COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+
+def compression_for_path(path: str | Path, compression: str | None = None) -> str:
+    """Get the compression of an output file, defaulting to its suffix.
+
+    Args:
+        path: Output file path
+        compression: Configured compression, if any
+
+    Returns:
+        One of COMPRESSIONS
+
+    Raises:
+        ValueError: If the compression is not supported
+    """
+    if compression is None:
+        return _SUFFIX_COMPRESSIONS.get(Path(path).suffix, "none")
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported compression '{compression}', use one of {', '.join(COMPRESSIONS)}"
+        )
+    return compression
+
+
+def open_compressed(path: str | Path, compression: str, text: bool = False) -> IO:
+    """Open a file for writing, compressing on the fly if requested.
+
+    Args:
+        path: Output file path
+        compression: One of COMPRESSIONS
+        text: Open a UTF-8 text stream instead of a binary one
+
+    Returns:
+        Writable file object
+
+    Raises:
+        ValueError: If zstd is requested without the zstandard package
+    """
+    mode = "wt" if text else "wb"
+    text_options = {"encoding": "utf-8", "newline": ""} if text else {}
+    if compression == "gzip":
+        return gzip.open(path, mode, compresslevel=6, **text_options)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError(
+                "zstd compression requires the zstandard package: pip install zstandard"
+            ) from None
+        return zstandard.open(path, mode, **text_options)
+    return open(path, mode, **text_options)
+
+
+class FileSink(ABC):
+    """Writes records to files instead of producing them to Kafka.
+
+    Sinks have the produce/flush/close interface of KafkaProducer, so any
+    generation loop can write datasets offline. Records are buffered and
+    written in chunks; with rotation, output goes to numbered files
+    (``orders-00000.ndjson``, ``orders-00001.ndjson``, ...) and a new file
+    is started once the current one reaches ``max_bytes`` on disk or has
+    been open for ``max_seconds``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        topic: str | None = None,
+        key_field: str | None = None,
+        max_bytes: int | None = None,
+        max_seconds: float | None = None,
+        buffer_records: int = DEFAULT_BUFFER_RECORDS,
+    ):
+        """Initialize the sink.
+
+        Args:
+            path: Output file path (base name of numbered files with rotation)
+            topic: Name reported as the sink's topic (default: file base name)
+            key_field: Field holding the record key; kept for interface
+                compatibility, files store only the values
+            max_bytes: Start a new file once the current one reaches this size
+            max_seconds: Start a new file after this many seconds
+            buffer_records: Records buffered before each write
+        """
+        self.path = Path(path)
+        self.topic = topic or self.path.name.split(".", 1)[0]
+        self.key_field = key_field
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.buffer_records = buffer_records
+
+        # Files written so far, in order
+        self.files: list[Path] = []
+        self.records_written = 0
+        self.last_value_size = 0
+
+        self._buffer: list[Any] = []
+        self._current: Path | None = None
+        self._opened_at = 0.0
+
+    @property
+    def rotating(self) -> bool:
+        """Whether output is split into numbered files."""
+        return self.max_bytes is not None or self.max_seconds is not None
+
+    @property
+    def queue_size(self) -> int:
+        """Number of buffered records not yet written."""
+        return len(self._buffer)
+
+    def produce(
+        self,
+        key: str | None,
+        value: dict[str, Any],
+        on_delivery: Callable | None = None,
+    ) -> None:
+        """Buffer a record for writing.
+
+        Args:
+            key: Message key (stored only by formats that keep keys)
+            value: Record to write
+            on_delivery: Accepted for interface compatibility; files have no
+                delivery reports
+        """
+        if (
+            self.max_seconds is not None
+            and self._current is not None
+            and time.monotonic() - self._opened_at >= self.max_seconds
+        ):
+            self._write_buffer()
+            self._close_current()
+
+        self._buffer.append(self._encode(key, value))
+        if len(self._buffer) >= self.buffer_records:
+            self._write_buffer()
+
+    def flush(self, timeout: float = 10.0) -> int:
+        """Write buffered records to the current file.
+
+        Args:
+            timeout: Accepted for interface compatibility
+
+        Returns:
+            Number of records still buffered (always 0)
+        """
+        self._write_buffer()
+        if self._current is not None:
+            self._flush_file()
+        return 0
+
+    def poll(self, timeout: float = 0) -> int:
+        """Accepted for interface compatibility; files have no events."""
+        return 0
+
+    def close(self) -> None:
+        """Write buffered records and finish the current file."""
+        self._write_buffer()
+        self._close_current()
+
+    def _write_buffer(self) -> None:
+        """Write the buffered records, rotating by size afterwards."""
+        if not self._buffer:
+            return
+        if self._current is None:
+            self._open_next()
+        self._write(self._buffer)
+        self.records_written += len(self._buffer)
+        self._buffer = []
+        if self.max_bytes is not None and self._current_size() >= self.max_bytes:
+            self._close_current()
+
+    def _open_next(self) -> None:
+        """Open the next output file."""
+        if self.rotating:
+            base, _, suffixes = self.path.name.partition(".")
+            path = self.path.with_name(f"{base}-{len(self.files):05d}.{suffixes}".rstrip("."))
+        else:
+            path = self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._open(path)
+        self.files.append(path)
+        self._current = path
+        self._opened_at = time.monotonic()
+
+    def _close_current(self) -> None:
+        """Finish the current output file, if one is open."""
+        if self._current is not None:
+            self._close()
+            self._current = None
+
+    def _current_size(self) -> int:
+        """Size of the current file on disk, without data still held in write buffers."""
+        return os.path.getsize(self._current)
+
+    @abstractmethod
+    def _encode(self, key: str | None, value: dict[str, Any]) -> Any:
+        """Convert a message into the item buffered for writing."""
+        pass
+
+    @abstractmethod
+    def _open(self, path: Path) -> None:
+        """Open an output file."""
+        pass
+
+    @abstractmethod
+    def _write(self, items: list[Any]) -> None:
+        """Write buffered items to the open file."""
+        pass
+
+    def _flush_file(self) -> None:
+        """Push written data of the open file to disk."""
+        pass
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Finish the open output file."""
+        pass
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
@@ -0,0 +1,173 @@
+"""Binary log of pre-serialized Kafka messages.
+
+A message log stores messages exactly as they are sent to Kafka, so a
+dataset can be generated once and replayed many times without generating
+or serializing records again. The layout is::
+
+    magic (8 bytes) | metadata length (uint32) | metadata (JSON)
+    frame*
+
+where each frame is ``key length (int32, -1 for no key) | value length
+(uint32) | key | value``, all little-endian.
+"""
+import json
+import mmap
+import struct
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from testdatapy.sinks.base import FileSink
+
+MESSAGE_LOG_MAGIC = b"TDPYLOG1"
+
+_HEADER = struct.Struct("<8sI")
+_FRAME = struct.Struct("<iI")
+
+
+def json_value_serializer(value: dict[str, Any]) -> bytes:
+    """Serialize a value like JsonProducer does."""
+    return json.dumps(value).encode("utf-8")
+
+
+class MessageLogSink(FileSink):
+    """Writes serialized key/value messages to a message log."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        serializer: Callable[[dict[str, Any]], bytes] = json_value_serializer,
+        metadata: dict[str, Any] | None = None,
+        **options: Any,
+    ):
+        """Initialize the message log sink.
+
+        Args:
+            path: Output file path
+            serializer: Converts values to the bytes produced to Kafka
+            metadata: Stored in the file header, along with the topic
+            **options: FileSink options (topic, key_field, rotation, buffering)
+        """
+        super().__init__(path, **options)
+        self.serializer = serializer
+        self.metadata = {"topic": self.topic, **(metadata or {})}
+        self._file: IO | None = None
+
+    def _encode(self, key: str | None, value: dict[str, Any]) -> bytes:
+        if key is None and self.key_field and self.key_field in value:
+            key = str(value[self.key_field])
+        serialized = self.serializer(value)
+        self.last_value_size = len(serialized)
+        if not key:
+            return _FRAME.pack(-1, len(serialized)) + serialized
+        key_bytes = key.encode("utf-8")
+        return _FRAME.pack(len(key_bytes), len(serialized)) + key_bytes + serialized
+
+    def _open(self, path: Path) -> None:
+        self._file = open(path, "wb")
+        metadata = json.dumps(self.metadata).encode("utf-8")
+        self._file.write(_HEADER.pack(MESSAGE_LOG_MAGIC, len(metadata)) + metadata)
+
+    def _write(self, items: list[bytes]) -> None:
+        self._file.write(b"".join(items))
+
+    def _current_size(self) -> int:
+        return self._file.tell()
+
+    def _flush_file(self) -> None:
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+        self._file = None
+
+
+def is_message_log(path: str | Path) -> bool:
+    """Check whether a file is a message log."""
+    with open(path, "rb") as f:
+        return f.read(len(MESSAGE_LOG_MAGIC)) == MESSAGE_LOG_MAGIC
+
+
+class MessageLog:
+    """Memory-mapped reader of a message log.
+
+    Keys and values are sliced straight out of the mapping as bytes, ready
+    to be handed to the Kafka client; nothing is deserialized.
+    """
+
+    def __init__(self, path: str | Path):
+        """Open a message log.
+
+        Args:
+            path: Message log file
+
+        Raises:
+            ValueError: If the file is not a message log
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size or header[:len(MESSAGE_LOG_MAGIC)] != MESSAGE_LOG_MAGIC:
+                raise ValueError(f"{self.path} is not a message log")
+            _, metadata_size = _HEADER.unpack(header)
+            self.metadata: dict[str, Any] = json.loads(f.read(metadata_size))
+            self._start = _HEADER.size + metadata_size
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(self._mmap)
+
+    @property
+    def topic(self) -> str | None:
+        """Topic the messages were generated for."""
+        return self.metadata.get("topic")
+
+    def __iter__(self) -> Iterator[tuple[bytes | None, bytes]]:
+        """Iterate over (key, value) messages in file order.
+
+        Raises:
+            ValueError: If the file ends inside a frame
+        """
+        data = self._mmap
+        position = self._start
+        end = self.size
+        unpack_from = _FRAME.unpack_from
+        frame_size = _FRAME.size
+        while position < end:
+            if position + frame_size > end:
+                raise ValueError(f"{self.path} is truncated at byte {position}")
+            key_size, value_size = unpack_from(data, position)
+            position += frame_size
+            if key_size < 0:
+                key = None
+            else:
+                key = data[position:position + key_size]
+                position += key_size
+            value = data[position:position + value_size]
+            position += value_size
+            if len(value) != value_size:
+                raise ValueError(f"{self.path} is truncated at byte {end}")
+            yield key, value
+
+    def __len__(self) -> int:
+        """Count the messages by walking the frame headers."""
+        count = 0
+        position = self._start
+        unpack_from = _FRAME.unpack_from
+        while position + _FRAME.size <= self.size:
+            key_size, value_size = unpack_from(self._mmap, position)
+            position += _FRAME.size + max(key_size, 0) + value_size
+            count += 1
+        return count
+
+    def close(self) -> None:
+        """Unmap the file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
@@ -0,0 +1,49 @@
+"""Newline-delimited JSON file sink."""
+import json
+from pathlib import Path
+from typing import IO, Any
+
+from testdatapy.sinks.base import FileSink, compression_for_path, open_compressed
+
+
+class NdjsonSink(FileSink):
+    """Writes one JSON document per line, optionally gzip or zstd compressed."""
+
+    def __init__(self, path: str | Path, compression: str | None = None, **options: Any):
+        """Initialize the NDJSON sink.
+
+        Args:
+            path: Output file path
+            compression: none, gzip or zstd (default: from the .gz/.zst suffix)
+            **options: FileSink options (topic, rotation, buffering)
+        """
+        super().__init__(path, **options)
+        self.compression = compression_for_path(self.path, compression)
+        self._file: IO | None = None
+        # Compact separators; values JSON cannot represent (dates, decimals) become strings
+        self._dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str).encode
+
+    def _encode(self, key: str | None, value: dict[str, Any]) -> bytes:
+        line = self._dumps(value).encode("utf-8")
+        self.last_value_size = len(line)
+        return line
+
+    def _open(self, path: Path) -> None:
+        self._file = open_compressed(path, self.compression)
+
+    def _write(self, items: list[bytes]) -> None:
+        self._file.write(b"\n".join(items))
+        self._file.write(b"\n")
+
+    def _current_size(self) -> int:
+        # Bytes handed to the file so far, without flushing the (compressed) stream
+        if self.compression == "gzip":
+            return self._file.fileobj.tell()
+        return self._file.tell()
+
+    def _flush_file(self) -> None:
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+        self._file = None
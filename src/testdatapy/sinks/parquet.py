@@ -0,0 +1,74 @@
+"""Parquet file sink."""
+from pathlib import Path
+from typing import Any
+
+from testdatapy.sinks.base import FileSink
+
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
+
+def _import_pyarrow():
+    """Import pyarrow, which is an optional dependency."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError(
+            "Parquet output requires the pyarrow package: pip install testdatapy[parquet]"
+        ) from None
+    return pyarrow, pyarrow.parquet
+
+
+class ParquetSink(FileSink):
+    """Writes records to Parquet files, one row group per buffered chunk.
+
+    The Arrow schema is inferred from the first chunk and kept for the
+    rest of the output, including rotated files, so every file of a
+    dataset has the same columns.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "snappy",
+        **options: Any,
+    ):
+        """Initialize the Parquet sink.
+
+        Args:
+            path: Output file path
+            row_group_size: Rows per row group (records buffered before each write)
+            compression: Parquet column compression (snappy, gzip, zstd, none)
+            **options: FileSink options (topic, rotation)
+        """
+        options.setdefault("buffer_records", row_group_size)
+        super().__init__(path, **options)
+        self._pa, self._pq = _import_pyarrow()
+        self.compression = compression
+        self.arrow_schema = None
+        self._writer = None
+
+    def _encode(self, key: str | None, value: dict[str, Any]) -> dict[str, Any]:
+        # Records are converted to columns per row group
+        return value
+
+    def _open(self, path: Path) -> None:
+        # The writer needs the schema, so it is created with the first row group
+        self._path = path
+
+    def _write(self, items: list[dict[str, Any]]) -> None:
+        table = self._pa.Table.from_pylist(items, schema=self.arrow_schema)
+        if self.arrow_schema is None:
+            self.arrow_schema = table.schema
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(
+                self._path, self.arrow_schema, compression=self.compression
+            )
+        self._writer.write_table(table, row_group_size=len(items))
+        self.last_value_size = table.nbytes // len(items)
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
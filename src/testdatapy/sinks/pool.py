@@ -0,0 +1,171 @@
+"""Multi-topic file sink pool."""
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from testdatapy.sinks.avro_file import AvroFileSink
+from testdatapy.sinks.base import SINK_FORMATS, FileSink, compression_for_path
+from testdatapy.sinks.ndjson import NdjsonSink
+from testdatapy.sinks.parquet import ParquetSink, _import_pyarrow
+
+_COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+class SinkPool:
+    """Writes each topic to its own file in an output directory.
+
+    Has the interface of ProducerPool, so correlated generation can write
+    a whole dataset (``customers.ndjson``, ``orders.ndjson``, ...) without
+    a Kafka cluster.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        format: str = "ndjson",
+        compression: str | None = None,
+        max_bytes: int | None = None,
+        max_seconds: float | None = None,
+    ):
+        """Initialize the sink pool.
+
+        Args:
+            output_dir: Directory receiving one file (or file series) per topic
+            format: ndjson, avro or parquet
+            compression: Compression of NDJSON files, or the Parquet column codec
+            max_bytes: Rotate topic files once they reach this size
+            max_seconds: Rotate topic files after this many seconds
+        """
+        if format not in SINK_FORMATS:
+            raise ValueError(
+                f"Unsupported output format '{format}', use one of {', '.join(SINK_FORMATS)}"
+            )
+        if format == "parquet":
+            # Fail before generation starts rather than on the first record
+            _import_pyarrow()
+        self.output_dir = Path(output_dir)
+        self.format = format
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self._sinks: dict[str, FileSink] = {}
+
+    @property
+    def topics(self) -> list[str]:
+        """Topics registered with the pool."""
+        return list(self._sinks)
+
+    @property
+    def files(self) -> list[Path]:
+        """Files written so far, across all topics."""
+        return [path for sink in self._sinks.values() for path in sink.files]
+
+    def has_topic(self, topic: str) -> bool:
+        """Check whether a topic has a sink registered."""
+        return topic in self._sinks
+
+    def ensure_topics(self, topics: list[str]) -> list[str]:
+        """Files are created on first write, so there is nothing to create."""
+        return []
+
+    def add_json_topic(self, topic: str, key_field: str | None = None) -> None:
+        """Register a topic written in the pool's format.
+
+        Args:
+            topic: Topic name, used as the file base name
+            key_field: Field to use as message key (not stored)
+        """
+        if self.format == "avro":
+            raise ValueError(f"Topic '{topic}' needs an Avro schema, use add_avro_topic()")
+        options = dict(topic=topic, key_field=key_field,
+                       max_bytes=self.max_bytes, max_seconds=self.max_seconds)
+        if self.format == "parquet":
+            sink = ParquetSink(self.output_dir / f"{topic}.parquet",
+                               compression=self.compression or "snappy", **options)
+        else:
+            compression = compression_for_path(f"{topic}.ndjson", self.compression)
+            suffix = _COMPRESSION_SUFFIXES[compression]
+            sink = NdjsonSink(self.output_dir / f"{topic}.ndjson{suffix}",
+                              compression=compression, **options)
+        self._sinks[topic] = sink
+
+    def add_protobuf_topic(
+        self,
+        topic: str,
+        proto_class: type,
+        key_field: str | None = None,
+    ) -> None:
+        """Register a Protobuf topic; files store its records in the pool's format."""
+        self.add_json_topic(topic, key_field)
+
+    def add_avro_topic(
+        self,
+        topic: str,
+        schema: dict[str, Any] | str | Path,
+        key_field: str | None = None,
+    ) -> None:
+        """Register a topic written to Avro container files.
+
+        Args:
+            topic: Topic name, used as the file base name
+            schema: Avro schema, or the path of an .avsc file
+            key_field: Field to use as message key (not stored)
+        """
+        self._sinks[topic] = AvroFileSink(
+            self.output_dir / f"{topic}.avro", schema, topic=topic, key_field=key_field,
+            max_bytes=self.max_bytes, max_seconds=self.max_seconds,
+        )
+
+    def produce(
+        self,
+        topic: str,
+        value: dict[str, Any],
+        key: str | None = None,
+        on_delivery: Callable | None = None,
+        timestamp: int | None = None,
+    ) -> None:
+        """Write a record to a registered topic's file.
+
+        Args:
+            topic: Topic to write to
+            value: Record to write
+            key: Message key (not stored)
+            on_delivery: Accepted for interface compatibility
+            timestamp: Message timestamp (not stored)
+        """
+        sink = self._sinks.get(topic)
+        if sink is None:
+            raise ValueError(f"Topic '{topic}' is not registered with the sink pool")
+        sink.produce(key, value)
+
+    def flush(self, timeout: float = 10.0) -> int:
+        """Write buffered records of all topics.
+
+        Returns:
+            Number of records still buffered (always 0)
+        """
+        for sink in self._sinks.values():
+            sink.flush(timeout)
+        return 0
+
+    def close(self) -> None:
+        """Finish all topic files."""
+        for sink in self._sinks.values():
+            sink.close()
+
+    def poll(self, timeout: float = 0) -> int:
+        """Accepted for interface compatibility; files have no events."""
+        return 0
+
+    @property
+    def queue_size(self) -> int:
+        """Number of buffered records across all topics."""
+        return sum(sink.queue_size for sink in self._sinks.values())
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
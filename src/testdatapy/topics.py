@@ -6,8 +6,13 @@ from confluent_kafka import KafkaException
 from confluent_kafka.admin import AdminClient, NewTopic
 from confluent_kafka.error import KafkaError
 
+from testdatapy.config.loader import THROUGHPUT_SETTING_KEYS
+
 logger = logging.getLogger(__name__)
 
+# Producer-only settings that are dropped from the AdminClient configuration
+_PRODUCER_ONLY_KEYS = frozenset(THROUGHPUT_SETTING_KEYS) | {"stats_cb", "statistics.interval.ms"}
+
 
 class TopicManager:
     """Manages Kafka topic operations."""
@@ -22,7 +27,9 @@ class TopicManager:
         self.bootstrap_servers = bootstrap_servers
         admin_config = {"bootstrap.servers": bootstrap_servers}
         if config:
-            admin_config.update(config)
+            admin_config.update(
+                {k: v for k, v in config.items() if k not in _PRODUCER_ONLY_KEYS}
+            )
         self.admin_client = AdminClient(admin_config)
 
     def topic_exists(self, topic_name: str) -> bool:
@@ -116,6 +123,57 @@ class TopicManager:
         )
         return True
 
+    def ensure_topics_exist(
+        self,
+        topic_names: list[str],
+        num_partitions: int = 1,
+        replication_factor: int = 1,
+        config: Dict[str, str] | None = None
+    ) -> list[str]:
+        """Ensure several topics exist using one metadata and one create call.
+
+        Args:
+            topic_names: Names of the topics
+            num_partitions: Number of partitions (used only if creating)
+            replication_factor: Replication factor (used only if creating)
+            config: Additional topic configuration (used only if creating)
+
+        Returns:
+            Names of the topics that were created
+
+        Raises:
+            KafkaException: If unable to create topics or check existence
+        """
+        existing = set(self.list_topics())
+        missing = [name for name in dict.fromkeys(topic_names) if name not in existing]
+        if not missing:
+            return []
+
+        logger.info(f"Creating {len(missing)} missing topics: {', '.join(missing)}")
+        new_topics = [
+            NewTopic(
+                name,
+                num_partitions=num_partitions,
+                replication_factor=replication_factor,
+                config=config or {}
+            )
+            for name in missing
+        ]
+
+        futures = self.admin_client.create_topics(new_topics)
+        created = []
+        for name, future in futures.items():
+            try:
+                future.result(timeout=10)
+                created.append(name)
+            except KafkaException as e:
+                if e.args[0].code() == KafkaError.TOPIC_ALREADY_EXISTS:
+                    logger.debug(f"Topic '{name}' already exists")
+                else:
+                    logger.error(f"Failed to create topic '{name}': {e}")
+                    raise
+        return created
+
     def delete_topic(self, topic_name: str) -> None:
         """Delete a topic.
 
@@ -4,7 +4,13 @@ This module provides utilities for flattening nested dictionaries and objects
 into flat structures with dot-notation keys, commonly used for CSV export
 and data processing.
 """
-from typing import Dict, Any, Union, List, Optional
+from typing import Dict, Any, Union, List, Optional, Callable, Iterable, Sequence, Tuple
+
+_BOOLEAN_FORMATS = {
+    "true_false": ("true", "false"),
+    "1_0": ("1", "0"),
+    "yes_no": ("yes", "no"),
+}
 
 
 class DataFlattener:
@@ -42,39 +48,78 @@ class DataFlattener:
         if boolean_format not in ["true_false", "1_0", "yes_no", "preserve"]:
             raise ValueError(f"Invalid boolean_format: {boolean_format}")
         
-        flattened = {}
-        
+        flattened: Dict[str, Any] = {}
+        convert = DataFlattener.value_converter(convert_to_strings, null_value, boolean_format)
+        DataFlattener._flatten_into(flattened, data, prefix, separator, convert)
+        return flattened
+    
+    @staticmethod
+    def _flatten_into(
+        flattened: Dict[str, Any],
+        data: Dict[str, Any],
+        prefix: str,
+        separator: str,
+        convert: Callable[[Any], Any]
+    ) -> None:
+        """Add the flattened fields of a dictionary to an output dictionary."""
         for key, value in data.items():
             full_key = f"{prefix}{separator}{key}" if prefix else key
             
             if isinstance(value, dict):
                 # Recursively flatten nested dictionaries
-                nested_flattened = DataFlattener.flatten_dict(
-                    value, full_key, separator, convert_to_strings, 
-                    null_value, boolean_format
-                )
-                flattened.update(nested_flattened)
+                DataFlattener._flatten_into(flattened, value, full_key, separator, convert)
             elif isinstance(value, list):
                 # Handle lists by indexing each element
                 for i, item in enumerate(value):
                     list_key = f"{full_key}[{i}]"
                     if isinstance(item, dict):
-                        nested_flattened = DataFlattener.flatten_dict(
-                            item, list_key, separator, convert_to_strings,
-                            null_value, boolean_format
-                        )
-                        flattened.update(nested_flattened)
+                        DataFlattener._flatten_into(flattened, item, list_key, separator, convert)
                     else:
-                        flattened[list_key] = DataFlattener._convert_value(
-                            item, convert_to_strings, null_value, boolean_format
-                        )
+                        flattened[list_key] = convert(item)
             else:
                 # Handle primitive values
-                flattened[full_key] = DataFlattener._convert_value(
-                    value, convert_to_strings, null_value, boolean_format
-                )
+                flattened[full_key] = convert(value)
+    
+    @staticmethod
+    def value_converter(
+        convert_to_strings: bool = True,
+        null_value: str = "",
+        boolean_format: str = "true_false"
+    ) -> Callable[[Any], Any]:
+        """Get a function converting single values like _convert_value().
         
-        return flattened
+        Args:
+            convert_to_strings: Whether to convert all values to strings
+            null_value: String representation for None values
+            boolean_format: Format for boolean values
+            
+        Returns:
+            Function of one value
+        """
+        if not convert_to_strings:
+            if boolean_format == "preserve":
+                return lambda value: value
+            true_text, false_text = _BOOLEAN_FORMATS[boolean_format]
+            
+            def convert_booleans(value: Any) -> Any:
+                if value is True:
+                    return true_text
+                if value is False:
+                    return false_text
+                return value
+            return convert_booleans
+        
+        true_text, false_text = _BOOLEAN_FORMATS.get(boolean_format, ("True", "False"))
+        
+        def convert_to_string(value: Any) -> str:
+            if value is None:
+                return null_value
+            if value is True:
+                return true_text
+            if value is False:
+                return false_text
+            return str(value)
+        return convert_to_string
     
     @staticmethod
     def _convert_value(
@@ -216,6 +261,308 @@ class DataFlattener:
         return list(flattened.keys())
 
 
+    @staticmethod
+    def flatten_many(
+        records: Iterable[Dict[str, Any]],
+        separator: str = ".",
+        convert_to_strings: bool = True,
+        null_value: str = "",
+        boolean_format: str = "true_false"
+    ) -> List[Dict[str, Any]]:
+        """Flatten many records through plans compiled per record shape.
+        
+        Gives the same result as calling flatten_dict() on each record.
+        
+        Args:
+            records: Records to flatten
+            separator: Separator for nested keys
+            convert_to_strings: Whether to convert all values to strings
+            null_value: String representation for None values
+            boolean_format: Format for boolean values
+            
+        Returns:
+            Flattened records
+        """
+        if boolean_format not in ["true_false", "1_0", "yes_no", "preserve"]:
+            raise ValueError(f"Invalid boolean_format: {boolean_format}")
+        convert = DataFlattener.value_converter(convert_to_strings, null_value, boolean_format)
+        plans = FlattenPlanCache(separator)
+        flattened = []
+        for record in records:
+            plan, values = plans.lookup(record)
+            if plan is None:
+                flattened.append(DataFlattener.flatten_dict(
+                    record, "", separator, convert_to_strings, null_value, boolean_format
+                ))
+            else:
+                flattened.append(dict(zip(plan.columns, map(convert, values))))
+        return flattened
+    
+    @staticmethod
+    def unflatten_many(
+        rows: Iterable[Dict[str, Any]],
+        separator: str = "."
+    ) -> List[Dict[str, Any]]:
+        """Unflatten many rows with the same columns, e.g. read from one CSV file.
+        
+        Gives the same result as calling unflatten_dict() on each row.
+        
+        Args:
+            rows: Flattened rows
+            separator: Separator used in the flattened keys
+            
+        Returns:
+            Nested records
+        """
+        plan = None
+        unflattened = []
+        for row in rows:
+            if plan is None:
+                plan = FlattenPlan.from_columns(list(row), separator)
+            unflattened.append(plan.unflatten(row) if plan else DataFlattener.unflatten_dict(row, separator))
+        return unflattened
+
+
+class _PlanNode:
+    """Node of the record shape a plan is compiled from."""
+    
+    def __init__(self, is_list: bool = False):
+        self.is_list = is_list
+        self.children: Dict[Any, Optional["_PlanNode"]] = {}
+
+
+def _literal(key: Any) -> str:
+    """Get the source literal of a dictionary key or list index."""
+    if type(key) not in (str, int):
+        raise ValueError(f"Cannot compile a plan for key {key!r}")
+    return repr(key)
+
+
+class FlattenPlan:
+    """Compiled flattening and unflattening of records with one shape.
+    
+    The shape (nested dictionary keys and list lengths) is compiled into
+    Python functions that read all leaf values into a tuple, or build the
+    nested record from a flat row, in a single call. Records of another
+    shape fall back to DataFlattener.
+    """
+    
+    def __init__(self, root: _PlanNode, separator: str = "."):
+        """Compile a plan for a record shape.
+        
+        Args:
+            root: Shape of the records
+            separator: Separator for nested keys
+            
+        Raises:
+            ValueError: If the shape cannot be compiled
+        """
+        self.separator = separator
+        self.paths: List[Tuple[Any, ...]] = []
+        self.columns: List[str] = []
+        self._collect(root, (), "")
+        self._values = self._compile_values(root)
+        self._build = self._compile_build(root)
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], separator: str = ".") -> "FlattenPlan":
+        """Compile a plan for records shaped like a sample record."""
+        def shape(value: Any, is_list: bool) -> _PlanNode:
+            node = _PlanNode(is_list)
+            items = enumerate(value) if is_list else value.items()
+            for key, item in items:
+                if isinstance(item, dict):
+                    node.children[key] = shape(item, False)
+                elif isinstance(item, list) and not is_list:
+                    node.children[key] = shape(item, True)
+                else:
+                    node.children[key] = None
+            return node
+        return cls(shape(record, False), separator)
+    
+    @classmethod
+    def from_schema(cls, schema: Dict[str, Any], separator: str = ".") -> "FlattenPlan":
+        """Compile a plan for records generated from an entity schema.
+        
+        Raises:
+            ValueError: If references or objects without properties make
+                the record shape unpredictable
+        """
+        def shape(fields: Dict[str, Any]) -> _PlanNode:
+            node = _PlanNode()
+            for field_name, field_config in fields.items():
+                field_type = field_config.get("type", "string")
+                if field_type == "reference":
+                    raise ValueError(f"Reference field '{field_name}' has no fixed shape")
+                if field_type == "object":
+                    if not field_config.get("properties"):
+                        raise ValueError(f"Object field '{field_name}' has no properties")
+                    node.children[field_name] = shape(field_config["properties"])
+                else:
+                    node.children[field_name] = None
+            return node
+        return cls(shape(schema), separator)
+    
+    @classmethod
+    def from_columns(cls, columns: Sequence[str], separator: str = ".") -> Optional["FlattenPlan"]:
+        """Compile a plan for flattened rows with the given columns.
+        
+        Returns:
+            Plan, or None if columns conflict (like ``a`` and ``a.b``) and
+            rows need unflatten_dict()'s handling
+        """
+        root = _PlanNode()
+        for column in columns:
+            if not isinstance(column, str):
+                return None
+            node = root
+            parts = column.split(separator)
+            for part in parts[:-1]:
+                child = node.children.setdefault(part, _PlanNode())
+                if child is None:
+                    return None
+                node = child
+            if parts[-1] in node.children:
+                return None
+            node.children[parts[-1]] = None
+        return cls(root, separator)
+    
+    def _collect(self, node: _PlanNode, path: Tuple[Any, ...], prefix: str) -> None:
+        for key, child in node.children.items():
+            if node.is_list:
+                column = f"{prefix}[{key}]"
+            else:
+                column = f"{prefix}{self.separator}{key}" if prefix else key
+            if child is None:
+                self.paths.append(path + (key,))
+                self.columns.append(column)
+            else:
+                self._collect(child, path + (key,), column)
+    
+    @staticmethod
+    def _compile(source: str, name: str) -> Callable:
+        namespace: Dict[str, Any] = {"Containers": (dict, list)}
+        try:
+            exec(compile(source, f"<flatten plan {name}>", "exec"), namespace)
+        except (SyntaxError, RecursionError, MemoryError) as e:
+            raise ValueError(f"Cannot compile flatten plan: {e}") from e
+        return namespace[name]
+    
+    def _compile_values(self, root: _PlanNode) -> Callable:
+        """Compile a function returning the leaf values, or None for other shapes."""
+        lines = ["def values(v0):"]
+        leaves: List[str] = []
+        counter = [0]
+        
+        def visit(node: _PlanNode, var: str) -> None:
+            container = "list" if node.is_list else "dict"
+            lines.append(f"    if type({var}) is not {container} or len({var}) != {len(node.children)}: return None")
+            for key, child in node.children.items():
+                counter[0] += 1
+                child_var = f"v{counter[0]}"
+                lines.append(f"    {child_var} = {var}[{_literal(key)}]")
+                if child is None:
+                    # Leaves must stay leaves; lists inside lists are values
+                    check = "is dict" if node.is_list else "in Containers"
+                    lines.append(f"    if type({child_var}) {check}: return None")
+                    leaves.append(child_var)
+                else:
+                    visit(child, child_var)
+        
+        visit(root, "v0")
+        lines.append(f"    return ({', '.join(leaves)}{',' if len(leaves) == 1 else ''})")
+        return self._compile("\n".join(lines), "values")
+    
+    def _compile_build(self, root: _PlanNode) -> Callable:
+        """Compile a function building the nested record from a flat row."""
+        columns = iter(self.columns)
+        
+        def literal(node: _PlanNode) -> str:
+            items = []
+            for key, child in node.children.items():
+                value = f"row[{_literal(next(columns))}]" if child is None else literal(child)
+                items.append(value if node.is_list else f"{_literal(key)}: {value}")
+            return f"[{', '.join(items)}]" if node.is_list else f"{{{', '.join(items)}}}"
+        
+        return self._compile(f"def build(row):\n    return {literal(root)}", "build")
+    
+    def values(self, record: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+        """Get the leaf values of a record in column order.
+        
+        Returns:
+            Values, or None if the record has another shape
+        """
+        try:
+            return self._values(record)
+        except (KeyError, IndexError):
+            return None
+    
+    def flatten(
+        self,
+        record: Dict[str, Any],
+        convert_to_strings: bool = True,
+        null_value: str = "",
+        boolean_format: str = "true_false"
+    ) -> Dict[str, Any]:
+        """Flatten a record like DataFlattener.flatten_dict()."""
+        values = self.values(record)
+        if values is None:
+            return DataFlattener.flatten_dict(
+                record, "", self.separator, convert_to_strings, null_value, boolean_format
+            )
+        convert = DataFlattener.value_converter(convert_to_strings, null_value, boolean_format)
+        return dict(zip(self.columns, map(convert, values)))
+    
+    def unflatten(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Unflatten a row like DataFlattener.unflatten_dict()."""
+        if len(row) == len(self.columns):
+            try:
+                return self._build(row)
+            except KeyError:
+                pass
+        return DataFlattener.unflatten_dict(row, self.separator)
+
+
+class FlattenPlanCache:
+    """Finds or compiles flatten plans for records of a few recurring shapes."""
+    
+    def __init__(self, separator: str = ".", max_plans: int = 16):
+        """Initialize the cache.
+        
+        Args:
+            separator: Separator for nested keys
+            max_plans: Shapes to compile before falling back to DataFlattener
+        """
+        self.separator = separator
+        self.max_plans = max_plans
+        self.plans: List[FlattenPlan] = []
+    
+    def add(self, plan: FlattenPlan) -> None:
+        """Add a plan, e.g. one compiled from the schema."""
+        self.plans.append(plan)
+    
+    def lookup(self, record: Dict[str, Any]) -> Tuple[Optional[FlattenPlan], Optional[Tuple[Any, ...]]]:
+        """Get a plan matching the record and the record's leaf values.
+        
+        Returns:
+            Tuple of plan and values, or (None, None) if no plan applies
+        """
+        for plan in self.plans:
+            values = plan.values(record)
+            if values is not None:
+                return plan, values
+        if len(self.plans) < self.max_plans:
+            try:
+                plan = FlattenPlan.from_record(record, self.separator)
+            except ValueError:
+                return None, None
+            values = plan.values(record)
+            if values is not None:
+                self.plans.append(plan)
+                return plan, values
+        return None, None
+
+
 # Convenience functions for common use cases
 def flatten_for_csv(data: Dict[str, Any], separator: str = ".") -> Dict[str, str]:
     """Convenience function to flatten data for CSV export.
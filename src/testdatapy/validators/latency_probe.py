@@ -0,0 +1,270 @@
+"""End-to-end produce-to-consume latency probe."""
+import json
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any, Dict, List, Optional
+
+from confluent_kafka import Consumer, KafkaError, TopicPartition
+from confluent_kafka import Producer as ConfluentProducer
+
+from testdatapy.metrics.latency import LatencyHistogram
+
+PROBE_HEADER = "testdatapy-probe"
+PROBE_KEY = b"__latency_probe__"
+
+
+class ProbeResult:
+    """Outcome of a latency probe run."""
+
+    def __init__(self, topics: List[str], interval: float):
+        """Initialize empty results.
+
+        Args:
+            topics: Probed topics
+            interval: Width of the throughput timeline buckets in seconds
+        """
+        self.topics = topics
+        self.interval = interval
+        self.sent: Dict[str, int] = {topic: 0 for topic in topics}
+        self.received: Dict[str, int] = {topic: 0 for topic in topics}
+        self.latency: Dict[str, LatencyHistogram] = {
+            topic: LatencyHistogram() for topic in topics
+        }
+        self.timeline: List[int] = []
+        self.duration = 0.0
+
+    @property
+    def lost(self) -> Dict[str, int]:
+        """Markers sent but not consumed back, per topic."""
+        return {topic: self.sent[topic] - self.received[topic] for topic in self.topics}
+
+    def overall_latency(self) -> LatencyHistogram:
+        """Latency histogram over all topics."""
+        overall = LatencyHistogram()
+        for histogram in self.latency.values():
+            overall.merge(histogram)
+        return overall
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the results to a dictionary.
+
+        Returns:
+            Per-topic counts and latency summaries plus the throughput timeline
+        """
+        return {
+            "duration_seconds": self.duration,
+            "topics": {
+                topic: {
+                    "sent": self.sent[topic],
+                    "received": self.received[topic],
+                    "lost": self.lost[topic],
+                    "latency": self.latency[topic].summary(),
+                }
+                for topic in self.topics
+            },
+            "overall_latency": self.overall_latency().summary(),
+            "timeline_interval_seconds": self.interval,
+            "timeline": list(self.timeline),
+        }
+
+    def format_report(self) -> List[str]:
+        """Format the results for the terminal.
+
+        Returns:
+            Report lines
+        """
+        lines = []
+        for topic in self.topics:
+            s = self.latency[topic].summary()
+            lines.append(
+                f"{topic}: {self.received[topic]}/{self.sent[topic]} markers, "
+                f"p50 {s['p50'] * 1000:.1f} ms, p99 {s['p99'] * 1000:.1f} ms, "
+                f"p999 {s['p999'] * 1000:.1f} ms, max {s['max'] * 1000:.1f} ms"
+            )
+        lines.append("Throughput over time (markers consumed/s):")
+        for i, count in enumerate(self.timeline):
+            lines.append(f"  {i * self.interval:6.1f}s  {count / self.interval:10.1f}")
+        return lines
+
+
+class LatencyProbe:
+    """Measures produce-to-consume latency with timestamped marker records.
+
+    Markers are JSON records carrying their send time and a probe header. The
+    consumer assigns every partition of the probed topics at the current end
+    offsets (no consumer group rebalance) before the first marker is sent, so
+    only this run's markers are measured.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers: str,
+        topics: List[str],
+        config: Optional[Dict[str, Any]] = None,
+        messages_per_topic: int = 1000,
+        rate: float = 1000.0,
+        timeout: float = 30.0,
+        interval: float = 1.0,
+        producer_factory: Callable[[Dict[str, Any]], Any] = ConfluentProducer,
+        consumer_factory: Callable[[Dict[str, Any]], Any] = Consumer,
+    ):
+        """Initialize the probe.
+
+        Args:
+            bootstrap_servers: Kafka bootstrap servers
+            topics: Topics to probe
+            config: Additional client configuration
+            messages_per_topic: Markers to send to each topic
+            rate: Markers per second across all topics (0 for unthrottled)
+            timeout: Maximum time to wait for markers after the last send
+            interval: Width of the throughput timeline buckets in seconds
+            producer_factory: Creates the producer (replaceable for tests)
+            consumer_factory: Creates the consumer (replaceable for tests)
+        """
+        if not topics:
+            raise ValueError("At least one topic is required for the latency probe")
+        self.bootstrap_servers = bootstrap_servers
+        self.topics = list(topics)
+        self.config = config or {}
+        self.messages_per_topic = messages_per_topic
+        self.rate = rate
+        self.timeout = timeout
+        self.interval = interval
+        self.producer_factory = producer_factory
+        self.consumer_factory = consumer_factory
+        self.probe_id = uuid.uuid4().hex
+        self._consumer_error: Optional[Exception] = None
+
+    def run(self) -> ProbeResult:
+        """Send markers, consume them back and measure latency.
+
+        Returns:
+            ProbeResult with per-topic latency and throughput over time
+        """
+        result = ProbeResult(self.topics, self.interval)
+        expected = self.messages_per_topic * len(self.topics)
+
+        consumer = self.consumer_factory({
+            "bootstrap.servers": self.bootstrap_servers,
+            "group.id": f"testdatapy-latency-probe-{self.probe_id}",
+            "enable.auto.commit": False,
+            **self.config,
+        })
+        producer = self.producer_factory({
+            "bootstrap.servers": self.bootstrap_servers,
+            **self.config,
+        })
+
+        try:
+            consumer.assign(self._end_offsets(consumer))
+
+            start = time.time()
+            done = threading.Event()
+            stop = threading.Event()
+            reader = threading.Thread(
+                target=self._consume,
+                args=(consumer, result, start, expected, done, stop),
+                daemon=True,
+            )
+            reader.start()
+
+            self._produce(producer, result)
+            producer.flush(self.timeout)
+
+            done.wait(self.timeout)
+            stop.set()
+            reader.join()
+            result.duration = time.time() - start
+        finally:
+            consumer.close()
+
+        if self._consumer_error is not None:
+            raise self._consumer_error
+
+        return result
+
+    def _end_offsets(self, consumer) -> List[TopicPartition]:
+        """Get the current end offset of every partition of the probed topics."""
+        assignment = []
+        for topic in self.topics:
+            metadata = consumer.list_topics(topic, timeout=10)
+            topic_metadata = metadata.topics.get(topic)
+            if topic_metadata is None or topic_metadata.error is not None:
+                raise ValueError(f"Topic '{topic}' is not available for the latency probe")
+            for partition in topic_metadata.partitions:
+                _, high = consumer.get_watermark_offsets(
+                    TopicPartition(topic, partition), timeout=10
+                )
+                assignment.append(TopicPartition(topic, partition, high))
+        return assignment
+
+    def _produce(self, producer, result: ProbeResult) -> None:
+        """Send markers round-robin across topics at the configured rate."""
+        headers = [(PROBE_HEADER, self.probe_id.encode("utf-8"))]
+        delay = 1.0 / self.rate if self.rate > 0 else 0.0
+        next_send = time.perf_counter()
+
+        for seq in range(self.messages_per_topic):
+            for topic in self.topics:
+                if delay:
+                    wait = next_send - time.perf_counter()
+                    if wait > 0:
+                        time.sleep(wait)
+                    next_send += delay
+
+                value = json.dumps({
+                    "probe_id": self.probe_id,
+                    "seq": seq,
+                    "sent_at": time.time(),
+                }).encode("utf-8")
+                producer.produce(topic=topic, key=PROBE_KEY, value=value, headers=headers)
+                result.sent[topic] += 1
+            producer.poll(0)
+
+    def _consume(
+        self,
+        consumer,
+        result: ProbeResult,
+        start: float,
+        expected: int,
+        done: threading.Event,
+        stop: threading.Event,
+    ) -> None:
+        """Read markers back until all arrived or the probe stops.
+
+        Messages are polled one at a time so each one is timestamped when it
+        is handed over, not when a batch fills up.
+        """
+        probe_id = self.probe_id.encode("utf-8")
+        received = 0
+
+        try:
+            while received < expected and not stop.is_set():
+                msg = consumer.poll(timeout=0.1)
+                if msg is None:
+                    continue
+                now = time.time()
+                if msg.error() is not None:
+                    if msg.error().code() != KafkaError._PARTITION_EOF:
+                        raise RuntimeError(f"Latency probe consumer error: {msg.error()}")
+                    continue
+                if (PROBE_HEADER, probe_id) not in (msg.headers() or []):
+                    continue
+
+                marker = json.loads(msg.value())
+                topic = msg.topic()
+                result.latency[topic].record(max(0.0, now - marker["sent_at"]))
+                result.received[topic] += 1
+                received += 1
+
+                bucket = int((now - start) / self.interval)
+                timeline = result.timeline
+                if bucket >= len(timeline):
+                    timeline.extend([0] * (bucket + 1 - len(timeline)))
+                timeline[bucket] += 1
+        except Exception as e:
+            self._consumer_error = e
+        finally:
+            done.set()
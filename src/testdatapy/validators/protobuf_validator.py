@@ -1,14 +1,258 @@
 """Utilities for validating protobuf data."""
 import json
+import multiprocessing
+import os
 import struct
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Any, Optional, Tuple, Dict, List
 from pathlib import Path
 
 from confluent_kafka import Consumer, KafkaError
 from confluent_kafka.schema_registry import SchemaRegistryClient
 from confluent_kafka.schema_registry.protobuf import ProtobufDeserializer
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
 from google.protobuf.message import Message
 
+from testdatapy.validators.topic_reader import Record, TopicReader
+
+# Records handed to a deserialization worker at once
+CHUNK_SIZE = 2000
+MAX_SAMPLES = 5
+
+
+def _proto_class_spec(proto_class: type) -> Tuple[str, Tuple[bytes, ...]]:
+    """Describe a protobuf class by its serialized file descriptors.
+
+    Generated classes often cannot be pickled (their ``__module__`` is the
+    bare ``*_pb2`` name), so worker processes rebuild them from this spec.
+    """
+    files: List[Any] = []
+
+    def collect(file_descriptor):
+        for dependency in file_descriptor.dependencies:
+            collect(dependency)
+        if file_descriptor not in files:
+            files.append(file_descriptor)
+
+    collect(proto_class.DESCRIPTOR.file)
+    return proto_class.DESCRIPTOR.full_name, tuple(f.serialized_pb for f in files)
+
+
+# Per-process caches of rebuilt classes and deserializers
+_PROTO_CLASSES: Dict[Tuple[str, Tuple[bytes, ...]], type] = {}
+_DESERIALIZERS: Dict[Any, ProtobufDeserializer] = {}
+
+
+def _load_proto_class(spec: Tuple[str, Tuple[bytes, ...]]) -> type:
+    """Rebuild a protobuf class from its spec (cached per process)."""
+    proto_class = _PROTO_CLASSES.get(spec)
+    if proto_class is None:
+        full_name, serialized_files = spec
+        pool = descriptor_pool.DescriptorPool()
+        for serialized in serialized_files:
+            pool.Add(descriptor_pb2.FileDescriptorProto.FromString(serialized))
+        proto_class = message_factory.GetMessageClass(pool.FindMessageTypeByName(full_name))
+        _PROTO_CLASSES[spec] = proto_class
+    return proto_class
+
+
+def _deserializer_for(proto: Any) -> ProtobufDeserializer:
+    """Get a deserializer for a protobuf class or class spec (cached per process)."""
+    deserializer = _DESERIALIZERS.get(proto)
+    if deserializer is None:
+        proto_class = _load_proto_class(proto) if isinstance(proto, tuple) else proto
+        deserializer = ProtobufDeserializer(proto_class, {'use.deprecated.format': False})
+        _DESERIALIZERS[proto] = deserializer
+    return deserializer
+
+
+def _analyze_value(
+    value: bytes,
+    deserializer: ProtobufDeserializer
+) -> Tuple[str, Optional[Message], Optional[str]]:
+    """Classify a message value as "json", "protobuf" or "invalid".
+
+    Returns:
+        Tuple of (kind, deserialized message, error_message)
+    """
+    # Check if it's JSON
+    try:
+        json_data = json.loads(value.decode('utf-8'))
+        # Additional check - if it has expected JSON structure
+        if isinstance(json_data, dict):
+            return "json", None, None
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        pass
+
+    # Check if it's valid protobuf
+    try:
+        proto_msg = deserializer(value, None)
+        # Verify it's a valid protobuf message
+        if isinstance(proto_msg, Message):
+            return "protobuf", proto_msg, None
+    except Exception as e:
+        return "invalid", None, str(e)
+
+    return "invalid", None, "Unknown format"
+
+
+def _empty_results(topic: str) -> Dict[str, Any]:
+    """Create an empty validation results dictionary."""
+    return {
+        "topic": topic,
+        "total_messages": 0,
+        "valid_protobuf": 0,
+        "json_messages": 0,
+        "invalid_messages": 0,
+        "empty_messages": 0,
+        "errors": [],
+        "message_samples": []
+    }
+
+
+def _add_percentages(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Add valid and JSON percentages to validation results."""
+    if results["total_messages"] > 0:
+        results["valid_percentage"] = (
+            results["valid_protobuf"] / results["total_messages"] * 100
+        )
+        results["json_percentage"] = (
+            results["json_messages"] / results["total_messages"] * 100
+        )
+    else:
+        results["valid_percentage"] = 0
+        results["json_percentage"] = 0
+    return results
+
+
+def _validate_chunk(
+    proto: Any,
+    records: List[Record],
+    max_errors: int,
+    max_samples: int
+) -> Dict[str, Any]:
+    """Validate a chunk of records; runs in a worker.
+
+    Args:
+        proto: Protobuf class, or class spec when running in another process
+        records: (partition, offset, key, value) tuples
+        max_errors: Maximum error messages to keep
+        max_samples: Maximum message samples to keep
+
+    Returns:
+        Partial validation results
+    """
+    deserializer = _deserializer_for(proto)
+    results = _empty_results("")
+    errors = results["errors"]
+    samples = results["message_samples"]
+    json_messages = valid = invalid = empty = 0
+
+    for partition, offset, key, value in records:
+        if not value:
+            empty += 1
+            continue
+
+        kind, proto_msg, error = _analyze_value(value, deserializer)
+        if kind == "protobuf":
+            valid += 1
+            if len(samples) < max_samples:
+                samples.append({
+                    "partition": partition,
+                    "offset": offset,
+                    "key": key.decode('utf-8', errors='replace') if key else None,
+                    "size_bytes": len(value),
+                    "sample_fields": _extract_sample_fields(proto_msg)
+                })
+        elif kind == "json":
+            json_messages += 1
+            if len(errors) < max_errors:
+                errors.append(
+                    f"Message at partition {partition} offset {offset} is JSON, not protobuf"
+                )
+        else:
+            invalid += 1
+            if error and len(errors) < max_errors:
+                errors.append(f"Message at partition {partition} offset {offset}: {error}")
+
+    results["total_messages"] = len(records)
+    results["valid_protobuf"] = valid
+    results["json_messages"] = json_messages
+    results["invalid_messages"] = invalid
+    results["empty_messages"] = empty
+    return results
+
+
+def _merge_results(
+    results: Dict[str, Any],
+    partial: Dict[str, Any],
+    max_errors: int,
+    max_samples: int
+) -> None:
+    """Merge partial validation results into the topic results."""
+    for field in ("total_messages", "valid_protobuf", "json_messages",
+                  "invalid_messages", "empty_messages"):
+        results[field] += partial[field]
+    results["errors"].extend(partial["errors"][:max_errors - len(results["errors"])])
+    results["message_samples"].extend(
+        partial["message_samples"][:max_samples - len(results["message_samples"])]
+    )
+
+
+def _extract_sample_fields(proto_msg: Message) -> Dict[str, Any]:
+    """Extract sample fields from a protobuf message."""
+    sample = {}
+
+    # Get first few fields
+    for field, value in proto_msg.ListFields():
+        field_name = field.name
+
+        # FieldDescriptor.label was removed in protobuf 7
+        repeated = (
+            field.is_repeated if hasattr(field, "is_repeated")
+            else field.label == field.LABEL_REPEATED
+        )
+
+        # Handle different field types
+        if field.type == field.TYPE_MESSAGE:
+            sample[field_name] = "<nested_message>"
+        elif repeated:
+            sample[field_name] = f"<repeated: {len(value)} items>"
+        else:
+            sample[field_name] = str(value)[:50]  # Truncate long values
+
+        if len(sample) >= 5:  # Limit to 5 fields
+            break
+
+    return sample
+
+
+def create_validation_executor(workers: Optional[int] = None) -> Executor:
+    """Create the worker pool used for deserialization.
+
+    Protobuf parsing holds the GIL, so a process pool is used where the
+    platform supports one, with a thread pool as fallback. Workers are
+    spawned rather than forked, since forking would copy the running
+    Kafka client's threads and locks in an undefined state.
+
+    Args:
+        workers: Number of workers (defaults to the CPU count)
+
+    Returns:
+        Executor for _validate_chunk calls
+    """
+    workers = workers or os.cpu_count() or 1
+    try:
+        return ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    except (OSError, NotImplementedError, ImportError):
+        return ThreadPoolExecutor(max_workers=workers)
+
 
 class ProtobufValidator:
     """Validates protobuf messages in Kafka topics."""
@@ -16,16 +260,19 @@ class ProtobufValidator:
     def __init__(
         self,
         bootstrap_servers: str,
-        schema_registry_url: Optional[str] = None
+        schema_registry_url: Optional[str] = None,
+        consumer_factory: Callable[[Dict[str, Any]], Any] = Consumer
     ):
         """Initialize the validator.
         
         Args:
             bootstrap_servers: Kafka bootstrap servers
             schema_registry_url: Schema Registry URL (optional)
+            consumer_factory: Creates consumers (replaceable for tests)
         """
         self.bootstrap_servers = bootstrap_servers
         self.schema_registry_url = schema_registry_url
+        self.consumer_factory = consumer_factory
         
         if schema_registry_url:
             self.sr_client = SchemaRegistryClient({"url": schema_registry_url})
@@ -60,21 +307,12 @@ class ProtobufValidator:
             "enable.auto.commit": False
         }
         
-        consumer = Consumer(consumer_config)
+        consumer = self.consumer_factory(consumer_config)
         consumer.subscribe([topic])
         
         deserializer = ProtobufDeserializer(proto_class, {'use.deprecated.format': False})
         
-        results = {
-            "topic": topic,
-            "total_messages": 0,
-            "valid_protobuf": 0,
-            "json_messages": 0,
-            "invalid_messages": 0,
-            "empty_messages": 0,
-            "errors": [],
-            "message_samples": []
-        }
+        results = _empty_results(topic)
         
         messages_processed = 0
         
@@ -134,19 +372,104 @@ class ProtobufValidator:
         finally:
             consumer.close()
         
-        # Calculate percentages
-        if results["total_messages"] > 0:
-            results["valid_percentage"] = (
-                results["valid_protobuf"] / results["total_messages"] * 100
-            )
-            results["json_percentage"] = (
-                results["json_messages"] / results["total_messages"] * 100
-            )
-        else:
-            results["valid_percentage"] = 0
-            results["json_percentage"] = 0
+        return _add_percentages(results)
+    
+    def validate_topic(
+        self,
+        topic: str,
+        proto_class: type,
+        max_messages: Optional[int] = None,
+        workers: Optional[int] = None,
+        batch_size: int = 1000,
+        executor: Optional[Executor] = None,
+        idle_timeout: float = 10.0,
+        max_errors: int = 100
+    ) -> Dict[str, Any]:
+        """Validate every message of a topic, reading all partitions in parallel.
         
-        return results
+        All partitions are read up to their end offsets as of the start with
+        a TopicReader and deserialized in a worker pool.
+        
+        Args:
+            topic: Topic to validate
+            proto_class: Protobuf message class
+            max_messages: Stop after this many messages (None for the full topic)
+            workers: Deserialization workers (1 validates inline)
+            batch_size: Messages per consume() call
+            executor: Shared worker pool (created and shut down here if None)
+            idle_timeout: Give up after this long without new messages
+            max_errors: Maximum error messages to keep
+            
+        Returns:
+            Validation results dictionary, including per-partition counts,
+            duration and messages per second
+        """
+        consumer = self.consumer_factory({
+            "bootstrap.servers": self.bootstrap_servers,
+            "group.id": f"protobuf_validator_{topic}_{uuid.uuid4().hex}",
+            "enable.auto.commit": False,
+            "enable.partition.eof": False
+        })
+        
+        results = _empty_results(topic)
+        results["partitions"] = {}
+        start = time.perf_counter()
+        
+        inline = executor is None and workers == 1
+        own_executor = executor is None and not inline
+        if own_executor:
+            executor = create_validation_executor(workers)
+        # Worker processes rebuild the class from its descriptors
+        proto = proto_class if inline or isinstance(executor, ThreadPoolExecutor) else (
+            _proto_class_spec(proto_class)
+        )
+        max_pending = 2 * (workers or os.cpu_count() or 1)
+        pending: deque = deque()
+        
+        def submit(records):
+            if inline:
+                _merge_results(results, _validate_chunk(proto, records, max_errors, MAX_SAMPLES),
+                               max_errors, MAX_SAMPLES)
+                return
+            pending.append(executor.submit(_validate_chunk, proto, records, max_errors, MAX_SAMPLES))
+            # Bound the records in flight
+            while len(pending) > max_pending:
+                _merge_results(results, pending.popleft().result(), max_errors, MAX_SAMPLES)
+        
+        try:
+            reader = TopicReader(consumer, topic, batch_size, idle_timeout)
+            partition_counts = {p: 0 for p in reader.end_offsets}
+            read = 0
+            chunk: List[Record] = []
+            
+            for batch in reader.batches():
+                if max_messages is not None:
+                    batch = batch[:max_messages - read]
+                for record in batch:
+                    partition_counts[record[0]] += 1
+                chunk.extend(batch)
+                read += len(batch)
+                if len(chunk) >= CHUNK_SIZE:
+                    submit(chunk)
+                    chunk = []
+                if max_messages is not None and read >= max_messages:
+                    break
+            
+            if chunk:
+                submit(chunk)
+            while pending:
+                _merge_results(results, pending.popleft().result(), max_errors, MAX_SAMPLES)
+            results["errors"].extend(reader.errors[:max_errors - len(results["errors"])])
+            results["partitions"] = partition_counts
+        finally:
+            consumer.close()
+            if own_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+        
+        duration = time.perf_counter() - start
+        results["duration_seconds"] = duration
+        results["messages_per_second"] = results["total_messages"] / duration if duration > 0 else 0.0
+        return _add_percentages(results)
     
     def _analyze_message_format(
         self,
@@ -159,59 +482,32 @@ class ProtobufValidator:
         Returns:
             Tuple of (is_json, is_protobuf, error_message)
         """
-        # Check if it's JSON
-        try:
-            json_data = json.loads(value.decode('utf-8'))
-            # Additional check - if it has expected JSON structure
-            if isinstance(json_data, dict):
-                return True, False, None
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            pass
-        
-        # Check if it's valid protobuf
-        try:
-            proto_msg = deserializer(value, None)
-            # Verify it's a valid protobuf message
-            if isinstance(proto_msg, Message):
-                return False, True, None
-        except Exception as e:
-            return False, False, str(e)
-        
-        return False, False, "Unknown format"
+        kind, _, error = _analyze_value(value, deserializer)
+        return kind == "json", kind == "protobuf", error
     
     def _extract_sample_fields(self, proto_msg: Message) -> Dict[str, Any]:
         """Extract sample fields from a protobuf message."""
-        sample = {}
-        
-        # Get first few fields
-        for field, value in proto_msg.ListFields():
-            field_name = field.name
-            
-            # Handle different field types
-            if field.type == field.TYPE_MESSAGE:
-                sample[field_name] = "<nested_message>"
-            elif field.label == field.LABEL_REPEATED:
-                sample[field_name] = f"<repeated: {len(value)} items>"
-            else:
-                sample[field_name] = str(value)[:50]  # Truncate long values
-            
-            if len(sample) >= 5:  # Limit to 5 fields
-                break
-        
-        return sample
+        return _extract_sample_fields(proto_msg)
     
     def compare_topics(
         self,
         topics: List[str],
         proto_classes: Dict[str, type],
-        sample_size: int = 100
+        sample_size: int = 100,
+        full: bool = False,
+        workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """Compare multiple topics for protobuf compliance.
         
+        Topics are validated in parallel; in full mode they share one
+        deserialization worker pool.
+        
         Args:
             topics: List of topics to compare
             proto_classes: Map of topic to protobuf class
-            sample_size: Messages to sample per topic
+            sample_size: Messages to sample per topic (ignored in full mode)
+            full: Validate every message with validate_topic()
+            workers: Deserialization workers for full mode
             
         Returns:
             Comparison results
@@ -226,15 +522,30 @@ class ProtobufValidator:
             }
         }
         
+        validated = [topic for topic in topics if proto_classes.get(topic)]
+        executor = create_validation_executor(workers) if full and validated and workers != 1 else None
+        
+        def validate(topic):
+            if full:
+                return self.validate_topic(
+                    topic, proto_classes[topic], workers=workers, executor=executor
+                )
+            return self.validate_topic_messages(topic, proto_classes[topic], sample_size)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(validated))) as topic_pool:
+                futures = {topic: topic_pool.submit(validate, topic) for topic in validated}
+                topic_results_by_topic = {topic: f.result() for topic, f in futures.items()}
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        
         for topic in topics:
-            proto_class = proto_classes.get(topic)
-            if not proto_class:
+            if topic not in topic_results_by_topic:
                 results["topics"][topic] = {"error": "No protobuf class provided"}
                 continue
             
-            topic_results = self.validate_topic_messages(
-                topic, proto_class, sample_size
-            )
+            topic_results = topic_results_by_topic[topic]
             results["topics"][topic] = topic_results
             
             # Update summary
@@ -289,7 +600,9 @@ def validate_protobuf_production(
     topics: List[str],
     proto_classes: Dict[str, type],
     schema_registry_url: Optional[str] = None,
-    sample_size: int = 100
+    sample_size: int = 100,
+    full: bool = False,
+    workers: Optional[int] = None
 ) -> None:
     """Validate protobuf production across multiple topics.
     
@@ -299,23 +612,31 @@ def validate_protobuf_production(
         proto_classes: Map of topic to protobuf class
         schema_registry_url: Schema Registry URL
         sample_size: Messages to sample per topic
+        full: Validate every message instead of a sample
+        workers: Deserialization workers for full validation
     """
     validator = ProtobufValidator(bootstrap_servers, schema_registry_url)
     
     print("Protobuf Production Validation Report")
     print("=" * 50)
     
-    # Validate each topic
+    comparison = validator.compare_topics(
+        topics, proto_classes, sample_size, full=full, workers=workers
+    )
+    
+    # Report each topic
     for topic in topics:
-        proto_class = proto_classes.get(topic)
-        if not proto_class:
-            print(f"\n❌ {topic}: No protobuf class provided")
+        results = comparison["topics"][topic]
+        if "error" in results:
+            print(f"\n❌ {topic}: {results['error']}")
             continue
         
         print(f"\nValidating topic: {topic}")
-        results = validator.validate_topic_messages(topic, proto_class, sample_size)
-        
-        print(f"  Total messages sampled: {results['total_messages']}")
+        if full:
+            print(f"  Total messages validated: {results['total_messages']} "
+                  f"({results['messages_per_second']:,.0f} msg/s)")
+        else:
+            print(f"  Total messages sampled: {results['total_messages']}")
         print(f"  Valid protobuf: {results['valid_protobuf']} ({results['valid_percentage']:.1f}%)")
         print(f"  JSON messages: {results['json_messages']} ({results['json_percentage']:.1f}%)")
         print(f"  Invalid messages: {results['invalid_messages']}")
@@ -0,0 +1,618 @@
+"""Referential-integrity verification of produced correlated topics."""
+import hashlib
+import json
+import math
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from confluent_kafka import Consumer
+from confluent_kafka.schema_registry.protobuf import ProtobufDeserializer
+from google.protobuf.json_format import MessageToDict
+
+from testdatapy.config.correlation_config import CorrelationConfig
+from testdatapy.validators.topic_reader import TopicReader
+
+KEY_SET_TYPES = ("bloom", "exact")
+MAX_ORPHAN_SAMPLES = 10
+
+
+def hash_keys(values: Iterable[Any]) -> np.ndarray:
+    """Hash key values to 64-bit integers.
+
+    Values are compared as strings, so ``42`` and ``"42"`` are the same key.
+
+    Args:
+        values: Key values
+
+    Returns:
+        uint64 array of hashes
+    """
+    digests = b"".join(
+        hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+        for value in values
+    )
+    return np.frombuffer(digests, dtype="<u8")
+
+
+class BloomFilter:
+    """Bloom filter over 64-bit key hashes.
+
+    Uses about 1.44 * log2(1 / error_rate) bits per key (14.4 bits at 0.1%),
+    independent of the key length. Membership checks have no false
+    negatives; false positives can hide orphans, never invent them.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """Size the filter.
+
+        Args:
+            capacity: Expected number of keys
+            error_rate: Target false-positive rate at capacity
+        """
+        capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        """Bit positions of each hash (one row per hash function).
+
+        Uses double hashing: position_i = h1 + i * h2, with h1 and h2 the
+        halves of the 64-bit hash.
+        """
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        i = np.arange(self.num_hashes, dtype=np.uint64)[:, None]
+        return (h1[None, :] + i * h2[None, :]) % np.uint64(self.num_bits)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """Add key hashes to the filter."""
+        positions = self._positions(hashes).ravel()
+        np.bitwise_or.at(
+            self._bits,
+            positions >> np.uint64(3),
+            np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8)),
+        )
+        self.count += len(hashes)
+
+    def contains_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        """Check key hashes for membership.
+
+        Returns:
+            Boolean array, True where the key may be present
+        """
+        positions = self._positions(hashes)
+        bits = (self._bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=0)
+
+    def freeze(self) -> None:
+        """Finish adding keys (no-op for Bloom filters)."""
+
+    @property
+    def memory_bytes(self) -> int:
+        """Memory used by the filter."""
+        return self._bits.nbytes
+
+
+class SortedKeySet:
+    """Exact key set stored as a sorted array of 64-bit key hashes.
+
+    Uses 8 bytes per distinct key; lookups are vectorized binary searches.
+    Exact up to 64-bit hash collisions.
+    """
+
+    def __init__(self, capacity: int = 0):
+        """Initialize an empty set.
+
+        Args:
+            capacity: Expected number of keys (unused, for a common signature)
+        """
+        self._chunks: List[np.ndarray] = []
+        self._sorted = np.empty(0, dtype=np.uint64)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """Add key hashes to the set."""
+        self._chunks.append(np.array(hashes, dtype=np.uint64))
+
+    def freeze(self) -> None:
+        """Sort and deduplicate the added keys; call before lookups."""
+        if self._chunks:
+            self._sorted = np.unique(np.concatenate([self._sorted, *self._chunks]))
+            self._chunks = []
+
+    def contains_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        """Check key hashes for membership.
+
+        Returns:
+            Boolean array, True where the key is present
+        """
+        if not len(self._sorted):
+            return np.zeros(len(hashes), dtype=bool)
+        index = np.searchsorted(self._sorted, hashes)
+        index[index == len(self._sorted)] = 0
+        return self._sorted[index] == hashes
+
+    @property
+    def count(self) -> int:
+        """Number of distinct keys (after freeze())."""
+        return len(self._sorted)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Memory used by the set."""
+        return self._sorted.nbytes + sum(c.nbytes for c in self._chunks)
+
+
+def create_key_set(kind: str, capacity: int, error_rate: float = 0.001):
+    """Create a compact key set.
+
+    Args:
+        kind: One of KEY_SET_TYPES
+        capacity: Expected number of keys
+        error_rate: False-positive rate for Bloom filters
+
+    Returns:
+        BloomFilter or SortedKeySet
+    """
+    if kind == "bloom":
+        return BloomFilter(capacity, error_rate)
+    if kind == "exact":
+        return SortedKeySet(capacity)
+    raise ValueError(f"Unknown key set type: {kind}")
+
+
+def get_path(record: Dict[str, Any], path: str) -> Any:
+    """Get a value by dotted path; ``field[].item`` collects from list items.
+
+    Returns:
+        The value, a list of values for ``[]`` paths, or None if missing
+    """
+    head, _, rest = path.partition(".")
+    if head.endswith("[]"):
+        items = record.get(head[:-2]) if isinstance(record, dict) else None
+        if not isinstance(items, list):
+            return None
+        values = [get_path(item, rest) if rest else item for item in items]
+        return [v for v in values if v is not None]
+    value = record.get(head) if isinstance(record, dict) else None
+    if rest and value is not None:
+        return get_path(value, rest)
+    return value
+
+
+class Relationship:
+    """A reference from a transactional entity field to another entity's field."""
+
+    def __init__(
+        self,
+        source: str,
+        source_topic: str,
+        field: str,
+        record_path: str,
+        target: str,
+        target_topic: str,
+        target_path: str,
+        percentage: Optional[float] = None
+    ):
+        """Initialize the relationship.
+
+        Args:
+            source: Referencing entity
+            source_topic: Topic of the referencing entity
+            field: Relationship field name in the configuration
+            record_path: Path of the referencing value in produced records
+            target: Referenced entity
+            target_topic: Topic of the referenced entity
+            target_path: Path of the referenced key in target records
+            percentage: Configured correlation percentage, if any
+        """
+        self.source = source
+        self.source_topic = source_topic
+        self.field = field
+        self.record_path = record_path
+        self.target = target
+        self.target_topic = target_topic
+        self.target_path = target_path
+        self.percentage = percentage
+
+    @property
+    def name(self) -> str:
+        """Readable name like ``orders.customer_id -> customers.customer_id``."""
+        return f"{self.source}.{self.field} -> {self.target}.{self.target_path}"
+
+
+def _record_path(entity_config: Dict[str, Any], field: str, references: str) -> str:
+    """Find the record field that carries a relationship value.
+
+    Relationship fields are dropped from produced records unless a derived
+    ``reference`` field copies them (``source: self.<field>``, or ``source``
+    equal to the reference with ``via: <field>``).
+    """
+    for name, derived in entity_config.get("derived_fields", {}).items():
+        if not isinstance(derived, dict) or derived.get("type") != "reference":
+            continue
+        source = derived.get("source", "")
+        if source == f"self.{field}" or (source == references and derived.get("via") == field):
+            return name
+    return field
+
+
+def relationships_from_config(config: CorrelationConfig) -> List[Relationship]:
+    """Collect the verifiable relationships of a correlation configuration.
+
+    Args:
+        config: Correlation configuration
+
+    Returns:
+        Relationships whose source and target entities have Kafka topics
+    """
+    topics = {}
+    for section in ("master_data", "transactional_data"):
+        for name, entity_config in config.config.get(section, {}).items():
+            if entity_config.get("kafka_topic"):
+                topics[name] = entity_config["kafka_topic"]
+
+    relationships = []
+    for name, entity_config in config.config.get("transactional_data", {}).items():
+        if name not in topics:
+            continue
+        for field, rel_config in entity_config.get("relationships", {}).items():
+            if not isinstance(rel_config, dict):
+                continue
+            if rel_config.get("type") == "array":
+                references = [
+                    (f"{field}[].{item_field}", item_config)
+                    for item_field, item_config in rel_config.get("item_schema", {}).items()
+                    if isinstance(item_config, dict) and "references" in item_config
+                ]
+            elif "references" in rel_config:
+                references = [(_record_path(entity_config, field, rel_config["references"]), rel_config)]
+            else:
+                continue
+
+            for record_path, ref_config in references:
+                target, _, target_path = ref_config["references"].partition(".")
+                if target not in topics or not target_path:
+                    continue
+                relationships.append(Relationship(
+                    source=name,
+                    source_topic=topics[name],
+                    field=field if "[]" not in record_path else record_path,
+                    record_path=record_path,
+                    target=target,
+                    target_topic=topics[target],
+                    target_path=target_path,
+                    percentage=ref_config.get("percentage"),
+                ))
+    return relationships
+
+
+class RelationshipResult:
+    """Join statistics of one relationship."""
+
+    def __init__(self, relationship: Relationship):
+        """Initialize empty statistics."""
+        self.relationship = relationship
+        self.records = 0
+        self.references = 0
+        self.null_references = 0
+        self.hits = 0
+        self.orphan_samples: List[Any] = []
+
+    @property
+    def orphans(self) -> int:
+        """References to keys that do not exist in the target topic."""
+        return self.references - self.hits
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of non-null references found in the target topic."""
+        return self.hits / self.references if self.references else 1.0
+
+    @property
+    def correlation_percentage(self) -> float:
+        """Share of records carrying a reference, in percent."""
+        records_with_reference = self.records - self.null_references
+        return records_with_reference / self.records * 100 if self.records else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the statistics to a dictionary."""
+        return {
+            "relationship": self.relationship.name,
+            "source_topic": self.relationship.source_topic,
+            "target_topic": self.relationship.target_topic,
+            "records": self.records,
+            "references": self.references,
+            "null_references": self.null_references,
+            "hits": self.hits,
+            "orphans": self.orphans,
+            "hit_ratio": self.hit_ratio,
+            "correlation_percentage": self.correlation_percentage,
+            "expected_percentage": self.relationship.percentage,
+            "orphan_samples": list(self.orphan_samples),
+        }
+
+
+class VerificationResult:
+    """Outcome of a referential-integrity verification."""
+
+    def __init__(self, key_set_type: str, error_rate: float):
+        """Initialize empty results.
+
+        Args:
+            key_set_type: Key set used for referenced keys
+            error_rate: Bloom filter false-positive rate
+        """
+        self.key_set_type = key_set_type
+        self.error_rate = error_rate
+        self.relationships: List[RelationshipResult] = []
+        # "entity.path" -> {"topic", "keys", "memory_bytes"}
+        self.key_sets: Dict[str, Dict[str, Any]] = {}
+        self.errors: List[str] = []
+        self.duration = 0.0
+
+    @property
+    def passed(self) -> bool:
+        """True if no relationship has orphans."""
+        return not any(r.orphans for r in self.relationships)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the results to a dictionary."""
+        return {
+            "passed": self.passed,
+            "key_set_type": self.key_set_type,
+            "error_rate": self.error_rate if self.key_set_type == "bloom" else 0.0,
+            "duration_seconds": self.duration,
+            "key_sets": self.key_sets,
+            "relationships": [r.to_dict() for r in self.relationships],
+            "errors": list(self.errors),
+        }
+
+    def format_report(self) -> List[str]:
+        """Format the results for the terminal.
+
+        Returns:
+            Report lines
+        """
+        lines = []
+        for name, key_set in self.key_sets.items():
+            lines.append(
+                f"{name}: {key_set['keys']:,} keys from {key_set['topic']} "
+                f"({key_set['memory_bytes'] / 1024 / 1024:.1f} MB {self.key_set_type})"
+            )
+        for result in self.relationships:
+            expected = result.relationship.percentage
+            correlation = f"{result.correlation_percentage:.1f}% correlated"
+            if expected is not None:
+                correlation += f" (configured {expected}%)"
+            lines.append(
+                f"{result.relationship.name}: hit ratio {result.hit_ratio:.4%}, "
+                f"{result.orphans:,} orphans of {result.references:,} references, {correlation}"
+            )
+            if result.orphan_samples:
+                samples = ", ".join(str(s) for s in result.orphan_samples[:5])
+                lines.append(f"  orphan samples: {samples}")
+        return lines
+
+
+def json_decoder(value: bytes) -> Any:
+    """Decode a JSON message value."""
+    return json.loads(value)
+
+
+def protobuf_decoder(proto_class: type) -> Callable[[bytes], Dict[str, Any]]:
+    """Build a decoder for Schema Registry framed protobuf values.
+
+    Args:
+        proto_class: Protobuf message class
+
+    Returns:
+        Function decoding a value to a dictionary keyed by proto field names
+    """
+    deserializer = ProtobufDeserializer(proto_class, {"use.deprecated.format": False})
+
+    def decode(value: bytes) -> Dict[str, Any]:
+        return MessageToDict(deserializer(value, None), preserving_proto_field_name=True)
+
+    return decode
+
+
+class ReferentialIntegrityVerifier:
+    """Streams correlated topics back and checks that references join.
+
+    Referenced topics are read first into compact key sets (a Bloom filter
+    or a sorted array of 64-bit key hashes), then referencing topics are
+    streamed and checked batch by batch. Memory depends only on the number
+    of referenced keys, not on record sizes or the referencing topics.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers: str,
+        config: CorrelationConfig,
+        client_config: Optional[Dict[str, Any]] = None,
+        key_set_type: str = "bloom",
+        error_rate: float = 0.001,
+        decoders: Optional[Dict[str, Callable[[bytes], Any]]] = None,
+        batch_size: int = 5000,
+        idle_timeout: float = 10.0,
+        consumer_factory: Callable[[Dict[str, Any]], Any] = Consumer
+    ):
+        """Initialize the verifier.
+
+        Args:
+            bootstrap_servers: Kafka bootstrap servers
+            config: Correlation configuration defining the relationships
+            client_config: Additional consumer configuration
+            key_set_type: One of KEY_SET_TYPES
+            error_rate: False-positive rate for Bloom filters
+            decoders: Entity name to value decoder (JSON by default)
+            batch_size: Messages per consume() call
+            idle_timeout: Give up on a topic after this long without messages
+            consumer_factory: Creates consumers (replaceable for tests)
+        """
+        if key_set_type not in KEY_SET_TYPES:
+            raise ValueError(f"Unknown key set type: {key_set_type}")
+        self.bootstrap_servers = bootstrap_servers
+        self.config = config
+        self.client_config = client_config or {}
+        self.key_set_type = key_set_type
+        self.error_rate = error_rate
+        self.decoders = decoders or {}
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self.consumer_factory = consumer_factory
+        self.relationships = relationships_from_config(config)
+
+    def run(self) -> VerificationResult:
+        """Verify all relationships.
+
+        Returns:
+            VerificationResult with per-relationship join statistics
+        """
+        result = VerificationResult(self.key_set_type, self.error_rate)
+        start = time.perf_counter()
+
+        # Referenced key paths per target entity and topic
+        targets: Dict[Tuple[str, str], List[str]] = {}
+        for relationship in self.relationships:
+            paths = targets.setdefault((relationship.target, relationship.target_topic), [])
+            if relationship.target_path not in paths:
+                paths.append(relationship.target_path)
+
+        # Referencing relationships per source entity and topic
+        sources: Dict[Tuple[str, str], List[RelationshipResult]] = {}
+        for relationship in self.relationships:
+            relationship_result = RelationshipResult(relationship)
+            result.relationships.append(relationship_result)
+            sources.setdefault((relationship.source, relationship.source_topic), []).append(
+                relationship_result
+            )
+
+        # Topics are read in parallel: all referenced topics first, then the
+        # referencing ones (a topic can be both, e.g. orders for payments)
+        key_sets: Dict[Tuple[str, str], Any] = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(targets), len(sources))) as pool:
+            futures = [
+                pool.submit(self._load_keys, entity, topic, paths, result)
+                for (entity, topic), paths in targets.items()
+            ]
+            for future in futures:
+                key_sets.update(future.result())
+
+            futures = [
+                pool.submit(self._check_references, entity, topic, stats, key_sets, result)
+                for (entity, topic), stats in sources.items()
+            ]
+            for future in futures:
+                future.result()
+
+        result.duration = time.perf_counter() - start
+        return result
+
+    def _reader(self, topic: str) -> TopicReader:
+        """Create a reader over a topic snapshot."""
+        consumer = self.consumer_factory({
+            "bootstrap.servers": self.bootstrap_servers,
+            "group.id": f"testdatapy-verify-{uuid.uuid4().hex}",
+            "enable.auto.commit": False,
+            "enable.partition.eof": False,
+            **self.client_config,
+        })
+        try:
+            return TopicReader(consumer, topic, self.batch_size, self.idle_timeout)
+        except Exception:
+            consumer.close()
+            raise
+
+    def _records(self, entity: str, reader: TopicReader, result: VerificationResult):
+        """Decode the records of a topic batch by batch."""
+        decode = self.decoders.get(entity, json_decoder)
+        for batch in reader.batches():
+            records = []
+            for _, offset, _, value in batch:
+                if not value:
+                    continue
+                try:
+                    records.append(decode(value))
+                except Exception as e:
+                    if len(result.errors) < 100:
+                        result.errors.append(f"{reader.topic} offset {offset}: {e}")
+            yield records
+        result.errors.extend(reader.errors)
+
+    def _load_keys(
+        self,
+        entity: str,
+        topic: str,
+        paths: List[str],
+        result: VerificationResult
+    ) -> Dict[Tuple[str, str], Any]:
+        """Read a referenced topic into one key set per referenced path."""
+        reader = self._reader(topic)
+        try:
+            key_sets = {
+                path: create_key_set(self.key_set_type, reader.total, self.error_rate)
+                for path in paths
+            }
+            for records in self._records(entity, reader, result):
+                for path, key_set in key_sets.items():
+                    values = [get_path(record, path) for record in records]
+                    key_set.add_hashes(hash_keys(v for v in values if v is not None))
+        finally:
+            reader.consumer.close()
+
+        for path, key_set in key_sets.items():
+            key_set.freeze()
+            result.key_sets[f"{entity}.{path}"] = {
+                "topic": topic,
+                "keys": key_set.count,
+                "memory_bytes": key_set.memory_bytes,
+            }
+        return {(entity, path): key_set for path, key_set in key_sets.items()}
+
+    def _check_references(
+        self,
+        entity: str,
+        topic: str,
+        relationship_results: List[RelationshipResult],
+        key_sets: Dict[Tuple[str, str], Any],
+        result: VerificationResult
+    ) -> None:
+        """Stream a referencing topic and look up its references."""
+        reader = self._reader(topic)
+        try:
+            for records in self._records(entity, reader, result):
+                for stats in relationship_results:
+                    relationship = stats.relationship
+                    values = []
+                    for record in records:
+                        value = get_path(record, relationship.record_path)
+                        if isinstance(value, list):
+                            if not value:
+                                stats.null_references += 1
+                            values.extend(value)
+                        elif value is None:
+                            stats.null_references += 1
+                        else:
+                            values.append(value)
+                    stats.records += len(records)
+                    if not values:
+                        continue
+
+                    key_set = key_sets[(relationship.target, relationship.target_path)]
+                    found = key_set.contains_hashes(hash_keys(values))
+                    stats.references += len(values)
+                    stats.hits += int(found.sum())
+                    if len(stats.orphan_samples) < MAX_ORPHAN_SAMPLES:
+                        for index in np.flatnonzero(~found)[:MAX_ORPHAN_SAMPLES]:
+                            if len(stats.orphan_samples) < MAX_ORPHAN_SAMPLES:
+                                stats.orphan_samples.append(values[index])
+        finally:
+            reader.consumer.close()
@@ -0,0 +1,122 @@
+"""Partition-parallel reading of a topic snapshot."""
+import time
+from collections.abc import Iterator
+from typing import Dict, List, Optional, Tuple
+
+from confluent_kafka import KafkaError, TopicPartition
+
+# (partition, offset, key, value)
+Record = Tuple[int, int, Optional[bytes], Optional[bytes]]
+
+
+class TopicReader:
+    """Reads every partition of a topic up to its end offsets as of the start.
+
+    All partitions are assigned explicitly from their low watermark (no
+    consumer group rebalance) and read with batched ``consume()`` calls.
+    Partitions are paused once they reach their end offset, so messages
+    produced while reading are not included.
+    """
+
+    def __init__(
+        self,
+        consumer,
+        topic: str,
+        batch_size: int = 1000,
+        idle_timeout: float = 10.0
+    ):
+        """Initialize the reader and assign the partitions.
+
+        Args:
+            consumer: Consumer created without a subscription
+            topic: Topic to read
+            batch_size: Messages per consume() call
+            idle_timeout: Give up after this long without new messages
+
+        Raises:
+            ValueError: If the topic does not exist
+        """
+        self.consumer = consumer
+        self.topic = topic
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self.errors: List[str] = []
+        # Messages in the snapshot, including offsets taken by transaction markers
+        self.total = 0
+        self.end_offsets = self._assign_partitions()
+
+    def _assign_partitions(self) -> Dict[int, int]:
+        """Assign all non-empty partitions from their low watermark.
+
+        Returns:
+            Mapping of partition to the high watermark to read up to
+        """
+        metadata = self.consumer.list_topics(self.topic, timeout=10)
+        topic_metadata = metadata.topics.get(self.topic)
+        if topic_metadata is None or topic_metadata.error is not None:
+            raise ValueError(f"Topic '{self.topic}' is not available")
+
+        assignment = []
+        end_offsets = {}
+        for partition in sorted(topic_metadata.partitions):
+            low, high = self.consumer.get_watermark_offsets(
+                TopicPartition(self.topic, partition), timeout=10
+            )
+            if high > low:
+                assignment.append(TopicPartition(self.topic, partition, low))
+                end_offsets[partition] = high
+                self.total += high - low
+        self.consumer.assign(assignment)
+        return end_offsets
+
+    def batches(self) -> Iterator[List[Record]]:
+        """Read the topic in batches.
+
+        Yields:
+            Lists of (partition, offset, key, value) records
+        """
+        remaining = dict(self.end_offsets)
+        last_progress = time.monotonic()
+
+        while remaining:
+            messages = self.consumer.consume(num_messages=self.batch_size, timeout=1.0)
+            if not messages:
+                # Transaction markers or compaction can leave the last
+                # offsets before the high watermark without records
+                self._drop_finished(remaining)
+                if remaining and time.monotonic() - last_progress > self.idle_timeout:
+                    self.errors.append(
+                        f"Stopped after {self.idle_timeout:.0f}s without messages before "
+                        f"reaching the end of partitions {sorted(remaining)}"
+                    )
+                    return
+                continue
+            last_progress = time.monotonic()
+
+            batch = []
+            for msg in messages:
+                if msg.error():
+                    if msg.error().code() != KafkaError._PARTITION_EOF:
+                        self.errors.append(f"Consumer error: {msg.error()}")
+                    continue
+                partition = msg.partition()
+                end = remaining.get(partition)
+                offset = msg.offset()
+                # Skip messages produced after reading started
+                if end is None or offset >= end:
+                    continue
+                if offset + 1 >= end:
+                    del remaining[partition]
+                    self.consumer.pause([TopicPartition(self.topic, partition)])
+                batch.append((partition, offset, msg.key(), msg.value()))
+            if batch:
+                yield batch
+
+    def _drop_finished(self, remaining: Dict[int, int]) -> None:
+        """Drop partitions whose consumer position reached their end offset."""
+        positions = self.consumer.position(
+            [TopicPartition(self.topic, p) for p in remaining]
+        )
+        for tp in positions:
+            if tp.offset >= 0 and tp.offset >= remaining.get(tp.partition, 0):
+                del remaining[tp.partition]
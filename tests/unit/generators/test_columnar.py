@@ -0,0 +1,312 @@
+"""Tests for columnar master data generation."""
+import uuid
+
+import numpy as np
+import pytest
+
+from testdatapy.config.correlation_config import CorrelationConfig
+from testdatapy.generators.columnar import (
+    ColumnarGenerator,
+    ColumnarRecordCache,
+    ColumnarRecords,
+    supports_schema,
+)
+from testdatapy.generators.master_data_generator import MasterDataGenerator
+from testdatapy.generators.reference_pool import ReferencePool
+
+
+def _row_generator(field_name, field_config, index):
+    return f"{field_name}-{index}"
+
+
+SCHEMA = {
+    "customer_id": {"type": "string", "format": "CUST_{seq:04d}"},
+    "name": {"type": "faker", "method": "name"},
+    "tier": {"type": "weighted_choice", "choices": ["gold", "silver"], "weights": [0.9, 0.1]},
+    "credit": {"type": "float", "min": 10.0, "max": 20.0},
+    "age": {"type": "integer", "min": 18, "max": 20},
+    "id": {"type": "uuid"},
+    "created_at": {"type": "timestamp"},
+}
+
+
+class TestColumnarGenerator:
+    """Test column generation."""
+
+    def _generate(self, count=1000, counters=None, schema=SCHEMA, **kwargs):
+        generator = ColumnarGenerator(rng=np.random.default_rng(42), **kwargs)
+        counters = {} if counters is None else counters
+        return generator.generate("customers", schema, count, _row_generator, counters)
+
+    def test_generates_plain_python_records(self):
+        """Records contain Python values in schema field order."""
+        records = self._generate(count=10)
+
+        record = records[0]
+        assert list(record) == list(SCHEMA)
+        assert record["customer_id"] == "CUST_0001"
+        assert type(record["credit"]) is float
+        assert type(record["age"]) is int
+        assert record["created_at"] == "created_at-0"
+
+    def test_value_ranges(self):
+        """Numbers stay within the configured bounds, inclusive."""
+        records = self._generate()
+
+        ages = records.column_values("age")
+        assert set(ages) == {18, 19, 20}
+        credits = records.column_values("credit")
+        assert all(10.0 <= c <= 20.0 for c in credits)
+        assert all(round(c, 2) == c for c in credits)
+
+    def test_weighted_choice_distribution(self):
+        """Weighted choices follow their weights."""
+        tiers = self._generate(count=10000).column_values("tier")
+
+        assert 0.87 < tiers.count("gold") / len(tiers) < 0.93
+
+    def test_uuids_are_valid_version_4(self):
+        """UUIDs are distinct, well-formed UUID4 strings."""
+        ids = self._generate().column_values("id")
+
+        assert len(set(ids)) == len(ids)
+        for value in ids[:50]:
+            parsed = uuid.UUID(value)
+            assert str(parsed) == value
+            assert parsed.version == 4
+
+    def test_sequence_counters_continue(self):
+        """Sequence fields continue from the shared counters."""
+        counters = {"customers_customer_id": 5}
+        records = self._generate(count=3, counters=counters)
+
+        assert records.column_values("customer_id") == ["CUST_0005", "CUST_0006", "CUST_0007"]
+        assert counters["customers_customer_id"] == 8
+
+    def test_faker_values_drawn_from_pool(self):
+        """Faker fields reuse a pool of row-generated values."""
+        names = self._generate(count=500, faker_pool_size=20).column_values("name")
+
+        assert set(names) <= {f"name-{i}" for i in range(20)}
+        small = self._generate(count=5, faker_pool_size=20).column_values("name")
+        assert small == [f"name-{i}" for i in range(5)]
+
+    def test_unique_faker_fields_are_not_pooled(self):
+        """Fields listed as unique get one row-generated value per record."""
+        generator = ColumnarGenerator(rng=np.random.default_rng(42), faker_pool_size=20)
+        records = generator.generate("customers", SCHEMA, 500, _row_generator, {}, unique_fields={"name"})
+
+        assert records.column_values("name") == [f"name-{i}" for i in range(500)]
+
+    def test_string_formats(self):
+        """Index formats and plain strings are generated per row."""
+        records = self._generate(count=3, schema={
+            "code": {"type": "string", "format": "C-{index}-x"},
+            "label": {"type": "string"},
+            "fixed": {"type": "string", "format": "same"},
+        })
+
+        assert records.column_values("code") == ["C-0-x", "C-1-x", "C-2-x"]
+        assert records.column_values("label") == ["label_0", "label_1", "label_2"]
+        assert records.column_values("fixed") == ["same"] * 3
+
+    def test_index_format_specs(self):
+        """Index fields with format specs match row-wise str.format()."""
+        formats = ["C_{index:04d}", "{index:3d}|", "{index:d}", "{index:x}", "{index}-{index:02d}"]
+        schema = {f"f{i}": {"type": "string", "format": fmt} for i, fmt in enumerate(formats)}
+
+        records = self._generate(count=12, schema=schema)
+
+        for i, fmt in enumerate(formats):
+            assert records.column_values(f"f{i}") == [fmt.format(index=n) for n in range(12)]
+
+    def test_supports_schema(self):
+        """Row-dependent field types are not supported."""
+        assert supports_schema(SCHEMA)
+        assert not supports_schema({"a": {"type": "object", "properties": {}}})
+        assert not supports_schema({"a": {"type": "string", "template": "{b}"}})
+        assert not supports_schema({"a": {"type": "reference", "source": "x.y"}})
+
+
+class TestColumnarRecords:
+    """Test the record views over columns."""
+
+    def test_indexing_slicing_and_iteration(self):
+        """Indexing, slicing and iteration agree."""
+        records = ColumnarGenerator(rng=np.random.default_rng(1)).generate(
+            "customers", SCHEMA, 25, _row_generator, {}
+        )
+
+        materialized = list(records)
+        assert len(materialized) == len(records) == 25
+        assert materialized[7] == records[7]
+        assert records[-1] == materialized[-1]
+        assert records[3:6] == materialized[3:6]
+        assert records[::10] == materialized[::10]
+        with pytest.raises(IndexError):
+            records[25]
+
+    def test_record_cache(self):
+        """The cache looks records up by ID and skips rows without one."""
+        columns = ColumnarGenerator().generate(
+            "items", {"sku": {"type": "string", "format": "SKU{index}"}}, 3, _row_generator, {}
+        ).columns
+        records = ColumnarRecords(columns, 3)
+        cache = ColumnarRecordCache(records, ["SKU0", None, "SKU2"])
+
+        assert len(cache) == 2
+        assert "SKU2" in cache
+        assert "SKU1" not in cache
+        assert cache["SKU2"] == {"sku": "SKU2"}
+        assert cache.get("missing") is None
+
+
+class TestMasterDataGeneratorColumnar:
+    """Test columnar mode of the master data generator."""
+
+    def _config(self, schema, **entity_options):
+        return CorrelationConfig({
+            "master_data": {
+                "customers": {
+                    "source": "faker",
+                    "count": 200,
+                    "kafka_topic": "customers",
+                    "id_field": "customer_id",
+                    "schema": schema,
+                    **entity_options,
+                }
+            },
+            "transactional_data": {
+                "orders": {
+                    "kafka_topic": "orders",
+                    "relationships": {"customer_id": {"references": "customers.customer_id"}},
+                }
+            },
+        })
+
+    def test_columnar_generation_populates_reference_pool(self):
+        """Columnar data is registered like row-wise data."""
+        pool = ReferencePool()
+        pool.enable_stats()
+        generator = MasterDataGenerator(self._config(SCHEMA), pool, columnar=True)
+
+        generator.load_all()
+
+        data = generator.loaded_data["customers"]
+        assert isinstance(data, ColumnarRecords)
+        assert pool.get_type_count("customers") == 200
+        assert pool.get_random("customers") in {r["customer_id"] for r in data}
+        assert pool.get_nested_field_value("customers", "CUST_0042", "customer_id") == "CUST_0042"
+        assert pool.find_by_field_value("customers", "customer_id", "CUST_0007") == "CUST_0007"
+
+    def test_ids_and_referenced_fields_are_unique_beyond_the_pool(self):
+        """Id and referenced Faker fields do not repeat when count exceeds the pool size."""
+        schema = dict(
+            SCHEMA,
+            customer_id={"type": "faker", "method": "uuid4"},
+            email={"type": "faker", "method": "uuid4"},
+        )
+        config = self._config(schema)
+        config.config["transactional_data"]["orders"]["derived_fields"] = {
+            "email": {"type": "reference", "source": "customers.email", "via": "customer_id"}
+        }
+        generator = MasterDataGenerator(config, ReferencePool(), columnar=True)
+        generator._columnar_generator = ColumnarGenerator(rng=np.random.default_rng(1), faker_pool_size=50)
+
+        generator.load_all()
+
+        data = generator.loaded_data["customers"]
+        assert len(set(data.column_values("customer_id"))) == 200
+        assert len(set(data.column_values("email"))) == 200
+        assert len(set(data.column_values("name"))) <= 50
+
+    def test_entity_option_enables_columnar(self):
+        """The per-entity columnar option overrides the generator default."""
+        generator = MasterDataGenerator(self._config(SCHEMA, columnar=True), ReferencePool())
+
+        generator.load_all()
+
+        assert isinstance(generator.loaded_data["customers"], ColumnarRecords)
+
+    def test_unsupported_schema_falls_back_to_rows(self):
+        """Schemas with row-dependent fields are generated row by row."""
+        schema = dict(SCHEMA, email={"type": "string", "template": "user{index}@example.com"})
+        pool = ReferencePool()
+        generator = MasterDataGenerator(self._config(schema), pool, columnar=True)
+
+        generator.load_all()
+
+        data = generator.loaded_data["customers"]
+        assert isinstance(data, list)
+        assert data[0]["email"] == "user0@example.com"
+        assert pool.get_type_count("customers") == 200
+
+
+class TestColumnarCsvLoading:
+    """Test column-wise CSV ingestion against the row-wise loader."""
+
+    SCHEMA = {
+        "customer_id": {"type": "string"},
+        "age": {"type": "integer"},
+        "score": {"type": "float"},
+        "active": {"type": "boolean"},
+        "created": {"type": "timestamp"},
+        "address": {"type": "object", "properties": {
+            "zip": {"type": "integer"},
+            "city": {"type": "string"},
+        }},
+    }
+    ROWS = [
+        ["customer_id", "age", "score", "active", "created", "address.zip", "address.city"],
+        ["C1", "31", "1.5", "true", "1700000000", "10115", "Berlin"],
+        ["C2", "", "2", "No", "2024-01-01T00:00:00", "80331", "Munich"],
+        ["C3", "old", "x", "maybe", "1700000001", "", ""],
+    ]
+
+    def _load(self, tmp_path, columnar, rows=None):
+        csv_file = tmp_path / "customers.csv"
+        csv_file.write_text("\n".join(",".join(row) for row in (rows or self.ROWS)) + "\n")
+        config = CorrelationConfig({"master_data": {"customers": {
+            "source": "csv",
+            "file": str(csv_file),
+            "kafka_topic": "customers",
+            "id_field": "customer_id",
+            "schema": self.SCHEMA,
+        }}})
+        generator = MasterDataGenerator(config, ReferencePool(), columnar=columnar)
+        generator.load_all()
+        return generator
+
+    def test_matches_row_wise_loading(self, tmp_path):
+        """Typed and nested records equal those of the row-wise loader."""
+        rows = self._load(tmp_path, columnar=False).loaded_data["customers"]
+        columnar = self._load(tmp_path, columnar=True)
+
+        data = columnar.loaded_data["customers"]
+        assert isinstance(data, ColumnarRecords)
+        assert list(data) == rows
+        assert data[0]["address"] == {"zip": 10115, "city": "Berlin"}
+        assert type(data[0]["age"]) is int
+        assert data[2]["age"] == "old"
+        assert columnar.reference_pool.get_type_count("customers") == 3
+
+    def test_fully_typed_columns_are_numpy_arrays(self, tmp_path):
+        """Columns where every value converts are stored typed."""
+        data = self._load(tmp_path, columnar=True, rows=self.ROWS[:2]).loaded_data["customers"]
+
+        assert data.columns["age"].array.dtype == np.int64
+        assert data.columns["active"].array.dtype == bool
+        assert data.columns["customer_id"].array.dtype == object
+
+    def test_conflicting_headers_fall_back_to_rows(self, tmp_path):
+        """Headers that are both a value and a parent are loaded row by row."""
+        rows = [["customer_id", "address", "address.city"], ["C1", "x", "Berlin"]]
+        generator = self._load(tmp_path, columnar=True, rows=rows)
+
+        assert isinstance(generator.loaded_data["customers"], list)
+
+    def test_empty_csv(self, tmp_path):
+        """A header-only file loads no records."""
+        generator = self._load(tmp_path, columnar=True, rows=[self.ROWS[0]])
+
+        assert generator.loaded_data["customers"] == []
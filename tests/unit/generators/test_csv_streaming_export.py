@@ -0,0 +1,176 @@
+"""Tests for streaming CSV export."""
+import csv
+import gzip
+from unittest.mock import patch
+
+import pytest
+
+from testdatapy.config.correlation_config import CorrelationConfig, ValidationError
+from testdatapy.generators.csv_export import (
+    CsvExportWriter,
+    export_records,
+    schema_csv_header,
+)
+from testdatapy.generators.master_data_generator import MasterDataGenerator
+from testdatapy.generators.reference_pool import ReferencePool
+from testdatapy.sinks.base import compression_for_path
+
+
+def _read_rows(path, opener=open):
+    with opener(path, "rt", newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+class TestCsvHeaders:
+    """Test header derivation."""
+
+    def test_schema_header_flattens_objects(self):
+        """Nested object properties become dot-notation columns."""
+        schema = {
+            "id": {"type": "string"},
+            "address": {"type": "object", "properties": {
+                "city": {"type": "faker", "method": "city"},
+                "geo": {"type": "object", "properties": {"lat": {"type": "float"}}},
+            }},
+        }
+
+        assert schema_csv_header(schema) == ["id", "address.city", "address.geo.lat"]
+
+    def test_references_make_schema_header_unknown(self):
+        """References can resolve to any shape, so no header is derived."""
+        schema = {"id": {"type": "string"}, "customer": {"type": "reference", "source": "c.id"}}
+
+        assert schema_csv_header(schema) is None
+
+    def test_sparse_records_use_key_union(self, tmp_path):
+        """Fields missing from the first record still get a column."""
+        path = tmp_path / "sparse.csv"
+        records = [{"id": 1}, {"id": 2, "extra": {"note": "x"}}, {"id": 3, "flag": True}]
+
+        count = export_records(records, path)
+
+        assert count == 3
+        assert _read_rows(path) == [
+            ["id", "extra.note", "flag"],
+            ["1", "", ""],
+            ["2", "x", ""],
+            ["3", "", "true"],
+        ]
+
+    def test_schema_header_falls_back_on_mismatch(self, tmp_path):
+        """Values shaped differently than the schema restart with the key union."""
+        path = tmp_path / "profile.csv"
+        schema = {"id": {"type": "string"}, "profile": {"type": "faker", "method": "profile"}}
+        records = [{"id": "A", "profile": {"name": "Ann"}}]
+
+        export_records(records, path, schema=schema)
+
+        assert _read_rows(path) == [["id", "profile.name"], ["A", "Ann"]]
+
+
+class TestCsvExportWriter:
+    """Test chunked writing and compression."""
+
+    def test_rows_are_written_in_chunks(self, tmp_path):
+        """Row counts include the final partial chunk."""
+        path = tmp_path / "chunks.csv"
+        writer = CsvExportWriter(path, ["n"], delimiter=";", include_headers=False, chunk_size=3)
+
+        assert writer.write_rows([[i] for i in range(10)]) == 10
+        assert _read_rows(path) == [[str(i)] for i in range(10)]
+
+    def test_gzip_from_suffix(self, tmp_path):
+        """A .gz suffix compresses the export with gzip."""
+        path = tmp_path / "records.csv.gz"
+
+        export_records([{"id": i} for i in range(5)], path, compression=compression_for_path(path))
+
+        assert _read_rows(path, gzip.open) == [["id"]] + [[str(i)] for i in range(5)]
+
+    def test_unknown_compression(self):
+        """Unsupported compressions are rejected."""
+        with pytest.raises(ValueError, match="Unsupported compression"):
+            compression_for_path("out.csv", "bzip2")
+
+    def test_zstd_requires_zstandard(self, tmp_path):
+        """zstd compression needs the optional zstandard package."""
+        try:
+            import zstandard
+        except ImportError:
+            with pytest.raises(ValueError, match="zstandard"):
+                export_records([{"id": 1}], tmp_path / "out.csv.zst", compression="zstd")
+        else:
+            path = tmp_path / "out.csv.zst"
+            export_records([{"id": 1}], path, compression="zstd")
+            assert _read_rows(path, zstandard.open) == [["id"], ["1"]]
+
+
+class TestMasterDataCsvExport:
+    """Test CSV export of loaded master data."""
+
+    SCHEMA = {
+        "customer_id": {"type": "string", "format": "CUST_{seq:04d}"},
+        "tier": {"type": "choice", "choices": ["gold", "silver"]},
+        "score": {"type": "integer", "min": 0, "max": 100},
+        "name": {"type": "faker", "method": "name"},
+    }
+
+    def _config(self, csv_export, columnar=False):
+        return CorrelationConfig({
+            "master_data": {
+                "customers": {
+                    "source": "faker",
+                    "count": 25,
+                    "kafka_topic": "customers",
+                    "id_field": "customer_id",
+                    "columnar": columnar,
+                    "schema": self.SCHEMA,
+                    "csv_export": csv_export,
+                }
+            }
+        })
+
+    def test_columnar_export_matches_row_export(self, tmp_path):
+        """Column-wise export writes the same CSV as record-wise export."""
+        generator = MasterDataGenerator(
+            self._config(str(tmp_path / "c.csv"), columnar=True), ReferencePool(), seed=5
+        )
+        generator.load_all()
+        records = generator.loaded_data["customers"]
+
+        export_records(records, tmp_path / "columns.csv")
+        export_records(list(records), tmp_path / "rows.csv")
+
+        assert (tmp_path / "columns.csv").read_text() == (tmp_path / "rows.csv").read_text()
+
+    def test_export_completes_when_kafka_fails(self, tmp_path):
+        """Background exports finish even if Kafka production fails."""
+        path = tmp_path / "out" / "customers.csv.gz"
+        generator = MasterDataGenerator(self._config({"file": str(path)}), ReferencePool())
+        generator.load_all()
+
+        with pytest.raises(ValueError, match="No producer configured"):
+            generator.produce_all()
+
+        rows = _read_rows(path, gzip.open)
+        assert rows[0] == list(self.SCHEMA)
+        assert len(rows) == 26
+
+    def test_schema_header_when_source_is_implicit(self, tmp_path):
+        """Entities without a source default to faker and export with the schema header."""
+        config = self._config(str(tmp_path / "c.csv"))
+        del config.config["master_data"]["customers"]["source"]
+        generator = MasterDataGenerator(config, ReferencePool())
+        generator.load_all()
+
+        with patch(
+            "testdatapy.generators.master_data_generator.export_records", return_value=25
+        ) as export:
+            generator._export_to_csv("customers", config.config["master_data"]["customers"])
+
+        assert export.call_args.kwargs["schema"] == self.SCHEMA
+
+    def test_invalid_compression_config(self, tmp_path):
+        """Unknown compressions fail configuration validation."""
+        with pytest.raises(ValidationError, match="compression"):
+            self._config({"file": str(tmp_path / "x.csv"), "compression": "lz4"})
@@ -0,0 +1,189 @@
+"""Tests for event-time generation."""
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from testdatapy.cli import cli
+from testdatapy.config.correlation_config import CorrelationConfig
+from testdatapy.generators.clock import VirtualClock, WallClock
+from testdatapy.generators.correlated_generator import CorrelatedDataGenerator
+from testdatapy.generators.event_time import EventTimeScheduler
+from testdatapy.generators.reference_pool import ReferencePool
+
+START = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def _config_dict():
+    return {
+        "master_data": {
+            "customers": {
+                "source": "faker",
+                "count": 5,
+                "kafka_topic": "customers",
+                "id_field": "customer_id",
+                "schema": {"customer_id": {"type": "uuid"}},
+            }
+        },
+        "transactional_data": {
+            "orders": {
+                "kafka_topic": "orders",
+                "id_field": "order_id",
+                "rate_per_second": 2,
+                "relationships": {"customer_id": {"references": "customers.customer_id"}},
+                "derived_fields": {"created_at": {"type": "timestamp"}},
+            },
+            "payments": {
+                "kafka_topic": "payments",
+                "id_field": "payment_id",
+                "rate_per_second": 1,
+                "relationships": {"order_id": {"references": "orders.order_id"}},
+                "derived_fields": {
+                    "order": {"type": "reference", "source": "orders.order_id", "via": "order_id"},
+                    "paid_at": {"type": "timestamp_millis", "offset_minutes_min": 0, "offset_minutes_max": 0},
+                },
+            },
+        },
+    }
+
+
+def _generator(entity_type, pool, **options):
+    options.setdefault("clock", VirtualClock(START))
+    return CorrelatedDataGenerator(
+        entity_type, CorrelationConfig(_config_dict()), pool, event_time=True, **options
+    )
+
+
+def _pool():
+    pool = ReferencePool()
+    pool.add_references("customers", ["C1", "C2"])
+    return pool
+
+
+class TestEventTimeGenerator:
+    """Test a single generator in event-time mode."""
+
+    def test_no_sleeping_and_rate_spaced_timestamps(self):
+        """Records are one interval apart in event time and produced immediately."""
+        generator = _generator("orders", _pool(), max_messages=20)
+
+        started = time.perf_counter()
+        records = list(generator.generate())
+
+        assert time.perf_counter() - started < 1.0
+        assert [r["created_at"] for r in records[:3]] == [
+            "2024-03-01T00:00:00+00:00", "2024-03-01T00:00:00.500000+00:00", "2024-03-01T00:00:01+00:00"
+        ]
+
+    def test_stops_at_end_time(self):
+        """The window end bounds the number of records."""
+        generator = _generator("orders", _pool(), end_time=datetime(2024, 3, 1, 0, 1))
+        assert len(list(generator.generate())) == 120
+
+    def test_needs_a_rate(self):
+        """Without a rate the clock could never advance."""
+        with pytest.raises(ValueError, match="rate_per_second"):
+            _generator("orders", _pool(), rate_per_second=0)
+
+    def test_needs_a_virtual_clock(self):
+        """Wall-clock time cannot be advanced."""
+        with pytest.raises(ValueError, match="VirtualClock"):
+            _generator("orders", _pool(), clock=WallClock())
+
+
+class TestEventTimeScheduler:
+    """Test interleaving entities by event time."""
+
+    def test_records_are_ordered_by_event_time(self):
+        """Entities with different rates interleave, earliest event first."""
+        pool = _pool()
+        end = datetime(2024, 3, 1, 0, 0, 10)
+        scheduler = EventTimeScheduler([
+            _generator("orders", pool, end_time=end),
+            _generator("payments", pool, clock=VirtualClock(START), end_time=end),
+        ])
+
+        events = [(g.entity_type, t) for g, t, _ in scheduler]
+
+        assert [t for _, t in events] == sorted(t for _, t in events)
+        assert sum(1 for entity, _ in events if entity == "orders") == 20
+        assert sum(1 for entity, _ in events if entity == "payments") == 10
+        assert events[:3] == [("orders", START), ("payments", START), ("orders", START + timedelta(seconds=0.5))]
+
+    def test_slots_before_references_exist_are_skipped(self):
+        """Payments starting before the first order skip their early slots."""
+        pool = _pool()
+        end = datetime(2024, 3, 1, 0, 0, 10)
+        scheduler = EventTimeScheduler([
+            _generator("payments", pool, end_time=end),
+            _generator("orders", pool, clock=VirtualClock("2024-03-01T00:00:02.5"), end_time=end),
+        ])
+
+        payments = [(t, record) for g, t, record in scheduler if g.entity_type == "payments"]
+
+        assert scheduler.skipped["payments"] == 3
+        assert payments[0][0] == START + timedelta(seconds=3)
+        assert payments[0][1]["paid_at"] == int((START + timedelta(seconds=3)).timestamp() * 1000)
+
+    def test_missing_entity_is_an_error(self):
+        """References nobody will provide stop the entity."""
+        scheduler = EventTimeScheduler([_generator("payments", _pool(), max_messages=3)])
+        assert list(scheduler) == []
+        assert "orders" in scheduler.errors["payments"]
+
+    def test_other_errors_are_raised(self):
+        """Only missing references skip slots; other generation errors surface."""
+        generator = _generator("orders", _pool(), max_messages=3)
+        scheduler = EventTimeScheduler([generator])
+
+        with patch.object(generator, "generate_one", side_effect=ValueError("bad config")):
+            with pytest.raises(ValueError, match="bad config"):
+                list(scheduler)
+
+
+def test_cli_event_time_window(tmp_path):
+    """correlated generate --event-time-start/--event-time-end fills the window without sleeping."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(_config_dict()))
+    out = tmp_path / "out"
+
+    started = time.perf_counter()
+    result = CliRunner().invoke(cli, [
+        "correlated", "generate", "-c", str(config_path), "--output-dir", str(out),
+        "--event-time-start", "2024-03-01T00:00:00", "--event-time-end", "2024-03-01T01:00:00",
+    ])
+
+    assert result.exit_code == 0, result.output
+    assert time.perf_counter() - started < 30
+    assert len((out / "orders.ndjson").read_text().splitlines()) == 7200
+    assert len((out / "payments.ndjson").read_text().splitlines()) == 3600
+
+
+def test_cli_event_times_are_utc(tmp_path, monkeypatch):
+    """Times without an offset are UTC whatever the local time zone."""
+    monkeypatch.setenv("TZ", "America/New_York")
+    if hasattr(time, "tzset"):
+        time.tzset()
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(_config_dict()))
+    out = tmp_path / "out"
+
+    try:
+        result = CliRunner().invoke(cli, [
+            "correlated", "generate", "-c", str(config_path), "--output-dir", str(out),
+            "--event-time-start", "2024-03-01T00:00:00", "--event-time-end", "2024-03-01T00:00:10",
+        ])
+    finally:
+        monkeypatch.delenv("TZ")
+        if hasattr(time, "tzset"):
+            time.tzset()
+
+    assert result.exit_code == 0, result.output
+    order = json.loads((out / "orders.ndjson").read_text().splitlines()[0])
+    payment = json.loads((out / "payments.ndjson").read_text().splitlines()[0])
+    assert order["created_at"] == "2024-03-01T00:00:00+00:00"
+    assert payment["paid_at"] == int(datetime(2024, 3, 1, tzinfo=timezone.utc).timestamp() * 1000)
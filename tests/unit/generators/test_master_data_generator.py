@@ -245,6 +245,42 @@ class TestMasterDataGenerator:
         
         with pytest.raises(FileNotFoundError):
             generator.load_all()
+    
+    def test_indices_only_for_referenced_paths(self):
+        """Test that only field paths referenced in the config are indexed."""
+        config_dict = {
+            "master_data": {
+                "appointments": {
+                    "source": "faker",
+                    "count": 5,
+                    "kafka_topic": "appointments",
+                    "id_field": "jobid",
+                    "csv_export": "appointments.csv",
+                    "schema": {
+                        "jobid": {"type": "string", "format": "JOB_{seq:03d}"},
+                        "plate": {"type": "string", "format": "PLATE_{index}"},
+                        "branch": {"type": "string", "format": "BR_{index}"},
+                    }
+                }
+            },
+            "transactional_data": {
+                "carrepairs": {
+                    "kafka_topic": "carrepairs",
+                    "relationships": {
+                        "plate": {"references": "appointments.plate"}
+                    }
+                }
+            }
+        }
+        ref_pool = ReferencePool()
+        generator = MasterDataGenerator(config=CorrelationConfig(config_dict), reference_pool=ref_pool)
+        
+        assert generator._correlation_index_paths("appointments") == ["plate"]
+        
+        generator.load_all()
+        
+        assert ref_pool.find_by_field_value("appointments", "plate", "PLATE_2") == "JOB_003"
+        assert ref_pool.find_by_field_value("appointments", "branch", "BR_2") is None
 
 
 if __name__ == "__main__":
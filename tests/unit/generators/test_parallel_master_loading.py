@@ -0,0 +1,146 @@
+"""Tests for dependency ordering and parallel master data loading."""
+import csv
+
+import pytest
+
+from testdatapy.config.correlation_config import CorrelationConfig
+from testdatapy.generators.columnar import ColumnarRecords
+from testdatapy.generators.dependency_graph import dependency_levels, master_data_dependencies
+from testdatapy.generators.master_data_generator import MasterDataGenerator
+from testdatapy.generators.reference_pool import ReferencePool
+
+
+SCHEMA = {
+    "customer_id": {"type": "string", "format": "CUST_{seq:05d}"},
+    "name": {"type": "faker", "method": "name"},
+    "tier": {"type": "choice", "choices": ["gold", "silver", "bronze"]},
+    "score": {"type": "integer", "min": 0, "max": 100},
+}
+
+
+def _config(count=250, **entity_options):
+    return CorrelationConfig({
+        "master_data": {
+            "customers": {
+                "source": "faker",
+                "count": count,
+                "kafka_topic": "customers",
+                "id_field": "customer_id",
+                "schema": SCHEMA,
+                **entity_options,
+            }
+        }
+    })
+
+
+def _load(config, **options):
+    generator = MasterDataGenerator(config, ReferencePool(), **options)
+    generator.load_all()
+    return generator
+
+
+class TestDependencyGraph:
+    """Test dependency detection from reference fields."""
+
+    def test_dependencies_from_reference_fields(self):
+        """Cross-entity references, also nested, are dependencies."""
+        master_config = {
+            "appointments": {"schema": {
+                "full": {"type": "object", "properties": {
+                    "customer": {"type": "reference", "source": "customers.customer_id"},
+                    "plate": {"type": "reference", "source": "self.full.plate"},
+                }},
+            }},
+            "customers": {"schema": {"id": {"type": "string"}}},
+            "products": {},
+        }
+
+        dependencies = master_data_dependencies(master_config)
+
+        assert dependencies == {"appointments": {"customers"}, "customers": set(), "products": set()}
+        assert dependency_levels(dependencies) == [["customers", "products"], ["appointments"]]
+
+    def test_references_to_unknown_entities_are_ignored(self):
+        """Only configured master entities count as dependencies."""
+        master_config = {"orders": {"schema": {
+            "x": {"type": "reference", "source": "payments.id"},
+        }}}
+
+        assert master_data_dependencies(master_config) == {"orders": set()}
+
+    def test_cycle_raises(self):
+        """Circular references cannot be ordered."""
+        with pytest.raises(ValueError, match="Circular"):
+            dependency_levels({"a": {"b"}, "b": {"a"}, "c": set()})
+
+
+class TestParallelMasterLoading:
+    """Test chunked and parallel loading."""
+
+    def test_chunks_continue_sequences(self):
+        """Chunks are generated with continuous sequence values."""
+        generator = _load(_config(count=250), seed=1, chunk_size=100)
+
+        data = generator.loaded_data["customers"]
+        ids = [record["customer_id"] for record in data]
+        assert ids == [f"CUST_{i:05d}" for i in range(1, 251)]
+        assert generator._sequence_counters["customers_customer_id"] == 251
+        assert generator.reference_pool.get_type_count("customers") == 250
+        assert generator.get_loading_stats()["customers"]["record_count"] == 250
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_chunks_continue_indices(self, columnar):
+        """{index} formats and default string values count on across chunks."""
+        schema = {"customer_id": {"type": "string", "format": "C_{index}"}, "label": {"type": "string"}}
+        config = _config(count=5, schema=schema, columnar=columnar)
+
+        data = list(_load(config, seed=1, chunk_size=2).loaded_data["customers"])
+
+        assert [record["customer_id"] for record in data] == [f"C_{i}" for i in range(5)]
+        assert [record["label"] for record in data] == [f"label_{i}" for i in range(5)]
+
+    def test_seed_is_reproducible_for_any_worker_count(self):
+        """The same seed gives the same data, serial or in worker processes."""
+        serial = _load(_config(), seed=7, chunk_size=100).loaded_data["customers"]
+        parallel = _load(_config(), seed=7, chunk_size=100, workers=2).loaded_data["customers"]
+        other = _load(_config(), seed=8, chunk_size=100).loaded_data["customers"]
+
+        assert serial == parallel
+        assert serial != other
+
+    def test_columnar_chunks_are_concatenated(self):
+        """Columnar chunks are merged into one ColumnarRecords."""
+        seeded = _load(_config(columnar=True), seed=3, chunk_size=100)
+        again = _load(_config(columnar=True), seed=3, chunk_size=100, workers=2)
+
+        data = seeded.loaded_data["customers"]
+        assert isinstance(data, ColumnarRecords)
+        assert len(data) == 250
+        assert data.column_values("customer_id")[100] == "CUST_00101"
+        assert list(data) == list(again.loaded_data["customers"])
+
+    def test_csv_and_faker_entities_load_in_parallel(self, tmp_path):
+        """CSV entities are loaded whole alongside generated ones."""
+        csv_file = tmp_path / "products.csv"
+        with open(csv_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["product_id", "price"])
+            writer.writeheader()
+            writer.writerows([{"product_id": f"P{i}", "price": str(i)} for i in range(5)])
+        config = CorrelationConfig({
+            "master_data": {
+                "customers": _config(count=30).config["master_data"]["customers"],
+                "products": {
+                    "source": "csv",
+                    "file": str(csv_file),
+                    "kafka_topic": "products",
+                    "id_field": "product_id",
+                    "schema": {"product_id": {"type": "string"}, "price": {"type": "integer"}},
+                },
+            }
+        })
+
+        generator = _load(config, workers=2, chunk_size=10)
+
+        assert generator.reference_pool.get_type_count("customers") == 30
+        assert generator.reference_pool.get_type_count("products") == 5
+        assert generator.loaded_data["products"][0] == {"product_id": "P0", "price": 0}
@@ -0,0 +1,132 @@
+"""Tests for reference pool snapshots."""
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from testdatapy.cli_correlated import correlated
+from testdatapy.config.correlation_config import CorrelationConfig
+from testdatapy.generators.columnar import ColumnarRecordCache
+from testdatapy.generators.master_data_generator import MasterDataGenerator
+from testdatapy.generators.pool_snapshot import read_snapshot
+from testdatapy.generators.reference_pool import ReferencePool
+
+
+def _config(columnar=False):
+    return CorrelationConfig({
+        "master_data": {
+            "customers": {
+                "source": "faker",
+                "count": 50,
+                "kafka_topic": "customers",
+                "id_field": "customer_id",
+                "columnar": columnar,
+                "schema": {
+                    "customer_id": {"type": "string", "format": "CUST_{seq:04d}"},
+                    "age": {"type": "integer", "min": 18, "max": 90},
+                },
+            }
+        },
+        "transactional_data": {
+            "orders": {
+                "kafka_topic": "orders",
+                "relationships": {"customer_id": {"references": "customers.customer_id"}},
+            }
+        },
+    })
+
+
+def _loaded_pool(columnar=False):
+    pool = ReferencePool()
+    MasterDataGenerator(_config(columnar), pool).load_all()
+    pool.enable_recent_tracking("customers", 3)
+    pool.add_recent("customers", "CUST_0001")
+    return pool
+
+
+class TestPoolSnapshot:
+    """Test saving and loading complete pool snapshots."""
+
+    @pytest.mark.parametrize("memory_map", [True, False])
+    def test_round_trip(self, tmp_path, memory_map):
+        """References, cached records, indices and recent windows are restored."""
+        pool = _loaded_pool()
+        path = tmp_path / "pool.snap"
+
+        pool.save_snapshot(path)
+        restored = ReferencePool.load_snapshot(path, memory_map=memory_map)
+
+        assert restored.get_type_count("customers") == 50
+        assert restored.get_nested_field_value("customers", "CUST_0007", "age") == \
+            pool.get_nested_field_value("customers", "CUST_0007", "age")
+        assert restored.find_by_field_value("customers", "customer_id", "CUST_0009") == "CUST_0009"
+        assert restored.get_recent("customers") == ["CUST_0001"]
+
+    def test_columnar_records_are_memory_mapped(self, tmp_path):
+        """NumPy columns are restored from the mapped file without copying."""
+        pool = _loaded_pool(columnar=True)
+        path = tmp_path / "pool.snap"
+
+        pool.save_snapshot(path, {"master_entities": ["customers"]})
+        metadata, _ = read_snapshot(path)
+        restored = ReferencePool.load_snapshot(path)
+
+        assert metadata == {"master_entities": ["customers"]}
+        cache = restored._record_cache["customers"]
+        assert isinstance(cache, ColumnarRecordCache)
+        ages = cache.records.columns["age"].array
+        assert ages.dtype == np.int64
+        assert not ages.flags.writeable
+        assert cache["CUST_0010"] == pool._record_cache["customers"]["CUST_0010"]
+
+    def test_rejects_other_files(self, tmp_path):
+        """Files without the snapshot header are rejected."""
+        path = tmp_path / "pool.snap"
+        path.write_bytes(b"not a snapshot at all, just some bytes")
+
+        with pytest.raises(ValueError, match="not a reference pool snapshot"):
+            ReferencePool.load_snapshot(path)
+
+
+class TestReuseMasterCli:
+    """Test --save-master and --reuse-master."""
+
+    CONFIG = """
+master_data:
+  customers:
+    source: faker
+    count: 20
+    kafka_topic: customers
+    id_field: customer_id
+    schema:
+      customer_id: {type: string, format: "CUST_{seq:04d}"}
+transactional_data:
+  orders:
+    kafka_topic: orders
+    max_messages: 5
+    relationships:
+      customer_id: {references: customers.customer_id}
+"""
+
+    def test_reuse_master_skips_master_generation(self, tmp_path):
+        """A saved snapshot replaces master data loading."""
+        config_file = tmp_path / "correlation.yaml"
+        config_file.write_text(self.CONFIG)
+        snapshot = tmp_path / "master.snap"
+        runner = CliRunner()
+
+        saved = runner.invoke(correlated, [
+            "generate", "-c", str(config_file), "--dry-run", "--master-only",
+            "--save-master", str(snapshot),
+        ])
+        assert saved.exit_code == 0, saved.output
+        assert snapshot.exists()
+
+        reused = runner.invoke(correlated, [
+            "generate", "-c", str(config_file), "--dry-run", "--reuse-master", str(snapshot),
+        ])
+
+        assert reused.exit_code == 0, reused.output
+        assert "Reusing master data" in reused.output
+        assert "customers: 20 records" in reused.output
+        assert "Loading master data" not in reused.output
+        assert "Total: 5 orders" in reused.output
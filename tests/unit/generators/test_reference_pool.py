@@ -74,5 +74,50 @@ class TestReferencePool:
         assert len(all_products) == 5  # Should return all available
 
 
+class TestReferencePoolBulkLoad:
+    """Test single-pass bulk loading of master records."""
+    
+    RECORDS = [
+        {"id": "A1", "full": {"Vehicle": {"plate": "M-AB 1"}}, "name": "Ann"},
+        {"id": "", "full": {"Vehicle": {"plate": "M-AB 2"}}, "name": "Bob"},
+        {"id": "A3", "full": {"Vehicle": {}}, "name": "Cid"},
+        {"id": 4, "full": {"Vehicle": {"plate": "M-AB 4"}}, "name": "Dee"},
+    ]
+    
+    def test_bulk_load_ids_cache_and_indices(self):
+        """IDs, cached records and indices come from one pass."""
+        pool = ReferencePool()
+        
+        indexed = pool.bulk_load("appointments", self.RECORDS, "id", ["full.Vehicle.plate"])
+        
+        assert indexed == 2
+        assert pool.get_type_count("appointments") == 3
+        assert pool.get_nested_field_value("appointments", "A3", "name") == "Cid"
+        assert pool.find_by_field_value("appointments", "full.Vehicle.plate", "M-AB 4") == "4"
+        # Records without an ID are neither referenced nor indexed
+        assert pool.find_by_field_value("appointments", "full.Vehicle.plate", "M-AB 2") is None
+        # Only requested paths are indexed
+        assert pool.find_by_field_value("appointments", "name", "Ann") is None
+    
+    def test_bulk_load_nested_id_path(self):
+        """Nested ID paths are supported."""
+        pool = ReferencePool()
+        records = [{"full": {"Job": {"key": "J1"}}}, {"full": {}}]
+        
+        pool.bulk_load("jobs", records, "full.Job.key")
+        
+        assert pool.get_random("jobs") == "J1"
+    
+    def test_bulk_load_merges_with_existing(self):
+        """Loading the same type again extends references and indices."""
+        pool = ReferencePool()
+        pool.bulk_load("appointments", self.RECORDS[:1], "id", ["name"])
+        pool.bulk_load("appointments", self.RECORDS[2:], "id", ["name"])
+        
+        assert pool.get_type_count("appointments") == 3
+        assert pool.find_by_field_value("appointments", "name", "Ann") == "A1"
+        assert pool.find_by_field_value("appointments", "name", "Dee") == "4"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
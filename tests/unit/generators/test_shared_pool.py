@@ -0,0 +1,154 @@
+"""Tests for the shared-memory reference pool."""
+import uuid
+
+import pytest
+from click.testing import CliRunner
+
+from testdatapy.cli_correlated import correlated
+from testdatapy.config.correlation_config import CorrelationConfig
+from testdatapy.generators.master_data_generator import MasterDataGenerator
+from testdatapy.generators.reference_pool import ReferencePool
+from testdatapy.generators.shared_pool import SharedRecordCache, is_shared_pool_file
+
+
+def _loaded_pool(columnar=False):
+    config = CorrelationConfig({
+        "master_data": {
+            "customers": {
+                "source": "faker",
+                "count": 50,
+                "kafka_topic": "customers",
+                "id_field": "customer_id",
+                "columnar": columnar,
+                "schema": {
+                    "customer_id": {"type": "string", "format": "CUST_{seq:04d}"},
+                    "age": {"type": "integer", "min": 18, "max": 90},
+                    "address": {"type": "object", "properties": {
+                        "city": {"type": "choice", "choices": ["Berlin", "Paris"]},
+                    }},
+                },
+            }
+        },
+        "transactional_data": {
+            "orders": {
+                "kafka_topic": "orders",
+                "relationships": {"customer_id": {"references": "customers.customer_id"}},
+            }
+        },
+    })
+    pool = ReferencePool()
+    MasterDataGenerator(config, pool).load_all()
+    pool.add_references("products", ["P1", "P2", "Ümlaut"])
+    pool.enable_recent_tracking("customers", 3)
+    pool.add_recent("customers", "CUST_0001")
+    return pool
+
+
+class TestSharedPool:
+    """Test publishing and attaching shared pools."""
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_file_round_trip(self, tmp_path, columnar):
+        """References, records, indices and recent windows are shared."""
+        pool = _loaded_pool(columnar)
+        path = tmp_path / "master.pool"
+
+        segment = pool.publish_shared(path=path)
+        shared = ReferencePool.attach_shared(path=path)
+
+        assert segment.size == path.stat().st_size
+        assert is_shared_pool_file(path)
+        assert shared.get_type_count("customers") == 50
+        assert list(shared._references["products"]) == ["P1", "P2", "Ümlaut"]
+        assert shared.get_random("customers").startswith("CUST_")
+        assert shared.validate_reference("customers", "CUST_0050")
+        assert shared.get_nested_field_value("customers", "CUST_0007", "address.city") == \
+            pool.get_nested_field_value("customers", "CUST_0007", "address.city")
+        assert shared.find_by_field_value("customers", "customer_id", "CUST_0009") == "CUST_0009"
+        assert shared.find_by_field_value("customers", "customer_id", "CUST_9999") is None
+        assert shared.get_recent("customers") == ["CUST_0001"]
+
+    def test_shared_memory_round_trip(self):
+        """A named shared memory segment can be attached and unlinked."""
+        pool = _loaded_pool()
+        name = f"tdpy_{uuid.uuid4().hex[:12]}"
+
+        with pool.publish_shared(name=name) as segment:
+            assert segment.name == name
+            shared = ReferencePool.attach_shared(name=name)
+            cache = shared._record_cache["customers"]
+
+            assert isinstance(cache, SharedRecordCache)
+            assert cache["CUST_0010"] == pool._record_cache["customers"]["CUST_0010"]
+            assert "CUST_0010" in cache and "CUST_0100" not in cache
+            assert shared.get_random_batch("customers", 5, avoid_recent=True)
+
+    def test_arrays_are_read_only(self, tmp_path):
+        """Attached data cannot be modified in place."""
+        pool = _loaded_pool()
+        path = tmp_path / "master.pool"
+        pool.publish_shared(path=path)
+        shared = ReferencePool.attach_shared(path=path)
+
+        references = shared._references["customers"]
+        with pytest.raises(ValueError):
+            references.data[0] = 0
+
+    def test_writes_copy_locally(self, tmp_path):
+        """Adding to an attached pool copies the type without touching the file."""
+        pool = _loaded_pool()
+        path = tmp_path / "master.pool"
+        pool.publish_shared(path=path)
+        shared = ReferencePool.attach_shared(path=path)
+
+        shared.add_references("products", ["P3"])
+        shared.add_field_index("customers", "customer_id", "CUST_NEW", "CUST_NEW")
+
+        assert shared._references["products"] == ["P1", "P2", "Ümlaut", "P3"]
+        assert shared.find_by_field_value("customers", "customer_id", "CUST_NEW") == "CUST_NEW"
+        assert shared.find_by_field_value("customers", "customer_id", "CUST_0001") == "CUST_0001"
+        assert ReferencePool.attach_shared(path=path).get_type_count("products") == 3
+
+
+class TestPublishMasterCli:
+    """Test --publish-master together with --reuse-master."""
+
+    CONFIG = """
+master_data:
+  customers:
+    source: faker
+    count: 20
+    kafka_topic: customers
+    id_field: customer_id
+    schema:
+      customer_id: {type: string, format: "CUST_{seq:04d}"}
+transactional_data:
+  orders:
+    kafka_topic: orders
+    max_messages: 5
+    relationships:
+      customer_id: {references: customers.customer_id}
+"""
+
+    def test_reuse_published_master(self, tmp_path):
+        """A published pool file is attached instead of loading master data."""
+        config_file = tmp_path / "correlation.yaml"
+        config_file.write_text(self.CONFIG)
+        pool_file = tmp_path / "master.pool"
+        runner = CliRunner()
+
+        published = runner.invoke(correlated, [
+            "generate", "-c", str(config_file), "--dry-run", "--master-only",
+            "--publish-master", str(pool_file),
+        ])
+        assert published.exit_code == 0, published.output
+        assert "Published shared master data" in published.output
+
+        reused = runner.invoke(correlated, [
+            "generate", "-c", str(config_file), "--dry-run", "--reuse-master", str(pool_file),
+        ])
+
+        assert reused.exit_code == 0, reused.output
+        assert "customers: 20 records" in reused.output
+        assert "Loading master data" not in reused.output
+        assert "Total: 5 orders" in reused.output
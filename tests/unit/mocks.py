@@ -1,7 +1,10 @@
 """Test fixtures and utilities for producer tests."""
+import time
 from typing import Any
 from unittest.mock import MagicMock
 
+from confluent_kafka import TopicPartition
+
 
 class MockSchema:
     """Mock Schema object for testing."""
@@ -24,14 +27,24 @@ class MockConfluentProducer:
         self.messages: list[dict[str, Any]] = []
         self._callbacks = []
 
-    def produce(self, topic: str, key: Any, value: Any, on_delivery: Any | None = None):
+    def produce(
+        self,
+        topic: str,
+        key: Any,
+        value: Any,
+        on_delivery: Any | None = None,
+        partition: int | None = None,
+        timestamp: int = 0,
+    ):
         """Mock produce method."""
+        partition = 0 if partition is None else partition
         message = {
             "topic": topic,
             "key": key,
             "value": value,
-            "partition": 0,
+            "partition": partition,
             "offset": len(self.messages),
+            "timestamp": timestamp,
         }
         self.messages.append(message)
 
@@ -39,7 +52,8 @@ class MockConfluentProducer:
             # Simulate successful delivery
             mock_msg = MagicMock()
             mock_msg.topic.return_value = topic
-            mock_msg.partition.return_value = 0
+            mock_msg.partition.return_value = partition
+            mock_msg.value.return_value = value
             mock_msg.offset.return_value = len(self.messages) - 1
             on_delivery(None, mock_msg)
 
@@ -95,6 +109,178 @@ class MockAvroSerializer:
         return json.dumps(value).encode("utf-8")
 
 
+class InMemoryMessage:
+    """Message stored by the in-memory broker."""
+
+    def __init__(self, topic, partition, offset, key, value, headers=None, timestamp=0.0):
+        self._topic = topic
+        self._partition = partition
+        self._offset = offset
+        self._key = key
+        self._value = value
+        self._headers = headers
+        self._timestamp = timestamp
+
+    def topic(self):
+        return self._topic
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+    def key(self):
+        return self._key
+
+    def value(self):
+        return self._value
+
+    def headers(self):
+        return self._headers
+
+    def error(self):
+        return None
+
+    def latency(self):
+        return 0.0
+
+
+class _Metadata:
+    """Topic metadata in the shape returned by list_topics()."""
+
+    def __init__(self, topics: dict[str, int]):
+        self.topics = {
+            name: MagicMock(partitions={p: MagicMock(id=p) for p in range(count)}, error=None)
+            for name, count in topics.items()
+        }
+
+
+class InMemoryBroker:
+    """Local stand-in for a Kafka cluster shared by producers and consumers."""
+
+    def __init__(self, topics: dict[str, int]):
+        """Create the broker.
+
+        Args:
+            topics: Topic name to partition count
+        """
+        self.partitions = {
+            topic: [[] for _ in range(count)] for topic, count in topics.items()
+        }
+        self._next_partition = 0
+
+    def append(self, topic, key, value, headers=None, partition=None):
+        """Append a message and return it."""
+        partitions = self.partitions[topic]
+        if partition is None:
+            partition = self._next_partition % len(partitions)
+            self._next_partition += 1
+        log = partitions[partition]
+        message = InMemoryMessage(topic, partition, len(log), key, value, headers)
+        log.append(message)
+        return message
+
+    def metadata(self, topic=None):
+        """Metadata for one or all topics."""
+        counts = {name: len(parts) for name, parts in self.partitions.items()}
+        if topic is not None:
+            counts = {topic: counts[topic]} if topic in counts else {}
+        return _Metadata(counts)
+
+    def producer(self, config: dict[str, Any]) -> "InMemoryProducer":
+        """Producer factory."""
+        return InMemoryProducer(self, config)
+
+    def consumer(self, config: dict[str, Any]) -> "InMemoryConsumer":
+        """Consumer factory."""
+        return InMemoryConsumer(self, config)
+
+
+class InMemoryProducer:
+    """Producer writing to an InMemoryBroker."""
+
+    def __init__(self, broker: InMemoryBroker, config: dict[str, Any]):
+        self.broker = broker
+        self.config = config
+
+    def produce(self, topic, value=None, key=None, headers=None, partition=None, on_delivery=None):
+        message = self.broker.append(topic, key, value, headers, partition)
+        if on_delivery:
+            on_delivery(None, message)
+
+    def poll(self, timeout: float = 0):
+        return 0
+
+    def flush(self, timeout: float = 10.0):
+        return 0
+
+    def list_topics(self, topic=None, timeout: float = 10.0):
+        return self.broker.metadata(topic)
+
+    def __len__(self):
+        return 0
+
+
+class InMemoryConsumer:
+    """Consumer reading assigned partitions of an InMemoryBroker."""
+
+    def __init__(self, broker: InMemoryBroker, config: dict[str, Any]):
+        self.broker = broker
+        self.config = config
+        self.positions: dict[tuple[str, int], int] = {}
+        self.paused: set[tuple[str, int]] = set()
+        self.subscribed = False
+        self.closed = False
+
+    def list_topics(self, topic=None, timeout: float = 10.0):
+        return self.broker.metadata(topic)
+
+    def get_watermark_offsets(self, partition, timeout: float = 10.0, cached: bool = False):
+        log = self.broker.partitions[partition.topic][partition.partition]
+        return 0, len(log)
+
+    def assign(self, partitions):
+        for tp in partitions:
+            offset = tp.offset if tp.offset >= 0 else 0
+            self.positions[(tp.topic, tp.partition)] = offset
+
+    def subscribe(self, topics):
+        self.subscribed = True
+
+    def pause(self, partitions):
+        for tp in partitions:
+            self.paused.add((tp.topic, tp.partition))
+
+    def position(self, partitions):
+        return [
+            TopicPartition(tp.topic, tp.partition, self.positions.get((tp.topic, tp.partition), -1001))
+            for tp in partitions
+        ]
+
+    def consume(self, num_messages: int = 1, timeout: float = -1):
+        batch = []
+        for (topic, partition), offset in self.positions.items():
+            if (topic, partition) in self.paused:
+                continue
+            log = self.broker.partitions[topic][partition]
+            taken = log[offset:offset + num_messages - len(batch)]
+            batch.extend(taken)
+            self.positions[(topic, partition)] = offset + len(taken)
+            if len(batch) >= num_messages:
+                break
+        if not batch and timeout:
+            time.sleep(min(timeout, 0.01) if timeout > 0 else 0.01)
+        return batch
+
+    def poll(self, timeout: float = -1):
+        batch = self.consume(num_messages=1, timeout=timeout)
+        return batch[0] if batch else None
+
+    def close(self):
+        self.closed = True
+
+
 def create_mock_producer(producer_class: str = "ConfluentProducer"):
     """Create a mock producer for testing."""
     return MockConfluentProducer
@@ -0,0 +1,277 @@
+"""Tests for the asyncio correlated runtime."""
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+import yaml
+from click.testing import CliRunner
+from confluent_kafka import KafkaException
+
+from testdatapy.async_runtime import (
+    AsyncCorrelatedRuntime,
+    AsyncPacer,
+    AsyncProducer,
+    split_message_key,
+)
+from testdatapy.cli import cli
+from testdatapy.config.correlation_config import CorrelationConfig
+from testdatapy.generators.reference_pool import ReferencePool
+from testdatapy.producers.partitioning import PartitionStats
+from testdatapy.producers.pool import ProducerPool
+from testdatapy.sinks import SinkPool
+from tests.unit.mocks import MockConfluentProducer
+
+
+def _config(orders_rate=0, payments_rate=0):
+    return CorrelationConfig({
+        "master_data": {
+            "customers": {"source": "faker", "count": 3, "kafka_topic": "customers", "id_field": "customer_id"},
+        },
+        "transactional_data": {
+            "orders": {
+                "kafka_topic": "orders",
+                "id_field": "order_id",
+                "rate_per_second": orders_rate,
+                "max_messages": 20,
+                "relationships": {"customer_id": {"references": "customers.customer_id"}},
+            },
+            "payments": {
+                "kafka_topic": "payments",
+                "id_field": "payment_id",
+                "rate_per_second": payments_rate,
+                "max_messages": 10,
+                "relationships": {"order_id": {"references": "orders.order_id"}},
+            },
+        },
+    })
+
+
+def _reference_pool():
+    pool = ReferencePool()
+    pool.add_references("customers", ["C1", "C2", "C3"])
+    return pool
+
+
+@pytest.fixture
+def producer_pool():
+    """Producer pool backed by a mock client."""
+    with patch("testdatapy.producers.pool.ConfluentProducer", MockConfluentProducer):
+        yield ProducerPool(bootstrap_servers="localhost:9092")
+
+
+class TestAsyncPacer:
+    """Test deadline-based pacing."""
+
+    def test_paces_to_rate(self):
+        """Waits follow the configured rate."""
+        async def run():
+            pacer = AsyncPacer(100)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(21):
+                await pacer.wait()
+            return loop.time() - start
+
+        assert 0.18 <= asyncio.run(run()) < 0.5
+
+    def test_unpaced(self):
+        """Without a rate nothing sleeps."""
+        async def run():
+            pacer = AsyncPacer(None)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(1000):
+                await pacer.wait()
+            return loop.time() - start
+
+        assert asyncio.run(run()) < 0.1
+
+
+class TestAsyncProducer:
+    """Test delivery futures."""
+
+    def test_delivery_resolves_future(self, producer_pool):
+        """The delivery callback resolves the message's future."""
+        producer_pool.add_json_topic("orders")
+
+        async def run():
+            producer = AsyncProducer(producer_pool, max_in_flight=2)
+            futures = [await producer.produce("orders", {"id": i}, key=str(i)) for i in range(5)]
+            assert await producer.drain(1.0) == 0
+            return [await future for future in futures]
+
+        assert asyncio.run(run()) == [None] * 5
+        assert [m["key"] for m in producer_pool._producer.messages] == [b"0", b"1", b"2", b"3", b"4"]
+
+    def test_pool_accounting_sees_deliveries(self):
+        """Partition statistics of the pool still count async deliveries."""
+        stats = PartitionStats()
+        with patch("testdatapy.producers.pool.ConfluentProducer", MockConfluentProducer):
+            pool = ProducerPool(bootstrap_servers="localhost:9092", partition_stats=stats)
+        pool.add_json_topic("orders")
+
+        async def run():
+            producer = AsyncProducer(pool)
+            for i in range(3):
+                await producer.produce("orders", {"id": i})
+            await producer.drain(1.0)
+
+        asyncio.run(run())
+        assert stats.histogram("orders")[0]["messages"] == 3
+
+    def test_full_queue_is_retried(self, producer_pool):
+        """A full local queue waits on the loop and produces again."""
+        producer_pool.add_json_topic("orders")
+        client = producer_pool._producer
+        produce = client.produce
+        calls = []
+
+        def produce_once_full(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise BufferError("Local: Queue full")
+            produce(*args, **kwargs)
+
+        client.produce = produce_once_full
+
+        async def run():
+            producer = AsyncProducer(producer_pool, poll_interval=0.001)
+            return await (await producer.produce("orders", {"id": 1}))
+
+        assert asyncio.run(run()) is None
+        assert len(calls) == 2
+
+
+    def test_produce_error_frees_the_slot(self, producer_pool):
+        """A message that could not be produced is raised, not reported as delivered."""
+        producer_pool.add_json_topic("orders")
+
+        def produce_fails(*args, **kwargs):
+            raise KafkaException("broken")
+
+        producer_pool._producer.produce = produce_fails
+
+        async def run():
+            producer = AsyncProducer(producer_pool, max_in_flight=1)
+            with pytest.raises(KafkaException):
+                await producer.produce("orders", {"id": 1})
+            return producer.in_flight, await producer.drain(0.1)
+
+        assert asyncio.run(run()) == (0, 0)
+
+
+class TestAsyncCorrelatedRuntime:
+    """Test concurrent entity streams."""
+
+    def test_streams_run_concurrently(self, producer_pool):
+        """Paced streams overlap instead of running one after the other."""
+        runtime = AsyncCorrelatedRuntime(_config(orders_rate=100, payments_rate=50), _reference_pool(), producer_pool)
+        start = asyncio.run(_timed(runtime.run()))
+
+        stats = runtime.stats
+        assert stats["orders"].generated == stats["orders"].delivered == 20
+        assert stats["payments"].generated == stats["payments"].delivered == 10
+        # Sequentially this takes 0.4s; both streams need 0.2s on their own
+        assert start < 0.35
+
+    def test_dependent_stream_waits_for_references(self, tmp_path):
+        """Payments wait for orders to exist instead of failing."""
+        sink_pool = SinkPool(tmp_path)
+        runtime = AsyncCorrelatedRuntime(_config(orders_rate=200), _reference_pool(), sink_pool)
+        asyncio.run(runtime.run())
+        sink_pool.close()
+
+        orders = [json.loads(line) for line in (tmp_path / "orders.ndjson").read_text().splitlines()]
+        payments = [json.loads(line) for line in (tmp_path / "payments.ndjson").read_text().splitlines()]
+        assert len(orders) == 20
+        assert len(payments) == 10
+        assert runtime.stats["payments"].error is None
+
+    def test_missing_references_fail_the_stream(self, producer_pool):
+        """A stream whose references never appear stops with an error."""
+        runtime = AsyncCorrelatedRuntime(_config(), ReferencePool(), producer_pool, entities=["orders"])
+        stats = asyncio.run(runtime.run())
+
+        assert stats["orders"].generated == 0
+        assert "customers" in stats["orders"].error
+
+    def test_progress_every_n_records(self, producer_pool):
+        """progress_records reports after every N records across all streams."""
+        reports = []
+        runtime = AsyncCorrelatedRuntime(
+            _config(), _reference_pool(), producer_pool, progress_interval=None, progress_records=10,
+            on_progress=lambda stats: reports.append(sum(s.generated for s in stats.values())),
+        )
+        asyncio.run(runtime.run())
+
+        assert reports == [10, 20, 30, 30]
+
+    def test_produce_error_stops_one_stream(self, producer_pool):
+        """A stream that cannot produce fails alone; the others finish."""
+        client = producer_pool._producer
+        produce = client.produce
+
+        def produce_except_payments(topic, *args, **kwargs):
+            if topic == "payments":
+                raise KafkaException("payments unavailable")
+            produce(topic, *args, **kwargs)
+
+        client.produce = produce_except_payments
+        runtime = AsyncCorrelatedRuntime(_config(), _reference_pool(), producer_pool)
+        stats = asyncio.run(runtime.run())
+
+        assert stats["orders"].delivered == 20
+        assert stats["orders"].error is None
+        assert stats["payments"].failed == 1
+        assert stats["payments"].delivered == 0
+        assert "payments unavailable" in stats["payments"].error
+
+    def test_stop(self, producer_pool):
+        """stop() ends all streams and reports progress a final time."""
+        reports = []
+        runtime = AsyncCorrelatedRuntime(
+            _config(orders_rate=10, payments_rate=10), _reference_pool(), producer_pool,
+            on_progress=lambda stats: reports.append(sum(s.generated for s in stats.values())),
+        )
+
+        async def run():
+            task = asyncio.create_task(runtime.run())
+            await asyncio.sleep(0.15)
+            runtime.stop()
+            return await task
+
+        stats = asyncio.run(run())
+        assert stats["orders"].generated < 20
+        assert reports == [stats["orders"].generated + stats["payments"].generated]
+
+
+def test_split_message_key():
+    """Key-only fields provide the key and are not produced."""
+    record = {"id": 1, "_key_only_fields": {"partition_key": "p-1"}}
+    assert split_message_key(record, "partition_key") == ("p-1", {"id": 1})
+    assert split_message_key({"id": 1}, "id") == ("1", {"id": 1})
+
+
+async def _timed(coroutine):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await coroutine
+    return loop.time() - start
+
+
+def test_cli_async_runtime(tmp_path):
+    """correlated generate --async-runtime writes every transactional entity."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(_config().config))
+    out = tmp_path / "out"
+
+    result = CliRunner().invoke(cli, [
+        "correlated", "generate", "-c", str(config_path), "--output-dir", str(out), "--async-runtime",
+        "--progress-interval", "15",
+    ])
+
+    assert result.exit_code == 0, result.output
+    assert "orders: 15 generated" in result.output
+    assert len((out / "orders.ndjson").read_text().splitlines()) == 20
+    assert len((out / "payments.ndjson").read_text().splitlines()) == 10
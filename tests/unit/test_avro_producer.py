@@ -205,3 +205,50 @@ class TestAvroProducer:
 
         assert callback_called is True
         assert callback_error is None
+
+    @patch("testdatapy.producers.avro_producer.ConfluentProducer", MockConfluentProducer)
+    @patch("testdatapy.producers.avro_producer.SchemaRegistryClient", MockSchemaRegistryClient)
+    @patch("testdatapy.producers.avro_producer.AvroSerializer", MockAvroSerializer)
+    @patch("testdatapy.producers.wire_format.Schema", MockSchema)
+    def test_produce_with_fast_serialization(self, sample_schema):
+        """Test producing with a precomputed wire-format header."""
+        producer = AvroProducer(
+            auto_create_topic=False,
+            bootstrap_servers="localhost:9092",
+            topic="test-topic",
+            schema_registry_url="http://localhost:8081",
+            schema_str=sample_schema,
+            fast_serialization=True,
+        )
+
+        # Schema is registered once at startup
+        assert "test-topic-value" in producer._schema_registry_client.schemas
+
+        producer.produce(key="test", value={"id": 1, "name": "a"})
+        value = producer._producer.messages[0]["value"]
+        # Magic byte, schema ID 1, then zigzag int 1 and string "a"
+        assert value == b"\x00\x00\x00\x00\x01\x02\x02a"
+
+    @patch("testdatapy.producers.avro_producer.ConfluentProducer", MockConfluentProducer)
+    @patch("testdatapy.producers.avro_producer.SchemaRegistryClient", MockSchemaRegistryClient)
+    @patch("testdatapy.producers.avro_producer.AvroSerializer", MockAvroSerializer)
+    @patch("testdatapy.producers.wire_format.Schema", MockSchema)
+    def test_produce_batch(self, sample_schema):
+        """Test producing a batch encoded in one call."""
+        producer = AvroProducer(
+            auto_create_topic=False,
+            bootstrap_servers="localhost:9092",
+            topic="test-topic",
+            schema_registry_url="http://localhost:8081",
+            schema_str=sample_schema,
+            key_field="id",
+            fast_serialization=True,
+        )
+
+        records = [{"id": i, "name": f"user-{i}"} for i in range(3)]
+        producer.produce_batch(records, on_delivery=lambda err, msg: None)
+
+        messages = producer._producer.messages
+        assert [m["key"] for m in messages] == [b"0", b"1", b"2"]
+        assert messages[1]["value"] == producer._framed_serializer(records[1])
+        assert producer.last_value_size == len(messages[-1]["value"])
@@ -134,6 +134,38 @@ class TestCLI:
         mock_producer.assert_called_once()
         assert mock_prod_instance.produce.call_count == 2
 
+    @patch("testdatapy.cli.JsonProducer")
+    @patch("testdatapy.cli.FakerGenerator")
+    def test_produce_with_preset(self, mock_generator, mock_producer, runner):
+        """Test produce command with a throughput preset."""
+        mock_gen_instance = MagicMock()
+        mock_gen_instance.generate.return_value = [{"id": 1, "name": "Test1"}]
+        mock_generator.return_value = mock_gen_instance
+
+        mock_prod_instance = MagicMock()
+        mock_prod_instance.flush.return_value = 0
+        mock_producer.return_value = mock_prod_instance
+
+        def poll(timeout):
+            stats_cb = mock_producer.call_args.kwargs["config"]["stats_cb"]
+            stats_cb(json.dumps({"type": "producer", "tx_bytes": 250, "txmsg_bytes": 1000}))
+
+        mock_prod_instance.poll.side_effect = poll
+
+        result = runner.invoke(
+            cli,
+            ["produce", "--topic", "test-topic", "--count", "1", "--preset", "max-throughput"],
+        )
+
+        assert result.exit_code == 0
+        config = mock_producer.call_args.kwargs["config"]
+        assert config["compression.type"] == "zstd"
+        assert config["linger.ms"] == 100
+        assert "Throughput preset: max-throughput" in result.output
+        assert "compression.type=zstd" in result.output
+        assert "Bytes on the wire: 250" in result.output
+        assert "Compression ratio: 4.00x" in result.output
+
     @patch("testdatapy.cli.JsonProducer")
     @patch("testdatapy.cli.CSVGenerator")
     def test_produce_json_csv(self, mock_generator, mock_producer, runner, temp_csv):
@@ -88,9 +88,9 @@ class TestCorrelatedCLIProtobuf(unittest.TestCase):
         self.assertNotEqual(result.exit_code, 0)
         self.assertIn("Protobuf format requires --schema-registry-url", result.output)
     
-    @patch('testdatapy.cli_correlated.ProtobufProducer')
-    def test_protobuf_producer_creation(self, mock_protobuf_producer):
-        """Test that protobuf producers are created correctly."""
+    @patch('testdatapy.cli_correlated.ProducerPool')
+    def test_protobuf_producer_creation(self, mock_producer_pool):
+        """Test that protobuf topics are registered on the shared producer pool."""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
             yaml.dump(self.test_config, f)
             config_file = f.name
@@ -117,7 +117,9 @@ class TestCorrelatedCLIProtobuf(unittest.TestCase):
         }):
             # Create mock producer instance
             mock_producer_instance = Mock()
-            mock_protobuf_producer.return_value = mock_producer_instance
+            mock_producer_instance.has_topic.return_value = False
+            mock_producer_instance.ensure_topics.return_value = []
+            mock_producer_pool.return_value = mock_producer_instance
             
             result = self.runner.invoke(correlated, [
                 'generate',
@@ -133,21 +135,23 @@ class TestCorrelatedCLIProtobuf(unittest.TestCase):
                 print(f"Output: {result.output}")
                 print(f"Exception: {result.exception}")
             
-            # Should create protobuf producers
-            self.assertTrue(mock_protobuf_producer.called)
+            # Should create a single shared producer
+            mock_producer_pool.assert_called_once()
+            self.assertEqual(
+                mock_producer_pool.call_args.kwargs['schema_registry_url'],
+                'http://localhost:8081'
+            )
             
-            # Check producer was created with correct parameters
-            calls = mock_protobuf_producer.call_args_list
+            # Topic existence is checked in one batched call
+            mock_producer_instance.ensure_topics.assert_called_once_with(
+                ['test_customers', 'test_orders']
+            )
             
-            # Should have created producers for both customers and orders
-            topics_created = {call.kwargs['topic'] for call in calls if 'topic' in call.kwargs}
+            # Should have registered serializers for both customers and orders
+            calls = mock_producer_instance.add_protobuf_topic.call_args_list
+            topics_created = {call.args[0] for call in calls}
             self.assertIn('test_customers', topics_created)
             self.assertIn('test_orders', topics_created)
-            
-            # Check schema registry URL was passed
-            for call in calls:
-                if 'schema_registry_url' in call.kwargs:
-                    self.assertEqual(call.kwargs['schema_registry_url'], 'http://localhost:8081')
     
     def test_json_format_still_works(self):
         """Test that JSON format still works (backward compatibility)."""
@@ -184,8 +188,8 @@ class TestCorrelatedCLIProtobuf(unittest.TestCase):
         self.assertNotEqual(result.exit_code, 0)
         self.assertIn("Invalid value for '--format'", result.output)
     
-    @patch('testdatapy.cli_correlated.ProtobufProducer')
-    def test_protobuf_with_all_entity_types(self, mock_protobuf_producer):
+    @patch('testdatapy.cli_correlated.ProducerPool')
+    def test_protobuf_with_all_entity_types(self, mock_producer_pool):
         """Test protobuf support for all entity types."""
         # Extended config with payments
         extended_config = self.test_config.copy()
@@ -230,7 +234,9 @@ class TestCorrelatedCLIProtobuf(unittest.TestCase):
             'testdatapy.schemas.protobuf.payment_pb2': mock_payment_module
         }):
             mock_producer_instance = Mock()
-            mock_protobuf_producer.return_value = mock_producer_instance
+            mock_producer_instance.has_topic.return_value = False
+            mock_producer_instance.ensure_topics.return_value = []
+            mock_producer_pool.return_value = mock_producer_instance
             
             result = self.runner.invoke(correlated, [
                 'generate',
@@ -239,9 +245,9 @@ class TestCorrelatedCLIProtobuf(unittest.TestCase):
                 '--schema-registry-url', 'http://localhost:8081'
             ])
             
-            # Check that producers were created for all topics
-            calls = mock_protobuf_producer.call_args_list
-            topics_created = {call.kwargs['topic'] for call in calls if 'topic' in call.kwargs}
+            # Check that serializers were registered for all topics
+            calls = mock_producer_instance.add_protobuf_topic.call_args_list
+            topics_created = {call.args[0] for call in calls}
             
             self.assertIn('test_customers', topics_created)
             self.assertIn('test_orders', topics_created)
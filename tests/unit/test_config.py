@@ -3,7 +3,16 @@ import json
 import tempfile
 from pathlib import Path
 
-from testdatapy.config.loader import AppConfig, KafkaConfig
+import pytest
+
+from testdatapy.config.loader import (
+    THROUGHPUT_PRESETS,
+    AppConfig,
+    KafkaConfig,
+    ProducerConfig,
+    apply_throughput_preset,
+    throughput_settings,
+)
 
 
 class TestAppConfig:
@@ -65,6 +74,49 @@ class TestAppConfig:
         assert confluent_config["ssl.key.location"] == "/key"
         assert confluent_config["ssl.key.password"] == "password"
 
+    def test_to_confluent_config_without_tuning(self):
+        """Default configuration leaves batching to librdkafka defaults."""
+        assert throughput_settings(AppConfig().to_confluent_config()) == {}
+
+    def test_to_confluent_config_with_preset(self):
+        """Presets set linger, batching, compression and queue sizes."""
+        config = AppConfig(producer=ProducerConfig(throughput_preset="balanced"))
+
+        confluent_config = config.to_confluent_config()
+
+        assert throughput_settings(confluent_config) == THROUGHPUT_PRESETS["balanced"]
+        assert confluent_config["compression.type"] == "lz4"
+
+    def test_explicit_settings_override_preset(self):
+        """batch_size, linger_ms and compression_type win over the preset."""
+        config = AppConfig(producer=ProducerConfig(
+            throughput_preset="max-throughput",
+            batch_size=5000,
+            linger_ms=20,
+            compression_type="gzip",
+        ))
+
+        confluent_config = config.to_confluent_config()
+
+        assert confluent_config["batch.num.messages"] == 5000
+        assert confluent_config["linger.ms"] == 20
+        assert confluent_config["compression.type"] == "gzip"
+        assert confluent_config["batch.size"] == THROUGHPUT_PRESETS["max-throughput"]["batch.size"]
+
+    def test_unknown_preset(self):
+        """Unknown presets are rejected."""
+        with pytest.raises(ValueError, match="Unknown throughput preset"):
+            ProducerConfig(throughput_preset="fastest")
+        with pytest.raises(ValueError, match="Unknown throughput preset"):
+            apply_throughput_preset({}, "fastest")
+
+    def test_apply_throughput_preset_keeps_existing(self):
+        """Existing settings are not overwritten by the preset."""
+        merged = apply_throughput_preset({"linger.ms": 1, "acks": "all"}, "latency")
+        assert merged["linger.ms"] == 1
+        assert merged["acks"] == "all"
+        assert merged["compression.type"] == "none"
+
     def test_to_schema_registry_config(self):
         """Test conversion to Schema Registry configuration."""
         config = AppConfig()
@@ -0,0 +1,272 @@
+"""Tests for file sinks."""
+import gzip
+import json
+from unittest.mock import patch
+
+import fastavro
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from testdatapy.cli import cli
+from testdatapy.config.correlation_config import CorrelationConfig
+from testdatapy.generators.correlated_generator import CorrelatedDataGenerator
+from testdatapy.generators.master_data_generator import MasterDataGenerator
+from testdatapy.generators.reference_pool import ReferencePool
+from testdatapy.sinks import (
+    AvroFileSink,
+    NdjsonSink,
+    SinkPool,
+    create_sink,
+    sink_format_for_path,
+)
+
+AVRO_SCHEMA = {
+    "type": "record",
+    "name": "Reading",
+    "fields": [
+        {"name": "id", "type": "int"},
+        {"name": "sensor", "type": "string"},
+        {"name": "value", "type": ["null", "double"]},
+    ],
+}
+
+
+def _read_lines(path):
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _readings(count):
+    return [{"id": i, "sensor": f"s-{i % 7}", "value": i / 4 if i % 3 else None}
+            for i in range(count)]
+
+
+class TestNdjsonSink:
+    """Test buffered NDJSON output."""
+
+    def test_round_trip_with_gzip_suffix(self, tmp_path):
+        """A .gz suffix compresses the output."""
+        path = tmp_path / "readings.ndjson.gz"
+        with NdjsonSink(path, buffer_records=10) as sink:
+            for record in _readings(25):
+                sink.produce(None, record)
+            assert sink.queue_size == 5
+
+        assert sink.files == [path]
+        assert sink.records_written == 25
+        assert _read_lines(path) == _readings(25)
+
+    def test_rotation_by_size(self, tmp_path):
+        """Files are numbered and each holds whole chunks."""
+        sink = NdjsonSink(tmp_path / "readings.ndjson", buffer_records=50, max_bytes=4000)
+        for record in _readings(1000):
+            sink.produce(None, record)
+        sink.close()
+        sink.close()
+
+        assert len(sink.files) > 1
+        assert sink.files[0].name == "readings-00000.ndjson"
+        assert [r for path in sink.files for r in _read_lines(path)] == _readings(1000)
+
+    def test_rotation_by_time(self, tmp_path, monkeypatch):
+        """A file open longer than max_seconds is finished before the next record."""
+        clock = iter(range(100))
+        monkeypatch.setattr("testdatapy.sinks.base.time.monotonic", lambda: next(clock) * 10.0)
+        sink = NdjsonSink(tmp_path / "readings.ndjson", buffer_records=1, max_seconds=15)
+        for record in _readings(4):
+            sink.produce(None, record)
+        sink.close()
+
+        assert [len(_read_lines(path)) for path in sink.files] == [2, 2]
+
+    def test_unknown_compression(self, tmp_path):
+        """Unsupported compressions are rejected."""
+        with pytest.raises(ValueError, match="Unsupported compression"):
+            NdjsonSink(tmp_path / "out.ndjson", compression="bzip2")
+
+
+class TestAvroFileSink:
+    """Test Avro object container output."""
+
+    def test_round_trip(self, tmp_path):
+        """Files carry their schema and read back with any Avro reader."""
+        path = tmp_path / "readings.avro"
+        sink = AvroFileSink(path, AVRO_SCHEMA, buffer_records=100)
+        for record in _readings(250):
+            sink.produce(None, record)
+        sink.close()
+
+        with open(path, "rb") as f:
+            reader = fastavro.reader(f)
+            assert reader.writer_schema["name"] == "Reading"
+            assert list(reader) == _readings(250)
+        assert sink.last_value_size > 0
+
+    def test_schema_from_file(self, tmp_path):
+        """The schema can be given as an .avsc path."""
+        schema_file = tmp_path / "reading.avsc"
+        schema_file.write_text(json.dumps(AVRO_SCHEMA))
+
+        sink = create_sink(tmp_path / "out.avro", schema=str(schema_file))
+
+        assert isinstance(sink, AvroFileSink)
+
+    def test_records_are_validated(self, tmp_path):
+        """Records that do not match the schema fail on write."""
+        sink = AvroFileSink(tmp_path / "bad.avro", AVRO_SCHEMA)
+        sink.produce(None, {"id": "not a number", "sensor": "s", "value": None})
+
+        with pytest.raises((ValueError, TypeError)):
+            sink.flush()
+
+
+class TestParquetSink:
+    """Test Parquet output."""
+
+    def test_row_groups_and_rotation(self, tmp_path):
+        """Each chunk becomes a row group; rotated files share the schema."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        from testdatapy.sinks import ParquetSink
+
+        sink = ParquetSink(tmp_path / "readings.parquet", row_group_size=100, max_bytes=1)
+        for record in _readings(250):
+            sink.produce(None, record)
+        sink.close()
+
+        assert len(sink.files) == 3
+        tables = [pq.read_table(path) for path in sink.files]
+        assert all(table.schema == tables[0].schema for table in tables)
+        assert sum(table.num_rows for table in tables) == 250
+
+
+class TestSinkFormats:
+    """Test format selection."""
+
+    @pytest.mark.parametrize("name, expected", [
+        ("a.ndjson", "ndjson"),
+        ("a.jsonl.gz", "ndjson"),
+        ("a.ndjson.zst", "ndjson"),
+        ("a.avro", "avro"),
+        ("a.parquet", "parquet"),
+    ])
+    def test_format_from_suffix(self, name, expected):
+        """The file suffix selects the format."""
+        assert sink_format_for_path(name) == expected
+
+    def test_unknown_suffix(self):
+        """Unknown suffixes need an explicit format."""
+        with pytest.raises(ValueError, match="output format"):
+            sink_format_for_path("out.csv")
+
+    def test_avro_requires_schema(self, tmp_path):
+        """Avro output cannot be written without a schema."""
+        with pytest.raises(ValueError, match="schema"):
+            create_sink(tmp_path / "out.avro")
+
+
+class TestSinkPool:
+    """Test multi-topic file output."""
+
+    def test_master_data_written_per_topic(self, tmp_path):
+        """Master data production writes one file per topic."""
+        config = CorrelationConfig({
+            "master_data": {
+                "customers": {
+                    "source": "faker",
+                    "count": 30,
+                    "kafka_topic": "customers",
+                    "id_field": "customer_id",
+                    "schema": {
+                        "customer_id": {"type": "string", "format": "CUST_{seq:04d}"},
+                        "tier": {"type": "choice", "choices": ["gold", "silver"]},
+                    },
+                }
+            }
+        })
+        pool = SinkPool(tmp_path / "out", compression="gzip")
+        generator = MasterDataGenerator(config, ReferencePool(), producer=pool, seed=3)
+        generator.load_all()
+        generator.produce_all()
+        pool.close()
+
+        assert pool.files == [tmp_path / "out" / "customers.ndjson.gz"]
+        records = _read_lines(pool.files[0])
+        assert [r["customer_id"] for r in records] == [f"CUST_{i:04d}" for i in range(1, 31)]
+
+    def test_unregistered_topic_raises(self, tmp_path):
+        """Records for unknown topics are rejected like in ProducerPool."""
+        with pytest.raises(ValueError, match="not registered"):
+            SinkPool(tmp_path).produce("orders", {"id": 1})
+
+    def test_avro_topics_need_a_schema(self, tmp_path):
+        """Avro pools register topics with their schema."""
+        pool = SinkPool(tmp_path, format="avro")
+        with pytest.raises(ValueError, match="add_avro_topic"):
+            pool.add_json_topic("readings")
+
+        pool.add_avro_topic("readings", AVRO_SCHEMA)
+        pool.produce("readings", _readings(1)[0])
+        pool.close()
+
+        with open(tmp_path / "readings.avro", "rb") as f:
+            assert list(fastavro.reader(f)) == _readings(1)
+
+
+class TestProduceToFile:
+    """Test the produce command with --output."""
+
+    def test_produce_writes_ndjson(self, tmp_path):
+        """Generated messages go to the file instead of Kafka."""
+        path = tmp_path / "users.ndjson"
+
+        result = CliRunner().invoke(cli, [
+            "produce", "-t", "users", "-o", str(path), "--count", "20", "--rate", "100000",
+            "--seed", "1",
+        ])
+
+        assert result.exit_code == 0, result.output
+        assert f"Wrote {path}" in result.output
+        assert len(_read_lines(path)) == 20
+
+    def test_avro_output_requires_schema_file(self, tmp_path):
+        """Avro files need --schema-file."""
+        result = CliRunner().invoke(cli, [
+            "produce", "-t", "users", "-o", str(tmp_path / "users.avro"), "--count", "1",
+        ])
+
+        assert result.exit_code != 0
+        assert "schema" in result.output
+
+
+class TestCorrelatedToFiles:
+    """Test correlated generate with --output-dir."""
+
+    def test_files_are_finished_when_generation_is_interrupted(self, tmp_path):
+        """An interrupted run still closes the sinks, so gzip streams are complete."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "master_data": {
+                "customers": {
+                    "source": "faker",
+                    "count": 10,
+                    "kafka_topic": "customers",
+                    "id_field": "customer_id",
+                    "schema": {"customer_id": {"type": "string", "format": "CUST_{seq:04d}"}},
+                }
+            },
+            "transactional_data": {
+                "orders": {"kafka_topic": "orders", "rate_per_second": 0, "max_messages": 5},
+            },
+        }))
+        out = tmp_path / "out"
+
+        with patch.object(CorrelatedDataGenerator, "generate", side_effect=KeyboardInterrupt):
+            result = CliRunner().invoke(cli, [
+                "correlated", "generate", "-c", str(config_path), "--output-dir", str(out),
+                "--output-compression", "gzip",
+            ])
+
+        assert result.exit_code != 0
+        assert len(_read_lines(out / "customers.ndjson.gz")) == 10
@@ -0,0 +1,107 @@
+"""Unit tests for delivery latency tracking."""
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from testdatapy.metrics.collector import MetricsCollector
+from testdatapy.metrics.latency import LatencyHistogram, LatencyTracker
+
+
+def _delivered(topic: str, latency: float | None) -> MagicMock:
+    """Build a delivered message mock."""
+    msg = MagicMock()
+    msg.topic.return_value = topic
+    msg.latency.return_value = latency
+    return msg
+
+
+class TestLatencyHistogram:
+    """Test the LatencyHistogram class."""
+
+    def test_empty(self):
+        """An empty histogram reports zeros."""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(0.99) == 0.0
+        assert histogram.summary()["count"] == 0
+
+    def test_percentiles_within_relative_error(self):
+        """Percentiles are within the bucket precision of exact values."""
+        rng = random.Random(7)
+        values = [rng.expovariate(1 / 0.005) for _ in range(20000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+        for quantile in (0.5, 0.99, 0.999):
+            exact = values[int(quantile * len(values)) - 1]
+            assert histogram.percentile(quantile) == pytest.approx(exact, rel=0.02, abs=2e-6)
+        assert histogram.max == values[-1]
+        assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+    def test_summary_keys(self):
+        """Summaries contain p50, p99 and p999."""
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        summary = histogram.summary()
+        assert summary["p50"] == pytest.approx(0.5, rel=0.02)
+        assert summary["p99"] == pytest.approx(0.99, rel=0.02)
+        assert summary["p999"] == pytest.approx(0.999, rel=0.02)
+
+    def test_merge(self):
+        """Merging adds counts and keeps extremes."""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(0.001)
+        second.record(0.5)
+        second.record(0.002)
+
+        first.merge(second)
+
+        assert first.count == 3
+        assert first.min == 0.001
+        assert first.max == 0.5
+
+
+class TestLatencyTracker:
+    """Test the LatencyTracker class."""
+
+    def test_on_delivery(self):
+        """Latencies are recorded per topic for successful deliveries only."""
+        tracker = LatencyTracker()
+        tracker.on_delivery(None, _delivered("orders", 0.004))
+        tracker.on_delivery(None, _delivered("orders", 0.006))
+        tracker.on_delivery(None, _delivered("customers", None))
+        tracker.on_delivery("timeout", _delivered("customers", 1.0))
+
+        assert list(tracker.histograms) == ["orders"]
+        assert tracker.histograms["orders"].count == 2
+
+    def test_delivery_callback_chains(self):
+        """The chained callback still receives every report."""
+        tracker = LatencyTracker()
+        chained = MagicMock()
+        callback = tracker.delivery_callback(chained)
+
+        msg = _delivered("orders", 0.01)
+        callback(None, msg)
+
+        chained.assert_called_once_with(None, msg)
+        assert tracker.histograms["orders"].count == 1
+
+    def test_report_and_metrics(self):
+        """Quantiles are printed and exported as Prometheus gauges."""
+        tracker = LatencyTracker()
+        for _ in range(100):
+            tracker.record("orders", 0.010)
+
+        lines = tracker.format_report()
+        assert lines[0].startswith("Delivery latency orders: p50 10.0 ms")
+
+        collector = MetricsCollector()
+        collector.update_delivery_latency(tracker)
+        assert collector.registry.get_sample_value(
+            "testdatapy_delivery_latency_seconds", {"topic": "orders", "quantile": "0.99"}
+        ) == pytest.approx(0.010, rel=0.02)
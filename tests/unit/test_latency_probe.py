@@ -0,0 +1,124 @@
+"""Unit tests for the latency probe."""
+import functools
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from testdatapy.cli_correlated import correlated
+from testdatapy.validators.latency_probe import PROBE_HEADER, LatencyProbe
+from tests.unit.mocks import InMemoryBroker
+
+
+class TestLatencyProbe:
+    """Test the LatencyProbe class against an in-memory broker."""
+
+    def test_markers_round_trip(self):
+        """All markers are consumed back and measured per topic."""
+        broker = InMemoryBroker({"customers": 3, "orders": 6})
+        probe = LatencyProbe(
+            bootstrap_servers="localhost:9092",
+            topics=["customers", "orders"],
+            messages_per_topic=50,
+            rate=0,
+            timeout=5,
+            producer_factory=broker.producer,
+            consumer_factory=broker.consumer,
+        )
+
+        result = probe.run()
+
+        assert result.sent == {"customers": 50, "orders": 50}
+        assert result.received == {"customers": 50, "orders": 50}
+        assert result.lost == {"customers": 0, "orders": 0}
+        assert result.latency["orders"].count == 50
+        assert sum(result.timeline) == 100
+        assert result.to_dict()["overall_latency"]["count"] == 100
+
+    def test_existing_records_are_skipped(self):
+        """Only markers of this run are measured, starting at the end offsets."""
+        broker = InMemoryBroker({"orders": 2})
+        broker.append("orders", b"k", b'{"order_id": 1}')
+        broker.append("orders", b"k", b'{"probe_id": "old", "sent_at": 0}',
+                      headers=[(PROBE_HEADER, b"old")])
+
+        result = LatencyProbe(
+            bootstrap_servers="localhost:9092",
+            topics=["orders"],
+            messages_per_topic=10,
+            rate=0,
+            timeout=5,
+            producer_factory=broker.producer,
+            consumer_factory=broker.consumer,
+        ).run()
+
+        assert result.received == {"orders": 10}
+        assert result.latency["orders"].max < 5
+
+    def test_uses_assign_not_subscribe(self):
+        """Partitions are assigned explicitly, without a group subscription."""
+        broker = InMemoryBroker({"orders": 4})
+        consumers = []
+
+        def consumer_factory(config):
+            consumer = broker.consumer(config)
+            consumers.append(consumer)
+            return consumer
+
+        LatencyProbe(
+            bootstrap_servers="localhost:9092",
+            topics=["orders"],
+            messages_per_topic=5,
+            rate=0,
+            producer_factory=broker.producer,
+            consumer_factory=consumer_factory,
+        ).run()
+
+        consumer = consumers[0]
+        assert not consumer.subscribed
+        assert consumer.closed
+        assert sorted(consumer.positions) == [("orders", p) for p in range(4)]
+
+    def test_unknown_topic(self):
+        """Probing a missing topic fails early."""
+        broker = InMemoryBroker({"orders": 1})
+        probe = LatencyProbe(
+            bootstrap_servers="localhost:9092",
+            topics=["missing"],
+            producer_factory=broker.producer,
+            consumer_factory=broker.consumer,
+        )
+        with pytest.raises(ValueError, match="not available"):
+            probe.run()
+
+
+class TestLatencyProbeCLI:
+    """Test the correlated latency-probe command."""
+
+    def test_requires_topics(self):
+        """A topic or config is required."""
+        result = CliRunner().invoke(correlated, ["latency-probe"])
+        assert result.exit_code == 1
+        assert "Specify --topic or --config" in result.output
+
+    def test_reports_results(self, tmp_path, monkeypatch):
+        """The command prints per-topic latency and saves JSON results."""
+        broker = InMemoryBroker({"orders": 2})
+        monkeypatch.setattr(
+            "testdatapy.validators.latency_probe.LatencyProbe",
+            functools.partial(
+                LatencyProbe,
+                producer_factory=broker.producer,
+                consumer_factory=broker.consumer,
+            ),
+        )
+
+        output = tmp_path / "probe.json"
+        result = CliRunner().invoke(correlated, [
+            "latency-probe", "-t", "orders", "--messages", "20", "--rate", "0",
+            "--output", str(output),
+        ])
+
+        assert result.exit_code == 0, result.output
+        assert "orders: 20/20 markers" in result.output
+        assert json.loads(output.read_text())["topics"]["orders"]["received"] == 20
@@ -1,7 +1,9 @@
 """Unit tests for metrics collection."""
-from unittest.mock import ANY, patch
+import json
+from unittest.mock import ANY, MagicMock, patch
 
 from testdatapy.metrics.collector import MetricsCollector, create_metrics_collector
+from testdatapy.metrics.librdkafka_stats import LibrdkafkaStats, summarize_stats
 
 
 class TestMetricsCollector:
@@ -36,6 +38,56 @@ class TestMetricsCollector:
         assert collector._message_count == 1
         assert collector._total_bytes == 100
 
+    def test_record_message_produced_is_batched(self):
+        """Counter increments are buffered until flushed."""
+        collector = MetricsCollector(flush_every=10, flush_interval=3600)
+        labels = {"topic": "t", "format": "json", "generator": "faker"}
+
+        for _ in range(5):
+            collector.record_message_produced("t", "json", "faker", 100, 0.001)
+        sample = collector.registry.get_sample_value
+        assert sample("testdatapy_messages_produced_total", labels) == 0
+
+        for _ in range(5):
+            collector.record_message_produced("t", "json", "faker", 100, 0.001)
+        assert sample("testdatapy_messages_produced_total", labels) == 10
+        assert sample("testdatapy_bytes_produced_total", {"topic": "t", "format": "json"}) == 1000
+
+        collector.record_message_produced("t", "json", "faker", 100, 0.001)
+        collector.flush()
+        assert sample("testdatapy_messages_produced_total", labels) == 11
+
+    def test_record_message_produced_flushes_on_interval(self):
+        """Buffered increments are published once the interval has passed."""
+        collector = MetricsCollector(flush_every=1000, flush_interval=0)
+        collector.record_message_produced("t", "json", "faker", 100, 0.001)
+        assert collector.registry.get_sample_value(
+            "testdatapy_messages_produced_total",
+            {"topic": "t", "format": "json", "generator": "faker"},
+        ) == 1
+
+    def test_duration_histogram_is_sampled(self):
+        """Only one in histogram_sample_rate durations is observed."""
+        collector = MetricsCollector(histogram_sample_rate=4)
+        for _ in range(8):
+            collector.record_message_produced("t", "json", "faker", 10, 0.001)
+
+        assert collector.registry.get_sample_value(
+            "testdatapy_produce_duration_seconds_count", {"topic": "t", "format": "json"}
+        ) == 2
+        assert collector.get_stats()["messages_produced"] == 8
+
+    def test_label_children_are_bound_once(self):
+        """Label lookups happen once per label combination."""
+        collector = MetricsCollector()
+        with patch.object(
+            collector.messages_produced, "labels", wraps=collector.messages_produced.labels
+        ) as labels:
+            for _ in range(100):
+                collector.record_message_produced("t", "json", "faker", 10, 0.001)
+            collector.flush()
+        labels.assert_called_once()
+
     def test_record_message_failed(self):
         """Test recording failed message production."""
         collector = MetricsCollector()
@@ -122,3 +174,104 @@ class TestMetricsCollector:
             duration=0.01
         )
         # Should not fail but do nothing
+
+
+class TestLibrdkafkaStats:
+    """Test the LibrdkafkaStats class."""
+
+    def test_compression_ratio(self):
+        """Message bytes and wire bytes are read from the latest report."""
+        stats = LibrdkafkaStats()
+        stats(json.dumps({"type": "producer", "tx_bytes": 1000, "txmsg_bytes": 4000, "txmsgs": 50}))
+
+        assert stats.updates == 1
+        assert stats.tx_bytes == 1000
+        assert stats.txmsgs == 50
+        assert stats.compression_ratio == 4.0
+
+    def test_ignores_other_clients(self):
+        """Reports from admin clients sharing the config are ignored."""
+        stats = LibrdkafkaStats()
+        stats(json.dumps({"type": "admin", "tx_bytes": 10}))
+        assert stats.updates == 0
+        assert stats.compression_ratio is None
+
+    def test_configure(self):
+        """Statistics are enabled without overriding an explicit interval."""
+        stats = LibrdkafkaStats()
+        config = stats.configure({"statistics.interval.ms": 5000})
+        assert config["statistics.interval.ms"] == 5000
+        assert config["stats_cb"] is stats
+        assert stats.configure({})["statistics.interval.ms"] == 1000
+
+    def test_wait_for_update(self):
+        """Polling stops once a new report arrives."""
+        stats = LibrdkafkaStats()
+        poll = MagicMock(side_effect=lambda timeout: stats(json.dumps({"tx_bytes": 1})))
+        assert stats.wait_for_update(poll, timeout=1.0)
+        poll.assert_called_once_with(0.1)
+
+
+SAMPLE_STATS = {
+    "type": "producer",
+    "msg_cnt": 120,
+    "msg_size": 48000,
+    "tx_bytes": 90000,
+    "txmsg_bytes": 300000,
+    "brokers": {
+        "localhost:9092/bootstrap": {"nodeid": -1, "name": "localhost:9092/bootstrap"},
+        "broker1:9092/1": {
+            "nodeid": 1,
+            "nodename": "broker1:9092",
+            "rtt": {"p99": 25000},
+            "throttle": {"avg": 40},
+            "txretries": 3,
+        },
+    },
+    "topics": {
+        "orders": {
+            "batchsize": {"avg": 16384},
+            "partitions": {
+                "0": {"msgq_cnt": 10, "xmit_msgq_cnt": 5},
+                "-1": {"msgq_cnt": 2, "xmit_msgq_cnt": 0},
+            },
+        },
+    },
+}
+
+
+class TestLibrdkafkaStatsExport:
+    """Test exporting librdkafka statistics as Prometheus gauges."""
+
+    def test_summarize_stats(self):
+        """Key figures are extracted and bootstrap brokers are skipped."""
+        summary = summarize_stats(SAMPLE_STATS)
+        assert summary["queue_messages"] == 120
+        assert summary["topic_queue"] == {"orders": 17}
+        assert summary["topic_batch_size_avg"] == {"orders": 16384}
+        assert summary["broker_rtt_p99_ms"] == {"broker1:9092": 25.0}
+        assert summary["broker_throttle_avg_ms"] == {"broker1:9092": 40}
+        assert summary["broker_tx_retries"] == {"broker1:9092": 3}
+
+    def test_record_librdkafka_stats(self):
+        """Reports update the librdkafka gauges and the queue size gauge."""
+        collector = MetricsCollector()
+        stats = LibrdkafkaStats(on_update=collector.record_librdkafka_stats)
+        stats(json.dumps(SAMPLE_STATS))
+
+        sample = collector.registry.get_sample_value
+        assert sample("testdatapy_librdkafka_queue_messages") == 120
+        assert sample("testdatapy_librdkafka_tx_bytes") == 90000
+        assert sample("testdatapy_producer_queue_size", {"topic": "orders"}) == 17
+        assert sample("testdatapy_librdkafka_batch_size_avg_bytes", {"topic": "orders"}) == 16384
+        assert sample(
+            "testdatapy_librdkafka_broker_rtt_p99_seconds", {"broker": "broker1:9092"}
+        ) == 0.025
+        assert sample(
+            "testdatapy_librdkafka_broker_throttle_avg_seconds", {"broker": "broker1:9092"}
+        ) == 0.04
+
+    def test_dummy_collector_ignores_stats(self):
+        """The disabled collector accepts reports without Prometheus metrics."""
+        collector = create_metrics_collector(enabled=False)
+        collector.record_librdkafka_stats(SAMPLE_STATS)
@@ -0,0 +1,191 @@
+"""Unit tests for client-side partitioning and partition statistics."""
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from testdatapy.metrics.collector import MetricsCollector
+from testdatapy.producers.json_producer import JsonProducer
+from testdatapy.producers.partitioning import (
+    FieldPartitioner,
+    Murmur2Partitioner,
+    Partitioner,
+    PartitionStats,
+    StickyPartitioner,
+    create_partitioner,
+    murmur2,
+    murmur2_partition,
+)
+from testdatapy.producers.pool import ProducerPool
+from tests.unit.mocks import MockConfluentProducer
+
+
+class TestMurmur2:
+    """Test murmur2 compatibility with the Java client."""
+
+    @pytest.mark.parametrize("key,expected", [
+        # Reference values from Kafka's UtilsTest
+        ("21", -973932308),
+        ("foobar", -790332482),
+        ("a-little-bit-long-string", -985981536),
+        ("a-little-bit-longer-string", -1486304829),
+        ("lkjh234lh9fiuh90y23oiuhsafujhadof229phr9h19h89h8", -58897971),
+        ("abc", 479470107),
+    ])
+    def test_matches_java_client(self, key, expected):
+        """Hashes are identical to Kafka's Utils.murmur2."""
+        assert murmur2(key.encode("utf-8")) == expected
+
+    def test_partition_is_positive(self):
+        """Negative hashes are masked before the modulo."""
+        assert murmur2_partition(b"foobar", 7) == (-790332482 & 0x7FFFFFFF) % 7
+
+
+class TestPartitioners:
+    """Test the partitioner implementations."""
+
+    def test_base_class_is_abstract(self):
+        """Partitioners must implement partition()."""
+        with pytest.raises(TypeError):
+            Partitioner(4)
+
+    def test_murmur2_keyed(self):
+        """Keyed messages always map to the same partition."""
+        partitioner = Murmur2Partitioner(12)
+        partitions = {partitioner.partition(b"CUST_001", {}) for _ in range(10)}
+        assert partitions == {murmur2_partition(b"CUST_001", 12)}
+
+    def test_sticky_switches_after_batch(self):
+        """Sticky partitioning changes partition once per batch."""
+        partitioner = StickyPartitioner(4, batch_messages=3, seed=42)
+        partitions = [partitioner.partition(None, {}) for _ in range(9)]
+
+        batches = [partitions[i:i + 3] for i in range(0, 9, 3)]
+        assert all(len(set(batch)) == 1 for batch in batches)
+        assert batches[0][0] != batches[1][0]
+        assert batches[1][0] != batches[2][0]
+
+    def test_murmur2_null_keys_are_sticky(self):
+        """Messages without a key fall back to sticky partitioning."""
+        partitioner = Murmur2Partitioner(4, batch_messages=5, seed=1)
+        assert len({partitioner.partition(None, {}) for _ in range(5)}) == 1
+
+    def test_field_partitioner(self):
+        """The partition is taken from a record field."""
+        partitioner = FieldPartitioner(4, "shard")
+        assert partitioner.partition(b"k", {"shard": 6}) == 2
+        assert partitioner.partition(b"k", {}) == murmur2_partition(b"k", 4)
+
+    def test_create_partitioner(self):
+        """Modes map to partitioner classes."""
+        assert create_partitioner("default", 3) is None
+        assert isinstance(create_partitioner("murmur2", 3), Murmur2Partitioner)
+        assert isinstance(create_partitioner("sticky", 3), StickyPartitioner)
+        assert isinstance(create_partitioner("field", 3, "shard"), FieldPartitioner)
+        with pytest.raises(ValueError, match="partition field"):
+            create_partitioner("field", 3)
+        with pytest.raises(ValueError, match="Unknown"):
+            create_partitioner("roundrobin", 3)
+
+
+class TestPartitionStats:
+    """Test the PartitionStats class."""
+
+    def test_histogram_and_skew(self):
+        """Messages and bytes are counted per partition."""
+        stats = PartitionStats()
+        for partition, size in [(0, 10), (0, 20), (0, 30), (1, 40)]:
+            stats.record("orders", partition, size)
+
+        assert stats.histogram("orders") == {
+            0: {"messages": 3, "bytes": 60},
+            1: {"messages": 1, "bytes": 40},
+        }
+        assert stats.skew("orders") == pytest.approx(1.5)
+        assert stats.skew("unknown") == 0.0
+
+    def test_on_delivery_ignores_failures(self):
+        """Only successful deliveries are recorded."""
+        stats = PartitionStats()
+        msg = MagicMock()
+        msg.topic.return_value = "orders"
+        msg.partition.return_value = 2
+        msg.value.return_value = b"abcd"
+
+        stats.on_delivery(None, msg)
+        stats.on_delivery("error", msg)
+
+        assert stats.histogram("orders") == {2: {"messages": 1, "bytes": 4}}
+
+    def test_report_lists_empty_partitions(self):
+        """The report includes partitions that received nothing."""
+        stats = PartitionStats()
+        stats.record("orders", 1, 100)
+
+        lines = stats.format_report("orders", num_partitions=3)
+        assert lines[0] == "Partition distribution for orders:"
+        assert len(lines) == 5
+        assert "Skew (max/mean): 3.00" in lines[-1]
+
+    def test_metrics_export(self):
+        """Histograms are exported as Prometheus gauges."""
+        stats = PartitionStats()
+        stats.record("orders", 0, 10)
+        stats.record("orders", 0, 15)
+
+        collector = MetricsCollector()
+        collector.update_partition_stats(stats)
+
+        assert collector.registry.get_sample_value(
+            "testdatapy_partition_messages", {"topic": "orders", "partition": "0"}
+        ) == 2
+        assert collector.registry.get_sample_value(
+            "testdatapy_partition_bytes", {"topic": "orders", "partition": "0"}
+        ) == 25
+
+
+class TestProducerIntegration:
+    """Test partitioners wired into producers."""
+
+    @patch("testdatapy.producers.json_producer.ConfluentProducer", MockConfluentProducer)
+    def test_json_producer_passes_partition(self):
+        """Producers pass the chosen partition to librdkafka."""
+        producer = JsonProducer(
+            bootstrap_servers="localhost:9092",
+            topic="orders",
+            key_field="customer_id",
+            auto_create_topic=False,
+        )
+        producer.partitioner = Murmur2Partitioner(6)
+
+        for i in range(20):
+            producer.produce(key=None, value={"customer_id": f"C{i % 4}"})
+
+        for message in producer._producer.messages:
+            assert message["partition"] == murmur2_partition(message["key"], 6)
+
+    def test_pool_partitions_hot_keys(self):
+        """The pool applies its partitioner mode and records the distribution."""
+        stats = PartitionStats()
+        with patch("testdatapy.producers.pool.ConfluentProducer", MockConfluentProducer):
+            pool = ProducerPool(
+                bootstrap_servers="localhost:9092",
+                partitioner="murmur2",
+                partition_stats=stats,
+            )
+        metadata = MagicMock()
+        metadata.topics = {"orders": MagicMock(partitions={p: None for p in range(8)})}
+        pool._producer.list_topics = MagicMock(return_value=metadata)
+
+        pool.add_json_topic("orders", key_field="customer_id")
+        # Zipf-like: one hot key dominates
+        keys = ["HOT"] * 80 + [f"C{i}" for i in range(20)]
+        for key in keys:
+            pool.produce("orders", {"customer_id": key})
+
+        hot_partition = murmur2_partition(b"HOT", 8)
+        histogram = stats.histogram("orders")
+        assert histogram[hot_partition]["messages"] >= 80
+        assert sum(h["messages"] for h in histogram.values()) == 100
+        assert Counter(m["partition"] for m in pool._producer.messages)[hot_partition] >= 80
+        assert stats.skew("orders") > 2
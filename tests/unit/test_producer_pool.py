@@ -0,0 +1,94 @@
+"""Unit tests for the shared producer pool."""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from confluent_kafka.schema_registry._sync.mock_schema_registry_client import (
+    MockSchemaRegistryClient,
+)
+
+from testdatapy.producers.pool import ProducerPool
+from testdatapy.schemas.protobuf import customer_pb2
+from tests.unit.mocks import MockConfluentProducer
+
+
+@pytest.fixture
+def pool():
+    """Producer pool backed by mock clients."""
+    with patch("testdatapy.producers.pool.ConfluentProducer", MockConfluentProducer), \
+            patch("testdatapy.producers.pool.SchemaRegistryClient", MockSchemaRegistryClient):
+        yield ProducerPool(
+            bootstrap_servers="localhost:9092",
+            config={"linger.ms": 5},
+            schema_registry_url="mock://registry",
+        )
+
+
+class TestProducerPool:
+    """Test the ProducerPool class."""
+
+    def test_single_client_for_all_topics(self, pool):
+        """All topics share one underlying producer."""
+        pool.add_json_topic("customers", key_field="customer_id")
+        pool.add_json_topic("orders")
+
+        pool.produce("customers", {"customer_id": "C1", "name": "a"})
+        pool.produce("orders", {"order_id": "O1"}, key="C1")
+
+        messages = pool._producer.messages
+        assert [m["topic"] for m in messages] == ["customers", "orders"]
+        assert [m["key"] for m in messages] == [b"C1", b"C1"]
+        assert json.loads(messages[1]["value"]) == {"order_id": "O1"}
+        assert pool._producer.config == {"bootstrap.servers": "localhost:9092", "linger.ms": 5}
+
+    def test_message_timestamp(self, pool):
+        """An explicit timestamp is passed to the client, e.g. for event time."""
+        pool.add_json_topic("orders")
+
+        pool.produce("orders", {"order_id": "O1"}, timestamp=1709251200000)
+        pool.produce("orders", {"order_id": "O2"})
+
+        assert [m["timestamp"] for m in pool._producer.messages] == [1709251200000, 0]
+
+    def test_unregistered_topic_raises(self, pool):
+        """Producing to an unknown topic is an error."""
+        with pytest.raises(ValueError, match="not registered"):
+            pool.produce("unknown", {"id": 1})
+
+    @pytest.mark.parametrize("fast_serialization", [False, True])
+    def test_protobuf_topic(self, pool, fast_serialization):
+        """Protobuf topics share the Schema Registry client and frame values."""
+        pool.fast_serialization = fast_serialization
+        pool.add_protobuf_topic("customers", customer_pb2.Customer, key_field="customer_id")
+        pool.add_json_topic("events")
+
+        pool.produce("customers", {"customer_id": "C1", "name": "Jane"})
+
+        message = pool._producer.messages[0]
+        assert message["key"] == b"C1"
+        payload = customer_pb2.Customer(customer_id="C1", name="Jane").SerializeToString()
+        assert message["value"] == b"\x00\x00\x00\x00\x01\x00" + payload
+        assert pool.topics == ["customers", "events"]
+
+    def test_protobuf_requires_schema_registry(self):
+        """Protobuf topics need a Schema Registry URL."""
+        with patch("testdatapy.producers.pool.ConfluentProducer", MockConfluentProducer):
+            pool = ProducerPool(bootstrap_servers="localhost:9092")
+        with pytest.raises(ValueError, match="Schema Registry URL"):
+            pool.add_protobuf_topic("customers", customer_pb2.Customer)
+
+    def test_ensure_topics_uses_one_admin_client(self, pool):
+        """Topic existence is checked with a single batched call."""
+        pool.topic_config = {"num_partitions": 6, "replication_factor": 3}
+        with patch("testdatapy.producers.pool.TopicManager") as manager_class:
+            manager = MagicMock()
+            manager.ensure_topics_exist.return_value = ["orders"]
+            manager_class.return_value = manager
+
+            created = pool.ensure_topics(["customers", "orders"])
+
+        assert created == ["orders"]
+        manager_class.assert_called_once()
+        manager.ensure_topics_exist.assert_called_once_with(
+            ["customers", "orders"], num_partitions=6, replication_factor=3, config={}
+        )
@@ -0,0 +1,146 @@
+"""Unit tests for topic-level protobuf validation."""
+import json
+import struct
+
+import pytest
+
+from testdatapy.schemas.protobuf import customer_pb2, order_pb2
+from testdatapy.validators.protobuf_validator import (
+    ProtobufValidator,
+    _load_proto_class,
+    create_validation_executor,
+    _proto_class_spec,
+)
+from tests.unit.mocks import InMemoryBroker
+
+
+def frame(message) -> bytes:
+    """Frame a protobuf message in the Schema Registry wire format."""
+    return b"\x00" + struct.pack(">I", 1) + b"\x00" + message.SerializeToString()
+
+
+def fill(broker, topic, count, partitions):
+    """Write framed orders round-robin across partitions."""
+    for i in range(count):
+        order = order_pb2.Order(order_id=f"O{i}", customer_id=f"C{i % 7}")
+        broker.append(topic, f"O{i}".encode(), frame(order), partition=i % partitions)
+
+
+class TestValidateTopic:
+    """Test full-topic, partition-parallel validation."""
+
+    def test_validates_every_partition(self):
+        """Every message of every partition is validated, not a sample."""
+        broker = InMemoryBroker({"orders": 4})
+        fill(broker, "orders", 10_000, 4)
+        validator = ProtobufValidator("localhost:9092", consumer_factory=broker.consumer)
+
+        results = validator.validate_topic("orders", order_pb2.Order, workers=1)
+
+        assert results["total_messages"] == 10_000
+        assert results["valid_protobuf"] == 10_000
+        assert results["valid_percentage"] == 100
+        assert results["partitions"] == {0: 2500, 1: 2500, 2: 2500, 3: 2500}
+        assert results["message_samples"][0]["sample_fields"]["order_id"] == "O0"
+
+    def test_counts_json_and_empty_messages(self):
+        """JSON and empty values are classified; errors are capped."""
+        broker = InMemoryBroker({"orders": 2})
+        fill(broker, "orders", 10, 2)
+        for i in range(20):
+            broker.append("orders", b"k", json.dumps({"order_id": i}).encode(), partition=1)
+        broker.append("orders", b"k", None, partition=0)
+        validator = ProtobufValidator("localhost:9092", consumer_factory=broker.consumer)
+
+        results = validator.validate_topic("orders", order_pb2.Order, workers=1, max_errors=5)
+
+        assert results["total_messages"] == 31
+        assert results["json_messages"] == 20
+        assert results["empty_messages"] == 1
+        assert len(results["errors"]) == 5
+        assert "partition 1" in results["errors"][0]
+
+    def test_process_pool(self):
+        """Deserialization in worker processes gives the same results."""
+        broker = InMemoryBroker({"orders": 3})
+        fill(broker, "orders", 5000, 3)
+        validator = ProtobufValidator("localhost:9092", consumer_factory=broker.consumer)
+
+        results = validator.validate_topic("orders", order_pb2.Order, workers=2)
+
+        assert results["total_messages"] == 5000
+        assert results["valid_protobuf"] == 5000
+
+    def test_workers_are_spawned(self):
+        """Worker processes do not fork the running Kafka client."""
+        executor = create_validation_executor(2)
+        try:
+            assert executor._mp_context.get_start_method() == "spawn"
+        finally:
+            executor.shutdown()
+
+    def test_max_messages(self):
+        """Validation stops at max_messages."""
+        broker = InMemoryBroker({"orders": 2})
+        fill(broker, "orders", 100, 2)
+        validator = ProtobufValidator("localhost:9092", consumer_factory=broker.consumer)
+
+        results = validator.validate_topic("orders", order_pb2.Order, max_messages=30, workers=1)
+
+        assert results["total_messages"] == 30
+
+    def test_stops_at_gap_before_end_offset(self):
+        """Missing offsets before the high watermark end the run after the idle timeout."""
+        broker = InMemoryBroker({"orders": 1})
+        fill(broker, "orders", 10, 1)
+
+        def consumer_factory(config):
+            consumer = broker.consumer(config)
+            # Pretend a transaction marker occupies the last offset
+            consumer.get_watermark_offsets = lambda tp, timeout=10: (0, 11)
+            consumer.position = lambda partitions: partitions
+            return consumer
+
+        validator = ProtobufValidator("localhost:9092", consumer_factory=consumer_factory)
+        results = validator.validate_topic("orders", order_pb2.Order, workers=1, idle_timeout=0.1)
+
+        assert results["total_messages"] == 10
+        assert "Stopped after" in results["errors"][-1]
+
+    def test_unknown_topic(self):
+        """Validating a missing topic raises ValueError."""
+        broker = InMemoryBroker({})
+        validator = ProtobufValidator("localhost:9092", consumer_factory=broker.consumer)
+        with pytest.raises(ValueError, match="not available"):
+            validator.validate_topic("orders", order_pb2.Order, workers=1)
+
+
+class TestCompareTopics:
+    """Test parallel comparison of topics."""
+
+    def test_full_mode(self):
+        """Topics are validated in full and summarized."""
+        broker = InMemoryBroker({"orders": 2, "customers": 2})
+        fill(broker, "orders", 500, 2)
+        broker.append("customers", b"C1", json.dumps({"customer_id": "C1"}).encode())
+        validator = ProtobufValidator("localhost:9092", consumer_factory=broker.consumer)
+
+        results = validator.compare_topics(
+            ["orders", "customers", "payments"],
+            {"orders": order_pb2.Order, "customers": customer_pb2.Customer},
+            full=True,
+            workers=1,
+        )
+
+        assert results["topics"]["orders"]["valid_protobuf"] == 500
+        assert results["topics"]["customers"]["json_messages"] == 1
+        assert results["topics"]["payments"] == {"error": "No protobuf class provided"}
+        assert results["summary"]["total_messages"] == 501
+        assert results["summary"]["all_protobuf"] is False
+
+
+def test_proto_class_spec_round_trip():
+    """Classes rebuilt from their descriptors parse the same bytes."""
+    rebuilt = _load_proto_class(_proto_class_spec(order_pb2.Order))
+    message = rebuilt.FromString(order_pb2.Order(order_id="O1").SerializeToString())
+    assert message.order_id == "O1"
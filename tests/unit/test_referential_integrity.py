@@ -0,0 +1,194 @@
+"""Unit tests for referential-integrity verification."""
+import json
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from testdatapy.cli_correlated import correlated
+from testdatapy.config.correlation_config import CorrelationConfig
+from testdatapy.validators.referential_integrity import (
+    BloomFilter,
+    ReferentialIntegrityVerifier,
+    SortedKeySet,
+    get_path,
+    hash_keys,
+    relationships_from_config,
+)
+from tests.unit.mocks import InMemoryBroker
+
+CONFIG = {
+    "master_data": {
+        "customers": {
+            "source": "faker",
+            "count": 100,
+            "kafka_topic": "customers",
+            "id_field": "customer_id",
+        },
+    },
+    "transactional_data": {
+        "orders": {
+            "kafka_topic": "orders",
+            "id_field": "order_id",
+            "relationships": {
+                "customer_id": {"references": "customers.customer_id", "percentage": 80},
+            },
+            "derived_fields": {
+                "customer": {"type": "reference", "source": "self.customer_id"},
+            },
+        },
+        "payments": {
+            "kafka_topic": "payments",
+            "relationships": {
+                "order_id": {"references": "orders.order_id"},
+            },
+        },
+    },
+}
+
+
+def produce(broker, topic, records, partitions=2):
+    """Write JSON records round-robin across partitions."""
+    for i, record in enumerate(records):
+        broker.append(topic, None, json.dumps(record).encode(), partition=i % partitions)
+
+
+@pytest.fixture
+def broker():
+    """Broker with customers, orders (some orphaned) and payments."""
+    broker = InMemoryBroker({"customers": 2, "orders": 2, "payments": 2})
+    produce(broker, "customers", [{"customer_id": f"C{i}"} for i in range(1000)])
+    orders = []
+    for i in range(500):
+        order = {"order_id": f"O{i}"}
+        if i % 5:
+            # Every 50th order references a customer that does not exist
+            order["customer"] = f"MISSING{i}" if i % 50 == 1 else f"C{i}"
+        orders.append(order)
+    produce(broker, "orders", orders)
+    produce(broker, "payments", [{"order_id": f"O{i}"} for i in range(300)])
+    return broker
+
+
+class TestKeySets:
+    """Test the compact key sets."""
+
+    @pytest.mark.parametrize("key_set_class", [BloomFilter, SortedKeySet])
+    def test_membership(self, key_set_class):
+        """Added keys are found; absent keys are (almost) never found."""
+        key_set = key_set_class(10_000)
+        key_set.add_hashes(hash_keys(range(10_000)))
+        key_set.freeze()
+
+        assert key_set.contains_hashes(hash_keys(range(10_000))).all()
+        false_positives = key_set.contains_hashes(hash_keys(range(10_000, 20_000))).mean()
+        assert false_positives < 0.005
+
+    def test_bloom_filter_size(self):
+        """The Bloom filter uses about 14.4 bits per key at 0.1% error rate."""
+        bloom = BloomFilter(1_000_000, 0.001)
+        assert 1.7e6 < bloom.memory_bytes < 1.9e6
+        assert bloom.num_hashes == 10
+
+    def test_keys_compare_as_strings(self):
+        """Integer and string keys with the same text are the same key."""
+        assert np.array_equal(hash_keys([42]), hash_keys(["42"]))
+
+
+def test_get_path():
+    """Dotted and list paths are resolved."""
+    record = {"a": {"b": 1}, "items": [{"id": "x"}, {"id": "y"}, {}]}
+    assert get_path(record, "a.b") == 1
+    assert get_path(record, "items[].id") == ["x", "y"]
+    assert get_path(record, "missing.b") is None
+
+
+def test_relationships_from_config():
+    """Relationships use the derived field that carries the reference."""
+    relationships = relationships_from_config(CorrelationConfig(CONFIG))
+    by_name = {r.name: r for r in relationships}
+
+    orders = by_name["orders.customer_id -> customers.customer_id"]
+    assert orders.record_path == "customer"
+    assert orders.percentage == 80
+    payments = by_name["payments.order_id -> orders.order_id"]
+    assert payments.record_path == "order_id"
+    assert payments.target_topic == "orders"
+
+
+class TestVerifier:
+    """Test verification against an in-memory broker."""
+
+    @pytest.mark.parametrize("key_set_type", ["bloom", "exact"])
+    def test_reports_join_statistics(self, broker, key_set_type):
+        """Hit ratio, orphans and correlation percentage per relationship."""
+        result = ReferentialIntegrityVerifier(
+            "localhost:9092",
+            CorrelationConfig(CONFIG),
+            key_set_type=key_set_type,
+            consumer_factory=broker.consumer,
+        ).run()
+
+        stats = {r.relationship.source: r for r in result.relationships}
+        orders = stats["orders"]
+        assert orders.records == 500
+        assert orders.null_references == 100
+        assert orders.correlation_percentage == 80
+        assert orders.references == 400
+        assert orders.orphans == 10
+        assert orders.orphan_samples[0] == "MISSING1"
+        assert stats["payments"].hit_ratio == 1.0
+        assert result.key_sets["customers.customer_id"]["keys"] == 1000
+        assert not result.passed
+
+        report = "\n".join(result.format_report())
+        assert "10 orphans of 400 references" in report
+        assert "(configured 80%)" in report
+        assert result.to_dict()["relationships"][0]["orphans"] == 10
+
+    def test_passes_without_orphans(self):
+        """A fully joined data set passes."""
+        broker = InMemoryBroker({"customers": 1, "orders": 1, "payments": 1})
+        produce(broker, "customers", [{"customer_id": "C1"}], 1)
+        produce(broker, "orders", [{"order_id": "O1", "customer": "C1"}], 1)
+        produce(broker, "payments", [{"order_id": "O1"}], 1)
+
+        result = ReferentialIntegrityVerifier(
+            "localhost:9092", CorrelationConfig(CONFIG), consumer_factory=broker.consumer
+        ).run()
+
+        assert result.passed
+
+    def test_unknown_key_set_type(self):
+        """Unknown key set types are rejected."""
+        with pytest.raises(ValueError, match="Unknown key set type"):
+            ReferentialIntegrityVerifier(
+                "localhost:9092", CorrelationConfig(CONFIG), key_set_type="hash"
+            )
+
+
+def test_verify_command(broker, tmp_path, monkeypatch):
+    """The verify command reports orphans and fails."""
+    import functools
+
+    from testdatapy.validators import referential_integrity
+
+    config_file = tmp_path / "correlation.yaml"
+    config_file.write_text(json.dumps(CONFIG))
+    monkeypatch.setattr(
+        referential_integrity,
+        "ReferentialIntegrityVerifier",
+        functools.partial(
+            referential_integrity.ReferentialIntegrityVerifier,
+            consumer_factory=broker.consumer,
+        ),
+    )
+
+    output = tmp_path / "verify.json"
+    result = CliRunner().invoke(correlated, [
+        "verify", "--config", str(config_file), "--output", str(output),
+    ])
+
+    assert result.exit_code == 1
+    assert "10 orphans of 400 references" in result.output
+    assert json.loads(output.read_text())["passed"] is False
@@ -0,0 +1,173 @@
+"""Tests for message logs and replay."""
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from testdatapy.cli import cli
+from testdatapy.producers.replay import ReplayProducer
+from testdatapy.sinks import MessageLog, MessageLogSink
+from tests.unit.mocks import MockConfluentProducer
+
+
+def _write_log(path, records, **options):
+    with MessageLogSink(path, topic="readings", key_field="id", **options) as sink:
+        for record in records:
+            sink.produce(None, record)
+    return sink
+
+
+@pytest.fixture
+def replay_producer():
+    """Replay producer backed by a mock client."""
+    with patch("testdatapy.producers.replay.ConfluentProducer", MockConfluentProducer):
+        yield ReplayProducer("localhost:9092", auto_create_topic=False)
+
+
+class TestMessageLog:
+    """Test writing and reading message logs."""
+
+    def test_round_trip(self, tmp_path):
+        """Keys and values come back byte for byte."""
+        path = tmp_path / "readings.log"
+        records = [{"id": i, "value": i * 1.5} for i in range(100)] + [{"value": None}]
+        _write_log(path, records, metadata={"format": "json"})
+
+        with MessageLog(path) as log:
+            assert log.topic == "readings"
+            assert log.metadata["format"] == "json"
+            assert len(log) == 101
+            messages = list(log)
+
+        assert messages[0] == (b"0", json.dumps(records[0]).encode())
+        assert messages[-1] == (None, b'{"value": null}')
+
+    def test_custom_serializer(self, tmp_path):
+        """Values are stored exactly as the serializer returns them."""
+        path = tmp_path / "raw.log"
+        _write_log(path, [{"id": 7}], serializer=lambda value: b"\x00\x01raw")
+
+        with MessageLog(path) as log:
+            assert list(log) == [(b"7", b"\x00\x01raw")]
+
+    def test_not_a_message_log(self, tmp_path):
+        """Other files are rejected."""
+        path = tmp_path / "data.ndjson"
+        path.write_text('{"id": 1}\n')
+
+        with pytest.raises(ValueError, match="not a message log"):
+            MessageLog(path)
+
+    def test_truncated_log(self, tmp_path):
+        """A log cut off inside a frame fails instead of yielding a partial message."""
+        path = tmp_path / "cut.log"
+        _write_log(path, [{"id": 1}, {"id": 2}])
+        path.write_bytes(path.read_bytes()[:-3])
+
+        with MessageLog(path) as log, pytest.raises(ValueError, match="truncated"):
+            list(log)
+
+
+class TestReplayProducer:
+    """Test replaying message logs."""
+
+    def test_replay_sends_raw_bytes(self, tmp_path, replay_producer):
+        """Messages are produced unchanged to the recorded topic."""
+        path = tmp_path / "readings.log"
+        _write_log(path, [{"id": i} for i in range(10)])
+
+        with MessageLog(path) as log:
+            assert replay_producer.replay(log) == 10
+
+        sent = replay_producer._producer.messages
+        assert [m["topic"] for m in sent] == ["readings"] * 10
+        assert sent[3]["key"] == b"3"
+        assert sent[3]["value"] == b'{"id": 3}'
+        assert replay_producer.bytes_sent == sum(len(m["value"]) for m in sent)
+
+    def test_replay_all_respects_max_messages(self, tmp_path, replay_producer):
+        """The message limit spans all logs."""
+        logs = []
+        for name in ("a.log", "b.log"):
+            _write_log(tmp_path / name, [{"id": i} for i in range(5)])
+            logs.append(MessageLog(tmp_path / name))
+
+        assert replay_producer.replay_all(logs, topic="other", max_messages=7) == 7
+        assert {m["topic"] for m in replay_producer._producer.messages} == {"other"}
+
+    def test_low_rate_is_paced_per_message(self, tmp_path, replay_producer):
+        """Messages are spread over time instead of sent in one burst."""
+        path = tmp_path / "readings.log"
+        _write_log(path, [{"id": i} for i in range(5)])
+        client = replay_producer._producer
+        produce = client.produce
+        sent_at = []
+
+        def timed_produce(*args, **kwargs):
+            sent_at.append(time.perf_counter())
+            produce(*args, **kwargs)
+
+        client.produce = timed_produce
+        with MessageLog(path) as log:
+            assert replay_producer.replay(log, rate_per_second=20) == 5
+
+        gaps = [b - a for a, b in zip(sent_at, sent_at[1:])]
+        assert all(gap >= 0.04 for gap in gaps)
+
+    def test_stop_while_waiting(self, tmp_path, replay_producer):
+        """should_stop is honoured during the pacing sleep."""
+        path = tmp_path / "readings.log"
+        _write_log(path, [{"id": i} for i in range(5)])
+        stop_at = time.perf_counter() + 0.2
+
+        started = time.perf_counter()
+        with MessageLog(path) as log:
+            sent = replay_producer.replay(
+                log, rate_per_second=1, should_stop=lambda: time.perf_counter() > stop_at
+            )
+
+        assert sent == 1
+        assert time.perf_counter() - started < 1.0
+
+    def test_full_queue_is_retried(self, tmp_path, replay_producer):
+        """A full local queue is drained and the message is produced again."""
+        path = tmp_path / "readings.log"
+        _write_log(path, [{"id": 1}])
+        client = replay_producer._producer
+        produce = client.produce
+        calls = []
+
+        def produce_once_full(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise BufferError("Local: Queue full")
+            produce(*args, **kwargs)
+
+        client.produce = produce_once_full
+        with MessageLog(path) as log:
+            assert replay_producer.replay(log) == 1
+        assert len(calls) == 2
+        assert len(client.messages) == 1
+
+
+class TestReplayCli:
+    """Test the generate-to-file and replay commands."""
+
+    def test_generate_then_replay(self, tmp_path):
+        """A generated log replays every message."""
+        path = tmp_path / "users.log"
+        runner = CliRunner()
+
+        result = runner.invoke(cli, [
+            "generate-to-file", "-t", "users", "-o", str(path), "--count", "15",
+            "--key-field", "CustomerID", "--seed", "3",
+        ])
+        assert result.exit_code == 0, result.output
+
+        with patch("testdatapy.producers.replay.ConfluentProducer", MockConfluentProducer):
+            result = runner.invoke(cli, ["replay", str(path), "--no-auto-create-topic"])
+
+        assert result.exit_code == 0, result.output
+        assert "Total messages: 15" in result.output
@@ -120,12 +120,14 @@ class TestGracefulProducer:
     def test_initialization(self):
         """Test graceful producer initialization."""
         mock_producer = MagicMock()
+        mock_producer.queue_size = 0
         handler = ShutdownHandler()
         
         graceful = GracefulProducer(mock_producer, handler)
         assert graceful.producer == mock_producer
         assert graceful.shutdown_handler == handler
-        assert graceful._messages_in_flight == 0
+        assert graceful.messages_in_flight == 0
+        assert graceful.drain_timeout == 30.0
 
     def test_produce_during_normal_operation(self):
         """Test producing during normal operation."""
@@ -137,7 +139,6 @@ class TestGracefulProducer:
         
         # Should call underlying producer
         mock_producer.produce.assert_called_once()
-        assert graceful._messages_in_flight == 1
 
     def test_produce_during_shutdown(self):
         """Test producing during shutdown."""
@@ -150,8 +151,8 @@ class TestGracefulProducer:
         with pytest.raises(RuntimeError, match="Cannot produce during shutdown"):
             graceful.produce(topic="test", key="key", value={"test": "data"})
 
-    def test_delivery_callback_wrapper(self):
-        """Test delivery callback wrapper."""
+    def test_delivery_callback_passed_through(self):
+        """Test delivery callbacks are passed through without wrapping."""
         mock_producer = MagicMock()
         handler = ShutdownHandler()
         graceful = GracefulProducer(mock_producer, handler)
@@ -166,17 +167,39 @@ class TestGracefulProducer:
             on_delivery=original_callback
         )
         
-        # Get the wrapped callback
         call_args = mock_producer.produce.call_args
-        wrapped_callback = call_args.kwargs["on_delivery"]
+        assert call_args.kwargs["on_delivery"] is original_callback
+
+    def test_messages_in_flight_from_queue_length(self):
+        """Test in-flight messages are read from the producer queue."""
+        mock_producer = MagicMock()
+        mock_producer.queue_size = 7
+        graceful = GracefulProducer(mock_producer, ShutdownHandler())
+        assert graceful.messages_in_flight == 7
+
+        # Raw confluent producers expose the queue via len()
+        raw_producer = MagicMock(spec=["produce", "flush", "__len__"])
+        raw_producer.__len__.return_value = 3
+        graceful = GracefulProducer(raw_producer, ShutdownHandler())
+        assert graceful.messages_in_flight == 3
+
+    def test_cleanup_reports_undelivered(self, capsys):
+        """Test cleanup drains within the timeout and reports the remainder."""
+        mock_producer = MagicMock()
+        mock_producer.queue_size = 12
+        mock_producer.flush.return_value = 4
         
-        # Simulate delivery
-        wrapped_callback(None, MagicMock())
+        handler = ShutdownHandler()
+        graceful = GracefulProducer(mock_producer, handler, drain_timeout=2.5)
+        graceful._cleanup()
         
-        # Should call original callback
-        original_callback.assert_called_once()
-        # Should decrement in-flight counter
-        assert graceful._messages_in_flight == 0
+        mock_producer.flush.assert_called_once_with(timeout=2.5)
+        assert graceful.undelivered == 4
+        output = capsys.readouterr().out
+        assert "Flushing 12 messages" in output
+        assert "4 messages not delivered within 2.5s" in output
+        # Closing would flush the remainder again without a timeout
+        mock_producer.close.assert_not_called()
 
     def test_cleanup(self):
         """Test cleanup on shutdown."""
@@ -187,7 +210,7 @@ class TestGracefulProducer:
         graceful = GracefulProducer(mock_producer, handler)
         
         # Simulate some in-flight messages
-        graceful._messages_in_flight = 5
+        mock_producer.queue_size = 5
         
         # Run cleanup
         graceful._cleanup()
@@ -132,6 +132,37 @@ class TestTopicManager:
         assert result is True
         admin_client_mock.create_topics.assert_not_called()
 
+    def test_ensure_topics_exist_batches_creation(self, topic_manager, admin_client_mock):
+        """Test ensure_topics_exist creates all missing topics in one call."""
+        metadata_mock = Mock()
+        metadata_mock.topics = {"existing-topic": Mock()}
+        admin_client_mock.list_topics.return_value = metadata_mock
+
+        futures = {"new-a": Mock(), "new-b": Mock()}
+        futures["new-a"].result.return_value = None
+        futures["new-b"].result.side_effect = KafkaException(KafkaError(36, "Topic already exists"))
+        admin_client_mock.create_topics.return_value = futures
+
+        created = topic_manager.ensure_topics_exist(
+            ["existing-topic", "new-a", "new-b", "new-a"], num_partitions=3
+        )
+
+        assert created == ["new-a"]
+        admin_client_mock.list_topics.assert_called_once()
+        admin_client_mock.create_topics.assert_called_once()
+        new_topics = admin_client_mock.create_topics.call_args[0][0]
+        assert [t.topic for t in new_topics] == ["new-a", "new-b"]
+        assert all(t.num_partitions == 3 for t in new_topics)
+
+    def test_ensure_topics_exist_all_present(self, topic_manager, admin_client_mock):
+        """Test ensure_topics_exist does not call create when nothing is missing."""
+        metadata_mock = Mock()
+        metadata_mock.topics = {"a": Mock(), "b": Mock()}
+        admin_client_mock.list_topics.return_value = metadata_mock
+
+        assert topic_manager.ensure_topics_exist(["a", "b"]) == []
+        admin_client_mock.create_topics.assert_not_called()
+
     def test_ensure_topic_with_config(self, topic_manager, admin_client_mock):
         """Test creating topic with additional configuration."""
         # Mock topic doesn't exist
@@ -0,0 +1,175 @@
+"""Unit tests for Confluent wire-format framing."""
+import io
+import json
+
+import pytest
+from confluent_kafka.schema_registry._sync.mock_schema_registry_client import (
+    MockSchemaRegistryClient,
+)
+from confluent_kafka.schema_registry.avro import AvroSerializer
+from confluent_kafka.schema_registry.protobuf import ProtobufSerializer
+from confluent_kafka.serialization import MessageField, SerializationContext
+
+from testdatapy.producers.wire_format import (
+    FastAvroEncoder,
+    FramedAvroSerializer,
+    FramedProtobufSerializer,
+    build_header,
+    encode_message_indexes,
+    protobuf_message_indexes,
+)
+from testdatapy.schemas.protobuf import customer_pb2
+
+
+class TestHeader:
+    """Test header construction."""
+
+    def test_build_header_avro(self):
+        """Avro headers are the magic byte plus a big-endian schema ID."""
+        assert build_header(1) == b"\x00\x00\x00\x00\x01"
+        assert build_header(258) == b"\x00\x00\x00\x01\x02"
+
+    def test_build_header_protobuf_first_message(self):
+        """The first top-level message is encoded as a single zero byte."""
+        assert build_header(1, [0]) == b"\x00\x00\x00\x00\x01\x00"
+
+    @pytest.mark.parametrize("indexes", [[1], [0, 2], [3, 1, 70]])
+    def test_encode_message_indexes_matches_confluent(self, indexes):
+        """Index arrays are encoded like the confluent serializer does."""
+        buf = io.BytesIO()
+        ProtobufSerializer._encode_varints(buf, indexes)
+        assert encode_message_indexes(indexes) == buf.getvalue()
+
+    def test_protobuf_message_indexes_top_level(self):
+        """Top-level messages resolve to their position in the file."""
+        assert protobuf_message_indexes(customer_pb2.Customer.DESCRIPTOR) == [0]
+
+
+class TestFramedProtobufSerializer:
+    """Test the FramedProtobufSerializer class."""
+
+    def test_matches_stock_serializer(self):
+        """Framed output is byte-identical to ProtobufSerializer output."""
+        client = MockSchemaRegistryClient({"url": "mock://registry"})
+        serializer = ProtobufSerializer(
+            customer_pb2.Customer, client, {"use.deprecated.format": False}
+        )
+        framed = FramedProtobufSerializer.from_serializer(
+            serializer, customer_pb2.Customer, "customers"
+        )
+
+        message = customer_pb2.Customer(customer_id="CUST_001", name="Jane Doe")
+        ctx = SerializationContext("customers", MessageField.VALUE)
+        assert framed(message) == serializer(message, ctx)
+        assert framed.schema_id == client.get_latest_version("customers-value").schema_id
+
+
+class TestFramedAvroSerializer:
+    """Test the FramedAvroSerializer class."""
+
+    @pytest.fixture
+    def schema_str(self):
+        """Sample Avro schema."""
+        return json.dumps({
+            "type": "record",
+            "name": "TestRecord",
+            "fields": [
+                {"name": "id", "type": "int"},
+                {"name": "name", "type": "string"},
+                {"name": "score", "type": ["null", "double"], "default": None},
+            ],
+        })
+
+    def test_matches_stock_serializer(self, schema_str):
+        """Framed output is byte-identical to AvroSerializer output."""
+        client = MockSchemaRegistryClient({"url": "mock://registry"})
+        serializer = AvroSerializer(client, schema_str)
+        framed = FramedAvroSerializer(schema_str, client, "test-value")
+
+        ctx = SerializationContext("test", MessageField.VALUE)
+        for record in ({"id": 1, "name": "a", "score": None}, {"id": 2, "name": "b", "score": 1.5}):
+            assert framed(record) == serializer(record, ctx)
+
+    def test_lookup_without_registration(self, schema_str):
+        """Existing schemas can be looked up instead of registered."""
+        client = MockSchemaRegistryClient({"url": "mock://registry"})
+        schema_id = FramedAvroSerializer(schema_str, client, "test-value").schema_id
+
+        framed = FramedAvroSerializer(schema_str, client, "test-value", auto_register=False)
+        assert framed.schema_id == schema_id
+        assert framed.header == build_header(schema_id)
+
+
+class TestFastAvroEncoder:
+    """Test the FastAvroEncoder class."""
+
+    @pytest.fixture
+    def schema_str(self):
+        """Avro schema covering nested, collection and logical types."""
+        return json.dumps({
+            "type": "record",
+            "name": "Order",
+            "namespace": "com.example",
+            "fields": [
+                {"name": "order_id", "type": "string"},
+                {"name": "quantity", "type": "long"},
+                {"name": "amount", "type": "double"},
+                {"name": "paid", "type": "boolean"},
+                {"name": "status", "type": {"type": "enum", "name": "Status",
+                                            "symbols": ["PENDING", "SHIPPED"]}},
+                {"name": "tags", "type": {"type": "array", "items": "string"}},
+                {"name": "attributes", "type": {"type": "map", "values": "string"}},
+                {"name": "note", "type": ["null", "string"], "default": None},
+                {"name": "created_at", "type": {"type": "long",
+                                                "logicalType": "timestamp-millis"}},
+                {"name": "address", "type": {
+                    "type": "record",
+                    "name": "Address",
+                    "fields": [
+                        {"name": "city", "type": "string"},
+                        {"name": "zip", "type": ["null", "int"], "default": None},
+                    ],
+                }},
+            ],
+        })
+
+    @pytest.fixture
+    def records(self):
+        """Sample records for the order schema."""
+        return [
+            {
+                "order_id": f"ORD_{i:04d}",
+                "quantity": i * 1000,
+                "amount": i * 9.99,
+                "paid": i % 2 == 0,
+                "status": "SHIPPED" if i % 3 else "PENDING",
+                "tags": ["a", "b"][: i % 3],
+                "attributes": {"channel": "web"} if i % 2 else {},
+                "note": None if i % 2 else f"note {i}",
+                "created_at": 1700000000000 + i,
+                "address": {"city": "Berlin", "zip": None if i % 4 else 10115},
+            }
+            for i in range(50)
+        ]
+
+    def test_byte_for_byte_against_avro_serializer(self, schema_str, records):
+        """Framed fastavro output matches AvroSerializer output for every record."""
+        client = MockSchemaRegistryClient({"url": "mock://registry"})
+        serializer = AvroSerializer(client, schema_str)
+        framed = FramedAvroSerializer(schema_str, client, "orders-value")
+
+        ctx = SerializationContext("orders", MessageField.VALUE)
+        expected = [serializer(record, ctx) for record in records]
+        assert [framed(record) for record in records] == expected
+        assert framed.serialize_batch(records) == expected
+
+    def test_buffer_is_reused(self, schema_str, records):
+        """Encoding reuses one buffer without leaking bytes between records."""
+        encoder = FastAvroEncoder(schema_str)
+        buffer = encoder._buffer
+
+        long_record = encoder.encode(records[49])
+        short_record = encoder.encode(records[0])
+        assert encoder._buffer is buffer
+        assert len(short_record) < len(long_record)
+        assert encoder.encode_batch([records[0], records[49]]) == [short_record, long_record]
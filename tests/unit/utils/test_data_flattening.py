@@ -4,6 +4,8 @@ from typing import Dict, Any
 
 from testdatapy.utils.data_flattening import (
     DataFlattener, 
+    FlattenPlan,
+    FlattenPlanCache,
     flatten_for_csv, 
     flatten_dict, 
     unflatten_dict
@@ -540,4 +542,89 @@ class TestEdgeCases:
             "123": "value1",
             "nested.456": "value2"
         }
-        assert result == expected
\ No newline at end of file
+        assert result == expected
+
+
+class TestFlattenPlans:
+    """Test compiled flatten and unflatten plans."""
+    
+    RECORD = {
+        "id": "A1",
+        "active": True,
+        "missing": None,
+        "full": {"Vehicle": {"plate": "B-XY 1", "axles": [2, {"load": 7}, [1, 2]]}},
+        "tags": [],
+    }
+    
+    @pytest.mark.parametrize("options", [
+        {},
+        {"boolean_format": "yes_no"},
+        {"convert_to_strings": False, "boolean_format": "preserve"},
+        {"convert_to_strings": False},
+    ])
+    def test_plan_matches_flatten_dict(self, options):
+        """Compiled flattening gives the same keys, order and values."""
+        plan = FlattenPlan.from_record(self.RECORD)
+        
+        expected = DataFlattener.flatten_dict(self.RECORD, **options)
+        result = plan.flatten(self.RECORD, **options)
+        
+        assert list(result.items()) == list(expected.items())
+        assert plan.columns == list(expected)
+    
+    def test_other_shapes_fall_back(self):
+        """Records with other keys, list lengths or nesting are not read by the plan."""
+        plan = FlattenPlan.from_record({"a": {"b": 1}, "c": [1, 2]})
+        
+        assert plan.values({"a": {"b": 5}, "c": [3, 4]}) == (5, 3, 4)
+        assert plan.values({"a": {"x": 5}, "c": [3, 4]}) is None
+        assert plan.values({"a": {"b": 5}, "c": [3]}) is None
+        assert plan.values({"a": {"b": {"d": 1}}, "c": [3, 4]}) is None
+        assert plan.flatten({"a": "flat"}) == {"a": "flat"}
+    
+    def test_schema_plan(self):
+        """Plans compile from object schemas but not from references."""
+        schema = {
+            "id": {"type": "string"},
+            "address": {"type": "object", "properties": {"city": {"type": "faker"}}},
+        }
+        
+        assert FlattenPlan.from_schema(schema).columns == ["id", "address.city"]
+        with pytest.raises(ValueError, match="Reference"):
+            FlattenPlan.from_schema({"c": {"type": "reference", "source": "c.id"}})
+    
+    def test_unflatten_from_columns(self):
+        """Rows with the plan's columns are rebuilt like unflatten_dict()."""
+        row = {"full.Job.id": "1", "name": "x", "full.Job.kind": "k", "full.Vehicle.plate": "p"}
+        plan = FlattenPlan.from_columns(list(row))
+        
+        assert plan.unflatten(row) == DataFlattener.unflatten_dict(row)
+        assert list(plan.unflatten(row)) == ["full", "name"]
+        assert plan.unflatten({"other.key": "v"}) == {"other": {"key": "v"}}
+    
+    def test_conflicting_columns_have_no_plan(self):
+        """Columns that are both a value and an object are left to unflatten_dict()."""
+        assert FlattenPlan.from_columns(["a", "a.b"]) is None
+        assert FlattenPlan.from_columns(["a.b", "a"]) is None
+    
+    def test_batch_helpers(self):
+        """flatten_many() and unflatten_many() handle mixed shapes."""
+        records = [self.RECORD, {"id": "A2"}, self.RECORD]
+        
+        flattened = DataFlattener.flatten_many(records)
+        
+        assert flattened == [DataFlattener.flatten_dict(record) for record in records]
+        rows = [{"a.b": "1", "c": "2"}, {"a.b": "3", "c": "4"}]
+        assert DataFlattener.unflatten_many(rows) == [DataFlattener.unflatten_dict(row) for row in rows]
+    
+    def test_plan_cache_limit(self):
+        """The cache compiles one plan per shape up to its limit."""
+        plans = FlattenPlanCache(max_plans=2)
+        
+        first, _ = plans.lookup({"a": 1})
+        again, values = plans.lookup({"a": 2})
+        plans.lookup({"b": 1})
+        
+        assert first is again and values == (2,)
+        assert plans.lookup({"c": 1}) == (None, None)
+        assert len(plans.plans) == 2